@@ -250,6 +250,16 @@ const AgentItem = forwardRef<HTMLDivElement, AgentItemProps>(function AgentItem(
               <td>{info.iteration_index}/{info.iteration_total}</td>
             </tr>
           )}
+          {info.stage_timings?.total !== undefined && (
+            <tr>
+              <td style={{ paddingRight: 8, whiteSpace: 'nowrap', opacity: 0.7 }}>{t('agentRuntime.tooltipPromptBuild')}</td>
+              <td>
+                {Object.entries(info.stage_timings)
+                  .map(([stage, ms]) => `${stage} ${Math.round(ms)}ms`)
+                  .join(' · ')}
+              </td>
+            </tr>
+          )}
         </tbody>
       </Box>
       {info.error_summary && (
@@ -129,6 +129,12 @@ export interface ModelGroupConfig {
   PRESENCE_PENALTY?: number | null
   FREQUENCY_PENALTY?: number | null
   EXTRA_BODY?: string | null
+  MAX_CONCURRENCY?: number
+  RPM_LIMIT?: number
+  TPM_LIMIT?: number
+  CONTEXT_TOKEN_BUDGET?: number
+  TOKENIZER?: string
+  ROUTING_POOL?: string
   ENABLE_VISION?: boolean
   ENABLE_COT?: boolean
 }
@@ -53,6 +53,17 @@ interface AgentActivePayload {
   max_duration_ms: number
 }
 
+export interface ContextBudgetReport {
+  tokenizer: string
+  budget: number
+  used: number
+  sections: Record<string, number>
+  history_kept: number
+  history_dropped: number
+  images_dropped: number
+  memory_trimmed: boolean
+}
+
 interface AgentRuntimePhasePayload {
   chat_key: string
   active: boolean
@@ -70,6 +81,8 @@ interface AgentRuntimePhasePayload {
   sandbox_stop_type?: number | null
   model_name?: string | null
   error_summary?: string | null
+  stage_timings?: Record<string, number>
+  context_budget?: ContextBudgetReport | null
 }
 
 interface MemoryRecallMatchedNode {
@@ -242,6 +255,8 @@ export interface AgentRuntimeStatusInfo {
   sandbox_stop_type?: number | null
   model_name?: string | null
   error_summary?: string | null
+  stage_timings?: Record<string, number>
+  context_budget?: ContextBudgetReport | null
 }
 
 export interface MemoryRecallActivityInfo {
@@ -502,6 +517,8 @@ export function useSystemEvents(): SystemEvents {
           sandbox_stop_type: value.sandbox_stop_type,
           model_name: value.model_name,
           error_summary: value.error_summary,
+          stage_timings: value.stage_timings,
+          context_budget: value.context_budget,
         })
       }
       setAgentRuntimeStatuses(next)
@@ -762,6 +779,8 @@ export function useSystemEvents(): SystemEvents {
         sandbox_stop_type: event.sandbox_stop_type,
         model_name: event.model_name,
         error_summary: event.error_summary,
+        stage_timings: event.stage_timings,
+        context_budget: event.context_budget,
       }))
     }
 
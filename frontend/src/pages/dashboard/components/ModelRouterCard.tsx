@@ -0,0 +1,129 @@
+import React from 'react'
+import {
+  Card,
+  CardContent,
+  Typography,
+  Box,
+  Chip,
+  CircularProgress,
+  Table,
+  TableBody,
+  TableCell,
+  TableHead,
+  TableRow,
+  List,
+  ListItem,
+  ListItemText,
+  Grid,
+} from '@mui/material'
+import { useTranslation } from 'react-i18next'
+import { ModelEndpointStatus, ModelRouterSnapshot } from '../../../services/api/dashboard'
+import { UI_STYLES } from '../../../theme/themeConfig'
+import { CARD_VARIANTS } from '../../../theme/variants'
+
+interface ModelRouterCardProps {
+  title: string
+  data?: ModelRouterSnapshot
+  loading?: boolean
+}
+
+const STATE_COLORS: Record<ModelEndpointStatus['state'], 'success' | 'error' | 'warning'> = {
+  closed: 'success',
+  open: 'error',
+  half_open: 'warning',
+}
+
+const formatMs = (value: number | null) => (value === null ? '-' : `${Math.round(value)}ms`)
+
+export const ModelRouterCard: React.FC<ModelRouterCardProps> = ({ title, data, loading = false }) => {
+  const { t } = useTranslation('dashboard')
+  const endpoints = data?.endpoints ?? []
+  const decisions = data?.decisions ?? []
+
+  return (
+    <Card className="w-full h-full" sx={CARD_VARIANTS.default.styles}>
+      <CardContent>
+        <Typography variant="h6" gutterBottom color="text.primary">
+          {title}
+        </Typography>
+
+        {loading ? (
+          <Box
+            className="flex justify-center items-center"
+            sx={{ height: UI_STYLES.CARD_LAYOUT.LOADING_HEIGHT }}
+          >
+            <CircularProgress />
+          </Box>
+        ) : endpoints.length === 0 ? (
+          <Box
+            className="flex justify-center items-center"
+            sx={{ height: UI_STYLES.CARD_LAYOUT.LOADING_HEIGHT }}
+          >
+            <Typography variant="body2" color="text.secondary">
+              {t('charts.noData')}
+            </Typography>
+          </Box>
+        ) : (
+          <Grid container spacing={2}>
+            <Grid item xs={12} lg={7}>
+              <Typography variant="subtitle2" color="text.secondary" gutterBottom>
+                {t('modelRouter.endpoints')}
+              </Typography>
+              <Box sx={{ overflowX: 'auto' }}>
+                <Table size="small">
+                  <TableHead>
+                    <TableRow>
+                      <TableCell>{t('modelRouter.name')}</TableCell>
+                      <TableCell>{t('modelRouter.state')}</TableCell>
+                      <TableCell align="right">{t('modelRouter.latency')}</TableCell>
+                      <TableCell align="right">{t('modelRouter.ttft')}</TableCell>
+                      <TableCell align="right">{t('modelRouter.errorRate')}</TableCell>
+                    </TableRow>
+                  </TableHead>
+                  <TableBody>
+                    {endpoints.map(endpoint => (
+                      <TableRow key={endpoint.name} title={endpoint.last_error || undefined}>
+                        <TableCell>{endpoint.name}</TableCell>
+                        <TableCell>
+                          <Chip
+                            size="small"
+                            color={STATE_COLORS[endpoint.state]}
+                            label={
+                              endpoint.state === 'open'
+                                ? `${t(`modelRouter.states.${endpoint.state}`)} ${Math.ceil(endpoint.open_remaining_seconds)}s`
+                                : t(`modelRouter.states.${endpoint.state}`)
+                            }
+                          />
+                        </TableCell>
+                        <TableCell align="right">{formatMs(endpoint.latency_ms)}</TableCell>
+                        <TableCell align="right">{formatMs(endpoint.ttft_ms)}</TableCell>
+                        <TableCell align="right">{`${(endpoint.error_rate * 100).toFixed(1)}%`}</TableCell>
+                      </TableRow>
+                    ))}
+                  </TableBody>
+                </Table>
+              </Box>
+            </Grid>
+            <Grid item xs={12} lg={5}>
+              <Typography variant="subtitle2" color="text.secondary" gutterBottom>
+                {t('modelRouter.decisions')}
+              </Typography>
+              <List dense sx={{ maxHeight: UI_STYLES.CARD_LAYOUT.LOADING_HEIGHT, overflow: 'auto' }}>
+                {decisions.map(decision => (
+                  <ListItem key={`${decision.timestamp}-${decision.chat_key}-${decision.attempt}`} disableGutters>
+                    <ListItemText
+                      primary={`${decision.chosen} · ${t(`modelRouter.reasons.${decision.reason}`)}`}
+                      secondary={`${new Date(decision.timestamp * 1000).toLocaleTimeString()} · ${
+                        decision.chat_key || '-'
+                      } · ${t('modelRouter.attempt', { attempt: decision.attempt })}`}
+                    />
+                  </ListItem>
+                ))}
+              </List>
+            </Grid>
+          </Grid>
+        )}
+      </CardContent>
+    </Card>
+  )
+}
@@ -31,6 +31,7 @@ import { TrendsChart } from './components/TrendsChart'
 import { DistributionsCard } from './components/DistributionsCard'
 import { RankingList } from './components/RankingList'
 import { RealTimeStats } from './components/RealTimeStats'
+import { ModelRouterCard } from './components/ModelRouterCard'
 import { createEventStream } from '../../services/api/utils/stream'
 import { CARD_VARIANTS } from '../../theme/variants'
 import { PageTabs } from '../../components/common/NekroTabs'
@@ -155,6 +156,13 @@ const DashboardContent: React.FC = () => {
     queryFn: () => dashboardApi.getDistributions({ time_range: timeRange }),
   })
 
+  // 查询模型组路由状态（进程内统计，定时刷新）
+  const { data: modelRouter, isLoading: modelRouterLoading } = useQuery({
+    queryKey: ['dashboard-model-router'],
+    queryFn: () => dashboardApi.getModelRouter(),
+    refetchInterval: 10000,
+  })
+
   // 查询活跃用户排名
   const { data: activeUsers, isLoading: usersLoading } = useQuery({
     queryKey: ['dashboard-active-ranking', 'users', timeRange],
@@ -403,6 +411,17 @@ const DashboardContent: React.FC = () => {
         </Grid>
       </Grid>
 
+      {/* 模型组路由与熔断状态 */}
+      <Grid container spacing={2}>
+        <Grid item xs={12}>
+          <ModelRouterCard
+            title={t('charts.modelRouter')}
+            data={modelRouter}
+            loading={modelRouterLoading}
+          />
+        </Grid>
+      </Grid>
+
       {/* 重启系统确认对话框 */}
       <Dialog
         open={restartDialogOpen}
@@ -693,6 +693,82 @@ function EditDialog({
                 rows={3}
                 helperText={t('modelGroup.helpers.extraBody') || '额外的请求参数 (JSON 格式)'}
               />
+              <TextField
+                label={t('modelGroup.form.maxConcurrency')}
+                type="number"
+                value={config.MAX_CONCURRENCY ?? 0}
+                onChange={e =>
+                  setConfig({
+                    ...config,
+                    MAX_CONCURRENCY: e.target.value ? Math.max(0, parseInt(e.target.value, 10) || 0) : 0,
+                  })
+                }
+                fullWidth
+                size={isSmall ? 'small' : 'medium'}
+                inputProps={{ step: 1, min: 0 }}
+                helperText={t('modelGroup.helpers.maxConcurrency') || '同一模型组同时进行的请求数上限，0 表示不限制'}
+              />
+              <TextField
+                label={t('modelGroup.form.rpmLimit')}
+                type="number"
+                value={config.RPM_LIMIT ?? 0}
+                onChange={e =>
+                  setConfig({
+                    ...config,
+                    RPM_LIMIT: e.target.value ? Math.max(0, parseInt(e.target.value, 10) || 0) : 0,
+                  })
+                }
+                fullWidth
+                size={isSmall ? 'small' : 'medium'}
+                inputProps={{ step: 1, min: 0 }}
+                helperText={t('modelGroup.helpers.rpmLimit') || '每分钟请求数上限，0 表示不限制'}
+              />
+              <TextField
+                label={t('modelGroup.form.tpmLimit')}
+                type="number"
+                value={config.TPM_LIMIT ?? 0}
+                onChange={e =>
+                  setConfig({
+                    ...config,
+                    TPM_LIMIT: e.target.value ? Math.max(0, parseInt(e.target.value, 10) || 0) : 0,
+                  })
+                }
+                fullWidth
+                size={isSmall ? 'small' : 'medium'}
+                inputProps={{ step: 1, min: 0 }}
+                helperText={t('modelGroup.helpers.tpmLimit') || '每分钟 Token 数上限，按提示词长度预估并在请求完成后校正，0 表示不限制'}
+              />
+              <TextField
+                label={t('modelGroup.form.contextTokenBudget')}
+                type="number"
+                value={config.CONTEXT_TOKEN_BUDGET ?? 0}
+                onChange={e =>
+                  setConfig({
+                    ...config,
+                    CONTEXT_TOKEN_BUDGET: e.target.value ? Math.max(0, parseInt(e.target.value, 10) || 0) : 0,
+                  })
+                }
+                fullWidth
+                size={isSmall ? 'small' : 'medium'}
+                inputProps={{ step: 1, min: 0 }}
+                helperText={t('modelGroup.helpers.contextTokenBudget') || '单次请求提示词的 Token 上限，0 表示按字符长度裁剪'}
+              />
+              <TextField
+                label={t('modelGroup.form.tokenizer')}
+                value={config.TOKENIZER ?? ''}
+                onChange={e => setConfig({ ...config, TOKENIZER: e.target.value })}
+                fullWidth
+                size={isSmall ? 'small' : 'medium'}
+                helperText={t('modelGroup.helpers.tokenizer') || 'tiktoken 编码名，留空按模型名称自动选择'}
+              />
+              <TextField
+                label={t('modelGroup.form.routingPool')}
+                value={config.ROUTING_POOL ?? ''}
+                onChange={e => setConfig({ ...config, ROUTING_POOL: e.target.value })}
+                fullWidth
+                size={isSmall ? 'small' : 'medium'}
+                helperText={t('modelGroup.helpers.routingPool') || '路由池名称相同的聊天模型组可相互替换，留空表示不参与路由'}
+              />
             </Stack>
           )}
 
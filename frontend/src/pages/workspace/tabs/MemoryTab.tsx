@@ -139,6 +139,13 @@ function formatDateTime(value: string | number | null | undefined): string {
   return date.toLocaleString('zh-CN', { hour12: false })
 }
 
+function formatEtaSeconds(seconds: number): string {
+  if (seconds < 60) return `${Math.max(1, Math.round(seconds))} 秒`
+  const minutes = Math.round(seconds / 60)
+  if (minutes < 60) return `${minutes} 分钟`
+  return `${Math.floor(minutes / 60)} 小时 ${minutes % 60} 分钟`
+}
+
 function formatFieldValue(value: unknown): string {
   if (value === null || value === undefined || value === '') return '-'
   if (typeof value === 'boolean') return value ? '是' : '否'
@@ -1214,9 +1221,25 @@ export default function MemoryTab({ workspace }: { workspace: WorkspaceDetail })
                       阶段 {rebuildStatus.phase}
                     </Typography>
                   )}
-                  {rebuildStatus.current_chat_key && (
+                  {rebuildStatus.active_chat_keys && rebuildStatus.active_chat_keys.length > 0 ? (
+                    <Typography variant="caption" color="text.secondary">
+                      并发频道 {rebuildStatus.active_chat_keys.length}/{rebuildStatus.worker_count ?? 1}
+                    </Typography>
+                  ) : (
+                    rebuildStatus.current_chat_key && (
+                      <Typography variant="caption" color="text.secondary">
+                        当前频道 {rebuildStatus.current_chat_key}
+                      </Typography>
+                    )
+                  )}
+                  {rebuildStatus.is_running && !!rebuildStatus.throughput_messages_per_minute && (
+                    <Typography variant="caption" color="text.secondary">
+                      速度 {Math.round(rebuildStatus.throughput_messages_per_minute)} 条/分钟
+                    </Typography>
+                  )}
+                  {rebuildStatus.is_running && rebuildStatus.eta_seconds != null && (
                     <Typography variant="caption" color="text.secondary">
-                      当前频道 {rebuildStatus.current_chat_key}
+                      预计剩余 {formatEtaSeconds(rebuildStatus.eta_seconds)}
                     </Typography>
                   )}
                   {rebuildStatus.cutoff && (
@@ -218,6 +218,7 @@ export const chatChannelApi = {
     chat_key: string
     before_id?: number
     page_size?: number
+    search?: string
   }): Promise<ChatMessageListResponse> => {
     const response = await axios.get<ChatMessageListResponse>(
       `/chat-channel/${params.chat_key}/messages`,
@@ -225,6 +226,7 @@ export const chatChannelApi = {
       params: { 
         before_id: params.before_id,
         page_size: params.page_size || 32,
+        search: params.search || undefined,
       },
 
       }
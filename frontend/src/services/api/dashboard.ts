@@ -47,6 +47,40 @@ export interface DistributionsResponse {
   message_type: DistributionItem[]
 }
 
+// 模型组健康状态接口
+export interface ModelEndpointStatus {
+  name: string
+  state: 'closed' | 'open' | 'half_open'
+  samples: number
+  error_rate: number
+  latency_ms: number | null
+  ttft_ms: number | null
+  consecutive_failures: number
+  open_remaining_seconds: number
+  last_error: string
+}
+
+// 模型组路由决策接口
+export interface RoutingDecision {
+  timestamp: number
+  chat_key: string
+  attempt: number
+  chosen: string
+  reason: 'primary' | 'score' | 'failover' | 'fallback' | 'all_open'
+  candidates: {
+    name: string
+    state: ModelEndpointStatus['state']
+    failed_this_request: boolean
+    expected_ms: number
+    quota_wait_ms: number
+  }[]
+}
+
+export interface ModelRouterSnapshot {
+  endpoints: ModelEndpointStatus[]
+  decisions: RoutingDecision[]
+}
+
 // 仪表盘API服务
 export const dashboardApi = {
   // 获取概览数据
@@ -83,6 +117,12 @@ export const dashboardApi = {
     return response.data
   },
 
+  // 获取模型组路由状态
+  getModelRouter: async (): Promise<ModelRouterSnapshot> => {
+    const response = await axios.get<ModelRouterSnapshot>('/dashboard/model-router')
+    return response.data
+  },
+
   // 创建实时统计数据流
   createStatsStream: (onMessage: (data: string) => void, granularity: number = 10) => {
     return createEventStream({
@@ -17,6 +17,7 @@ export interface SandboxCodeExtData {
   log_path: string
   llm_retry_count: number
   llm_retry_errors: string[]
+  rpc_latency?: Record<string, { calls: number; total_ms: number; max_ms: number }>
 }
 
 export interface SandboxLog {
@@ -35,6 +36,7 @@ export interface SandboxLog {
   exec_time_ms: number
   generation_time_ms: number
   total_time_ms: number
+  first_reply_time_ms: number
   use_model: string
   extra_data: string | null
 }
@@ -12,6 +12,7 @@ import { I18nDict } from './types'
 // 资源类型枚举
 export enum ResourceType {
   USER_UPLOADS = 'user_uploads',
+  UPLOAD_BLOBS = 'upload_blobs',
   SANDBOX_SHARED = 'sandbox_shared',
   SANDBOX_PIP_CACHE = 'sandbox_pip_cache',
   SANDBOX_PACKAGES = 'sandbox_packages',
@@ -1582,6 +1582,10 @@ export interface MemoryRebuildStatus {
   semantic_replayed: boolean
   cancel_requested: boolean
   current_chat_key?: string | null
+  active_chat_keys?: string[]
+  worker_count?: number
+  throughput_messages_per_minute?: number
+  eta_seconds?: number | null
   last_heartbeat_at?: string | null
   failure_code?: string | null
   failure_reason?: string | null
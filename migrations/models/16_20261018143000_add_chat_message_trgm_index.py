@@ -0,0 +1,237 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # pg_trgm 需要建扩展权限，权限不足时跳过索引，检索仍可用（退化为顺序扫描）
+    return """
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS "idx_chat_messa_content_trgm" ON "chat_message" USING GIN ("content_text" gin_trgm_ops);
+        EXCEPTION WHEN insufficient_privilege OR undefined_file THEN
+            RAISE NOTICE 'pg_trgm unavailable, skip chat_message trigram index';
+        END
+        $$;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_chat_messa_content_trgm";"""
+
+
+MODELS_STATE = (
+    "eJztfXmT20aS71dh8C9vRNsCcWPixUa0jt3RriV7JPntvrEcDByFblgkwAFBHTP2d3+VVTgK"
+    "QIEEwKOKTYTDrW6iskhm1pHnL/81XycBWm1/ePn8PnA3GUpfx9vMjX00/8vsX/PYXcMv3YPu"
+    "ZnN3s6mGwAuZ660IlUsHLyN2tLfNUtfP8PPQXW0RfilAWz+NNlmUxED1cecoiop/LvTg484w"
+    "TRv/9Bz0caeHtvdxZ7rqAr9iwe9hqPgfd5ah4jE6shGMNGC84towz8ItnhoO/M7OQ+e3QhO/"
+    "ouF3hE8XJD7+eFH8IPqD7OLoHzu0zJIHlD2iFH+cX38t+fkJfYMxBVvJ37/9Rl4J0Fe0hdHw"
+    "5+bTMozQKqiJMgqAlry+zL5tyGuv4+w/yEBggbf0k9VuHVeDN9+yxyQuR0dxBq8+oBilboZg"
+    "+izdgSTj3WqVC78QLv0i1RD6ERmaAIXubgXrAajby+H1y6Zg8nF+EsNSwp9mS77gA7zL9+pC"
+    "t3RbM3UbDyGfpHzF+pN+veq7U0LyLm8/zP8kz93MpSMIGyu+NZhfZ+CLRzflc7BB1mAl/gJN"
+    "VhaM28fL4oXBzOQuaUMNYdEqCl7StmJ93Nmeb/Zk+tr9ulyh+CF7xH8uVHsPi//v/bsXf71/"
+    "9x0e9W8we4KPAXpOvM0fqfQZyIFZr+wqH8D4Jt25OF+dYiNYz5wCkoshiLablfttSf4eIIYm"
+    "3eXEMJ/zhFA7wE0N/245GhzIugKHsBMqY1iuGmYPluNRnSwnz+osx+s3222HMLuiuNg5M9+g"
+    "OABGHWK2pXomZrmiLMYwWFN78FdTO9kLj+rcRTF8a85l+DxJVsiN+RxmqBos9jDZmXhcvtBg"
+    "r2nCkWHoqkl+hlTF6MfePex8/tNPP8Ik6+32HyvywusPDb7+8ub5K3yEEHbjQVGG2EuUOby3"
+    "y+JrDONznfBsrG6fGp1KKctsBwU2nM+uzq5xmRi/SZPPUYDSIacHSyP6mDYtOI4N1cUatqkF"
+    "CnDYgSMbs1uaO7Fg2NL1/WQXZ0uebn2Y3w1ymVmPF31AThsttI5VU85yZ65R5hIV/vct/j4t"
+    "YXxAXzssnRahaDHUdMOFroEALNANNRN991/vf3r7b0efNx9e/e+H2nlTsPa7N/f/S6Zff8uf"
+    "/PjT2/8shjOiePHjT88bEli522yJ0jThnD3d7K9TieY93gKY03YY4C3gGAtY9h4C7TxEsCkU"
+    "M5SY966fRZ/R0uVcuS8x97JojfbIoEbdkEOQk/9Q/NJDKrnuchIDihWLGWgenEY+2RghXMpG"
+    "qB8vltdvXr3/cP/m55psXt5/eAVP1Jpcile/a55Q5SSz/3n94a8z+HP295/eviIsTbbZQ0re"
+    "sRr34e9z+EzuLkuWcfJl6QYsY4qXi5dqIo/xllqmWAZfRki8RXwRgff2VWBjGO4dD9xsFkIB"
+    "rIBFeNvyptLCp1GSouU6incZ4piInQ69LvLDLr5Tnbimwt3aRNEwVOIJZURtqAqIWndCev9d"
+    "0hdYMd1PEebCstgBQ7ZYg/QEG+ykPilDXYB+gccN31Z4MbnBT/HqW76nr2Sb5cfP3l222wRj"
+    "Bd4glU3gphnqRJdXbljg5MNDhCT8xPj64QXP9T99cdNg2XqSqEnX2PajtbpuvuLG7gORFfAW"
+    "PmVXTO3VZxRn8z7RNzrybkgIbolKmqMDcTqiP2ER7Y+F2R4sNyM0jC6fIJiU4FOhyxNf/Igo"
+    "eqDu2bpff69RwTrRH5YT0JsidueN2JVrfhgD61TnUoyOCdiVi3J2WVYzznM4RShTWpztdnjV"
+    "qYSHQtltavmWR4+EMa4sU+/hyTL1TkcWPOLFfpZhmqyHB4BKMtF+FPaYzHV7yaJAOcOyZASX"
+    "KZFUPNbhKpKNx2u03WLdZ5g3tiQRzd+a4hDYtsz+v437bZW4wWDnd5NOJp7boYXPDVuzLJm9"
+    "3pOH4EkbjNRDIKvF+B6fllReh23GYuzdIKtxy1AdbzeGkAFpe0EwJIeSNbByI2xB/IQa5E1S"
+    "Iwzff/DUM426uTbOYhT2MSdb8ZZtxbGslNRUzI+OJSjNg6zFFqFwrYQ5EPCWV47VtE9vNWJV"
+    "IsAmdoS/0GAdkEcrmuPs0Xkd2Q/bb7FPV+xgAXBIhfOfe1HJzH/0dRNhJW9ELLxOKVnmgx36"
+    "1hT9zsPXKBgh3jqlZOJlE1umRAcml8nfpVteIlm31tAgE32CspJlT1MTaTZNoByjORiLPk46"
+    "PKpTdyDPOMljueNtmaJ1kvG14QO8584gkxjwT7DfXEjoqxx6/fXj8yexTs6kG3AmTekmNyNw"
+    "udJN8Pmd4f/jGK3mXI8hO+Bun5vQxwOXPjOyh2uwMuPgHHA0fB4rOtTfOaqDF4ftQMq1Ymis"
+    "z43juhs7zeRau7xrbZsnlbfZd6gErKK7YAVYn2o7M/QVmoN+tGJ+wqKvxNui9DNawlYdyOwm"
+    "qRQVd4YP6prjq+UuDpXjI68nrbJDW8Qv++o8GWo0ozzGp7Q8deQRn6aHhDmI4eAY4icrxktQ"
+    "0M9eM+WFJKdj7MnCVxxXhHgGHzzVhwaaznUq8WwuV7ZUdnHOpKEYFE26Uew95anLHhzHAU+c"
+    "b/0OTe5s0knF5OPSO0+fEkcsp4FHMUsj/IAwFiS87OtKt+V1OkSb85wmSfwZpVs3y4PMaTbO"
+    "49Y9jWzOGMMLnSKAbQeWBULzvRt2zLQ9cV+S9NN24w5NBGmSCdfrjYVFfCIGZAUHyIDsBcOH"
+    "bGHNFabpT37tG9tNk1/7SQtcPr/2m7xuoNOv/aYqLDjg12ZKEI73a1dxxqP82t3TTH7ti/u1"
+    "tygG8KZhdn6NSLwWrxGEG5J8bCuKIZOxn3NqqK3fIJOOxdgWpcAWJDPXNDVjvPF/FlCzgoGR"
+    "/2ks7xlSCfnPon5KyP8ICgt5fO8+kyuKy8G4dCtGVZQMqh1mz5Nshllshja1SsSYHphHKfLd"
+    "1XDEzwblBQNj/VhMlrFOkCjNAJ20RvGEkbIp/HAh922RfjdMLalTCWczq+caCDwZhhYqI7WT"
+    "syRLXr0D91qdtsDDEaEJiWAnujgvW4xis3KzMEnXy90WpQORbdukwtlenSNF8aapapZMFg9+"
+    "x4wApKCvnPKGPZVbDTrxiRG183thEyAlAA82DZuUsaj+0brJear4c04OTUlp0sksgcK/NIMq"
+    "LjnFkLpflv4/MH95aWzdUmiQiReCoQFsJcTYZi/+BkaQ3bdQ9PJlc8MXPUsjntemajoQkAbU"
+    "NtlzscBPQiIb28xdbwZY+m1C4fBkrH+lCoSQy1WQqT9FGZ900GmKMt6YwOWKMr5au1FH3Qx9"
+    "dLcvsojKIb1QdFzUD7KUBaAxglAFpUPBK8fSAT3bMm29Plt3H4MLvi2/xWHeCgUMxyKGQJi2"
+    "3GE7cmpyeO4mhxz29/bVcmiFW/2mChmKWC1ExVK0PG9RtLEBD4A05n+1zAcwvUYkWgt//eb+"
+    "59kv4zwqZ4mlyewMbzOVV7qe56t8//rlDE5Xre/lf34P+Hbn/Y58jqNqT3y4IhENCFC7lhC0"
+    "knFsp2frvMbCVdQ+QRwY1r10yUNeHH4Qe0sK0dylRmHBXc+VZtGmyI82EYI3bDF2j2OpRiWa"
+    "uaahmSxzZYZjCriYb/ttsoJGMoyemlpsQEY1YPQcz3aJbK+CGXutbS8Jvg0OUdSIRG8gC7kh"
+    "G4sgmDwafeU7UApV4l9xA0k31aMLKGWZ6z+u+SfZ3nwWDrUUxd5sdb2lQGzU1HW64Y4WwykT"
+    "WUrWkRzDQfcIj1b0Zqi4XGwJ+jstSzTUBWQA2KYt8y0TxcsUbVbfBsL4N8jESuJ1/P07+DDf"
+    "f0hk0/RTFKIUxf6wxV6nEsvcd+VnGcTbS6/jEGX+4yh0wzqlbG5sW/MsYhSYN+zGbmtSU6Dq"
+    "xgQ+BaqetMAlC1R9Rf4LSIXhx6qKp3d7w1V4VJlPM64KzlRNq+qLhzSaBTO4Cq7fNFMV3MUj"
+    "RlMitJhoEf4ADw8oJdG2gfENDunFpDBXuFao7SCzcBtXybkS5ebWeDY0MsolvqBF9P7bNkPr"
+    "AYyn5v+oaMhZShJ3Pjbdhjq6GCrpHFzqgnQ7d6Sq0YKLfkTyOUMkOgC9R0+QPPM82WWb3bCo"
+    "FEMinu92CFqasQCLz0IBaGyWIymv8TFMcE5XQ87wGtHFsM26GhFZYXlcd+rRwo5rzJvdwyNB"
+    "ho4GdcBpEQrHkDOVBYDzIbBuHT1E+1Ln5Fjc2yzZdBTIYXPmVbxbE94X7QDbtyZLf7lycoXH"
+    "fUMxaHBOHVEdR+0eTbXM0uSBP/ZZO+/f3P/4I6fZNVjB4FVZrjkHdKeR2CQTzEz2ZqxcNBDv"
+    "9BB0t3cCtWd459QJ+zkLAD9vOJf5xIJ5bRmkew/R8uTidZZk7moEm1t0oo8G3Q+Ibwjcjgrk"
+    "b2E1z6LcloHPYZRusyK8OJjbHdSCee44DgnOm4sCa8JwIEgsF+exdpG6Y4rZGCrhQXnbgdXt"
+    "LEz5i9mmKNaTDmpMUawbE7hcUaz/fn6/3aJszg1iFQ/v9sWwPnlLtxzVI4TFIltbFuR5gt+/"
+    "RGMMaLqUCz7ShV5r/NDZZ/wUUx4Obf0KUFUohu9Ndl7ZT3a3neOhv859vI0ekpSGapJ07Wa0"
+    "oOpJxMNYPl4Y4HgPRGSyS3203LjZ4xBfU4PsNNrIeMbm2G1e6MzwZlpFXuqm356F0YqkU5m2"
+    "5sAYBPpgCOX3tPDPRI5STym0A2i5aIS2PKltMWyDVfRPFBAf9mBJddELd1zxZfZD9Xn3SM52"
+    "fPipKQQvB3RQeoBRWR4nxbME52ApDg7K1YjEO9ArrJB2Hq5cjOYGiA7wWZ74EMNaFjJkLJtP"
+    "D7u1Bnuf78DdU7LIEsnE5dkbUEyPBTc7T5giylbDwvgFgXgGszojTU4ZW76oGkavc8LYc04Y"
+    "LSQzVtPsmxTE0Ij2v9RUcpWAGeD1O4a9pwf4zNwHjisRqjM6Vm0+vsHTX2L8bX8NIj+7m62i"
+    "bfbb2Tj8f8Jd7ANvZ94uWmVRvP0B3vDfD3KeLmzLsxBbiHK0F6zAPev2gjUdXnd1kxomaIXd"
+    "duu1y1vw3S5HhkSm9W7qAOqBTxNJocpy42joDdkguyDHd5tV4gZcvpuWaRSWkmzwn7mHYIim"
+    "V1KIvyDzfB+b1HXamj+kd+y5OVt30wzIaKsTni2preUY6NMR2VjoC9JIFg4P2/VIGtCC9Dlw"
+    "KRI8CAK6JluB2nKSiUx7I6EfPytcZQMWfJvygsfKBsUBMI8rGNULioIrS/XA1lH6Qk+ee/Wz"
+    "bskh53edTBJGw1qGo2VhyMfoApT20d0O8mk16US7Hzs9IwysraH74O5CSs+Uw3Mr6U2/4FAZ"
+    "dNELVxT3ugZlk4L/uIs/LQkq2YBgRoNKaNIF+SyzIiLkLPy+KszJ01lWaLnF65GjsUQPe/JY"
+    "GDLR+W/s0eGosFz93hohZaejqppmqYpm2oZuWYatlHxtP9rH4Oev/xN4XFvIbaav3G22zL/n"
+    "iJpwDrlkkDqmBcVVdkiKT5ibdGjs/Upi7QVj9mZXEKmhNE040F/dvoQ6lfDoEytYx1iQpsNI"
+    "0oTpKX/pSaezTPlLNyZwKfOXnkfUhtyXxlSMueuTzbT0mNF9spoaPcALl0z/1CTWnUO7i1t+"
+    "6HXnPJ39Dbn40c1G7JRZHOjoQ0OfSFJUxURpkqKafO/JziaZ+M4XjRV+YQYzkHTFwu3PTJZE"
+    "PCOZI0FYEt+kEN6IfjAphDcmcCkVwhfg2NurDtIR/ZRBvxx70gR31idjqJCMYViGdYI090MT"
+    "81uDMHcW9dGSLcHR7PaOfCKKHXNRkpUijXp37doI2zFEBm2EWb/9OdqgEt8Wvl7kAoE7x7bA"
+    "sEO2oJDGI77e8PsNTvlv0okOyVXpn+TsVQm++dF5+udqmp1CDD8dFo5jiUSXnXsGSUlUSTmL"
+    "ZRVxaUPRAZHFCYehU5zwlMBMQvGQQ5clkYirBXiQEYrnapZ8QvHg+HGDSjBv9VADdcxzrBn5"
+    "YHkwWQxD0dpDATk9UxoO6p1p1SQ8U4irp5bwtyB14wywxPXFgsblRzYSP0PSw+S+eMrW7OS+"
+    "uDGBS+m+KBsqzPe5MKpRd73cGGlt/EldGbQpdZ6oSYDz+sSwTjw9162RFyawNjBWdvGI5Z7Y"
+    "VZOI1PdzyZ6Iu4Nlre3BgQAVy9I4PThC7MldDqVwFwiFA87tG4bxeXm4eKdIc6UPUM7blMLZ"
+    "TcslpGQ0+1kHqOsNMtEukvrhQXQKE3IRaEdrU/NDSFYLFZ4o2FPetqFcy1joBumATarzEcls"
+    "cDw2H32Uw0VR+jhcFKXb4QLPWpVGoEm0RXeozKigkg042zK0RXGrWigAuS1AAoYKPchpfZEZ"
+    "6B4LwdhPGpepNZqMsyetq0/G2Y0JXDbjbG9YuV9EeVAsuW0VDYwZD5+Aa0ThWXekr2af8HAz"
+    "k4wlJoZUc8DTjCHLFTaesgJPrbrXt0RPfjaohLOTjcZXNf1TNP7Iu5tBR5ii8VM0fshSnqLx"
+    "UzReCFenaPwUjZ+i8dLY/5PDp2DX5PC5HYHL5vB5mdtr8w6fT/n87oDbJ2AHjvL81I2KntD4"
+    "Y6fpVfzJ4qgfdgMx6Gp8L1ABUMp9WgDq857VkPifjP9IoEE+uZEupiTK1MLgmNurBog/NS/Y"
+    "Ry8cPqYuq6lpwdS0YGpaMDUtuByXp6YFF8BknpoWnDr0wBpOU9OCCzYtmBoVXGyNT80JTsvl"
+    "tRvv3BWf11NzgotchFNzgvM3J9B8dWpCMDUhmJoQ3HYTgiNKSKYmBNLIYmpCMDUhmJoQTE0I"
+    "piYEUxOCnoKdmhBMaWJTmtiUJnbraWIHcVvaA+96Jo6NQG9ptQjYnw02DsPlLG+yD8mlUUKV"
+    "I07UigwP5qJxpuJmlnVN/kQSzCRHfXkqyWZskR0n8YwAZdh0SZIse9uf0YUHf4U+LR/zSD6C"
+    "XxbreabO2314qr74GOfJZBtXF8knFi65/Ug9EhRMcg6o/kznEwtnehdejwTsnvB62Lt8wuuZ"
+    "8HrICxNez2SXT3b5ZJdLZpe/QetXcRZl3+Zca7x6fLfPBl+j9RJV43oY3oUpRSxgz0FEQwc7"
+    "2FUX/CyfXkQfY/wfSX2D69lDxZGvI3DEsjS2agMyggJRU3qp08sbX9KoMZKa6apKje8FsQDV"
+    "ck4a/cMGSd1MNy3Qx+jhtsdkP2iG+26cxJHvrmjOPdcEp6yn+/wp2d460jw4I1Q02dsnNiA6"
+    "bWzMb9PRAWTB88geglIXQ/dFms3s+uaaFK/i3Zow/jX+HG7u/6unKNWnOJd50Z//zAFzZI5/"
+    "n3qVRXe5yqJVrTK0IujcxUCjmAqFKQQqRCnWNZs/M2Atn786qHHED+B8m1K4DDiZMS1J1G5a"
+    "Dc4ZZ+EH5S3aul2lkpa7itwtGlRKwJBcRzUBVXao4KpqAio++JplJo6FQNr95XPpUgOssiI3"
+    "hRthcPoTj/RyqTsLrlgWoE1aGrGfPNB5xSH35N7ox4jH1H53cmOKC7r8Ype77Km+CaUd9dID"
+    "UwtgrTt58MCO3Wf+MIWodiz1qcnrrshr1eNF22UUY3Mr+szLSjvgtWMpL5cw38txZwQhZEI5"
+    "4L4zA62ncnQZp9xm5WZQzoHVeaJZRsMuhA7y67gc7ACR7FaL3PDEBY7ABa6jMCASJIE8RS/t"
+    "CRssYcswnALYzfQ8Q+ZbY3K5PmkP3ORyvTGBy+dy3URb/Oe80+eaP7876HRlBh70uuazYuXd"
+    "VgyX6Pd23anKOFL5yUzjphjj90zS6CGKl/6jmy0/oQ7EK9hRORRs93OANOU+ZdWfyW16Auvg"
+    "Jt2mYsyv5vbgmmB8pnJIxYKnVocKa3TZiu6SChWHgHRABr1iaNK4ga4XBYVh95EIKGdga+ym"
+    "mAv4RF6OQIngEsvDbkMLHOL29ORHkWBu1oEKcZ3yIpVWg88ZFqn9lousSv1ojIz5UPGSSJhF"
+    "jb9lCW/wPoz8aOPGWZ6hgVWpYb6qzhmuw13FAm9UAUKsuM3kR0rCvHcfUnfzOEJodcJrkZVC"
+    "MAUh+pQnNBNXoa1rwZVI7NHdouUaW+05VEZviTUJZZIYvC1fYo6pmYWUDFVT2hLL5Vi6heWU"
+    "mwfc/4Kih0eOwvMfq8TtUDkbdA2hhUB4LkEtfuDU9zPapkWChTbU1ZgWgJhDkP1o7r/86Zfn"
+    "P76a/fzu1YvX71/nkiivPPKwHjx59+r+xyliJTxi9VQ6rTTiSWW7FbYEY4w1O/VdmaJIUxRp"
+    "iiJdURTpDQoi9x2iaTTzrlhSfdTdoYjSGobjo54ZPzSd33XUMneetK7Ps2h6p/YfnICm+Vvh"
+    "QiMpBZCO4CzcYoRJkvRZylpxpKX6RWIhW8dHiwCohUhTrMIQzxkvfph1YazVsxfpBI5ihaTg"
+    "LyizGh2F/oRbS1fMj7FKpmQqBh09RORzBJBMobrlpwlNlVak1TgEgHvIC3OwoPnHWIMJwcSd"
+    "gQhL429WlCTYiqGPDcTRBUFrC3hRtBJzIU+TmyJp8ymSdkWRNLngIcevVfa8Y48rOPtmb14a"
+    "z97/9V41zFn9AMtT4wl4oeETDAZDLQumxmY4nl6ZZk4hrowOZ5vWZxAdFarfcrJVgOyt4e+O"
+    "v52ihv908Gv3r2dsTTdPC6juf0mjcDfYs+AKqwyejm/F0KBJlaMoTrFdWA8Li00pm7eFZrW4"
+    "qyVgrQ6to+ISC0ePvJ7WVnxE3DPC4Z4UpJMLiFuqRiRjnVaLi6uADaI1irf4Iw+6DupUJ7gU"
+    "Trq6TbB5LVW3npGqQbNI8zJ8qLMxvNAuZeDY6uxfX6Ige/zLzFaUu9kjibjgc0RR/pT5Zgh2"
+    "kJDE06L2xJRYopEBpVMKyrFCrS6hwgVolbvEcoJB++PMASZBveBOx/WTdH87/SXb9PX0P/I5"
+    "lIKLKTm4XYJLKsMo3WbLLULxCJTzFrFsMQTHccyCx7VC1luNJ7QDSAS9fKT8m7SyiZ9CoWPV"
+    "FU3ir8JJ/MN1lQxKHWoRXof5z0fW3Wf+Q3jFNBSSaWSy6Pqzt7R4YCGzLjjlAzzp/TzlA9yY"
+    "wKXLB/i5iPvOu3IBqhF3h/IANrWhA1MAqhzQAWF/PhEN9ZuqRRz1VlD4KKseiqWnkpTX0GA+"
+    "6+TPIXtJnh77fiwkbB4asDWbPK3SChSXIEcZFMRXOxLLL3mII1Kf1B1Ox7xP0m/LPP3icN0q"
+    "Fw/wMwQmycEwRePnUzT+icEB1rdIi+t7PDxNQvFoaez5xxS/yocy1Di7uFw/HIRvzyKBCFy9"
+    "6MhS+duoCCi8QuQ/2yJ89WbREeI4fZD+E1ZDVih4OE4i7VmES4TtjiNbZkSe9dPmdndWBEMi"
+    "PuuEPXDofZrDZTIZQ7lL3wPlSUcKqVn23ALCkVWzTmJsnyVzorN6fE9n5SNrxk8Zc7E8WyEb"
+    "IWBLxbn4mSECpUiBNBfDBz21xKkb11Ri0acBMx7V3VRi0WrBzCikLYHsN4TrlDLVGheV/Hng"
+    "mHTBybONSou4CiKHzqy4TCCuo1pOgbJJk4RL8Z5gP0lkNfeqUc5BjIap0HWiMyURjGhfNSsq"
+    "8ETlsxaMIQWlY7WC1iTCT0TDUu1ZVd2oIzUozPaqBlUOHeGp1JJKXUNK4l0piuIwwcbc6L7Q"
+    "rRmkbA1Nw2Y0JzuPoIYkSYZWsdwwvsWjuwqXqyhEyy3CX5OHktB5hXBpL5eVYKkKf9NpAHxl"
+    "2xbZdIvROTanvlimqu2panushvS3IHVj0quzTCfO8TykTCNefop4oEj9dKfGFOJtftaxKJs/"
+    "JWfWwNVdpxKum7IMZrMa6LltBjb8VMzw9ctnxF4ECajuAnzslqc7kjW4eErQkk2Hl2sVRjo1"
+    "Hfggk0VpCrggpRELPmsek3S53j5wDeVuobQIRYvEMRYkwdtxq9AtOK5oAk+t6qHcOv3N6fN7"
+    "s2oM7QJJ7CmPTqREARa2F4Jj1wsCmpZfRuRZsMQrEAgXz7CvOPighvIIo4ZrKLMwwFbGa3u9"
+    "6dog3Y13OicQXirUa4sw3l9T1foiFp/YWGsxkbsr+suAvy/kkQAf71OkBLDRu0mTDPnAlxbn"
+    "D9nLNVIZWmobWgBVciEw3lTdMiHX9DUSiwKMk1pjbQRQjoB3IpM9jTkbpsk/Eacg65BEKjop"
+    "xLHwvGLVW6pnFqg3RbIblCsaCqTzUEeSgS1umQSxduOdu8q93csArTJ3kK+8g/6SPnOF7zM3"
+    "Vd0rNoHtQxtE07D0MsWw9KLjMTZgDTmnkMzJPOo5X12fX7XYrUbxqYXrUV3+c1ZKpg7SoMlv"
+    "x/lHtD76lNatTmktbarN1rGRDt4kVxLs6BLWLQc+Cpy2cFBFeJ3qSuqESgiz0l3ABYi7DoDo"
+    "qQroSReFTFVANyZw6aqA3hUZDWsUZz8mD/OuYqDWwLtDNUEpS1EUmw6GB61lLiACJQSmZX94"
+    "0IMT0Johm6kpNT3AL2qnTti2TpJctRJyk82tZAFAVYWk6JMQjw5mro4cr1FQhAgMNQKDOEcX"
+    "0KFgieQq5aCfqkq2jBt0T2No8HoeoTZN+Kx2qOQgnyxGaI0RePjs7T2McFCZj0hRUe0wsPMR"
+    "L15wRszLA2FYOVPmpnh0mTee/xl1dNvD0nx4QOneyib2hpsql+ZT5dIV4Yg2dsOYzIHGFOIz"
+    "BywToRKnT7LMgeq46b96azTCl27FXXGLtn4oj123rVnEL132kqvyMyRZujm/Bma9NMiE+9Zq"
+    "ekQ77SWv4kIqW459DQkwuVPZQ1jX5eyJPV7pFqUE8G2slmioAEsvWSZ3zjQ3zFA6htsloWzM"
+    "Jn5MyZjtJdjYXbprPnzbvuKEBuFlIy3aQWbLFUuZvHxP2ulDvXxyeX1Wbi6kLm/PqgQVPeTl"
+    "YUYOde4QXz1FVunv0OES5U4cgghuh16te2e7nye8ontF1gcNExQ5ISTRMwzgMNZcg0K4wNz4"
+    "tLAqhw/UOVOIF4o3RnuvGCGFAl642533O/Kz2ff/PtukKIh8vOHgj4S8PNaHks9adVblO0aS"
+    "XqPKz0Uft+eujeFOOzldJqfLE4OL4W6DnpznbyHR7K8BN7AtjcUwuHak9DVma0TCIUfYK8j2"
+    "oa2Y7fXV2M9ekjR++fJIha9ew3NVmVYv0yp7AGubZMIRCJgapFoL5qrHU7XEdeSjIgCV925m"
+    "wfO0gOK8mBPK1+lRd64f5qvDbr0YtNcQvl8pttcEITGfICQmCIkJQmK/yG1TnzAk5n+ZMCT2"
+    "lVpMvugb8EVPGac3I3C5Mk5/Xu0eohivKnfODT0wz+/2RR42ZNwyKAb2CDzQ7iCmZoItixyN"
+    "WK5qgcjIPt0bihg7zWF3/5NxpsviP88XyUBUkjqVcF8ju7rYZtvHYY4s1D6eADyq2wpVW94A"
+    "IoiB3GZppOI1u5MhKiQXlz+7qx3nut7TbLtGJd7X0sVqQ9H8443K83TXJtmgY4COOKTC1zqb"
+    "rNuFa3S68+YsmXc5W3dblA4EOWpTSiWPvMGkqlnjkFrOwu3JMHzSdsJkGN6YwCUzDPHXQNmc"
+    "bxTSZ3d7DUIyZjveGHRskvjlecMNwG7Syei7uNGXonWS8TOmuvWBGpFowEM7DKCy1FU8dmmN"
+    "xGzrk19idOeXGO38kni5xXwcjFJVo5MBE6nmkLdUmvOwILCfXn1PQ0WuTC568u+A1V2MF67j"
+    "skw1dMAAgyZB0mi4WZStBjG2JBDOWWo3YNttFDD2WfwU7md8RHNKdLp9FBWFeP9Ebak6GmR4"
+    "K374HWRM5Ol48nkorr3bWI3nZYcxOXnNfvgB/G6QycVzU/NDmtUnJ88z94GTbbHPy/PAy7AQ"
+    "zWXq4vEs9B3pxAZQsFpoFaAhkBHf83y5RCu2r1kZZKuzvRs1jKU5AWbYSZObVBPqdkjju8qO"
+    "O3q1nwX6C5vqjwnn/tyDTV1SiF/xtNrDVpRxXbbOoZBMDswn7c+aHJg3JnC5HJjvkL9LgfEf"
+    "8HpI/yvx5lxfZnvY3T63ZloMJ0sxXf6eE/RxcWoK8WboRgUxYNpFgiftp0HXTgWxQRM//TSJ"
+    "+WmfJ5z2xK7RX355/XKAb3S3i4IfgGbMzj3sImUgS8k7wQ+dj1daxzcBPsHHOlFzV4ogTHck"
+    "u9fIN9/vR8UrbaATtaI4jfoxvpaXwv4bzsLk8Zd2Ss7/gpLUBaxfwyc9WZmI9+j6jj56+B41"
+    "vK2Fj8k5mJINrto5eEqrhz2IK0dhWemnoRBkoBwBrHQWfZ0284ZvM8TDUqcSbwjVkMXIvUgL"
+    "JvXQoS0ZnNk9/jzQ7ZDiULB9wiuPTCEtvD8IDKjiFThZp+kCfhZ/JL7wl+jrZpARWyMSLb4X"
+    "+MPMGrAiOcQHQS9AAJUKZYMzY1bUxgL6xzqKZ4/JLp0F7rfZOomzx1mQfJFsf4FG+c8kHnio"
+    "VTSihVPsJ4CUoBJ5ff/2fvbh78XFroewkwzHVmf328h99v7RjR8e3Wi8HE5frg9gHXiRLEH3"
+    "HyKIJt3lhDGPc/kfOOqgijbPhihRcYD0Gd4PyzCNnn1B6BOKg2d+vMy/DfyKNdQM/zpql5y8"
+    "sHabudlukM+5oriY0jWv6tzailet2c/CpUOfbdzdFo0CrDg9j2PwF6e7MZ1KGqQXqaQdALtC"
+    "7mhSPNtWAijyVIF9qYIZYmlK60g7wc0ukQ+nV4EtrZIetR4apNKtB3daDyNa10TbMErRcpOs"
+    "In+QCdymvOAtSd45KfCPOU1tCYAKQMqxi8HyDGgNYJi5IlnO8mz7KdrIcWAXbH1IAWNseBV8"
+    "J/3lKuE1fh18l1QMzwsgMmsoRU08DR7mBjRNHmPG5MkLxLDGtoNRzCOukh6mR/6OAK6EbrTa"
+    "wQbtL7Iu8stJjCsvCtNoIRQU1fR2oBplHzAsIzHcJvcQSlNe+Lbbc1GnEu41okAgmMWLBhAI"
+    "w+i8+7aJlOO8SZf2TFD9F185WUSOoDgboW10TiIZokutzyrT6pNivFAsCuqTshzN5SkkbJcb"
+    "QwOsRtqSkqW6TeVkyil40iHmKafgxgQuV07BL1sSGOekEZAnd/syB3bFiFHVUFUF6uBqqG7S"
+    "G6qGGlXDe+bKKFgRQ0tHWBrx/n52aUH9iDShlI273X5J0kHpEiyNeNYaHulJaCsLaZjqBu4m"
+    "Q+nQxIcGmXjWOtBAAGvM0EzHwAr4uEq+04eeNis3C5N0TWAQhqX6cEjF89lAAFlsaBAslxJB"
+    "YYMwx1boM1oNuMzqRJdzuHS7BQgqK/WFkW5cFnItQX6WBJCaxujidUrZVHE2VGCZBIiY9qW9"
+    "YdxVz42XuziLOHtnv6hrhJK5ZgwfArOWY4O7UlWJ0E31tgW9SWkKV9G/cJTQOyeRbAHkoidC"
+    "rwUFp8VA3kuC+rNx4b8qAdzbRassirc/wNvyc8CvqSxt8ng+aQfY5PG8MYHL5fH8n6J32Zzr"
+    "9qwe3+3zfX6pDevhAG12KBuABzyE9IYcoLI4PcVi5RxRwtRaVscB5pzefXRtCBhzrurF2b6S"
+    "o2DImJPM4fY2SzabPMe4Oyv5LzOakfxHPvwPyC7C/+AjHasEmOsjlvoZ0sDdOPCSr8toje+t"
+    "QZxvEopd7r7/ff6JZqDrkDWv+KFkwZSCaZ9RuuUeLof5zZBekOMrPOE24654ltmWqudJvs+e"
+    "Y9swmH1wR63z0x/pgAaF3wyly6HXZpvyJPlrx5QAQzNZCLcUNyetCTJtzacVKZgWfUqT7/Gm"
+    "+Ncj+mr/WdYD62QgMQjyzCd8PcxeJv4nlM6K7E4rNBZFb1XTKi5o2eQ4LKzTpBOeg1hJkWlN"
+    "aYeQdWbbeiklwzbBcl/ohmQldo/YMltukpSTW9jdJIylOVOf0EESCOvL3DRVhXiuoVeiC9me"
+    "hoY0MQGgFPy66zG1AW3KC14U7kOOucfLaC7XdlULgLUkoPgjRSsXT/oHcJk2kRevG5Gs5Ufk"
+    "ppmHRlbs1Kglc9CzWdBG6EOr5yDUbtsp/+TS2/O6Dw8OMz1EEH9RzFBO82+NMndoRISluY6I"
+    "CL7LtSkWMsVCpljIFAu5+VjIi2S9/jF5mO8PiRSj7npFRvDKXK+Xq3z8wRDJ2/uPO3Xh6C9e"
+    "zAhorUtgT8IC58EIg1YKWF+a2wmKFC8KD4pUq2AQB5tk50pG7O/kWUDGp60YetuRP7tsBIqJ"
+    "i0Qp8vlRkT1tEFki0am0b++XH35a4m37x+zFC/j17T3+9Zf3r96Vr7//f+8/vHojhwW6TXYp"
+    "HGgjQPI4pKIDUqYF9eImchQWHm9WfMTCSVmrslF1ryjwpOljDgF8KWA48WZY0l53yzESO083"
+    "uSvvVWAGtk3NRPl7FWCOpm5HGt0eIL0a1cXsdf6usFAA9qAFAHk56mzDQpyBgUZdxMX59Yw5"
+    "skpXsWfYsxf+z2my3mRvsF0sc5l6tF3it0cAJ/fQFt3edktNUtk6LsGpBLtIL/HB8DVOgyh2"
+    "JW7n+F6wJ+y7lLnbT4MbjZYkwj1erLZUQYL215MmhP7xiurkTincKfKZ1+8QVQPn++3rcthd"
+    "PwM7ZcePykG0A10vVEEKrK4jKLiqkgo/7jRFUVuW97GT3Y5JLk2eYrFahlowTTrReYuWq2nF"
+    "AmOXnGOoPZ34F7hnrraBYm0TH5UPeh5EYbSGyuDBi7hJJ1xVooeiaVnh+JV7+rSecq/HScZZ"
+    "v92mXItQtJOjto4dQKQ3fdSzdeWljbCSedBObvn7lufY6w698qllCsLCG/KDsKyUqq51RJu1"
+    "KCj60RI7S1i25PmGWPmjdkpFKtNeqQDX5NwrW/8Rrd3Bm6RBdh27w/AMq8D8r7mnSuVazt2x"
+    "2XmryF9u3G+rxOVo691ialPKJKnuZBLHMqAUy9Ah9rigbaoq2RmKdryX6SyS2iI/RVnB7yWK"
+    "/fTbJkMcmXUfaPvmEH2yGaqrFMhDFIySdkA5q6TO42GPgTscwez10TJUF3TPlsbGHu8s/hnS"
+    "GJNM/tdrcw9O6VZTutWUbnV16VaFo/c5FiyVQx+3cDH6bph3eOkxdKO8xDqCm5O1ErA2uij0"
+    "UBr0sfxwiK94+JQcj/GvrXyh8jvjP39rOJTbo7dJmi2TNMCz4bHt58Xt+dvki76b0sP67BVh"
+    "KWHswu/PzwaVcHZW54EwRk569iX0bObk7b9a60SCG4OYmgNtDpDds4jn1OuU76DfE2CSxC8/"
+    "1Bd/iUTByeh7yjbAZPTdmMBlMvruURr5j3OOgZc/udtnzLnVmEOGW3flx+2k2khT/TICV0YI"
+    "nsyRXGxczUavq9nYczUbLYD+zWYIE/Ph18nAhaL0yZdRlO58GXjWswiiOwbXXQRxseDbcWy9"
+    "RBBN6PXy5/8HOcVbog=="
+)
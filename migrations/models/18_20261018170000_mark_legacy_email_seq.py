@@ -0,0 +1,239 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # email_uid 由 IMAP 序号改为 UID，为旧记录加前缀以免与新 UID 混淆，由邮箱适配器按 Message-ID 对账
+    return """
+        UPDATE "email" SET "email_uid" = 'seq:' || "email_uid" WHERE "email_uid" ~ '^[0-9]+$';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        UPDATE "email" AS legacy SET "email_uid" = substr(legacy."email_uid", 5)
+        WHERE legacy."email_uid" LIKE 'seq:%' AND NOT EXISTS (
+            SELECT 1 FROM "email" AS current
+            WHERE current."account_username" = legacy."account_username"
+            AND current."email_uid" = substr(legacy."email_uid", 5)
+        );"""
+
+
+MODELS_STATE = (
+    "eJztfXmT20aS71dh8C9vRNsCcWPixUa0jt3RriV5JPntvrEcjAJQ6IZFAhwQlKwZ+7u/yioc"
+    "BaBAAuCBYhPhcKubqCySmXXk+ct/zdexj1fbH14+v/fRJsXJ62ibosjD87/M/jWP0Bp+aR90"
+    "N5ujzaYcAi+kyF1RKsQGL0N+tLtNE+Sl5HmAVltMXvLx1kvCTRrGEVB92jmKopKfC93/tDNM"
+    "0yY/XQd/2umB7X7amUhdkFcs+D0IFO/TzjJUMkbHNoaRBoxXkA3zLFD+1HDgd34eNr8VmOQV"
+    "jbwjfDo/9sjHC6OHsT/ILgr/scPLNH7A6SNOyMf55ZeCn5/xNxiTs5X+/euv9BUf/463MBr+"
+    "3HxeBiFe+RVRhj7Q0teX6bcNfe11lP4HHQgscJdevNqto3Lw5lv6GEfF6DBK4dUHHOEEpRim"
+    "T5MdSDLarVaZ8HPhsi9SDmEfkaPxcYB2K1gPQN1cDq9f1gWTjfPiCJYS+TRb+gUf4F2+Vxe6"
+    "pduaqdtkCP0kxSvWn+zrld+dEdJ3eftx/id9jlLERlA2lnyrMb/KwBePKBFzsEZWYyX5AnVW"
+    "5ozbx8v8hd7MFC5pQw1g0SoKWdK2Yn3a2a5ndmT6Gv2+XOHoIX0kfy5Uew+L/+/9+xd/vX//"
+    "HRn1bzB7TI4Bdk68zR6p7BnIgVuv/Crvwfg63bk4X55iA1jPnQKSi8EPt5sV+rakf/cQQ53u"
+    "cmKYz0VCqBzgpkZ+txwNDmRdgUPYCZQhLFcNswPLyahWltNnVZaT9Zvutn2YXVJc7JyZb3Dk"
+    "A6MOMdtSXZOwXFEWQxisqR34q6mt7IVHVe7iCL614DJ8HscrjCIxhzmqGotdQnYmHhcv1Nhr"
+    "mnBkGLpq0p8BUzG6sXcPO5+/e/cjTLLebv+xoi+8/ljj689vnr8iRwhlNxkUppi/RLnDe7vM"
+    "v0Y/PlcJz8bq5qnRqpTyzHawb8P5jHR+jcvE+E0Sfwl9nPQ5PXiasY9p04Lj2FAR0bBNzVeA"
+    "ww4c2YTd0tyJOcOWyPPiXZQuRbr1YX7XyGVmPVn0Pj1ttMA6Vk05y525ximiKvxvW/J9GsL4"
+    "iH9vsXQahGOLoaIbLnQNBGCBbqiZ+Lv/+vDu7b8dfd58fPW/HyvnTc7a797c/y+dfv0te/Lj"
+    "u7f/mQ/nRPHix3fPaxJYoW26xEkSC86edvZXqcbmPdkChNN24JMt4BgLWPYuBu08wLApFDOQ"
+    "mPfIS8MveIkEV+5Lwr00XOM9MqhQ1+TgZ+Q/5L90kEqmu5zEgOLFYvqaC6eRRzdGAJeyEejH"
+    "i+X1m1cfPt6/+akim5f3H1/BE7Uil/zV7+onVDHJ7H9ef/zrDP6c/f3d21eUpfE2fUjoO5bj"
+    "Pv59Dp8J7dJ4GcVfl8jnGZO/nL9UEXlEttQyITL4OkDiDeKLCLyzr4IYw3DvuOBmszD2YQUs"
+    "gtuWN5MWOY3iBC/XYbRLscBEbHXotZEfdvGd6sQ1FeHWpoqGoVJPKCdqQ1VA1LoTsPvvkr7A"
+    "kuleggkXlvkO6LPFaqQn2GAn9UkZ6gL0CzKu/7Yiiwn576LVt2xPX8k2y46fvbtst/GHCrxG"
+    "KpvATTPQqS6v3LDA6YeHCEnwmfP1wwsu8j5/RYm/bDyJ1bhtbPPRWl3XX0EReqCyAt7Cp2yL"
+    "qb36gqN03iX6xkbe9QnBLXFBc3QgTsfsJyyi/bEw24XlZgSG0eYTBJMSfCpseZKLH1NFD9Q9"
+    "W/eq7zUoWDf2hxUE9KaI3XkjdsWa78fAKtW5FKNjAnbFopxdltWc8xxOEcaUBmfbHV5VqtFD"
+    "ofw2tTzLZUfCEFeWqXfwZJl6qyMLHoliP8sgidf9A0AF2dh+FP6YzHR7yaJAGcPSeACXGZFU"
+    "PNbhKpKNx2u83RLdp583tiAZm78VxcG3bZn9fxv0bRUjv7fzu04nE8/twCLnhq1Zlsxe78lD"
+    "8KQNRuYhkNVi/EBOSyavwzZjPvaul9W45aiOtxsDyIC0Xd/vk0PJG1iZEbagfkIN8iaZEUbu"
+    "P3jqmkbVXBtmMY72MSdb8ZZtxaGslNRUzI6OJSjNvazFBuHoWgl3IJAtrxyraZ/eaiSqhE9M"
+    "7JB8od46oIh2bI7zR+d1ZD9sv0UeW7G9BSAgHZ3/wotKZv7j3zchUfIGxMKrlJJlPtiBZ03R"
+    "7yx8jf0B4q1SSiZePrFlSnTgcpm8XbIVJZK1aw01srFPUF6y/GlqYs1mCZRDNAdj0cVJR0a1"
+    "6g70mSB5LHO8LRO8jlOxNnyA98IZZBID+Qn2G4KEvtKh110/Pn8S6+RMugFn0pRucjMClyvd"
+    "hJzfKfk/ivBqLvQY8gPu9rkJPTJw6XEjO7gGSzMOzgFHI+exokP9naM6ZHHYDqRcK4bG+9wE"
+    "rruh00yutcu71rZZUnmTfYdKwEq6C1aAdam2MwNPYTnoRyvmJyz6it0tTr7gJWzVnsyuk0pR"
+    "cWd4oK45nlrs4kA5PvJ60io7vMXisq/Wk6FCM8hjfErLU8cu9Wm6eDQHMRwcffxk+XgJCvr5"
+    "a6a4kOR0jD1Z+IrjihDP4INn+lBP07lKNT6bi5UtlV2cMakvBkWdbhB7T3nq8gfHccAT51u/"
+    "fZM763RSMfm49M7Tp8RRy6nnUczTjH5AGAsaXvZ0pd3yOh2izXlOkzj6gpMtSrMgc5IO87i1"
+    "TyObM8ZwAycPYNu+ZYHQPPeGHTNNT9zXOPm83aC+iSB1stH1emNhUZ+IAVnBPjYge8HwIFtY"
+    "Q6Np+pNf+8Z20+TXftICl8+v/SarG2j1a78pCwsO+LW5EoTj/dplnPEov3b7NJNf++J+7S2O"
+    "ALypn51fIRpfi9cowg1NPrYVxZDJ2M841dfWr5FJx2JiizJgC5qZa5qaMdz4PwuoWc7A0Ps8"
+    "lPccqYT851E/JeR/CIWFIr63n8klxeVgXNoVozJKBtUOs+dxOiMsNgObWSXjmB6ERwn20Ko/"
+    "4meN8oKBsW4spstYp0iUpo9PWqN4wkjZFH64kPs2T7/rp5ZUqUZnM6/nGhg8GYYWKAO1k7Mk"
+    "S169A/danbbAwwGhCYlgJ9o4L1uMYrNCaRAn6+Vui5OeyLZN0tHZXp4jefGmqWqWTBYPeceU"
+    "AqTg3wXlDXsqt2p04ydGVM7vhU2BlAA82DRsWsaiekfrJuep4s842TclpU4nswRy/9IMqrjk"
+    "FEOCvi69fxD+itLY2qVQIxtfCIYGsJUQY5u9+BsYQXbXQtHLl831X/Q8zfi8NlXTgYA0oLbJ"
+    "nosFfhIa2dimaL3pYek3CUeHJ+P9K2UghF6uI5n6U5TxSQedpijjjQlcrijjqzUKW+pm2KO7"
+    "fZFFXAzphKKDcDfIUh6AxvADFZQOhawcSwf0bMu09eps7X0MLvi24haHWSsUMBzzGAJl2nJH"
+    "7MipyeG5mxwK2N/ZVyugHd3qN1XIUCRqIc6XouW6i7yNDXgApDH/y2Xeg+kVorG18Ndv7n+a"
+    "/TzMo3KWWJrMzvAmU0Wl61m+yvevX87gdNW6Xv7n94Bvd+5v2BM4qvbEh0uSsQEBKtcShlYy"
+    "ju10bJ1XW7iK2iWIA8Paly59KIrD92JvQTE2d5lRmHPXRdIs2gR74SbE8IYNxu5xLFWoxmau"
+    "aWgmz1yZ4Zh8Iebbfpssp5EMo6eiFhuQUQ0YPcezXSLbK2fGXmvbjf1vvUMUFaKxN5CFUcDH"
+    "Iigmj8Ze+Q6UQpX6V5Av6aZ6RIBSliLvcS0+yfbmswiopSj25qvrLQVio6ausw13tBhOmchS"
+    "sI7mGPa6R0S0Y2+Gksv5lmC/s7JEQ11ABoBt2jLfMmG0TPBm9a0njH+NbFxJvI6+fw8f5vuP"
+    "sWyafoIDnODI67fYq1TjMvd98Vl68fbS6zjAqfc4CN2wSimbG9vWXIsaBeYNu7GbmtQUqLox"
+    "gU+BqictcMkCVb9j7wWkwohjVfnTu73hKjKqyKcZVgVnqqZV9sXDGsuC6V0F122aqQru4hGj"
+    "KRF6nGgR+QAPDzih0bae8Q0B6cWkMFeEVqjtYDN3G5fJuRLl5lZ41jcyKiS+oEX04ds2xese"
+    "jGfm/6BoyFlKEnceMd36Oro4KukcXOqCdjt3pKrRgot+QPI5RzR2AHqPniB55nm8Sze7flEp"
+    "jmR8vtsBaGnGAiw+C/ugsVmOpLwmxzDFOV31OcMrRBfDNmtrRGQFxXHdqkePdlwT3uweHiky"
+    "dNirA06DcHQMOVNZADgfBuvW0QO8L3VOjsW9TeNNS4EcMWdeRbs15X3eDrB5a/L0lysnV0Tc"
+    "NxSDBefUAdVxzO7RVMssTB74Y5+18+HN/Y8/CppdgxUMXpXlWnBAtxqJdbKRmcnfjKWLBuKd"
+    "Lobu9o6vdgzvnDphP2MB4Of157KYeGReWwbt3kO1PLl4ncYpWg1gc4Nu7KNB93zqGwK3owL5"
+    "W0TNsxi3ZeBzECbbNA8v9uZ2C/XIPHcchwbnzUWONWE4ECSWi/NEu0jQkGI2jmr0oLztwOp2"
+    "Fqb8xWxTFOtJBzWmKNaNCVyuKNZ/P7/fbnE6Fwax8od3+2JYn90lKkZ1CGHxyNaWBXme4Pcv"
+    "0Bh9li6FwEe60CuNH1r7jJ9iysOhrV8AqgpH8L3pziv6ye62czL0l7lHttFDnLBQTZysUcoK"
+    "qp5EPIzn44UBjvdARMa7xMPLDUof+/iaamSn0UaGMzbDbnMDZ0Y20yp0E5R8exaEK5pOZdqa"
+    "A2Mw6IMBlN+zwj8TO0o1pdD2oeWiEdjypLZFsA1W4T+xT33YvSXVRj+640ossx/Kz7tHcrbj"
+    "wU9NoXg5oIOyA4zJ8jgpniU4B0uxd1CuQjS+A73ECmnm4crFaGGA6ACf5YkPcazlIUOGsvn0"
+    "sFtrsPfFDtw9JYs8kUxcnr0BxfRYcLPzhCnCdNUvjJ8TjM9gXmdkySlDyxdVw+h0Thh7zgmj"
+    "gWTGa5pdk4I4mrH9LxWVXKVgBmT9DmHv6QE+U/QgcCVCdUbLqs3G13j6c0S+7S9+6KV3s1W4"
+    "TX89G4f/T7CLPODtzN2FqzSMtj/AG/77Qc6zhW25FuYLUY72guW4Z+1esLrD665qUsMEjbDb"
+    "br1GogXf7nLkSGRa76YOoB7kNJEUqiwzjvrekDWyC3J8t1nFyBfy3bRMI7eUZIP/zDwEfTS9"
+    "gmL8CzLL97FpXaeteX16x56bs1U3TY+Mtirh2ZLaGo6BLh2RjYW+oI1k4fCwkUvTgBa0zwFi"
+    "SPAgCOiabPlqw0k2ZtobDf14ae4q67Hgm5QXPFY2OPKBeULBqK6fF1xZqgu2jtIVevLcq593"
+    "S/Y5v6tkkjAa1jIcLQtDPkbnoLSPaNvLp1WnG9v92OoZ4WBtDd0DdxdWOqYcnltJr/sF+8qg"
+    "jX50RXGva1A2KXiPu+jzkqKS9Qhm1KhGTbqgn2WWR4SchddVhTl5OssKL7dkPQo0lvBhTx4L"
+    "RzZ2/ht/dDgqLFevs0bI2OmoqqZZqqKZtqFblmErBV+bj/Yx+Pnr/wQeVxZyk+krtE2X2fcc"
+    "UBMuIJcMUse0oLjKDmjxCXeT9o29X0msPWfM3uwKKjWcJLEA+qvdl1ClGj36xAvWMRa06TCW"
+    "NGF6yl960uksU/7SjQlcyvyl5yGzIfelMeVj7rpkMy1dbnSXrKZaD/DcJdM9NYl357Du4pYX"
+    "uO05T2d/QyF+dL0RO2OWADr60NAnkhRVMlGapKg63zuys042fueL2gq/MIM5SLp84XZnJk8y"
+    "PiO5I2G0JL5JIbwR/WBSCG9M4FIqhC/AsbdXHWQjuimDXjH2pAnuvE/GUCEZw7AM6wRp7ocm"
+    "FrcG4e4s5qOlW0Kg2e0d+UQUO+6ipCtFGvXu2rURvmOIDNoIt367c7RGNX5b+GqRCwTuHNsC"
+    "ww7bI4U0Hsn1Rt6vd8p/nW7skFyZ/knPXpXimx+dp3+uptkJxPCTfuE4nmjssnPXoCmJKi1n"
+    "saw8Lm0oOiCyOEE/dIoTnhKESTjqc+jyJBJxNQcPMoLxuZrGn3HUO35coxqZt3qggTrmOtaM"
+    "frAsmDwOQ/HaxT49PRMWDuqcaVUnPFOIq6OW8Dc/QVEKWOL6YsHi8gMbiZ8h6WFyXzxla3Zy"
+    "X9yYwKV0XxQNFeb7XBjlqLtOboykMv6krgzWlDpL1KTAeV1iWCeeXujWyAoTeBuYKLtkxHJP"
+    "7KpOROv7hWRPxN3Bs9Z24UCAimVpnB4CIXbkroBydBcIgwPO7BuO8Vl5+PhOkfpK76GcNylH"
+    "Zzcrl5CS0fxn7aGu18jGdpFUDw+qU5iQi8A6WpuaF0CyWqCIRMGf8rYN5VrGQjdoB2xanY9p"
+    "ZoPj8vnogxwuitLF4aIo7Q4XeNaoNAJNoim6Q2VGOZVswNmWoS3yW9XCPshtARIwVOhBzuqL"
+    "TF93eQjGbtK4TK3RZJw9aV19Ms5uTOCyGWd7w8rdIsq9YslNq6hnzLj/BEIjisy6o301u4SH"
+    "65lkPDE1pOoDnmYMWa6w8ZQVeGrVvbolOvKzRjU6O/lofFnTP0Xjj7y7OXSEKRo/ReP7LOUp"
+    "Gj9F40fh6hSNn6LxUzReGvt/cvjk7JocPrcjcNkcPi8ze23e4vMpnt8dcPv4/MBBnp+qUdER"
+    "Gn/oNJ2KP3kc9cNuIA5dTewFygFKhU9zQH3RswoS/5PxH41okE9upIspiTK1MDjm9qoA4k/N"
+    "C/bRjw4fU5XV1LRgalowNS2YmhZcjstT04ILYDJPTQtOHXrgDaepacEFmxZMjQoutsan5gSn"
+    "5fIaRTu0EvN6ak5wkYtwak5w/uYEmqdOTQimJgRTE4LbbkJwRAnJ1IRAGllMTQimJgRTE4Kp"
+    "CcHUhGBqQtBRsFMTgilNbEoTm9LEbj1N7CBuS3PgXcfEsQHoLY0WAfuzwYZhuJzlTfYhudRK"
+    "qDLEiUqR4cFcNMFUwsyytsmfSIKZ5KgvTyXZjC+yEySeUaAMmy1JmmVvezO28OCvwGPlYy7N"
+    "R/CKYj3X1EW7j0zVFR/jPJlsw+oixcSjS24/Uo8EBZOCA6o708XEozO9Da9HAnZPeD38XT7h"
+    "9Ux4PfSFCa9nsssnu3yyyyWzy9/g9asoDdNvc6E1Xj6+22eDr/F6ictxHQzv3JSiFrDrYKqh"
+    "gx2M1IU4y6cT0aeI/EdT3+B6dnF+5OsYHLE8ja3agIygQNSUXers8iaXNK6NZGa6qjLje0Et"
+    "QLWYk0X/iEFSNdNNC/QxdrjtMdkPmuEeiuIo9NCK5dwLTXDGerbPn5LtrWPNhTNCxZO9fWID"
+    "otXGJvw2HR1AFlyX7iEodTF0b0yzmV/fQpPiVbRbU8a/Jp8DZf6/aopSdYpzmRfd+c8dMEfm"
+    "+HepV1m0l6ssGtUqfSuCzl0MNIipUJhCoUKUfF3z+TM91vL5q4NqR3wPzjcpR5eBIDOmIYnK"
+    "TavBOeMsPL+4RRu3q1TSQqsQbXGvUgKO5DqqCZiywwRXVhMw8cHXLDJxLAzS7i6fS5caEJUV"
+    "owRuhN7pTyLSy6XuLIRiWYA2aWnUfnJB5x0PuSfzRj+GIqZ2u5NrU1zQ5Rch4bJn+iaUdlRL"
+    "D0zNh7XuZMEDO0LPvH4KUeVY6lKT116R16jHC7fLMCLmVvhFlJV2wGvHU14uYb6T487wA8iE"
+    "csB9Z/paR+XoMk65zQqlUM5B1HmqWYb9LoQW8uu4HGwf0+xWi97w1AWOwQWu48CnEqSBPEUv"
+    "7AkbLGHLMJwc2M10XUPmW2NyuT5pD9zkcr0xgcvnct2EW/LnvNXnmj2/O+h05QYe9LpmsxLl"
+    "3VYMRPV7u+pU5Ryp4mSmYVMM8XvGSfgQRkvvEaXLz7gF8Qp2VAYF2/4cIE2FT3n1Z3KbnsA6"
+    "uEm36TjmV317CE0wMVMFpOOCp5aHCm902YqOaIWKQ0E6IINeMTRp3EDXi4LCsftIBJQzsDVC"
+    "CeECOZGXA1AihMTysNvQfIe6PV35USS4m7WnQlylvEilVe9zhkdqv+Uiq0I/GiJjMVS8JBLm"
+    "UeNvWcIbsg9DL9ygKM0yNIgq1c9X1TrDdbireOCNMkBIFLeZ/EhJhPfoIUGbxwFCqxJei6wU"
+    "iikI0acsoZm6Cm1d869EYo9oi5drYrVnUBmdJVYnlEli8LZiiTmmZuZSMlRNaUosk2PhFpZT"
+    "bi5w/ysOHx4FCs9/rGLUonLW6GpCC4DwXIJa/CCo7+e0TYsGC22oqzEtADGHIPvR3H/57ufn"
+    "P76a/fT+1YvXH15nkiiuPPqwGjx5/+r+xyliNXrE6ql0WqnFk4p2K3wJxhBrduq7MkWRpijS"
+    "FEW6oijSG+yH6D1maTTztlhSddTdoYjSGoaTo54b3zedHzlqkTtPW9dnWTSdU/sPTsDS/K1g"
+    "odGUAkhHcBYoH2HSJH2eslIcaalenljI1/GxIgBmIbIUqyAgc0aLH2ZtGGvV7EU2gaNYAS34"
+    "84usRkdhP+HW0hXzU6TSKbmKQUcPMP0cPiRTqKj4NIGpsoq0CocAcA+7QQYWNP8UaTAhmLgz"
+    "EGFh/M3ykgRbMfShgTi2IFhtgSiKVmAuZGlyUyRtPkXSriiSJhc85PC1yp93/HEFZ9/szUvj"
+    "2Ye/3quGOaseYFlqPAUvNDyKwWCoRcHU0AzH0yvT3CkklNHhbNPqDGNHhaq3nGwVIHtr+Nvj"
+    "b6eo4T8d/Nr96xlf0y3SAsr7X9Io3A32LLjCKoOn41sxNGhS5SiKk28X3sPCY1PK5m1hWS1o"
+    "tQSs1b51VELi0dEjr6e1lRgR94xwuCcF6RQC4haqEc1YZ9Xi41XA+uEaR1vykXtdB1WqE1wK"
+    "J13dJti8lqpbz2jVoJmneRke1NkYbmAXMnBsdfavr6GfPv5lZivK3eyRRlzIOaIof8p8M/g7"
+    "SEgSaVF7Yko80cCA0ikF5ViBVpVQ7gK0il1iOX6v/XHmANNIveBOx/WTdH87/SVb9/V0P/IF"
+    "lCMXUwpwu0YuqQzCZJsutxhHA1DOG8SyxRAcxzFzHlcKWW81ntAMIFH08oHyr9PKJn4GhU5U"
+    "VzyJvwwniQ/XVdwrdahBeB3mvxhZd5/5D+EV01BoppHJo+vP3rLigYXMuuCUD/Ck9/OUD3Bj"
+    "ApcuH+CnPO47b8sFKEfcHcoD2FSG9kwBKHNAe4T9xUQs1G+qFnXUW37uoyx7KBaeSlpew4L5"
+    "vJM/g+yleXr8+/GQsFlowNZs+rRMK1AQRY4yGIivdiSWX/wQhbQ+qT2cTngfJ9+WWfrF4bpV"
+    "IR7gFwhM0oNhisbPp2j8E4MDrG6RBtf3eHjqhOOjpfHnH1f8Kh/KUO3sEnL9cBC+OYsEIkB6"
+    "3pGl9LcxETB4hdB7tsXk6k3DI8Rx+iD9Z6KGrLD/cJxEmrOMLhG+O45smRFZ1k+T2+1ZERzJ"
+    "+Fkn/IHD7tMMLpPLGMpc+i4oTzpWaM2yi3IIR17NOomxfZbMidbq8T2dlY+sGT9lzMVybYVu"
+    "BJ8vFRfiZwYYlCIF0lwMD/TUAqduWFOJRZcGzGRUe1OJRaMFM6eQNgSy3xCuUspUa5xX8meB"
+    "Y9oFJ8s2KiziMogcOLP8MoG4jmo5OcomSxIuxHuC/SSR1dypRjkDMeqnQleJzpREMKB91Syv"
+    "wBsrnzVnDC0oHaoVNCYZ/UQ0LNWeldWNOlb93Gwva1Dl0BGeSi2p1DWkNN6V4DAKYmLMDe4L"
+    "3ZhBytbQLGzGcrKzCGpAk2RYFcsN41s8olWwXIUBXm4x+ZoilITWK0RIe7msBEtVxJtOA+Ar"
+    "27boplsMzrE59cUyVW1PVdtDNaS/+QmKaK/OIp04w/OQMo14+TkUgSJ1051qU4xv8/OORdn8"
+    "KRmzeq7uKtXouinPYD6rgZ3bpm/DT8UMXr98Ru1FkICKFuBjt1zdkazBxVOClqw7vJCVG+nM"
+    "dBCDTOalKeCClEYs5Kx5jJPlevsgNJTbhdIgHFskjrGgCd4OKkO34LhiCTyVqodi63Q3p8/v"
+    "zaowtA0ksaM8WpESR7Cw3QAcu67vs7T8IiLPgyVegUCEeIZdxSEGNZRHGBVcQ5mFAbYyWdvr"
+    "TdsGaW+80zrB6KVCnbYI5/01Va0rYvGJjbUGE4W7orsMxPtCHgmI8T7HlAAxejdJnGIP+NLg"
+    "/CF7uUIqQ0ttQ/OhSi4AxpsqKhJyTU+jsSjAOKk01sYA5Qh4JzLZ04SzQRL/EwsKsg5JpKST"
+    "QhwL181XvaW6Zo56kye7QbmioUA6D3MkGcTilkkQaxTt0Crzdi99vEpRL195C/0lfeaK2Gdu"
+    "qrqbbwLbgzaIpmHpRYph4UUnY2zAGnJOIZmTedQzviJPXLXYrkaJqUfXo9r857yUTB2kwZLf"
+    "jvOPaF30Ka1dndIa2lSTrUMjHaJJriTY0SasWw585DhtQa+K8CrVldQJFRBmhbtACBB3HQDR"
+    "UxXQky4KmaqAbkzg0lUBvc8zGtY4Sn+MH+ZtxUCNgXeHaoISniIvNu0ND1rJXMAUSghMy+7w"
+    "oAcnYDVDNldTarqAX9RMnbBtnSa5agXkJp9byQOAqgpN0achHh3MXB07bq2gCFMYagwGcYYu"
+    "oEPBEs1VykA/VZVuGeS3T2No8HoWoTZN+Kx2oGQgnzxGaIURZPjs7T2McHCRj8hQUe3At7MR"
+    "L14IRsyLA6FfOVOKEjK6yBvP/gxbuu0RaT484GRvZRN/w02VS/OpcumKcERru2FI5kBtivEz"
+    "BywT4wKnT7LMgfK46b56KzSjL92Su+Mt2uqhPHTdNmYZf+nyl1yZnyHJ0s341TPrpUY2um+t"
+    "okc0016yKi6s8uXY15AAkzmVXUx0XcGe2OOVblBKAN/Ga4mGCrD0kmVyZ0xDQYqTIdwuCGVj"
+    "NvVjSsZsNybG7hKtxfBt+4oTaoSXjbRoB5ktVyxl8vI9aacP8/LJ5fVZoUxIbd6eVQEqesjL"
+    "w43s69yhvnqGrNLdoSMkypw4FBHcDtxK985mP094RXfzrA8WJshzQmiiZ+DDYawhg0G4wNzk"
+    "tLBKhw/UOTOIF4Y3xnqvGAGDAl6g7c79DXvp7Pt/n20S7Ice2XDwR0xfHupDyWYtO6uKHSNx"
+    "p1HF52KPm3NXxginnZwuk9PlicHFCLdBR86Lt9DY7K8AN/AtjcdhcOVI6WrMVohGhxzhryDb"
+    "g7ZitttVYz97SdLw5SsiHX31Gi5SZVq9XKvsHqytk42OQMDVIFVaMJc9nsolrmMP5wGorHcz"
+    "D56n+QznxZxQvk6PunP9MF8tduvFoL368P1Ksb0mCIn5BCExQUhMEBL7RW6b+oQhMf/LhCGx"
+    "r9Ri8kXfgC96yji9GYHLlXH6bpe68e9v8HaL6F0hiD5Uh9ztiz/EdOhyzY3tEIEwAgAvNVXH"
+    "oEiYJSI86zODwLQti6UF0Yj+Exz29T8VT3r+4ujOc+SjTYqTvpgkNbLxjVIHwk/ECoJUDMOE"
+    "8NZxaCOn9zgOgX45GvPlPJl17RAvfJ9zCeFeNugbsdYFR0U70DRHMv4qZ2lhDi1Ktt0A0r88"
+    "XZ1BSRQzRn5aoZSYzesPOPLfY/KG21RqQOkUpTuBabgHT7qguNh+mG8IM4Frwk1RKRNfoGzs"
+    "swCFKzwo1nF6vxdKU7zepH1McJ7kcpa32OpmVqC38ClEhfFp9JaS1EGFkyQWZNa1HyRVqtHz"
+    "TMs+bzUHFjW3bV81CtQoE3dk9KWPj2szwrtH8yYbfLLBb07gl7bBKyb3T6vdQxiRRYTmQnub"
+    "e363z9je0HFLPx/YwdJmDTlNzYTwMXY0GixW8yYI/NO92X9Dp7kdq3suS8patkh6WoNVqtHt"
+    "QX51nc7uW6hdgu9kVLsCrDYC8FQQPbnN00jFa34nQyKmXFz+glY7we3crhdXqca3sdtYbSia"
+    "J6canBVgDnEwCUhHX+tPwM+UsXW3xUlPXOEmpVTyYHn9pqpZw8BRz8LtazMDp1jsZAdOdqA8"
+    "duDd3ljsT+Rr4HQuNgrZs7u9BiEdsx1uDDo2rbVy3f4GYDvpZPRd3OhL8DpOxUVK7fpAhWjs"
+    "HgN24AOYE1JcfmkNhEnvEmA12gOsRrOkI1puCR97A0NX6GSAIa7kwFkqKzOgbnrkVvc0gGAd"
+    "bZOcMCuO/ttjdefjR9dxeaYaOsBuQ19eaTTcNExXvRhbEIzOWWY3ENttUC+qs/gp0BdyRPeK"
+    "3ZUU4/snKkvV0SChSvGC76BIIctHkc9Dce0Nvis8L5p6y8lr/sP34HeNTC6emxqAQEIhnZw8"
+    "T9FDryyWfLxkXGYuHtfC39GMTei+okGSEcPphCL0jufLJbqf/54WQbYq29uBunmaE8B0nzQd"
+    "QzUBKoP2mi/tuKNX+1nQtomp/ijKfdmTLlpQjL/iGcCCrSjDGlufQyGZHJhP2p81OTBvTOBy"
+    "OTDfY2+XAOM/kvWQ/FfszoW+zOawu31uzSQfTpdisvwtI+ji4tQU6s3QjRLVj2bs05pK1sKS"
+    "rZ0S1ZKlN3tJHInzmU847Yldoz///PplD9/obhf6PwDNkJ172EXKdQmh7wQ/dHGLkCqkKPAJ"
+    "PtaJ0slZ0x62I/m9Rr/5fj8qWWk9naglxWnUj+HwWazTnuEsTBF/KaqCn/0FKFALWL+GB2X+"
+    "fMR7MKRCFz18jxre1MKnopabcw6e0urhD+LSUViA62g4oNUuR2AZn0Vfx1+gVQd8mz4elirV"
+    "+IZQBcyb3osMo0gPHNYF0Zndk8+TzvLCTR3bbpEZVXhkcmmR/UE7byhuDk0tb90RXPhL/Pum"
+    "lxFbIRpbfC/Ih5nVkDwzVE0KGIihOwkg9cyMWQ5HBfVJ6zCaPca7ZOajb7N1HKWPMz/+Ktn+"
+    "Ao3yn3HU81AracYWTr6fAMWRSeT1/dv72ce/5xe7HsBOMhxbnd1vQ/TswyOKHh5ROFwOp69X"
+    "BXxMskiWoPv3EUSd7nLCmEeZ/A8cdQBclWVDFEC0QPqM7IdlkITPvmL8GUf+My9aZt8GfiUa"
+    "akp+HbRLTl7Tdx2VkyW0zMHCSTb02QbttrLUTUbgL052Q5qD1kgvAl7VA+mU3tG03K+pBDCw"
+    "57zdhApmiKUpjSPtBDe7RD6cnJt7vXYMmGzQeqiRSrce0LQeBnSLDbdBmODlJl6FXi8TuEl5"
+    "wVuSvnOctxxqBASNBcUsBRR3fjFYrgHd+AwzUySLWZ5tP4cbOQ7snK0PCcB69weea6W/XAm8"
+    "Joaea5OK4bo+RGYNJYehY8HDzIBmyWPcmCx5gRrWxHYw8nnGA6+D6bG3oxinAJqwgw3aXWRt"
+    "5CODFrDOCBbGfrWifoIuuDh0wXHepEt7Jpj+S66cNKRHUJQO0DZaJ5EMRNVeAFZ21oLetAHm"
+    "Q6HdDyisKgP+YD4py9GQSCHhG8saGrRHACDcKtVtKidTTsGTDjFPOQU3JnC5cgp+3tLAuCCN"
+    "gD6525c5sMtHDKqGKitQe1dDtZPeUDXUoBreM1dGwYroWzrC04zv7+eXFtSPSBNK2aDt9muc"
+    "9EqX4GnGZ63hQoMPy1YW0jD1qYKmDqvkO33oaZOhWFIYhH6pPgLS8flsYOgSZGgQLJcSQWGD"
+    "CcdW+Ate9bjMqkSXc7i0uwVoIxTmC6MNsC2MrJH8LDEgNQ3RxauUsqnifKjAMmnvn4CVLNxu"
+    "qxMXRctdlIaCvbNf1BVCyVwzhgeBWcuxwV2pqlTopnrbgt4kLIWLfOOHB3KPDxJ66ySSLYBM"
+    "9FTolaDgtBjoe0lQfzYs/FcmgLu7cJWG0fYHeFtxDvg1laVNHs8n7QCbPJ43JnC5PJ7/k7cL"
+    "nwvdnuXju32+z6+VYV268NSagvfAA+5DekMOUFmcnuNi5RxRwtRYVscB5pzefXRtCBhzoeol"
+    "2L6So2DImJMs4PY2jTebLMe4PSv5LzOWkfxHNvwP1tHlD3KkE5Ug6wYzesbbFkU+9HYL11ln"
+    "t86crxOOu9w97/vsE81A16FrXvECyYIpOdO+4GQrPFwO85sjvSDHV2TCbSpc8TyzLVXPknyf"
+    "PSe2oT/7iAat8zM0T4ujlLwZTpZ9r80m5Uny144pAXadvEcduzlZTZBpax6rSCG0+HMSf082"
+    "xb8e8e/2n0U9sE4HUoMgy3wi18PsZex9xsksz+60AoMmxmmQ5G/lF7RscuwX1qnTjZ6DWEpx"
+    "VlZv2wFkndm2XkjJsE2w3Be6IVmJ3SOxzJabOBHkFrb35eZpBsV7TiyBoLrMTVNVqOdaB5BS"
+    "yPY0NKyNEwBKwK+7HlIb0KS84EWBHjLMPVFGc7G2y1oAoiUBxR8JXiEy6R/AZS+VQzeiWcuP"
+    "GCWpiwdW7FSoJXPQ81nQRuBpkPkcaLftlH9y6e1Z3YcLh5keYIi/CJoty2H+rXGK+kZEeJrr"
+    "iIiQu1ybYiFTLGSKhUyxkJuPhbyI1+sf44f5/pBIPuquU2SErMz1ernKxh8Mkby9/7RTF47+"
+    "4sWMgtYiCnsS5DgPRuA3UsC60txOUCR/cfSgSLkKenGwTnauZMTuTp4FZHzaiqE3Hfmzy0ag"
+    "uLhImGBPHBXZ0waRJxo7lfbt/fLjuyXZtn/MXryAX9/ek19//vDqffH6h//34eOrN3JYoNt4"
+    "l8CBNgAkT0A6dkDKtKBe3MSOwsPjzfKPmDspK1U2qu7mBZ4sfcyhgC85DCfZDEvW6245RGLn"
+    "6SZ35b0KTN+2mZkof68CwtEEtaTR7QHSq1BdzF4X7woL+2APWgCQl6HO1izEGRhozEWcn1/P"
+    "uCOrcBW7hj174f2UxOtN+obYxTKXqYfbJXl7DHByD03R7W23VCeVreMSnEqwi/QCH4xc4yyI"
+    "Ypfido7vBXvCvksp2n7u3Wi0IBnd48VrSyUkaHc9aULoH66oTu6U3J0in3n9HjM1cL7fvi6G"
+    "3XUzsBN+/KAcRNvX9VwVZMDqOoaCqzKp8NNOUxS1YXkfO9ntmOTS5Cnmq6WvBVOnGztv0UKa"
+    "li8wfsk5htrRiX+Be+ZqGyhWNvFR+aDnQRTGa6gM7r2I63Sjq0rsUDQtKxi+ck+f1lPs9ShO"
+    "Beu33ZRrEI7t5KisYwcQ6U0Pd2xdeWkjrGAetJNb/rYVOfbaQ69iapmCsPCG4iAsL6Wyax3V"
+    "Zi0Gin60xM4Sli14vqFW/qCdUpLKtFdKwDU598rWe8Rr1HuT1MiuY3cYrmHlmP8V91ShXMu5"
+    "OzY7dxV6yw36toqRQFtvF1OTUiZJtSeTOJYBpViGDrHHBWtTVcrOULTjvUxnkdQWewlOc34v"
+    "ceQl3zYpFsis/UDbN8fYJ5uhIiVHHmJglKwDylkldR4PewTcEQhmr4+Wo7qge7YwNvZ4Z8nP"
+    "gMWYZPK/Xpt7cEq3mtKtpnSrq0u3yh29z4lgmRy6uIXz0Xf9vMNLl6Mb5CXWMdycvJVAtNFF"
+    "roeyoI/lBX18xf2nFHiMf2nkCxXfmfz5a82h3By9jZN0GSc+mY2MbT7Pb89fJ1/03ZQe1mWv"
+    "jJYSxi/87vysUY3OzvI8GI2Rk559CT2bO3m7r9Yq0ciNQUzNgTYH2O5YxHPqdSp20O8JMEni"
+    "l+/ri79EouBk9D1lG2Ay+m5M4DIZffc4Cb3HucDAy57c7TPmUDnmkOHWXvlxO6k20lS/DMCV"
+    "GQVP5kgu1q5mo9PVbOy5mo0GQP9m04eJ2fDrZOBCUbrkyyhKe74MPOtYBNEeg2svgrhY8O04"
+    "tl4iiDbq9fLn/wcJ7T+S"
+)
@@ -13,6 +13,7 @@ from nekro_agent.core.database import init_db
 from nekro_agent.core.db_migration import run_db_migrations
 from nekro_agent.core.logger import logger
 from nekro_agent.routers import mount_api_routes, mount_middlewares
+from nekro_agent.services.coordination import LEADER_CLEANUP, LEADER_MEMORY, coordinator
 from nekro_agent.services.mail.mail_service import send_bot_status_email
 from nekro_agent.services.mcp.web_chat_auth import init_web_chat_mcp_runtime_auth
 from nekro_agent.services.memory.feature_flags import is_memory_system_enabled
@@ -77,6 +78,8 @@ async def _init_kb_collection() -> None:
 
 async def _recover_stale_kb_tasks() -> None:
     """恢复因服务重启而卡在非终态的知识库文档/资产，重新调度索引。"""
+    if not coordinator.is_leader(LEADER_CLEANUP):
+        return
     try:
         from nekro_agent.models.db_kb_asset import DBKBAsset
         from nekro_agent.models.db_kb_document import DBKBDocument
@@ -136,6 +139,12 @@ if _driver is not None:
         await init_adapters(app)
         await init_web_chat_mcp_runtime_auth()
 
+        # 多实例协调需在定时器与后台维护任务之前就绪，以便确定各角色的主节点
+        try:
+            await coordinator.start()
+        except Exception as e:
+            logger.error(f"协调器启动失败，按单实例模式运行: {e}")
+
         # 注册内置命令
         from nekro_agent.services.command.built_in import register_built_in_commands
 
@@ -213,8 +222,26 @@ if _driver is not None:
             except Exception as e:
                 logger.error(f"[cc_workspace] CC 待投递结果恢复任务失败: {e}")
 
+            # 恢复已退出实例尚未执行的 Agent 触发，多实例时只在清理主节点上回放
+            if coordinator.is_leader(LEADER_CLEANUP):
+                try:
+                    from nekro_agent.services.message_service import message_service
+
+                    await message_service.scheduler.restore(coordinator.is_worker_alive)
+                except Exception as e:
+                    logger.warning(f"恢复待执行 Agent 触发失败: {e}")
+
+            # 补发上次退出前尚未送达的消息
+            if coordinator.is_leader(LEADER_CLEANUP):
+                try:
+                    from nekro_agent.services.outbox import outbox_service
+
+                    await outbox_service.recover()
+                except Exception as e:
+                    logger.warning(f"补发待发送消息失败: {e}")
+
             # 恢复因重启中断的工作区记忆重建任务
-            if is_memory_system_enabled():
+            if is_memory_system_enabled() and coordinator.is_leader(LEADER_MEMORY):
                 try:
                     from nekro_agent.services.memory.rebuild import recover_pending_memory_rebuilds
 
@@ -250,6 +277,20 @@ if _driver is not None:
         await timer_service.stop()
         logger.debug(f"[shutdown] timer service stopped in {time.perf_counter() - step_started_at:.3f}s")
 
+        step_started_at = time.perf_counter()
+        logger.debug("[shutdown] stopping agent mailbox scheduler")
+        from nekro_agent.services.message_service import message_service
+
+        await message_service.scheduler.stop()
+        logger.debug(f"[shutdown] agent mailbox scheduler stopped in {time.perf_counter() - step_started_at:.3f}s")
+
+        step_started_at = time.perf_counter()
+        logger.debug("[shutdown] stopping outbox")
+        from nekro_agent.services.outbox import outbox_service
+
+        await outbox_service.stop()
+        logger.debug(f"[shutdown] outbox stopped in {time.perf_counter() - step_started_at:.3f}s")
+
         step_started_at = time.perf_counter()
         logger.debug("[shutdown] cleaning up adapters")
         await cleanup_adapters(get_app())
@@ -279,6 +320,11 @@ if _driver is not None:
         except Exception as e:
             logger.exception(f"清理插件时发生错误: {e}")
 
+        step_started_at = time.perf_counter()
+        logger.debug("[shutdown] stopping coordinator")
+        await coordinator.stop()
+        logger.debug(f"[shutdown] coordinator stopped in {time.perf_counter() - step_started_at:.3f}s")
+
         logger.debug(f"[shutdown] finished in {time.perf_counter() - shutdown_started_at:.3f}s")
         logger.info("Timer service stopped")
 
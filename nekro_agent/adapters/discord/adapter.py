@@ -5,7 +5,7 @@ import discord
 from nonebot import get_driver
 from nonebot.drivers import Driver
 
-from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter
+from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter, SendRateLimit
 from nekro_agent.adapters.interface.schemas.platform import (
 
     PlatformChannel,
@@ -60,6 +60,8 @@ class DiscordAdapter(BaseAdapter[DiscordConfig]):
             author="NekroAI",
             homepage="https://github.com/KroMiose/nekro-agent",
             tags=["discord", "chat", "im"],
+            # 全局 50 次/秒，单频道 5 条/5 秒
+            send_rate_limit=SendRateLimit(per_minute=3000, per_channel_per_minute=60, burst=5),
         )
 
     async def forward_message(self, request: PlatformSendRequest) -> PlatformSendResponse:
@@ -2,6 +2,7 @@ import asyncio
 import base64
 import email
 import imaplib
+import json
 import re
 import time
 from contextlib import asynccontextmanager, suppress
@@ -13,7 +14,7 @@ from email.mime.text import MIMEText
 from email.utils import mktime_tz, parseaddr, parsedate_tz
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
 import aiofiles
 from fastapi import APIRouter
@@ -34,10 +35,15 @@ from nekro_agent.schemas.chat_message import ChatType
 from nekro_agent.services.message_service import message_service
 
 from .base import EMAIL_PROVIDER_CONFIGS
+from .checkpoint import EmailCheckpointStore
 from .clients import EmailClient, GmailApiClient, ImapSmtpOAuth2Client, ImapSmtpPasswordClient, MicrosoftGraphMailClient
+from .clients.imap_sync import BodyPart, EmailPreview, MailboxState
 from .config import EmailAccount, EmailConfig
 from .routers import router, set_email_adapter
 
+if TYPE_CHECKING:
+    from nekro_agent.models.db_email import DBEmail
+
 logger = get_sub_logger("adapter.email")
 def decode_mime_words(s):
     """解码MIME编码的字符串"""
@@ -169,6 +175,10 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
     """邮箱适配器"""
 
     _POLLING_STATUS_LOG_INTERVAL_SECONDS = 3600
+    # 单次 UID FETCH 的邮件数上限
+    _FETCH_BATCH_SIZE = 20
+    # 延迟下载附件的元数据文件名（位于邮件附件目录下）
+    _LAZY_ATTACHMENT_INDEX = ".lazy_attachments.json"
 
     def __init__(self, config_cls: Type[EmailConfig] = EmailConfig):
         """初始化邮箱适配器"""
@@ -189,11 +199,15 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
         # 邮箱账户到聊天ID的映射
         self.account_chat_mapping: Dict[str, str] = {}
 
-        # 轮询任务
-        self._polling_task: Optional[asyncio.Task] = None
+        # 同步任务：每个账户独立运行，慢账户不会拖累其他账户
+        self._account_tasks: Dict[str, asyncio.Task] = {}
+        self._idle_watchers: Dict[str, ImapSmtpPasswordClient] = {}
         self._polling_active = False
         self._last_polling_status_log_at: float | None = None
 
+        # IMAP UID 增量同步检查点
+        self.checkpoints = EmailCheckpointStore()
+
     def get_default_channel_status(self, channel_type: ChatType) -> str:
         if channel_type in {ChatType.GROUP, ChatType.PRIVATE}:
             return "disabled"
@@ -291,6 +305,36 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
             raw_bytes=raw_email,
         )
 
+    def _parse_email_preview(self, preview: EmailPreview) -> ParsedEmail:
+        """解析大邮件预览（仅头部与正文部件）"""
+        header_message = email.message_from_bytes(preview.header_bytes)
+        subject = decode_mime_words(header_message.get("Subject", "")) or "无主题"
+        sender_name, sender_addr = parseaddr(header_message.get("From", ""))
+        sender_name = decode_mime_words(sender_name) or sender_name
+
+        html_content = ""
+        text_content = ""
+        for part, payload in preview.text_parts:
+            try:
+                text = payload.decode(part.charset, errors="ignore")
+            except LookupError:
+                text = payload.decode("utf-8", errors="ignore")
+            if part.content_type == "text/html":
+                html_content = text
+            elif part.content_type == "text/plain":
+                text_content = text
+
+        return ParsedEmail(
+            subject=subject,
+            sender_name=sender_name,
+            sender_addr=sender_addr,
+            date_str=header_message.get("Date", ""),
+            html_content=html_content,
+            text_content=text_content,
+            attachments=[self._lazy_attachment_name(part) for part in preview.lazy_attachments],
+            raw_bytes=preview.header_bytes,
+        )
+
     def _connect_imap(self, account: EmailAccount) -> imaplib.IMAP4_SSL:
         """连接到IMAP服务器
 
@@ -431,60 +475,100 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
         logger.info("邮箱适配器清理完成")
 
     def _start_polling(self) -> None:
-        """启动轮询任务"""
+        """为每个已连接账户启动同步任务"""
         # 如果没有邮件客户端连接，不启动轮询任务
         if not self.email_clients:
             logger.info("没有邮件客户端连接，跳过轮询任务启动")
             return
 
-        if not self._polling_task or self._polling_task.done():
-            self._polling_active = True
+        if not self._polling_active:
             self._last_polling_status_log_at = None
-            self._polling_task = asyncio.create_task(self._polling_loop())
-            logger.info("邮箱适配器轮询任务已启动")
+        self._polling_active = True
+        for account_username in list(self.email_clients):
+            task = self._account_tasks.get(account_username)
+            if task is None or task.done():
+                self._account_tasks[account_username] = asyncio.create_task(self._account_sync_loop(account_username))
+                logger.info(f"邮箱账户 {account_username} 同步任务已启动")
 
     def _stop_polling(self) -> None:
-        """停止轮询任务"""
+        """停止全部同步任务"""
         self._polling_active = False
-        if self._polling_task and not self._polling_task.done():
-            self._polling_task.cancel()
-            logger.info("邮箱适配器轮询任务已停止")
-
-    async def _polling_loop(self) -> None:
-        """轮询循环"""
-        poll_count = 0
-        while self._polling_active:
-            try:
-                poll_count += 1
+        for task in self._account_tasks.values():
+            if not task.done():
+                task.cancel()
+        if self._account_tasks:
+            logger.info("邮箱适配器同步任务已停止")
+        self._account_tasks.clear()
+
+    async def _account_sync_loop(self, account_username: str) -> None:
+        """单个账户的同步循环：增量拉取后等待 IDLE 推送 / NOOP 探测 / 轮询间隔"""
+        round_count = 0
+        try:
+            while self._polling_active:
+                client = self.email_clients.get(account_username)
+                if client is None:
+                    logger.info(f"邮箱账户 {account_username} 已断开，同步任务退出")
+                    break
+
+                round_count += 1
                 now = time.monotonic()
                 if (
                     self._last_polling_status_log_at is None
                     or now - self._last_polling_status_log_at >= self._POLLING_STATUS_LOG_INTERVAL_SECONDS
                 ):
                     logger.info(
-                        f"邮箱适配器第 {poll_count} 次轮询开始，轮询间隔: {self.config.POLL_INTERVAL} 秒，已连接账户数: {len(self.email_clients)}",
+                        f"邮箱账户 {account_username} 第 {round_count} 次同步开始，轮询间隔: {self.config.POLL_INTERVAL} 秒，"
+                        f"IDLE: {'启用' if self.config.IMAP_IDLE_ENABLED else '关闭'}，已连接账户数: {len(self.email_clients)}",
                     )
                     self._last_polling_status_log_at = now
 
-                # 检查每个账户的新邮件
-                accounts_to_check = list(self.email_clients.items())
-                for account_username, client in accounts_to_check:
-                    if self._polling_active:
-                        try:
-                            await self._check_new_emails(account_username, client)
-                        except Exception as e:
-                            logger.error(f"检查账户 {account_username} 的新邮件时发生错误: {e}")
+                try:
+                    await self._check_new_emails(account_username, client)
+                except Exception as e:
+                    logger.error(f"检查账户 {account_username} 的新邮件时发生错误: {e}")
 
-                # 等待下次轮询
-                await asyncio.sleep(self.config.POLL_INTERVAL)
+                await self._wait_for_new_mail(account_username)
+        except asyncio.CancelledError:
+            logger.info(f"邮箱账户 {account_username} 同步任务被取消")
+        finally:
+            if self._account_tasks.get(account_username) is asyncio.current_task():
+                self._account_tasks.pop(account_username, None)
+            self._close_idle_watcher(account_username)
 
-            except asyncio.CancelledError:
-                logger.info("邮箱适配器轮询任务被取消")
-                break
-            except Exception as e:
-                logger.error(f"邮箱适配器轮询过程中发生错误: {e}")
-                # 发生错误时仍然继续轮询
-                await asyncio.sleep(self.config.POLL_INTERVAL)
+    async def _wait_for_new_mail(self, account_username: str) -> None:
+        """等待下一轮同步
+
+        IMAP 账户使用独立的监听连接：服务器支持 IDLE 时等待推送，否则以 NOOP 探测代替；
+        API 类账户或监听连接不可用时按轮询间隔休眠。
+        """
+        client = self.email_clients.get(account_username)
+        if not self.config.IMAP_IDLE_ENABLED or not isinstance(client, ImapSmtpPasswordClient):
+            await asyncio.sleep(self.config.POLL_INTERVAL)
+            return
+
+        try:
+            watcher = self._idle_watchers.get(account_username)
+            if watcher is None:
+                watcher = await client.open_watcher()
+                self._idle_watchers[account_username] = watcher
+                await watcher.select_mailbox()
+                mode = "IDLE" if watcher.supports_idle() else "NOOP"
+                logger.info(f"邮箱账户 {account_username} 已建立监听连接，模式: {mode}")
+            timeout = self.config.IMAP_IDLE_TIMEOUT if watcher.supports_idle() else self.config.POLL_INTERVAL
+            if await watcher.wait_for_changes(timeout):
+                logger.debug(f"邮箱账户 {account_username} 收到新邮件通知")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"邮箱账户 {account_username} 监听连接异常，本轮退回轮询: {e}")
+            self._close_idle_watcher(account_username)
+            await asyncio.sleep(self.config.POLL_INTERVAL)
+
+    def _close_idle_watcher(self, account_username: str) -> None:
+        watcher = self._idle_watchers.pop(account_username, None)
+        if watcher is not None:
+            # 监听线程可能仍阻塞在 IDLE 上，直接关闭 socket 使其立即返回
+            watcher.abort()
 
     @asynccontextmanager
     async def _account_lock(self, account_username: str):
@@ -828,7 +912,13 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
         unseen_only: bool | None = None,
         limit: int | None = None,
         reconnect_on_error: bool = True,
+        incremental: bool = False,
     ) -> EmailPullResult:
+        """拉取账户邮件
+
+        IMAP 账户在 `incremental` 模式下基于 UIDVALIDITY / UID 检查点只检索新邮件，
+        并按批次先拉取 BODYSTRUCTURE，超过阈值的大邮件只下载头部与正文，附件按需下载。
+        """
         effective_unseen_only = self.config.FETCH_UNSEEN_ONLY if unseen_only is None else unseen_only
         configured_limit = max(1, self.config.MAX_PER_POLL)
         effective_limit = configured_limit if limit is None else min(max(1, limit), configured_limit)
@@ -865,6 +955,11 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
                     result.debug_steps.append({"stage": "select_mailbox", "error": str(e)})
                     raise
 
+                mailbox_state = client.mailbox_state if isinstance(client, ImapSmtpPasswordClient) else None
+                checkpoint = None
+                if incremental and mailbox_state is not None:
+                    checkpoint = self.checkpoints.get(account_username, result.mailbox, mailbox_state.uidvalidity)
+
                 try:
                     list_step = {"stage": "list_message_ids", "unseen_only": effective_unseen_only, "mailbox": result.mailbox}
                     if client.__class__.__name__ == "MicrosoftGraphMailClient":
@@ -874,10 +969,22 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
                             list_step["params"]["$filter"] = "isRead eq false"
                         else:
                             list_step["params"]["$orderby"] = "receivedDateTime desc"
+                    elif checkpoint is not None:
+                        list_step["criteria"] = f"UID {checkpoint.last_uid + 1}:*" + (
+                            " UNSEEN" if effective_unseen_only else ""
+                        )
                     else:
                         list_step["criteria"] = "UNSEEN" if effective_unseen_only else "ALL"
+                    if mailbox_state is not None:
+                        list_step["uidvalidity"] = mailbox_state.uidvalidity
+                        list_step["uidnext"] = mailbox_state.uidnext
                     result.debug_steps.append(list_step)
-                    email_ids = await client.list_message_ids(effective_unseen_only)
+                    if isinstance(client, ImapSmtpPasswordClient) and checkpoint is not None:
+                        email_ids = await client.list_uids_since(checkpoint.last_uid, effective_unseen_only)
+                    else:
+                        email_ids = await client.list_message_ids(effective_unseen_only)
+                    if isinstance(client, ImapSmtpPasswordClient):
+                        email_ids.sort(key=int)
                     result.found_count = len(email_ids)
                     result.debug_steps.append(
                         {
@@ -899,29 +1006,60 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
                 else:
                     logger.debug(f"账户 {account_username} 在文件夹 {target_folder} 中没有新邮件")
 
-                for email_id in email_ids[: result.effective_limit]:
-                    email_id_text = self._email_id_text(email_id)
-                    try:
-                        if await self._process_email(account_username, email_id, client, raise_on_error=True):
-                            result.processed_count += 1
-                        else:
+                selected_ids = email_ids[: result.effective_limit]
+                for batch_start in range(0, len(selected_ids), self._FETCH_BATCH_SIZE):
+                    batch = selected_ids[batch_start : batch_start + self._FETCH_BATCH_SIZE]
+                    prefetched: Dict[bytes, bytes | EmailPreview] = {}
+                    if isinstance(client, ImapSmtpPasswordClient):
+                        prefetched = await self._prefetch_imap_batch(client, batch, result)
+                    for email_id in batch:
+                        email_id_text = self._email_id_text(email_id)
+                        try:
+                            if await self._process_email(
+                                account_username,
+                                email_id,
+                                client,
+                                raise_on_error=True,
+                                prefetched=prefetched.get(email_id),
+                            ):
+                                result.processed_count += 1
+                            else:
+                                result.failed_count += 1
+                                result.errors.append(
+                                    {"stage": "process", "email_id": email_id_text, "message": "邮件处理失败"},
+                                )
+                        except Exception as e:
                             result.failed_count += 1
-                            result.errors.append(
-                                {"stage": "process", "email_id": email_id_text, "message": "邮件处理失败"},
-                            )
-                    except Exception as e:
-                        result.failed_count += 1
-                        result.errors.append({"stage": "process", "email_id": email_id_text, "message": str(e)})
+                            result.errors.append({"stage": "process", "email_id": email_id_text, "message": str(e)})
 
-                if self.config.MARK_AS_SEEN_AFTER_FETCH and effective_unseen_only:
-                    for email_id in email_ids[: result.effective_limit]:
-                        email_id_text = self._email_id_text(email_id)
+                if self.config.MARK_AS_SEEN_AFTER_FETCH and effective_unseen_only and selected_ids:
+                    if isinstance(client, ImapSmtpPasswordClient):
                         try:
-                            await client.mark_seen(email_id)
-                            result.marked_seen_count += 1
+                            await client.mark_seen_batch(selected_ids)
+                            result.marked_seen_count += len(selected_ids)
                         except Exception as e:
-                            result.mark_seen_failed_count += 1
-                            result.errors.append({"stage": "mark_seen", "email_id": email_id_text, "message": str(e)})
+                            result.mark_seen_failed_count += len(selected_ids)
+                            result.errors.append({"stage": "mark_seen", "message": str(e)})
+                    else:
+                        for email_id in selected_ids:
+                            email_id_text = self._email_id_text(email_id)
+                            try:
+                                await client.mark_seen(email_id)
+                                result.marked_seen_count += 1
+                            except Exception as e:
+                                result.mark_seen_failed_count += 1
+                                result.errors.append(
+                                    {"stage": "mark_seen", "email_id": email_id_text, "message": str(e)},
+                                )
+
+                # 推进检查点：失败的邮件同样越过，与原先 RFC822 拉取即置已读的语义一致，避免反复重试坏邮件
+                if mailbox_state is not None:
+                    last_uid = max((int(uid) for uid in selected_ids), default=0)
+                    if incremental and not result.skipped_count and mailbox_state.uidnext:
+                        last_uid = max(last_uid, mailbox_state.uidnext - 1)
+                    if last_uid:
+                        self.checkpoints.advance(account_username, result.mailbox, mailbox_state.uidvalidity, last_uid)
+                        result.debug_steps.append({"stage": "checkpoint", "last_uid": last_uid})
         except Exception as e:
             if not result.errors:
                 result.errors.append({"stage": "pull", "message": str(e)})
@@ -943,6 +1081,42 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
 
         return result
 
+    async def _prefetch_imap_batch(
+        self,
+        client: ImapSmtpPasswordClient,
+        batch: List[bytes],
+        result: EmailPullResult,
+    ) -> Dict[bytes, bytes | EmailPreview]:
+        """批量预取一批邮件：先取 BODYSTRUCTURE，小邮件整封拉取，大邮件只取头部与正文
+
+        预取失败时返回已取得的部分，剩余邮件由 `_process_email` 逐封拉取。
+        """
+        prefetched: Dict[bytes, bytes | EmailPreview] = {}
+        threshold = self.config.LAZY_ATTACHMENT_THRESHOLD_MB * 1024 * 1024
+        try:
+            summaries = await client.fetch_summaries(batch)
+            lazy = [
+                summary for summary in summaries.values() if summary.size > threshold and summary.attachment_parts
+            ]
+            lazy_uids = {summary.uid for summary in lazy}
+            prefetched.update(await client.fetch_raw_messages([uid for uid in batch if uid not in lazy_uids]))
+            for summary in lazy:
+                preview = await client.fetch_preview(summary)
+                if preview is not None:
+                    prefetched[summary.uid] = preview
+            result.debug_steps.append(
+                {
+                    "stage": "fetch_batch",
+                    "uids": [self._email_id_text(uid) for uid in batch],
+                    "full_count": len(prefetched) - len(lazy_uids),
+                    "lazy_count": len(lazy_uids),
+                },
+            )
+        except Exception as e:
+            logger.warning(f"账户 {client.account_username} 批量拉取邮件失败，改为逐封拉取: {e}")
+            result.debug_steps.append({"stage": "fetch_batch", "error": str(e)})
+        return prefetched
+
     async def _check_new_emails(self, account_username: str, client: EmailClient) -> None:
         """检查指定账户的新邮件"""
         result = await self._pull_account_emails(
@@ -951,6 +1125,7 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
             unseen_only=self.config.FETCH_UNSEEN_ONLY,
             limit=self.config.MAX_PER_POLL,
             reconnect_on_error=True,
+            incremental=True,
         )
         if result.found_count:
             logger.info(
@@ -967,22 +1142,37 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
         client: EmailClient,
         *,
         raise_on_error: bool = False,
+        prefetched: bytes | EmailPreview | None = None,
     ) -> bool:
-        """处理单封邮件"""
+        """处理单封邮件
+
+        Args:
+            prefetched: 批量预取得到的整封邮件或大邮件预览，为空时逐封拉取
+        """
         try:
-            raw_email = await client.fetch_raw_message(email_id)
-            if raw_email is None:
-                message = f"获取邮件 {self._email_id_text(email_id)} 失败"
-                logger.warning(message)
-                if raise_on_error:
-                    raise RuntimeError(message)
-                return False
-            # 只解析一次邮件，避免重复解析
-            email_message = email.message_from_bytes(raw_email)
-            parsed = self._parse_email(raw_email)
-
-            # 处理附件下载（基于解析结果）
-            if parsed.attachments and email_message.is_multipart():
+            if isinstance(prefetched, EmailPreview):
+                email_message = email.message_from_bytes(prefetched.header_bytes)
+                parsed = self._parse_email_preview(prefetched)
+                await self._record_lazy_attachments(
+                    account_username,
+                    self._email_id_text(email_id),
+                    prefetched,
+                    getattr(client, "mailbox_state", None),
+                )
+            else:
+                raw_email = prefetched if prefetched is not None else await client.fetch_raw_message(email_id)
+                if raw_email is None:
+                    message = f"获取邮件 {self._email_id_text(email_id)} 失败"
+                    logger.warning(message)
+                    if raise_on_error:
+                        raise RuntimeError(message)
+                    return False
+                # 只解析一次邮件，避免重复解析
+                email_message = email.message_from_bytes(raw_email)
+                parsed = self._parse_email(raw_email)
+
+            # 处理附件下载（基于解析结果，大邮件的附件改为按需下载）
+            if parsed.attachments and email_message.is_multipart() and not isinstance(prefetched, EmailPreview):
                 for part in email_message.walk():
                     cdisp = part.get_content_disposition()
                     if cdisp in {"attachment", "inline"}:
@@ -1064,9 +1254,7 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
 
             # 写入本地缓存
             try:
-                import json
-
-                from nekro_agent.models.db_email import DBEmail
+                from nekro_agent.models.db_email import LEGACY_SEQ_PREFIX, DBEmail
 
                 # 提取 In-Reply-To 和 References 头
                 in_reply_to = email_message.get("In-Reply-To", "") or ""
@@ -1094,6 +1282,16 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
                 except Exception:
                     pass
 
+                email_uid = self._email_id_text(email_id)
+                if message_id_header:
+                    # 迁移前以序号存储的同一封邮件，改用 UID 后合并到同一条记录
+                    legacy = await DBEmail.filter(
+                        account_username=account_username,
+                        message_id=message_id_header[:512],
+                        email_uid__startswith=LEGACY_SEQ_PREFIX,
+                    ).first()
+                    if legacy is not None:
+                        await self._adopt_email_uid(legacy, email_uid)
                 await DBEmail.update_or_create(
                     defaults={
                         "message_id": message_id_header[:512],
@@ -1108,7 +1306,7 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
                         "references": references_header,
                     },
                     account_username=account_username,
-                    email_uid=self._email_id_text(email_id),
+                    email_uid=email_uid,
                 )
             except Exception as cache_exc:
                 logger.warning(f"写入邮件缓存失败: {cache_exc}")
@@ -1193,6 +1391,7 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
             return True
 
     async def _remove_email_client(self, account_username: str) -> None:
+        self._close_idle_watcher(account_username)
         client = self.email_clients.pop(account_username, None)
         if client:
             await client.close()
@@ -1406,6 +1605,19 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
             "connected_accounts": len(self.email_clients),
             "poll_interval": self.config.POLL_INTERVAL,
             "accounts": list(self.email_clients.keys()),
+            "idle_enabled": self.config.IMAP_IDLE_ENABLED,
+            "sync_tasks": {
+                account_username: {
+                    "running": not task.done(),
+                    "watcher": (
+                        ("idle" if watcher.supports_idle() else "noop")
+                        if (watcher := self._idle_watchers.get(account_username)) and watcher.conn
+                        else None
+                    ),
+                }
+                for account_username, task in self._account_tasks.items()
+            },
+            "checkpoints": self.checkpoints.to_dict(),
         }
 
     async def get_raw_email_content(self, account_username: str, email_id: str, folder: str | None = None) -> dict:
@@ -1441,6 +1653,108 @@ class EmailAdapter(BaseAdapter[EmailConfig]):
                 error_msg = f"Failed to get raw email content: {e!s}"
                 raise Exception(error_msg) from e
 
+    def _lazy_attachment_name(self, part: BodyPart) -> str:
+        return self._sanitize_filename(part.filename or f"attachment_{part.section}")
+
+    def _attachment_dir(self, account_username: str, email_uid: str) -> Path:
+        return Path(OsEnv.DATA_DIR) / "uploads" / "email_attachment" / account_username / email_uid
+
+    async def _record_lazy_attachments(
+        self,
+        account_username: str,
+        email_uid: str,
+        preview: EmailPreview,
+        mailbox_state: MailboxState | None = None,
+    ) -> None:
+        """记录大邮件中尚未下载的附件及其 section 与所在文件夹，供按需下载使用"""
+        if not preview.lazy_attachments:
+            return
+        index = {
+            self._lazy_attachment_name(part): {
+                "section": part.section,
+                "encoding": part.encoding,
+                "content_type": part.content_type,
+                "size": part.size,
+                "mailbox": mailbox_state.name if mailbox_state else "",
+                "uidvalidity": mailbox_state.uidvalidity if mailbox_state else 0,
+            }
+            for part in preview.lazy_attachments
+        }
+        email_dir = self._attachment_dir(account_username, email_uid)
+        await asyncio.to_thread(email_dir.mkdir, parents=True, exist_ok=True)
+        async with aiofiles.open(email_dir / self._LAZY_ATTACHMENT_INDEX, "w", encoding="utf-8") as f:
+            await f.write(json.dumps(index, ensure_ascii=False))
+        logger.info(
+            f"邮件 {email_uid} 大小 {preview.size} 字节，{len(index)} 个附件将在查看时按需下载 (账户={account_username})",
+        )
+
+    def list_lazy_attachments(self, account_username: str, email_uid: str) -> Dict[str, dict]:
+        """列出尚未下载的延迟附件"""
+        index_path = self._attachment_dir(account_username, email_uid) / self._LAZY_ATTACHMENT_INDEX
+        if not index_path.exists():
+            return {}
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    async def download_lazy_attachment(self, account_username: str, email_uid: str, filename: str) -> Optional[Path]:
+        """按需下载大邮件的附件，成功后返回本地文件路径"""
+        entry = self.list_lazy_attachments(account_username, email_uid).get(filename)
+        client = self.email_clients.get(account_username)
+        if not entry or not isinstance(client, ImapSmtpPasswordClient):
+            return None
+
+        part = BodyPart(
+            section=str(entry.get("section", "")),
+            content_type=str(entry.get("content_type", "")),
+            encoding=str(entry.get("encoding", "")),
+            filename=filename,
+        )
+        mailbox = str(entry.get("mailbox") or "")
+        async with self._account_lock(account_username):
+            await client.select_mailbox(override_folder=mailbox or None)
+            uidvalidity = entry.get("uidvalidity") or 0
+            if uidvalidity and client.mailbox_state and client.mailbox_state.uidvalidity != uidvalidity:
+                logger.warning(f"邮件 {email_uid} 所在文件夹 {mailbox} 的 UIDVALIDITY 已变化，无法按 UID 下载附件")
+                return None
+            data = await client.fetch_body_part(email_uid.encode(), part)
+
+        file_path = self._attachment_dir(account_username, email_uid) / filename
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(data)
+        logger.info(f"延迟附件已下载: {file_path}")
+        return file_path
+
+    async def reconcile_legacy_email(self, record: "DBEmail") -> Optional[str]:
+        """按 Message-ID 查回以序号存储的旧记录对应的 UID，更新记录后返回 UID"""
+        client = self.email_clients.get(record.account_username)
+        if not record.message_id or not isinstance(client, ImapSmtpPasswordClient):
+            return None
+        async with self._account_lock(record.account_username):
+            await client.select_mailbox()
+            uid = await client.find_uid_by_message_id(record.message_id)
+        if uid is None:
+            return None
+        return await self._adopt_email_uid(record, self._email_id_text(uid))
+
+    async def _adopt_email_uid(self, record: "DBEmail", email_uid: str) -> str:
+        """将旧记录改为以 UID 标识，并迁移其附件目录；已有同 UID 记录时删除旧记录"""
+        from nekro_agent.models.db_email import DBEmail
+
+        if await DBEmail.filter(account_username=record.account_username, email_uid=email_uid).exists():
+            await record.delete()
+            return email_uid
+        legacy_dir = self._attachment_dir(record.account_username, record.storage_key)
+        uid_dir = self._attachment_dir(record.account_username, email_uid)
+        if legacy_dir.is_dir() and not uid_dir.exists():
+            await asyncio.to_thread(legacy_dir.rename, uid_dir)
+        record.email_uid = email_uid
+        await record.save(update_fields=["email_uid"])
+        logger.info(f"邮件记录 {record.id} 已按 Message-ID 对账为 UID {email_uid} (账户={record.account_username})")
+        return email_uid
+
     async def _download_attachment(
         self,
         part,
@@ -0,0 +1,98 @@
+"""IMAP 增量同步检查点
+
+按账户记录上次同步到的邮箱、UIDVALIDITY 与最大 UID。
+UIDVALIDITY 变化说明服务器重建了 UID 编号，此时检查点失效，退回一次全量 SEARCH。
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import APP_SYSTEM_DIR
+
+logger = get_sub_logger("adapter.email")
+
+EMAIL_CHECKPOINT_PATH = Path(APP_SYSTEM_DIR) / "email" / "sync_checkpoints.json"
+
+
+class EmailSyncCheckpoint(BaseModel):
+    """单个账户的同步检查点"""
+
+    mailbox: str
+    uidvalidity: int
+    last_uid: int = 0
+    updated_at: int = 0
+
+
+class EmailCheckpointStore:
+    """同步检查点的 JSON 文件存储"""
+
+    def __init__(self, path: Path = EMAIL_CHECKPOINT_PATH) -> None:
+        self._path = path
+        self._checkpoints: Dict[str, EmailSyncCheckpoint] = self._load()
+
+    def _load(self) -> Dict[str, EmailSyncCheckpoint]:
+        if not self._path.exists():
+            return {}
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"加载邮箱同步检查点失败: {e}")
+            return {}
+        if not isinstance(raw, dict):
+            return {}
+        checkpoints: Dict[str, EmailSyncCheckpoint] = {}
+        for account_username, data in raw.items():
+            try:
+                checkpoints[account_username] = EmailSyncCheckpoint.model_validate(data)
+            except ValidationError:
+                continue
+        return checkpoints
+
+    def _save(self) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {k: v.model_dump() for k, v in self._checkpoints.items()}
+            self._path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"保存邮箱同步检查点失败: {e}")
+
+    def get(self, account_username: str, mailbox: str, uidvalidity: int) -> Optional[EmailSyncCheckpoint]:
+        """获取仍然有效的检查点，邮箱或 UIDVALIDITY 不一致时返回 None"""
+        checkpoint = self._checkpoints.get(account_username)
+        if checkpoint is None or not uidvalidity:
+            return None
+        if checkpoint.mailbox != mailbox or checkpoint.uidvalidity != uidvalidity:
+            logger.info(
+                f"账户 {account_username} 的同步检查点已失效 (mailbox={checkpoint.mailbox}->{mailbox}, "
+                f"uidvalidity={checkpoint.uidvalidity}->{uidvalidity})，将重新全量检索",
+            )
+            return None
+        return checkpoint
+
+    def advance(self, account_username: str, mailbox: str, uidvalidity: int, last_uid: int) -> None:
+        """推进检查点，UID 只增不减"""
+        if not uidvalidity:
+            return
+        current = self._checkpoints.get(account_username)
+        if current and current.mailbox == mailbox and current.uidvalidity == uidvalidity:
+            if last_uid <= current.last_uid:
+                return
+        self._checkpoints[account_username] = EmailSyncCheckpoint(
+            mailbox=mailbox,
+            uidvalidity=uidvalidity,
+            last_uid=last_uid,
+            updated_at=int(time.time()),
+        )
+        self._save()
+
+    def remove(self, account_username: str) -> None:
+        if self._checkpoints.pop(account_username, None) is not None:
+            self._save()
+
+    def to_dict(self) -> Dict[str, dict]:
+        return {k: v.model_dump() for k, v in self._checkpoints.items()}
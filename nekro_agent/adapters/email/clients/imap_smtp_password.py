@@ -1,15 +1,19 @@
 import asyncio
 import base64
+import copy
 import email
 import imaplib
 import re
 import socket
 import smtplib
 import ssl
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
+from typing import Any, Callable, TypeVar
 from urllib.parse import urlparse
 
 import aiofiles
@@ -18,6 +22,24 @@ from nekro_agent.adapters.email.base import EMAIL_PROVIDER_CONFIGS
 from nekro_agent.adapters.email.config import EmailAccount
 
 from .base import EmailRawContent
+from .imap_sync import (
+    IDLE_CHANGE_PATTERN,
+    BodyPart,
+    EmailPreview,
+    IdleLineReader,
+    MailboxState,
+    MessageSummary,
+    decode_transfer_encoding,
+    format_uid_set,
+    join_fetch_response,
+    parse_bodystructure,
+    parse_fetch_items,
+)
+
+# NOOP 退化模式下的探测间隔（秒）
+NOOP_PROBE_INTERVAL = 10.0
+
+T = TypeVar("T")
 
 
 class ProxiedIMAP4SSL(imaplib.IMAP4_SSL):
@@ -89,6 +111,9 @@ class ImapSmtpPasswordClient:
         self.imap_timeout = imap_timeout
         self.proxy_url = proxy_url
         self.conn: imaplib.IMAP4_SSL | None = None
+        self.mailbox_state: MailboxState | None = None
+        # 监听连接独占的线程：IDLE 最长阻塞 IMAP_IDLE_TIMEOUT，不能占用默认线程池
+        self._wait_executor: ThreadPoolExecutor | None = None
 
     async def connect(self) -> None:
         self.conn = await asyncio.to_thread(self._connect_sync)
@@ -99,6 +124,16 @@ class ImapSmtpPasswordClient:
         conn = self.conn
         self.conn = None
         await asyncio.to_thread(self._close_sync, conn)
+        self._shutdown_wait_executor()
+
+    def abort(self) -> None:
+        """直接关闭底层 socket，用于中断阻塞中的 IDLE 等待"""
+        conn = self.conn
+        self.conn = None
+        if conn is not None:
+            with suppress(Exception):
+                conn.shutdown()
+        self._shutdown_wait_executor()
 
     async def select_mailbox(self, preferred: str = "INBOX", override_folder: str | None = None) -> str:
         conn = self._require_conn()
@@ -109,6 +144,7 @@ class ImapSmtpPasswordClient:
             status, data = await asyncio.to_thread(conn.select, '"INBOX"')
         if status != "OK":
             raise RuntimeError(f"Failed to select mailbox {target} for account {self.account_username}: {data!r}")
+        self.mailbox_state = self._read_mailbox_state(conn, target, data)
         return target
 
     async def get_mailbox_folders_debug(self) -> list[str]:
@@ -116,23 +152,140 @@ class ImapSmtpPasswordClient:
         return await asyncio.to_thread(self._get_mailbox_folders_sync, conn)
 
     async def list_message_ids(self, unseen_only: bool) -> list[bytes]:
+        """列出邮件 UID（而非会随删除变化的序号）"""
         conn = self._require_conn()
         criteria = "UNSEEN" if unseen_only else "ALL"
-        status, messages = await asyncio.to_thread(conn.search, None, criteria)
+        status, messages = await asyncio.to_thread(conn.uid, "SEARCH", None, criteria)
         if status != "OK":
             raise RuntimeError(f"邮件搜索失败: {status}")
-        return list(messages[0].split()) if messages else []
+        return list(messages[0].split()) if messages and messages[0] else []
 
-    async def fetch_raw_message(self, email_id: bytes) -> bytes | None:
+    async def list_uids_since(self, last_uid: int, unseen_only: bool) -> list[bytes]:
+        """列出 UID 大于 `last_uid` 的邮件"""
+        conn = self._require_conn()
+        criteria = f"UID {last_uid + 1}:*" + (" UNSEEN" if unseen_only else "")
+        status, messages = await asyncio.to_thread(conn.uid, "SEARCH", None, criteria)
+        if status != "OK":
+            raise RuntimeError(f"邮件搜索失败: {status}")
+        uids = list(messages[0].split()) if messages and messages[0] else []
+        # `n:*` 在没有更大 UID 时仍会返回最后一封邮件，需要再过滤一次
+        return [uid for uid in uids if int(uid) > last_uid]
+
+    async def find_uid_by_message_id(self, message_id: str) -> bytes | None:
+        """在当前文件夹中按 Message-ID 查找邮件 UID"""
+        if not message_id or "\r" in message_id or "\n" in message_id:
+            return None
         conn = self._require_conn()
-        status, msg_data = await asyncio.to_thread(conn.fetch, email_id, "(RFC822)")
+        quoted = '"' + message_id.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        status, messages = await asyncio.to_thread(conn.uid, "SEARCH", None, "HEADER", "Message-ID", quoted)
         if status != "OK":
+            raise RuntimeError(f"邮件搜索失败: {status}")
+        uids = messages[0].split() if messages and messages[0] else []
+        return uids[-1] if uids else None
+
+    async def fetch_raw_message(self, email_id: bytes) -> bytes | None:
+        raw_messages = await self.fetch_raw_messages([email_id])
+        return raw_messages.get(self._uid_bytes(email_id))
+
+    async def fetch_raw_messages(self, uids: list[bytes]) -> dict[bytes, bytes]:
+        """按 UID 集合批量拉取完整邮件"""
+        if not uids:
+            return {}
+        items = await self._uid_fetch(uids, "(UID RFC822)")
+        return {uid: values["RFC822"] for uid, values in items.items() if isinstance(values.get("RFC822"), bytes)}
+
+    async def fetch_summaries(self, uids: list[bytes]) -> dict[bytes, MessageSummary]:
+        """批量拉取邮件大小与 BODYSTRUCTURE，不下载正文"""
+        if not uids:
+            return {}
+        items = await self._uid_fetch(uids, "(UID RFC822.SIZE BODYSTRUCTURE)")
+        summaries: dict[bytes, MessageSummary] = {}
+        for uid, values in items.items():
+            structure = values.get("BODYSTRUCTURE")
+            size = values.get("RFC822.SIZE")
+            summaries[uid] = MessageSummary(
+                uid=uid,
+                size=int(size) if isinstance(size, bytes) else 0,
+                parts=parse_bodystructure(structure),
+                multipart=isinstance(structure, list) and bool(structure) and isinstance(structure[0], list),
+            )
+        return summaries
+
+    async def fetch_preview(self, summary: MessageSummary) -> EmailPreview | None:
+        """只拉取头部与正文部件，附件保留在服务器上按需下载"""
+        text_parts = summary.text_parts
+        sections = ["HEADER"] + [part.section for part in text_parts]
+        items = await self._uid_fetch([summary.uid], "(UID " + " ".join(f"BODY[{s}]" for s in sections) + ")")
+        values = items.get(summary.uid)
+        if values is None:
             return None
-        return msg_data[0][1] if msg_data and msg_data[0] else None
+        header_bytes = values.get("BODY[HEADER]")
+        return EmailPreview(
+            uid=summary.uid,
+            header_bytes=header_bytes if isinstance(header_bytes, bytes) else b"",
+            text_parts=[
+                (part, decode_transfer_encoding(values.get(f"BODY[{part.section}]") or b"", part.encoding))
+                for part in text_parts
+            ],
+            lazy_attachments=summary.attachment_parts,
+            size=summary.size,
+        )
+
+    async def fetch_body_part(self, email_id: bytes, part: BodyPart) -> bytes:
+        """按 section 下载单个部件并完成传输编码解码，不改变已读状态"""
+        key = f"BODY[{part.section}]"
+        items = await self._uid_fetch([email_id], f"(UID BODY.PEEK[{part.section}])")
+        data = items.get(self._uid_bytes(email_id), {}).get(key)
+        if not isinstance(data, bytes):
+            raise RuntimeError(f"邮件 {self._uid_bytes(email_id).decode()} 的部件 {part.section} 不存在")
+        return decode_transfer_encoding(data, part.encoding)
 
     async def mark_seen(self, email_id: bytes) -> None:
+        await self.mark_seen_batch([email_id])
+
+    async def mark_seen_batch(self, uids: list[bytes]) -> None:
+        if not uids:
+            return
+        conn = self._require_conn()
+        status, data = await asyncio.to_thread(conn.uid, "STORE", format_uid_set(uids), "+FLAGS", "(\\Seen)")
+        if status != "OK":
+            raise RuntimeError(f"标记已读失败: {data!r}")
+
+    async def open_watcher(self) -> "ImapSmtpPasswordClient":
+        """为 IDLE 等待建立一条独立连接，避免阻塞主连接上的拉取与查询"""
+        watcher = copy.copy(self)
+        watcher.conn = None
+        watcher.mailbox_state = None
+        watcher._wait_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="imap-watch")
+        try:
+            await watcher.connect()
+        except BaseException:
+            watcher._shutdown_wait_executor()
+            raise
+        return watcher
+
+    def supports_idle(self) -> bool:
+        conn = self._require_conn()
+        return "IDLE" in {str(cap).upper() for cap in getattr(conn, "capabilities", ())}
+
+    async def wait_for_changes(self, timeout: float) -> bool:
+        """等待邮箱变化，返回是否收到新邮件通知
+
+        服务器支持 IDLE 时使用 IDLE 等待推送，否则每隔 `NOOP_PROBE_INTERVAL` 发送 NOOP 探测。
+        超时返回 False，由调用方执行一次兜底的增量同步。
+        """
         conn = self._require_conn()
-        await asyncio.to_thread(conn.store, email_id, "+FLAGS", "\\Seen")
+        if self.supports_idle():
+            return await self._run_wait(self._idle_sync, conn, timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            if await self._run_wait(self._noop_sync, conn):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(NOOP_PROBE_INTERVAL, remaining))
 
     async def get_raw_email_content(self, email_id: str, folder: str | None = None) -> EmailRawContent:
         await self.select_mailbox(override_folder=folder)
@@ -187,6 +340,95 @@ class ImapSmtpPasswordClient:
             }
         return EMAIL_PROVIDER_CONFIGS.get(self.account.EMAIL_ACCOUNT, {})
 
+    async def _uid_fetch(self, uids: list[bytes], query: str) -> dict[bytes, dict]:
+        conn = self._require_conn()
+        status, data = await asyncio.to_thread(conn.uid, "FETCH", format_uid_set(uids), query)
+        if status != "OK":
+            raise RuntimeError(f"邮件拉取失败: {data!r}")
+        results: dict[bytes, dict] = {}
+        for response in join_fetch_response(data or []):
+            values = parse_fetch_items(response)
+            uid = values.get("UID")
+            # 服务器可能穿插只含 FLAGS 的未请求 FETCH 响应，合并到同一 UID 下
+            if isinstance(uid, bytes):
+                results.setdefault(uid, {}).update(values)
+        return results
+
+    def _uid_bytes(self, email_id: bytes | str) -> bytes:
+        return email_id.encode() if isinstance(email_id, str) else bytes(email_id)
+
+    def _read_mailbox_state(self, conn: imaplib.IMAP4, name: str, select_data: list) -> MailboxState:
+        def _untagged_int(key: str) -> int:
+            _, values = conn.response(key)
+            for value in reversed(values or []):
+                match = re.match(rb"\d+", value) if isinstance(value, bytes) else None
+                if match:
+                    return int(match.group(0))
+            return 0
+
+        exists = select_data[0] if select_data else b""
+        # SELECT 留下的 EXISTS / RECENT 不会被 imaplib 清理，需取走以免 NOOP 探测误判为新邮件
+        for key in ("EXISTS", "RECENT"):
+            conn.response(key)
+        return MailboxState(
+            name=name,
+            uidvalidity=_untagged_int("UIDVALIDITY"),
+            uidnext=_untagged_int("UIDNEXT"),
+            exists=int(exists) if isinstance(exists, bytes) and exists.isdigit() else 0,
+        )
+
+    async def _run_wait(self, func: Callable[..., T], *args: Any) -> T:
+        if self._wait_executor is None:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._wait_executor, func, *args)
+
+    def _shutdown_wait_executor(self) -> None:
+        executor, self._wait_executor = self._wait_executor, None
+        if executor is not None:
+            # 不等待：阻塞中的 IDLE 会因 socket 关闭而退出
+            executor.shutdown(wait=False)
+
+    def _idle_sync(self, conn: imaplib.IMAP4, timeout: float) -> bool:
+        tag = conn._new_tag()  # noqa: SLF001
+        conn.send(tag + b" IDLE\r\n")
+        reader = IdleLineReader(conn.sock)
+        changed = False
+        try:
+            line = reader.readline(time.monotonic() + self.imap_timeout)
+            if line is None or not line.startswith(b"+"):
+                raise RuntimeError(f"服务器拒绝 IDLE: {line!r}")
+            deadline = time.monotonic() + timeout
+            while True:
+                line = reader.readline(deadline)
+                if line is None:
+                    break
+                if IDLE_CHANGE_PATTERN.match(line):
+                    changed = True
+                    break
+            conn.send(b"DONE\r\n")
+            while True:
+                line = reader.readline(time.monotonic() + self.imap_timeout)
+                if line is None:
+                    raise TimeoutError("等待 IDLE 结束响应超时")
+                if line.startswith(tag):
+                    break
+                if IDLE_CHANGE_PATTERN.match(line):
+                    changed = True
+        finally:
+            conn.tagged_commands.pop(tag, None)
+        return changed
+
+    def _noop_sync(self, conn: imaplib.IMAP4) -> bool:
+        status, _ = conn.noop()
+        if status != "OK":
+            raise RuntimeError(f"NOOP 失败: {status}")
+        changed = False
+        for key in ("EXISTS", "RECENT", "EXPUNGE"):
+            _, values = conn.response(key)
+            if values and values[0] is not None:
+                changed = True
+        return changed
+
     def _require_conn(self) -> imaplib.IMAP4_SSL:
         if not self.conn:
             raise RuntimeError(f"账户 {self.account_username} 未连接或不存在")
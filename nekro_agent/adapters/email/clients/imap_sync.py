@@ -0,0 +1,304 @@
+"""IMAP 增量同步辅助
+
+UID 增量同步、BODYSTRUCTURE 解析与 IDLE 响应读取所需的协议层工具，
+供 `ImapSmtpPasswordClient` 及其子类使用。
+"""
+
+import base64
+import binascii
+import quopri
+import re
+import select
+import socket
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+# IDLE / NOOP 期间表示邮箱内容发生变化的未标记响应
+IDLE_CHANGE_PATTERN = re.compile(rb"^\* \d+ (EXISTS|RECENT|EXPUNGE)\b", re.IGNORECASE)
+# FETCH 响应的起始：`<序号> (`
+_FETCH_START_PATTERN = re.compile(rb"^\d+ \(")
+# 原子，允许 `BODY[1.MIME]`、`BODY[]<0>` 这类带节号的数据项名
+_ATOM_PATTERN = re.compile(rb"[^\s()\[]+(\[[^\]]*\](<\d+>)?)?")
+
+
+@dataclass
+class MailboxState:
+    """SELECT 后的邮箱状态"""
+
+    name: str
+    uidvalidity: int = 0
+    uidnext: int = 0
+    exists: int = 0
+
+
+@dataclass
+class BodyPart:
+    """BODYSTRUCTURE 中的单个叶子部件"""
+
+    section: str
+    content_type: str
+    params: Dict[str, str] = field(default_factory=dict)
+    encoding: str = "7BIT"
+    size: int = 0
+    disposition: str = ""
+    filename: str = ""
+
+    @property
+    def charset(self) -> str:
+        return self.params.get("charset", "") or "utf-8"
+
+    @property
+    def is_attachment(self) -> bool:
+        if self.filename or self.disposition == "attachment":
+            return True
+        return not self.content_type.startswith("text/")
+
+
+@dataclass
+class MessageSummary:
+    """`UID FETCH (RFC822.SIZE BODYSTRUCTURE)` 的解析结果"""
+
+    uid: bytes
+    size: int
+    parts: List[BodyPart] = field(default_factory=list)
+    multipart: bool = False
+
+    @property
+    def text_parts(self) -> List[BodyPart]:
+        return [part for part in self.parts if not part.is_attachment]
+
+    @property
+    def attachment_parts(self) -> List[BodyPart]:
+        return [part for part in self.parts if part.is_attachment]
+
+
+@dataclass
+class EmailPreview:
+    """大邮件的预览内容：头部与正文部件，附件留待按需下载"""
+
+    uid: bytes
+    header_bytes: bytes
+    text_parts: List[tuple[BodyPart, bytes]]
+    lazy_attachments: List[BodyPart]
+    size: int
+
+
+def format_uid_set(uids: Sequence[bytes]) -> str:
+    """将 UID 列表压缩为 IMAP 序列集合，如 `3:7,9,12:13`"""
+    numbers = sorted({int(uid) for uid in uids})
+    ranges: List[str] = []
+    start = prev = None
+    for number in numbers:
+        if start is None:
+            start = prev = number
+            continue
+        if number == prev + 1:
+            prev = number
+            continue
+        ranges.append(str(start) if start == prev else f"{start}:{prev}")
+        start = prev = number
+    if start is not None:
+        ranges.append(str(start) if start == prev else f"{start}:{prev}")
+    return ",".join(ranges)
+
+
+def join_fetch_response(data: Sequence[Any]) -> List[bytes]:
+    """把 imaplib 的 FETCH 返回值拼回原始响应，每封邮件一段
+
+    imaplib 会把字面量拆成 `(前缀, 字面量)` 元组，并把字面量之后的剩余部分作为下一个元素，
+    这里按 `{n}` 标记重新拼接，交给 `parse_sexp` 统一解析。
+    """
+    responses: List[bytes] = []
+    current = b""
+    for item in data:
+        if isinstance(item, tuple):
+            head, chunk = item[0], item[0] + item[1]
+        elif isinstance(item, bytes):
+            head = chunk = item
+        else:
+            continue
+        if current and _FETCH_START_PATTERN.match(head):
+            responses.append(current)
+            current = b""
+        current += chunk
+    if current:
+        responses.append(current)
+    return responses
+
+
+def parse_sexp(raw: bytes) -> List[Any]:
+    """解析 IMAP 括号表达式，原子与字符串统一返回 bytes，NIL 返回 None"""
+    pos = 0
+    length = len(raw)
+
+    def _parse_list() -> List[Any]:
+        nonlocal pos
+        items: List[Any] = []
+        while pos < length:
+            char = raw[pos : pos + 1]
+            if char == b" ":
+                pos += 1
+            elif char == b"(":
+                pos += 1
+                items.append(_parse_list())
+            elif char == b")":
+                pos += 1
+                return items
+            elif char == b'"':
+                pos += 1
+                buf = bytearray()
+                while pos < length and raw[pos : pos + 1] != b'"':
+                    if raw[pos : pos + 1] == b"\\":
+                        pos += 1
+                    buf += raw[pos : pos + 1]
+                    pos += 1
+                pos += 1
+                items.append(bytes(buf))
+            elif char == b"{":
+                end = raw.index(b"}", pos)
+                size = int(raw[pos + 1 : end])
+                pos = end + 1
+                if raw[pos : pos + 2] == b"\r\n":
+                    pos += 2
+                items.append(raw[pos : pos + size])
+                pos += size
+            else:
+                match = _ATOM_PATTERN.match(raw, pos)
+                if not match or not match.group(0):
+                    pos += 1
+                    continue
+                token = match.group(0)
+                pos = match.end()
+                items.append(None if token.upper() == b"NIL" else token)
+        return items
+
+    return _parse_list()
+
+
+def parse_fetch_items(response: bytes) -> Dict[str, Any]:
+    """解析单封邮件的 FETCH 响应为 `{数据项名: 值}`"""
+    parsed = parse_sexp(response)
+    values = next((item for item in parsed if isinstance(item, list)), [])
+    result: Dict[str, Any] = {}
+    for index in range(0, len(values) - 1, 2):
+        key = values[index]
+        if isinstance(key, bytes):
+            result[key.decode(errors="ignore").upper()] = values[index + 1]
+    return result
+
+
+def _text(value: Any) -> str:
+    return value.decode(errors="ignore") if isinstance(value, bytes) else ""
+
+
+def _params(value: Any) -> Dict[str, str]:
+    if not isinstance(value, list):
+        return {}
+    return {_text(value[i]).lower(): _text(value[i + 1]) for i in range(0, len(value) - 1, 2)}
+
+
+def _decode_filename(value: str) -> str:
+    if not value:
+        return ""
+    from email.header import decode_header, make_header
+
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return value
+
+
+def parse_bodystructure(structure: Any, prefix: str = "") -> List[BodyPart]:
+    """展开 BODYSTRUCTURE 为叶子部件列表，section 编号遵循 RFC 3501"""
+    if not isinstance(structure, list) or not structure:
+        return []
+
+    if isinstance(structure[0], list):
+        parts: List[BodyPart] = []
+        index = 0
+        for child in structure:
+            if not isinstance(child, list):
+                break
+            index += 1
+            section = f"{prefix}.{index}" if prefix else str(index)
+            parts.extend(parse_bodystructure(child, section))
+        return parts
+
+    section = prefix or "1"
+    main_type = _text(structure[0]).lower()
+    sub_type = _text(structure[1]).lower() if len(structure) > 1 else ""
+    params = _params(structure[2]) if len(structure) > 2 else {}
+    encoding = _text(structure[5]).upper() if len(structure) > 5 else "7BIT"
+    size = int(structure[6]) if len(structure) > 6 and isinstance(structure[6], bytes) else 0
+
+    # 扩展字段起始位置：text 多一个 lines，message/rfc822 多 envelope/body/lines
+    ext_start = 7
+    if main_type == "text":
+        ext_start = 8
+    elif main_type == "message" and sub_type == "rfc822":
+        ext_start = 10
+    disposition = ""
+    disposition_params: Dict[str, str] = {}
+    if len(structure) > ext_start + 1 and isinstance(structure[ext_start + 1], list):
+        disp = structure[ext_start + 1]
+        disposition = _text(disp[0]).lower() if disp else ""
+        disposition_params = _params(disp[1]) if len(disp) > 1 else {}
+    filename = disposition_params.get("filename") or params.get("name") or ""
+
+    return [
+        BodyPart(
+            section=section,
+            content_type=f"{main_type}/{sub_type}",
+            params=params,
+            encoding=encoding,
+            size=size,
+            disposition=disposition,
+            filename=_decode_filename(filename),
+        ),
+    ]
+
+
+def decode_transfer_encoding(data: bytes, encoding: str) -> bytes:
+    """按 Content-Transfer-Encoding 解码部件内容"""
+    encoding = (encoding or "").upper()
+    if encoding == "BASE64":
+        try:
+            return base64.b64decode(data)
+        except (binascii.Error, ValueError):
+            return base64.b64decode(re.sub(rb"[^A-Za-z0-9+/=]", b"", data) + b"===")
+    if encoding == "QUOTED-PRINTABLE":
+        return quopri.decodestring(data)
+    return data
+
+
+class IdleLineReader:
+    """IDLE 期间直接读取 socket 的行读取器
+
+    imaplib 的 `readline` 基于带缓冲的 makefile，一旦超时该文件对象便不可再用。
+    IDLE 开始前上一条命令的响应已完整读出，缓冲区为空，因此可以绕过 imaplib
+    直接用 `select` 等待 socket，直到收到 tagged 响应后再把连接交还给 imaplib。
+    """
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self._buffer = b""
+
+    def readline(self, deadline: float) -> Optional[bytes]:
+        """读取一行，到达截止时间仍未读到完整行时返回 None"""
+        while b"\r\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            pending = self.sock.pending() if isinstance(self.sock, ssl.SSLSocket) else 0
+            if not pending:
+                readable, _, _ = select.select([self.sock], [], [], remaining)
+                if not readable:
+                    return None
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("IMAP 连接已关闭")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\r\n", 1)
+        return line
@@ -250,6 +250,8 @@ class EmailConfig(BaseAdapterConfig):
     - MAX_PER_POLL：单次轮询最大抓取数，防止突发大量邮件造成阻塞
     - MARK_AS_SEEN_AFTER_FETCH：读取后标记邮件为已读
     - IMAP_TIMEOUT：IMAP 连接和操作的超时时间
+    - IMAP_IDLE_ENABLED / IMAP_IDLE_TIMEOUT：IDLE 推送开关与单次等待上限
+    - LAZY_ATTACHMENT_THRESHOLD_MB：大邮件附件延迟下载阈值
     - SESSION_ENABLE_AT：聊天中的 @ 功能已禁用（邮箱场景不需要）
     - SESSION_PROCESSING_WITH_EMOJI：邮箱不支持消息 reaction，固定隐藏
     - COMMAND_*：邮箱场景不使用命令系统，固定隐藏并禁用
@@ -353,6 +355,50 @@ class EmailConfig(BaseAdapterConfig):
             ),
         ).model_dump(),
     )
+    IMAP_IDLE_ENABLED: bool = Field(
+        default=True,
+        title="启用 IMAP IDLE 推送",
+        description="服务器支持 IDLE 时使用独立连接等待新邮件推送，不支持时退化为 NOOP 探测；关闭后按轮询间隔拉取",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(zh_CN="轮询", en_US="Polling"),
+            i18n_title=i18n_text(zh_CN="启用 IMAP IDLE 推送", en_US="Enable IMAP IDLE Push"),
+            i18n_description=i18n_text(
+                zh_CN="服务器支持 IDLE 时使用独立连接等待新邮件推送，不支持时退化为 NOOP 探测；关闭后按轮询间隔拉取",
+                en_US="Use a dedicated connection to wait for IMAP IDLE pushes when the server supports it, "
+                "falling back to NOOP probing otherwise. When disabled, mail is pulled every polling interval.",
+            ),
+        ).model_dump(),
+    )
+    IMAP_IDLE_TIMEOUT: int = Field(
+        default=600,
+        title="IDLE 单次等待上限(秒)",
+        description="单次 IDLE 的最长等待时间，到期后执行一次增量同步并重新进入 IDLE。RFC 2177 建议不超过 29 分钟",
+        json_schema_extra=ExtraField(
+            placeholder="600",
+            i18n_category=i18n_text(zh_CN="轮询", en_US="Polling"),
+            i18n_title=i18n_text(zh_CN="IDLE 单次等待上限(秒)", en_US="IDLE Max Wait (s)"),
+            i18n_description=i18n_text(
+                zh_CN="单次 IDLE 的最长等待时间，到期后执行一次增量同步并重新进入 IDLE。RFC 2177 建议不超过 29 分钟",
+                en_US="Maximum wait of a single IDLE round. An incremental sync runs when it expires. "
+                "RFC 2177 recommends less than 29 minutes.",
+            ),
+        ).model_dump(),
+    )
+    LAZY_ATTACHMENT_THRESHOLD_MB: int = Field(
+        default=10,
+        title="附件延迟下载阈值(MB)",
+        description="超过该大小的 IMAP 邮件仅拉取头部与正文，附件在查看时再按需下载",
+        json_schema_extra=ExtraField(
+            placeholder="10",
+            i18n_category=i18n_text(zh_CN="轮询", en_US="Polling"),
+            i18n_title=i18n_text(zh_CN="附件延迟下载阈值(MB)", en_US="Lazy Attachment Threshold (MB)"),
+            i18n_description=i18n_text(
+                zh_CN="超过该大小的 IMAP 邮件仅拉取头部与正文，附件在查看时再按需下载",
+                en_US="IMAP messages larger than this only fetch headers and body text; "
+                "attachments are downloaded on demand.",
+            ),
+        ).model_dump(),
+    )
     EMAIL_NOTIFICATIONS_ENABLED: bool = Field(
         default=False,
         title="启用新邮件通知",
@@ -543,6 +589,10 @@ class EmailConfig(BaseAdapterConfig):
             self.MAX_PER_POLL = 50
         if not isinstance(self.IMAP_TIMEOUT, int) or self.IMAP_TIMEOUT <= 0:
             self.IMAP_TIMEOUT = 30
+        if not isinstance(self.IMAP_IDLE_TIMEOUT, int) or self.IMAP_IDLE_TIMEOUT <= 0:
+            self.IMAP_IDLE_TIMEOUT = 600
+        if not isinstance(self.LAZY_ATTACHMENT_THRESHOLD_MB, int) or self.LAZY_ATTACHMENT_THRESHOLD_MB <= 0:
+            self.LAZY_ATTACHMENT_THRESHOLD_MB = 10
         if not isinstance(self.STATUS_MAIL_TARGETS, list):
             self.STATUS_MAIL_TARGETS = []
         legacy_proxy_enabled = bool(str(getattr(self, "OAUTH_PROXY", "") or "").strip())
@@ -67,6 +67,9 @@ async def _remove_runtime_account(adapter, account: EmailAccount) -> None:
     remove = getattr(adapter, "_remove_email_client", None)
     if remove:
         await remove(account.USERNAME)
+    checkpoints = getattr(adapter, "checkpoints", None)
+    if checkpoints is not None:
+        checkpoints.remove(account.USERNAME)
 
 
 def _normalize_default_sender(accounts: List[EmailAccount], selected_index: int | None = None) -> None:
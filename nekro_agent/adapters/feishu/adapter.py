@@ -1,7 +1,7 @@
 from pathlib import Path
 from typing import List, Optional, Type
 
-from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter
+from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter, SendRateLimit
 from nekro_agent.adapters.interface.schemas.platform import (
     PlatformChannel,
     PlatformSendRequest,
@@ -12,7 +12,7 @@ from nekro_agent.adapters.interface.schemas.platform import (
 from nekro_agent.core.logger import get_sub_logger
 from nekro_agent.schemas.chat_message import ChatType
 
-from .client import FeishuClient
+from .client import FeishuClient, FeishuRateLimitError
 from .config import FeishuConfig
 from .tools import SegAt, parse_at_from_text
 
@@ -55,6 +55,8 @@ class FeishuAdapter(BaseAdapter[FeishuConfig]):
             author="NekroAI",
             homepage="https://github.com/KroMiose/nekro-agent",
             tags=["feishu", "lark", "im"],
+            # 发送消息接口 1000 次/分钟，同一用户或群 5 QPS
+            send_rate_limit=SendRateLimit(per_minute=1000, per_channel_per_minute=300, burst=5),
         )
 
     @property
@@ -70,6 +72,7 @@ class FeishuAdapter(BaseAdapter[FeishuConfig]):
             logger.warning(error_msg)
             return PlatformSendResponse(success=False, error_message=error_msg)
 
+        last_message_id: Optional[str] = None
         try:
             _, channel_id = self.parse_chat_key(request.chat_key)
 
@@ -87,7 +90,6 @@ class FeishuAdapter(BaseAdapter[FeishuConfig]):
 
             # 合并文本段 + AT 段为一条消息
             content_parts: List[str] = []
-            last_message_id: Optional[str] = None
 
             for seg in request.segments:
                 if seg.type == PlatformSendSegmentType.TEXT:
@@ -117,8 +119,7 @@ class FeishuAdapter(BaseAdapter[FeishuConfig]):
                         content_parts.clear()
 
                     if seg.file_path:
-                        image_bytes = Path(seg.file_path).read_bytes()
-                        image_key = await self.client.upload_image(image_bytes)
+                        image_key = await self.client.upload_image(Path(seg.file_path))
                         last_message_id = await self.client.send_image_message(receive_id, receive_id_type, image_key)
 
                 elif seg.type == PlatformSendSegmentType.FILE:
@@ -131,8 +132,7 @@ class FeishuAdapter(BaseAdapter[FeishuConfig]):
 
                     if seg.file_path:
                         file_path = Path(seg.file_path)
-                        file_bytes = file_path.read_bytes()
-                        file_key = await self.client.upload_file(file_bytes, file_path.name)
+                        file_key = await self.client.upload_file(file_path, file_path.name)
                         last_message_id = await self.client.send_file_message(receive_id, receive_id_type, file_key)
 
             # 发送剩余的文本
@@ -143,6 +143,14 @@ class FeishuAdapter(BaseAdapter[FeishuConfig]):
 
             return PlatformSendResponse(success=True, message_id=last_message_id)
 
+        except FeishuRateLimitError as e:
+            logger.warning(f"发送消息到飞书被限流 {request.chat_key}: {e}")
+            # 已发出部分消息时不再建议重试，避免重复发送
+            return PlatformSendResponse(
+                success=False,
+                error_message=str(e),
+                retry_after=e.retry_after if last_message_id is None else None,
+            )
         except Exception as e:
             logger.exception(f"发送消息到飞书失败 {request.chat_key}: {e}")
             return PlatformSendResponse(success=False, error_message=str(e))
@@ -3,34 +3,18 @@ import io
 import json
 import logging
 import threading
-from functools import partial
-from typing import TYPE_CHECKING, Any, Dict, Optional
+import time
+from contextlib import ExitStack, asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Mapping, Optional, Tuple
 
+import aiofiles
+import httpx
 import lark_oapi as lark
-from lark_oapi.api.contact.v3 import GetUserRequest, GetUserResponse
-from lark_oapi.api.im.v1 import (
-    CreateFileRequest,
-    CreateFileRequestBody,
-    CreateFileResponse,
-    CreateImageRequest,
-    CreateImageRequestBody,
-    CreateImageResponse,
-    CreateMessageReactionRequest,
-    CreateMessageReactionRequestBody,
-    CreateMessageRequest,
-    CreateMessageRequestBody,
-    CreateMessageResponse,
-    DeleteMessageReactionRequest,
-    Emoji,
-    GetChatRequest,
-    GetChatResponse,
-    GetMessageResourceRequest,
-)
-from lark_oapi.core.enum import AccessTokenType, HttpMethod
-from lark_oapi.core.model import BaseRequest
 
 from nekro_agent.adapters.interface.schemas.platform import PlatformUser
 from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.perf_metrics import perf_metrics
 
 logger = get_sub_logger("adapter.feishu")
 lark_logger = get_sub_logger("adapter.feishu.lark")
@@ -75,6 +59,54 @@ if TYPE_CHECKING:
     from .adapter import FeishuAdapter
 
 
+FEISHU_API_BASE_URL = "https://open.feishu.cn"
+FEISHU_REQUEST_TIMEOUT_SECONDS = 30.0
+# 连接池上限，上传下载与消息发送共用
+FEISHU_MAX_CONNECTIONS = 20
+FEISHU_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# tenant_access_token 在过期前提前刷新的秒数
+FEISHU_TOKEN_REFRESH_MARGIN_SECONDS = 300
+# tenant_access_token 缺失 / 失效错误码
+FEISHU_TOKEN_INVALID_CODES = {99991661, 99991663}
+# 接口频控错误码
+FEISHU_RATE_LIMIT_CODE = 99991400
+# 频控响应未携带重置时间时的默认等待（秒）
+FEISHU_RATE_LIMIT_DEFAULT_WAIT = 1.0
+# 频控等待不超过该秒数时在客户端内重试，更久的交由调用方决定
+FEISHU_RATE_LIMIT_MAX_INLINE_WAIT = 5.0
+FEISHU_MAX_RETRIES = 2
+FEISHU_RETRY_BASE_DELAY_SECONDS = 0.5
+
+
+class FeishuRateLimitError(RuntimeError):
+    """飞书接口触发频控，`retry_after` 为建议等待秒数"""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after_from_headers(headers: Mapping[str, str]) -> float:
+    """频控等待时间，优先取 x-ogw-ratelimit-reset，其次 Retry-After"""
+    for name in ("x-ogw-ratelimit-reset", "retry-after"):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            continue
+    return FEISHU_RATE_LIMIT_DEFAULT_WAIT
+
+
+def _parse_json(response: httpx.Response) -> Dict[str, Any]:
+    try:
+        payload = response.json()
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
 class FeishuClient:
     """飞书客户端，负责 WebSocket 连接和 API 封装
 
@@ -82,18 +114,28 @@ class FeishuClient:
     - 主线程运行 asyncio 事件循环
     - daemon 线程运行 lark.ws.Client 的 WebSocket 长连接
     - 通过 asyncio.run_coroutine_threadsafe 从 daemon 线程桥接到主线程
-    - 通过 run_in_executor 从主线程调用同步 API
+    - OpenAPI 调用直接走连接池化的异步 httpx 客户端，不占用默认线程池；
+      tenant_access_token 本地缓存并在过期前刷新，上传与下载均为流式
     """
 
-    def __init__(self, app_id: str, app_secret: str, adapter: "FeishuAdapter"):
+    def __init__(
+        self,
+        app_id: str,
+        app_secret: str,
+        adapter: "FeishuAdapter",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self._app_id = app_id
         self._app_secret = app_secret
         self._adapter = adapter
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._bot_info: Optional[PlatformUser] = None
 
-        # 创建 lark-oapi 同步客户端
-        self._lark_client = lark.Client.builder().app_id(app_id).app_secret(app_secret).build()
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._token_lock = asyncio.Lock()
+        self._tenant_token = ""
+        self._tenant_token_expire_at = 0.0
 
     @property
     def bot_info(self) -> Optional[PlatformUser]:
@@ -105,7 +147,7 @@ class FeishuClient:
 
         # 获取机器人自身信息
         try:
-            bot_info_dict = await self._run_sync(self._get_bot_info_sync)
+            bot_info_dict = await self._get_bot_info()
             self._bot_info = PlatformUser(
                 platform_name="feishu",
                 user_id=bot_info_dict.get("open_id", ""),
@@ -140,6 +182,9 @@ class FeishuClient:
 
     async def stop(self) -> None:
         """停止客户端（daemon 线程随主进程自动终止）"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
         logger.info("飞书客户端停止")
 
     def _on_message_receive(self, data: lark.im.v1.P2ImMessageReceiveV1) -> None:
@@ -224,37 +269,150 @@ class FeishuClient:
 
         return result
 
-    async def _run_sync(self, func: Any, *args: Any) -> Any:
-        """在线程池中运行同步函数"""
-        if self._loop is None:
-            raise RuntimeError("事件循环未初始化")
-        return await self._loop.run_in_executor(None, partial(func, *args))
+    # ========================================================================================
+    # |                              HTTP 传输层                                              |
+    # ========================================================================================
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=FEISHU_API_BASE_URL,
+                timeout=httpx.Timeout(FEISHU_REQUEST_TIMEOUT_SECONDS),
+                limits=httpx.Limits(max_connections=FEISHU_MAX_CONNECTIONS),
+                transport=self._transport,
+            )
+        return self._http
+
+    async def _get_tenant_access_token(self) -> str:
+        """获取 tenant_access_token，过期前提前刷新"""
+        if self._tenant_token and time.monotonic() < self._tenant_token_expire_at:
+            return self._tenant_token
+        async with self._token_lock:
+            if self._tenant_token and time.monotonic() < self._tenant_token_expire_at:
+                return self._tenant_token
+            response = await self._get_http().post(
+                "/open-apis/auth/v3/tenant_access_token/internal",
+                json={"app_id": self._app_id, "app_secret": self._app_secret},
+            )
+            payload = _parse_json(response)
+            if payload.get("code") != 0:
+                raise RuntimeError(f"获取 tenant_access_token 失败: {payload.get('code')} - {payload.get('msg')}")
+            self._tenant_token = str(payload.get("tenant_access_token") or "")
+            expire = float(payload.get("expire") or 0)
+            self._tenant_token_expire_at = time.monotonic() + max(expire - FEISHU_TOKEN_REFRESH_MARGIN_SECONDS, 0)
+            return self._tenant_token
+
+    def _invalidate_tenant_access_token(self, token: str) -> None:
+        if self._tenant_token == token:
+            self._tenant_token = ""
+            self._tenant_token_expire_at = 0.0
+
+    @asynccontextmanager
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        action: str,
+        idempotent: bool,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Dict[str, Any]] = None,
+        form: Optional[Dict[str, str]] = None,
+        upload: Optional[Tuple[str, Path]] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """发送请求并以流式响应交给调用方
+
+        - 令牌失效时刷新一次后重试
+        - 频控（HTTP 429 / 99991400）按响应头等待后重试，等待过久或重试耗尽时抛出 FeishuRateLimitError
+        - 连接失败时重试；读超时与 5xx 仅对幂等请求重试，避免重复发送消息
+        """
+        token_refreshed = False
+        attempt = 0
+        while True:
+            token = await self._get_tenant_access_token()
+            retry_wait: Optional[float] = None
+            with ExitStack() as stack:
+                files = None
+                if upload is not None:
+                    field, path = upload
+                    files = {field: (path.name, stack.enter_context(path.open("rb")))}
+                request = self._get_http().build_request(
+                    method,
+                    url,
+                    params=params,
+                    json=json_body,
+                    data=form,
+                    files=files,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                try:
+                    response = await self._get_http().send(request, stream=True)
+                except httpx.TransportError as e:
+                    retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    if not retryable or attempt >= FEISHU_MAX_RETRIES:
+                        raise
+                    retry_wait = FEISHU_RETRY_BASE_DELAY_SECONDS * (2**attempt)
+                    logger.warning(f"{action}请求失败，{retry_wait:.1f}s 后重试: {e!r}")
+                else:
+                    try:
+                        error = await self._check_response(response, action)
+                        if error is None:
+                            yield response
+                            return
+                        code, msg, retry_after = error
+                        if code in FEISHU_TOKEN_INVALID_CODES and not token_refreshed:
+                            self._invalidate_tenant_access_token(token)
+                            token_refreshed = True
+                            continue
+                        if retry_after is not None:
+                            if attempt >= FEISHU_MAX_RETRIES or retry_after > FEISHU_RATE_LIMIT_MAX_INLINE_WAIT:
+                                raise FeishuRateLimitError(f"{action}触发飞书频控: {msg}", retry_after=retry_after)
+                            retry_wait = retry_after
+                        elif response.status_code >= 500 and idempotent and attempt < FEISHU_MAX_RETRIES:
+                            retry_wait = FEISHU_RETRY_BASE_DELAY_SECONDS * (2**attempt)
+                        else:
+                            raise RuntimeError(f"{action}失败: {code} - {msg}")
+                    finally:
+                        await response.aclose()
+            attempt += 1
+            perf_metrics.incr("feishu.api_retry")
+            await asyncio.sleep(retry_wait)
+
+    async def _check_response(self, response: httpx.Response, action: str) -> Optional[Tuple[int, str, Optional[float]]]:
+        """检查响应，成功返回 None，否则返回 (错误码, 错误信息, 频控等待秒数)
+
+        成功的二进制响应不读取响应体，交由调用方流式消费。
+        """
+        is_json = response.headers.get("content-type", "").startswith("application/json")
+        if response.status_code < 400 and not is_json:
+            return None
+        await response.aread()
+        payload = _parse_json(response) if is_json else {}
+        code = int(payload.get("code", -1)) if is_json else -1
+        if response.status_code < 400 and code == 0:
+            return None
+        msg = str(payload.get("msg") or f"HTTP {response.status_code}")
+        if response.status_code == 429 or code == FEISHU_RATE_LIMIT_CODE:
+            return code, msg, _retry_after_from_headers(response.headers)
+        return code, msg, None
+
+    async def _request_json(self, method: str, url: str, *, action: str, idempotent: bool, **kwargs: Any) -> Dict[str, Any]:
+        async with self._send(method, url, action=action, idempotent=idempotent, **kwargs) as response:
+            await response.aread()
+            return _parse_json(response)
 
     # ========================================================================================
     # |                              飞书 API 封装                                             |
     # ========================================================================================
 
-    def _get_bot_info_sync(self) -> Dict[str, Any]:
-        """获取机器人自身信息（同步）
+    async def _get_bot_info(self) -> Dict[str, Any]:
+        """获取机器人自身信息
 
         通过 GET /open-apis/bot/v3/info/ 获取机器人信息，
         该接口是飞书获取机器人自身信息的标准方式。
         """
-        request = (
-            BaseRequest.builder()
-            .http_method(HttpMethod.GET)
-            .uri("/open-apis/bot/v3/info/")
-            .token_types({AccessTokenType.TENANT})
-            .build()
-        )
-        response = self._lark_client.request(request)
-
-        if response.code != 0:
-            raise RuntimeError(f"获取机器人信息失败: {response.code} - {response.msg}")
-
-        # 从原始响应解析 bot 信息
-        raw_data = json.loads(response.raw.content.decode("utf-8")) if response.raw else {}
-        bot = raw_data.get("bot", {})
+        payload = await self._request_json("GET", "/open-apis/bot/v3/info/", action="获取机器人信息", idempotent=True)
+        bot = payload.get("bot", {})
         return {
             "open_id": bot.get("open_id", ""),
             "name": bot.get("app_name", ""),
@@ -268,237 +426,135 @@ class FeishuClient:
 
     async def get_user_info(self, open_id: str) -> Dict[str, Any]:
         """获取用户信息"""
-        return await self._run_sync(self._get_user_info_sync, open_id)
-
-    def _get_user_info_sync(self, open_id: str) -> Dict[str, Any]:
-        """获取用户信息（同步）"""
-        request = GetUserRequest.builder().user_id(open_id).user_id_type("open_id").build()
-        response: GetUserResponse = self._lark_client.contact.v3.user.get(request)
-
-        if not response.success():
-            raise RuntimeError(f"获取用户信息失败: {response.code} - {response.msg}")
-
-        user = response.data.user
+        payload = await self._request_json(
+            "GET",
+            f"/open-apis/contact/v3/users/{open_id}",
+            action="获取用户信息",
+            idempotent=True,
+            params={"user_id_type": "open_id"},
+        )
+        user = payload.get("data", {}).get("user", {})
+        avatar = user.get("avatar") or {}
         return {
-            "open_id": user.open_id or "",
-            "name": user.name or "",
+            "open_id": user.get("open_id") or "",
+            "name": user.get("name") or "",
             "avatar": {
-                "avatar_72": user.avatar.avatar_72 if user.avatar else "",
-                "avatar_240": user.avatar.avatar_240 if user.avatar else "",
-                "avatar_640": user.avatar.avatar_640 if user.avatar else "",
-                "avatar_origin": user.avatar.avatar_origin if user.avatar else "",
+                "avatar_72": avatar.get("avatar_72", ""),
+                "avatar_240": avatar.get("avatar_240", ""),
+                "avatar_640": avatar.get("avatar_640", ""),
+                "avatar_origin": avatar.get("avatar_origin", ""),
             },
         }
 
     async def get_chat_info(self, chat_id: str) -> Dict[str, Any]:
         """获取群聊信息"""
-        return await self._run_sync(self._get_chat_info_sync, chat_id)
-
-    def _get_chat_info_sync(self, chat_id: str) -> Dict[str, Any]:
-        """获取群聊信息（同步）"""
-        request = GetChatRequest.builder().chat_id(chat_id).build()
-        response: GetChatResponse = self._lark_client.im.v1.chat.get(request)
-
-        if not response.success():
-            raise RuntimeError(f"获取群聊信息失败: {response.code} - {response.msg}")
-
-        chat = response.data
+        payload = await self._request_json("GET", f"/open-apis/im/v1/chats/{chat_id}", action="获取群聊信息", idempotent=True)
+        chat = payload.get("data", {})
         return {
             "chat_id": chat_id,
-            "name": chat.name or "",
-            "avatar": chat.avatar or "",
-            "description": chat.description or "",
+            "name": chat.get("name") or "",
+            "avatar": chat.get("avatar") or "",
+            "description": chat.get("description") or "",
         }
 
-    async def send_text_message(self, receive_id: str, receive_id_type: str, text: str) -> str:
-        """发送文本消息，返回 message_id"""
-        return await self._run_sync(self._send_text_message_sync, receive_id, receive_id_type, text)
-
-    def _send_text_message_sync(self, receive_id: str, receive_id_type: str, text: str) -> str:
-        """发送文本消息（同步）"""
-        content = json.dumps({"text": text})
-        request = (
-            CreateMessageRequest.builder()
-            .receive_id_type(receive_id_type)
-            .request_body(
-                CreateMessageRequestBody.builder()
-                .receive_id(receive_id)
-                .msg_type("text")
-                .content(content)
-                .build()
-            )
-            .build()
+    async def _send_message(self, receive_id: str, receive_id_type: str, msg_type: str, content: Dict[str, Any], action: str) -> str:
+        payload = await self._request_json(
+            "POST",
+            "/open-apis/im/v1/messages",
+            action=action,
+            idempotent=False,
+            params={"receive_id_type": receive_id_type},
+            json_body={"receive_id": receive_id, "msg_type": msg_type, "content": json.dumps(content)},
         )
-        response: CreateMessageResponse = self._lark_client.im.v1.message.create(request)
-
-        if not response.success():
-            raise RuntimeError(f"发送文本消息失败: {response.code} - {response.msg}")
-
-        return response.data.message_id or ""
-
-    async def upload_image(self, image_bytes: bytes) -> str:
-        """上传图片，返回 image_key"""
-        return await self._run_sync(self._upload_image_sync, image_bytes)
-
-    def _upload_image_sync(self, image_bytes: bytes) -> str:
-        """上传图片（同步）"""
-        request = (
-            CreateImageRequest.builder()
-            .request_body(
-                CreateImageRequestBody.builder()
-                .image_type("message")
-                .image(io.BytesIO(image_bytes))
-                .build()
-            )
-            .build()
-        )
-        response: CreateImageResponse = self._lark_client.im.v1.image.create(request)
-
-        if not response.success():
-            raise RuntimeError(f"上传图片失败: {response.code} - {response.msg}")
+        return payload.get("data", {}).get("message_id") or ""
 
-        return response.data.image_key or ""
+    async def send_text_message(self, receive_id: str, receive_id_type: str, text: str) -> str:
+        """发送文本消息，返回 message_id"""
+        return await self._send_message(receive_id, receive_id_type, "text", {"text": text}, "发送文本消息")
 
     async def send_image_message(self, receive_id: str, receive_id_type: str, image_key: str) -> str:
         """发送图片消息，返回 message_id"""
-        return await self._run_sync(self._send_image_message_sync, receive_id, receive_id_type, image_key)
-
-    def _send_image_message_sync(self, receive_id: str, receive_id_type: str, image_key: str) -> str:
-        """发送图片消息（同步）"""
-        content = json.dumps({"image_key": image_key})
-        request = (
-            CreateMessageRequest.builder()
-            .receive_id_type(receive_id_type)
-            .request_body(
-                CreateMessageRequestBody.builder()
-                .receive_id(receive_id)
-                .msg_type("image")
-                .content(content)
-                .build()
-            )
-            .build()
-        )
-        response: CreateMessageResponse = self._lark_client.im.v1.message.create(request)
-
-        if not response.success():
-            raise RuntimeError(f"发送图片消息失败: {response.code} - {response.msg}")
-
-        return response.data.message_id or ""
-
-    async def upload_file(self, file_bytes: bytes, file_name: str, file_type: str = "stream") -> str:
-        """上传文件，返回 file_key"""
-        return await self._run_sync(self._upload_file_sync, file_bytes, file_name, file_type)
-
-    def _upload_file_sync(self, file_bytes: bytes, file_name: str, file_type: str = "stream") -> str:
-        """上传文件（同步）"""
-        request = (
-            CreateFileRequest.builder()
-            .request_body(
-                CreateFileRequestBody.builder()
-                .file_type(file_type)
-                .file_name(file_name)
-                .file(io.BytesIO(file_bytes))
-                .build()
-            )
-            .build()
-        )
-        response: CreateFileResponse = self._lark_client.im.v1.file.create(request)
-
-        if not response.success():
-            raise RuntimeError(f"上传文件失败: {response.code} - {response.msg}")
-
-        return response.data.file_key or ""
+        return await self._send_message(receive_id, receive_id_type, "image", {"image_key": image_key}, "发送图片消息")
 
     async def send_file_message(self, receive_id: str, receive_id_type: str, file_key: str) -> str:
         """发送文件消息，返回 message_id"""
-        return await self._run_sync(self._send_file_message_sync, receive_id, receive_id_type, file_key)
-
-    def _send_file_message_sync(self, receive_id: str, receive_id_type: str, file_key: str) -> str:
-        """发送文件消息（同步）"""
-        content = json.dumps({"file_key": file_key})
-        request = (
-            CreateMessageRequest.builder()
-            .receive_id_type(receive_id_type)
-            .request_body(
-                CreateMessageRequestBody.builder()
-                .receive_id(receive_id)
-                .msg_type("file")
-                .content(content)
-                .build()
-            )
-            .build()
+        return await self._send_message(receive_id, receive_id_type, "file", {"file_key": file_key}, "发送文件消息")
+
+    async def upload_image(self, image_path: Path) -> str:
+        """流式上传图片，返回 image_key"""
+        payload = await self._request_json(
+            "POST",
+            "/open-apis/im/v1/images",
+            action="上传图片",
+            idempotent=True,
+            form={"image_type": "message"},
+            upload=("image", image_path),
         )
-        response: CreateMessageResponse = self._lark_client.im.v1.message.create(request)
-
-        if not response.success():
-            raise RuntimeError(f"发送文件消息失败: {response.code} - {response.msg}")
-
-        return response.data.message_id or ""
+        return payload.get("data", {}).get("image_key") or ""
+
+    async def upload_file(self, file_path: Path, file_name: str, file_type: str = "stream") -> str:
+        """流式上传文件，返回 file_key"""
+        payload = await self._request_json(
+            "POST",
+            "/open-apis/im/v1/files",
+            action="上传文件",
+            idempotent=True,
+            form={"file_type": file_type, "file_name": file_name},
+            upload=("file", file_path),
+        )
+        return payload.get("data", {}).get("file_key") or ""
 
     async def download_image(self, message_id: str, image_key: str) -> bytes:
         """下载图片内容"""
-        return await self._run_sync(self._download_resource_sync, message_id, image_key, "image")
-
-    async def download_file(self, message_id: str, file_key: str) -> bytes:
-        """下载文件内容"""
-        return await self._run_sync(self._download_resource_sync, message_id, file_key, "file")
-
-    def _download_resource_sync(self, message_id: str, file_key: str, resource_type: str) -> bytes:
-        """下载消息资源（同步）"""
-        request = (
-            GetMessageResourceRequest.builder()
-            .message_id(message_id)
-            .file_key(file_key)
-            .type(resource_type)
-            .build()
-        )
-        response = self._lark_client.im.v1.message_resource.get(request)
-
-        if not response.success():
-            raise RuntimeError(f"下载资源失败: {response.code} - {response.msg}")
-
-        return response.file.read()
+        buffer = io.BytesIO()
+        async with self._send(
+            "GET",
+            f"/open-apis/im/v1/messages/{message_id}/resources/{image_key}",
+            action="下载图片",
+            idempotent=True,
+            params={"type": "image"},
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                buffer.write(chunk)
+        return buffer.getvalue()
+
+    async def download_file_to(self, message_id: str, file_key: str, save_path: Path) -> None:
+        """流式下载文件到本地路径"""
+        async with self._send(
+            "GET",
+            f"/open-apis/im/v1/messages/{message_id}/resources/{file_key}",
+            action="下载文件",
+            idempotent=True,
+            params={"type": "file"},
+        ) as response, aiofiles.open(save_path, "wb") as f:
+            async for chunk in response.aiter_bytes(FEISHU_DOWNLOAD_CHUNK_SIZE):
+                await f.write(chunk)
 
     async def add_message_reaction(self, message_id: str, emoji_type: str) -> Optional[str]:
         """添加消息表情回应，返回 reaction_id"""
-        return await self._run_sync(self._add_message_reaction_sync, message_id, emoji_type)
-
-    def _add_message_reaction_sync(self, message_id: str, emoji_type: str) -> Optional[str]:
-        """添加消息表情回应（同步）"""
-        request = (
-            CreateMessageReactionRequest.builder()
-            .message_id(message_id)
-            .request_body(
-                CreateMessageReactionRequestBody.builder()
-                .reaction_type(Emoji.builder().emoji_type(emoji_type).build())
-                .build()
+        try:
+            payload = await self._request_json(
+                "POST",
+                f"/open-apis/im/v1/messages/{message_id}/reactions",
+                action="添加表情回应",
+                idempotent=False,
+                json_body={"reaction_type": {"emoji_type": emoji_type}},
             )
-            .build()
-        )
-        response = self._lark_client.im.v1.message_reaction.create(request)
-
-        if not response.success():
-            logger.warning(f"添加表情回应失败: {response.code} - {response.msg}")
+        except Exception as e:
+            logger.warning(f"添加表情回应失败: {e}")
             return None
-
-        return response.data.reaction_id if response.data else None
+        return payload.get("data", {}).get("reaction_id")
 
     async def remove_message_reaction(self, message_id: str, reaction_id: str) -> bool:
         """移除消息表情回应"""
-        return await self._run_sync(self._remove_message_reaction_sync, message_id, reaction_id)
-
-    def _remove_message_reaction_sync(self, message_id: str, reaction_id: str) -> bool:
-        """移除消息表情回应（同步）"""
-        request = (
-            DeleteMessageReactionRequest.builder()
-            .message_id(message_id)
-            .reaction_id(reaction_id)
-            .build()
-        )
-        response = self._lark_client.im.v1.message_reaction.delete(request)
-
-        if not response.success():
-            logger.warning(f"移除表情回应失败: {response.code} - {response.msg}")
+        try:
+            await self._request_json(
+                "DELETE",
+                f"/open-apis/im/v1/messages/{message_id}/reactions/{reaction_id}",
+                action="移除表情回应",
+                idempotent=True,
+            )
+        except Exception as e:
+            logger.warning(f"移除表情回应失败: {e}")
             return False
-
         return True
@@ -1,3 +1,5 @@
+import tempfile
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict
 
 from nekro_agent.adapters.interface.collector import collect_message
@@ -128,12 +130,15 @@ async def handle_message(
             file_name = content.get("file_name", "unknown_file")
             if file_key:
                 try:
-                    file_bytes = await client.download_file(message_id, file_key)
-                    segment = await ChatMessageSegmentFile.create_from_bytes(
-                        _bytes=file_bytes,
-                        from_chat_key=chat_key,
-                        file_name=file_name,
-                    )
+                    # 大文件流式落盘，不整体读入内存
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        tmp_path = Path(tmp_dir) / "resource"
+                        await client.download_file_to(message_id, file_key, tmp_path)
+                        segment = await ChatMessageSegmentFile.create_form_local_path(
+                            local_path=str(tmp_path),
+                            from_chat_key=chat_key,
+                            file_name=file_name,
+                        )
                     segments.append(segment)
                     content_text = segment.text
                 except Exception:
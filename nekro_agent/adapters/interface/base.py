@@ -11,6 +11,7 @@ from nekro_agent.core.core_utils import ConfigBase, ExtraField
 
 if TYPE_CHECKING:
     from nekro_agent.schemas.agent_message import AgentMessageSegment
+    from nekro_agent.services.agent_run_scheduler import BackpressureSignal
     from nekro_agent.services.command.manager import UserPermissionSource
     from nekro_agent.services.command.schemas import CommandResponse
 from nekro_agent.core import config
@@ -29,6 +30,14 @@ from .schemas.platform import (
 )
 
 
+class SendRateLimit(BaseModel):
+    """适配器发送速率限制，由出站队列执行，<= 0 表示不限制"""
+
+    per_minute: float = Field(default=0, description="适配器每分钟最多发送的消息数")
+    per_channel_per_minute: float = Field(default=0, description="单个频道每分钟最多发送的消息数")
+    burst: Optional[float] = Field(default=None, description="允许的突发条数，默认为 10 秒的配额")
+
+
 class AdapterMetadata(BaseModel):
     """适配器元数据"""
 
@@ -38,6 +47,7 @@ class AdapterMetadata(BaseModel):
     author: str = ""
     homepage: str = ""
     tags: List[str] = []
+    send_rate_limit: SendRateLimit = Field(default_factory=SendRateLimit)
 class BaseAdapterConfig(ConfigBase):
     """适配器配置基类"""
 
@@ -352,6 +362,14 @@ class BaseAdapter(ABC, Generic[TConfig]):
         # 默认实现：不支持消息反应功能
         return False
 
+    def on_agent_backpressure(self, signal: "BackpressureSignal") -> None:
+        """Agent 运行排队状态变化通知（可选实现）
+
+        排队积压时（busy / overloaded）适配器可暂缓拉取消息或降低回执频率，
+        恢复为 normal 后再恢复正常处理。默认忽略。
+        """
+        return
+
     # region 辅助方法
 
     def build_chat_key(self, channel_id: str) -> str:
@@ -6,8 +6,10 @@ from nekro_agent.models.db_chat_channel import DBChatChannel
 from nekro_agent.models.db_user import DBUser
 from nekro_agent.schemas.chat_message import ChatMessage
 from nekro_agent.schemas.user import UserCreate
+from nekro_agent.services.admission_cache import admission_cache
 from nekro_agent.services.command.base import CommandPermission
 from nekro_agent.services.message_service import message_service
+from nekro_agent.services.perf_metrics import perf_metrics
 from nekro_agent.services.user.util import user_register
 
 logger = get_sub_logger("adapter.interface")
@@ -28,6 +30,16 @@ async def collect_message(
 ) -> None:
     """适配器消息收集器"""
 
+    with perf_metrics.timer("admission.total"):
+        await _collect_message(adapter, platform_channel, platform_user, platform_message)
+
+
+async def _collect_message(
+    adapter: "BaseAdapter",
+    platform_channel: "PlatformChannel",
+    platform_user: "PlatformUser",
+    platform_message: "PlatformMessage",
+) -> None:
     try:
         chat_key = adapter.build_chat_key(platform_channel.channel_id)
     except Exception:
@@ -40,13 +52,14 @@ async def collect_message(
         )
         chat_key = None
 
-    db_chat_channel: DBChatChannel = await DBChatChannel.get_or_create(
-        adapter_key=adapter.key,
-        channel_id=platform_channel.channel_id,
-        channel_type=platform_channel.channel_type,
-        channel_name=platform_channel.channel_name,
-        chat_key=chat_key,
-    )
+    with perf_metrics.timer("admission.channel"):
+        db_chat_channel: DBChatChannel = await admission_cache.get_or_create_channel(
+            adapter_key=adapter.key,
+            channel_id=platform_channel.channel_id,
+            channel_type=platform_channel.channel_type,
+            channel_name=platform_channel.channel_name,
+            chat_key=chat_key,
+        )
 
     # 命令检测与执行（在 is_active 检查之前，确保 na_on 等命令在频道关闭时仍可用）
     chat_key = db_chat_channel.chat_key
@@ -55,16 +68,22 @@ async def collect_message(
         command_message = _build_chat_message(adapter, chat_key, platform_channel, platform_user, platform_message)
         await message_service.record_human_message(command_message, db_chat_channel=db_chat_channel)
 
-    if content_text and await _try_handle_command(
-        adapter, chat_key, platform_channel, platform_user, platform_message, content_text,
-    ):
+    with perf_metrics.timer("admission.command"):
+        command_consumed = bool(content_text) and await _try_handle_command(
+            adapter, chat_key, platform_channel, platform_user, platform_message, content_text,
+        )
+    if command_consumed:
         return
 
     if not db_chat_channel.is_active:
         return
 
     # 用户处理
-    user: Optional[DBUser] = await DBUser.get_by_union_id(adapter_key=adapter.key, platform_userid=platform_user.user_id)
+    with perf_metrics.timer("admission.user"):
+        user: Optional[DBUser] = await admission_cache.get_user(
+            adapter_key=adapter.key,
+            platform_userid=platform_user.user_id,
+        )
 
     if not user:
         try:
@@ -80,7 +99,7 @@ async def collect_message(
             logger.exception(f"注册用户失败: {platform_user.user_name} - {platform_user.user_id}")
             return
 
-        user = await DBUser.get_by_union_id(adapter_key=adapter.key, platform_userid=platform_user.user_id)
+        user = await admission_cache.get_user(adapter_key=adapter.key, platform_userid=platform_user.user_id)
         assert user
         await _persist_registered_user_command_permission(
             adapter,
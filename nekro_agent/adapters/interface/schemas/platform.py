@@ -111,3 +111,7 @@ class PlatformSendResponse(BaseModel):
     error_message: Optional[str] = Field(default=None, description="错误信息")
     message_id: Optional[str] = Field(default=None, description="消息ID")
     recorded: bool = Field(default=False, description="适配器是否已经自行写入聊天历史")
+    retry_after: Optional[float] = Field(
+        default=None,
+        description="平台限流时建议的重试等待秒数，设置后出站队列会等待后重试；为空表示失败不可重试",
+    )
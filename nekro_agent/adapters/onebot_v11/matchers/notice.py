@@ -7,6 +7,7 @@ from nonebot import on_notice
 from nonebot.adapters.onebot.v11 import Bot, NoticeEvent
 from nonebot.matcher import Matcher
 
+from nekro_agent.adapters.onebot_v11.tools.group_member_cache import group_member_directory
 from nekro_agent.adapters.onebot_v11.tools.onebot_util import (
 
     get_chat_info_old,
@@ -241,6 +242,8 @@ notice_matcher: Type[Matcher] = on_notice(priority=99999, block=False)
 async def _(_: Matcher, event: NoticeEvent, bot: Bot):
     from nekro_agent.adapters.onebot_v11.adapter import OnebotV11Adapter
 
+    group_member_directory.handle_notice(dict(event))
+
     # 处理通知事件
     chat_key, chat_type = await get_chat_info_old(event=event)
     db_chat_channel: DBChatChannel = await DBChatChannel.get_channel(chat_key=chat_key)
@@ -70,7 +70,7 @@ async def parse_at_from_text(text: str, db_chat_channel: DBChatChannel) -> List[
             uid = seg.replace("id:", "").strip()
             if not adapter.config.SESSION_ENABLE_AT:
                 if "group" in db_chat_channel.chat_key:
-                    group_id = db_chat_channel.chat_key.replace("group_", "")
+                    group_id = db_chat_channel.channel_id.replace("group_", "", 1)
                     nickname = await get_user_group_card_name(group_id=group_id, user_id=uid, db_chat_channel=db_chat_channel)
                     result.append(f"{nickname}")
                 else:
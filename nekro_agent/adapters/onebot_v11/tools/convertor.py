@@ -2,7 +2,7 @@ import asyncio
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, ValidationError
 
@@ -32,6 +32,7 @@ from nekro_agent.schemas.chat_message import (
     ChatMessageSegmentType,
     ChatType,
 )
+from nekro_agent.services.media_download_pool import media_download_pool
 
 # JSON卡片处理常量
 
@@ -39,6 +40,8 @@ logger = get_sub_logger("adapter.onebot_v11")
 JSON_CARD_FALLBACK_TEXT = "[JSON卡片]"  # i18n: JSON Card fallback placeholder
 FORWARD_FALLBACK_TEXT = "[合并转发消息]"  # i18n: Forward message fallback placeholder
 VOICE_FALLBACK_TEXT = "[语音]"  # i18n: Voice fallback placeholder
+IMAGE_FALLBACK_TEXT = "[图片]"  # i18n: Image download failure placeholder
+FILE_FALLBACK_TEXT = "[文件]"  # i18n: File download failure placeholder
 MAX_FORWARD_DEPTH = 3  # 合并转发最大递归深度
 VOICE_SEGMENT_TYPES = {"record", "voice", "audio", "ptt"}
 _FETCH_PTT_TEXT_UNSUPPORTED = False
@@ -197,15 +200,102 @@ async def _fetch_voice_transcript(bot: Bot, message_id: str) -> str:
     return ""
 
 
+@dataclass
+class _MediaJob:
+    """待下载的媒体描述，下载完成后 result 为对应消息段，失败时为 None"""
+
+    segment_cls: Union[Type[ChatMessageSegmentImage], Type[ChatMessageSegmentFile]]
+    url: str
+    file_name: str = ""
+    use_suffix: str = ""
+    result: Optional[Union[ChatMessageSegmentImage, ChatMessageSegmentFile]] = None
+
+    def to_segment(self) -> ChatMessageSegment:
+        if self.result is not None:
+            return self.result
+        fallback = IMAGE_FALLBACK_TEXT if self.segment_cls is ChatMessageSegmentImage else FILE_FALLBACK_TEXT
+        return ChatMessageSegment(type=ChatMessageSegmentType.TEXT, text=fallback)
+
+
+@dataclass
+class _PendingForward:
+    """媒体下载完成前的合并转发消息段"""
+
+    text: str
+    forward_content: List[dict]
+
+    def to_segment(self) -> ChatMessageSegment:
+        return ChatMessageSegmentForward(
+            type=ChatMessageSegmentType.FORWARD,
+            text=self.text,
+            forward_content=_finalize_forward_images(self.forward_content),
+        )
+
+
+class _MediaCollector:
+    """两阶段媒体解析：先遍历消息（含嵌套转发）收集媒体描述，再经共享下载池并发下载
+
+    单个媒体下载失败只影响对应位置（降级为占位文本），不会导致整条消息转换失败。
+    """
+
+    def __init__(self, chat_key: str) -> None:
+        self.chat_key = chat_key
+        self.jobs: List[_MediaJob] = []
+
+    def add(
+        self,
+        segment_cls: Union[Type[ChatMessageSegmentImage], Type[ChatMessageSegmentFile]],
+        url: str,
+        file_name: str = "",
+        use_suffix: str = "",
+    ) -> _MediaJob:
+        job = _MediaJob(segment_cls=segment_cls, url=url, file_name=file_name, use_suffix=use_suffix)
+        self.jobs.append(job)
+        return job
+
+    async def _download(self, job: _MediaJob) -> None:
+        try:
+            job.result = await media_download_pool.run(
+                job.url,
+                lambda: job.segment_cls.create_from_url(
+                    url=job.url,
+                    from_chat_key=self.chat_key,
+                    file_name=job.file_name,
+                    use_suffix=job.use_suffix,
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"媒体下载失败，已使用占位文本 ({job.url}): {e}")
+
+    async def resolve(self) -> None:
+        if self.jobs:
+            await asyncio.gather(*(self._download(job) for job in self.jobs))
+
+
+def _finalize_forward_images(forward_content: List[dict]) -> List[dict]:
+    """将合并转发结构中的媒体描述替换为下载成功的文件名"""
+    for item in forward_content:
+        item["images"] = [
+            image.result.file_name if isinstance(image, _MediaJob) else image
+            for image in item.get("images", [])
+            if not isinstance(image, _MediaJob) or image.result is not None
+        ]
+        if item.get("forward_content"):
+            _finalize_forward_images(item["forward_content"])
+    return forward_content
+
+
 async def _parse_forward_nodes(
     nodes: list,
     bot: Bot,
     chat_key: str,
+    media: _MediaCollector,
     depth: int = 0,
 ) -> Tuple[str, List[dict]]:
     """从内联节点列表解析合并转发（不调用 API）
 
     用于 NapCat 内层转发消息，其内容已内联在 forward 段的 data.content 中。
+    图片仅登记到 media，images 列表在下载完成后由 `_finalize_forward_images` 替换为文件名。
     """
     if depth >= MAX_FORWARD_DEPTH:
         return "[嵌套转发消息，层级过深]", []
@@ -228,7 +318,7 @@ async def _parse_forward_nodes(
                 content = []
 
         text_parts: List[str] = []
-        images: List[str] = []
+        images: List[_MediaJob] = []
 
         for seg in content:
             seg_data = seg if isinstance(seg, dict) else {}
@@ -241,13 +331,7 @@ async def _parse_forward_nodes(
                 text_parts.append("[图片]")
                 url = data.get("url", "")
                 if url:
-                    try:
-                        img_seg = await ChatMessageSegmentImage.create_from_url(
-                            url=url, from_chat_key=chat_key,
-                        )
-                        images.append(img_seg.file_name)
-                    except Exception as e:
-                        logger.debug(f"嵌套转发图片下载失败: {e}")
+                    images.append(media.add(ChatMessageSegmentImage, url))
             elif seg_type == "forward":
                 inline = data.get("content") or data.get("message")
                 if inline:
@@ -260,7 +344,7 @@ async def _parse_forward_nodes(
                         inline = None
                     if inline:
                         n_text, n_content = await _parse_forward_nodes(
-                            nodes=inline, bot=bot, chat_key=chat_key, depth=depth + 1,
+                            nodes=inline, bot=bot, chat_key=chat_key, media=media, depth=depth + 1,
                         )
                         text_parts.append(n_text)
                         forward_content.append({
@@ -286,6 +370,7 @@ async def _parse_forward_message(
     bot: Bot,
     forward_id: str,
     chat_key: str,
+    media: _MediaCollector,
     depth: int = 0,
 ) -> Tuple[str, List[dict]]:
     """递归解析合并转发消息
@@ -294,6 +379,7 @@ async def _parse_forward_message(
         bot: Bot 实例
         forward_id: 合并转发消息的 resId
         chat_key: 聊天频道标识（用于图片存储）
+        media: 媒体收集器，图片在整条消息遍历完成后统一下载
         depth: 当前递归深度
 
     Returns:
@@ -333,7 +419,7 @@ async def _parse_forward_message(
         content = node_data.get("content") or node_data.get("message") or []
 
         text_parts: List[str] = []
-        images: List[str] = []
+        images: List[_MediaJob] = []
 
         for seg in content:
             seg_data = seg if isinstance(seg, dict) else (seg.dict() if hasattr(seg, "dict") else {})
@@ -346,14 +432,7 @@ async def _parse_forward_message(
                 text_parts.append("[图片]")
                 url = data.get("url", "")
                 if url:
-                    try:
-                        img_seg = await ChatMessageSegmentImage.create_from_url(
-                            url=url,
-                            from_chat_key=chat_key,
-                        )
-                        images.append(img_seg.file_name)
-                    except Exception as e:
-                        logger.debug(f"转发消息中图片下载失败: {e}")
+                    images.append(media.add(ChatMessageSegmentImage, url))
             elif seg_type == "forward":
                 nested_id = data.get("id", "")
                 # 优先从内联 content 解析嵌套转发（NapCat 内层消息无法二次获取）
@@ -369,6 +448,7 @@ async def _parse_forward_message(
                             nodes=inline_content,
                             bot=bot,
                             chat_key=chat_key,
+                            media=media,
                             depth=depth + 1,
                         )
                         text_parts.append(nested_text)
@@ -385,6 +465,7 @@ async def _parse_forward_message(
                         bot=bot,
                         forward_id=nested_id,
                         chat_key=chat_key,
+                        media=media,
                         depth=depth + 1,
                     )
                     text_parts.append(nested_text)
@@ -867,10 +948,13 @@ async def convert_chat_message(
     ob_message: Message = ob_event.message
     message_id: str = str(ob_event.message_id)
     voice_transcript_text: Optional[str] = None
+    # 第一阶段只登记远程媒体，遍历完成后统一并发下载，再按原顺序组装消息段
+    media = _MediaCollector(db_chat_channel.chat_key)
+    pending_list: List[Union[ChatMessageSegment, _MediaJob, _PendingForward]] = []
 
     for seg in ob_message:
         if seg.type == "text":
-            ret_list.append(
+            pending_list.append(
                 ChatMessageSegment(
                     type=ChatMessageSegmentType.TEXT,
                     text=seg.data.get("text", ""),
@@ -892,18 +976,12 @@ async def convert_chat_message(
                 suffix = ""
             if "url" in seg.data:
                 remote_url: str = seg.data["url"]
-                ret_list.append(
-                    await ChatMessageSegmentImage.create_from_url(
-                        url=remote_url,
-                        from_chat_key=db_chat_channel.chat_key,
-                        use_suffix=suffix,
-                    ),
-                )
+                pending_list.append(media.add(ChatMessageSegmentImage, remote_url, use_suffix=suffix))
             elif "file" in seg.data:
                 seg_local_path = seg.data["file"]
                 if seg_local_path.startswith("file:"):
                     seg_local_path = seg_local_path[len("file:") :]
-                ret_list.append(
+                pending_list.append(
                     await ChatMessageSegmentImage.create_form_local_path(
                         local_path=seg_local_path,
                         from_chat_key=db_chat_channel.chat_key,
@@ -917,7 +995,7 @@ async def convert_chat_message(
         elif seg.type == "at":
             assert isinstance(ob_event, GroupMessageEvent)
             at_qq = str(seg.data["qq"])
-            bot_qq = (await adapter.get_self_info()).user_id
+            bot_qq = str(bot.self_id)
             if at_qq == bot_qq:
                 at_qq = bot_qq
                 is_tome = True
@@ -930,7 +1008,7 @@ async def convert_chat_message(
                 )
             logger.info(f"OneBot at message: {at_qq=} {nick_name=}")
             if not adapter.config.SESSION_ENABLE_AT:
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegment(
                         type=ChatMessageSegmentType.TEXT,
                         text=f"@{nick_name}",
@@ -938,7 +1016,7 @@ async def convert_chat_message(
                 )
             else:
                 logger.info(f"Session Allow At: {nick_name}")
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegmentAt(
                         type=ChatMessageSegmentType.AT,
                         text="",
@@ -954,12 +1032,7 @@ async def convert_chat_message(
                 continue
             file_url = _extract_http_url(seg.data)
             if file_url:
-                ret_list.append(
-                    await ChatMessageSegmentFile.create_from_url(
-                        url=file_url,
-                        from_chat_key=db_chat_channel.chat_key,
-                    ),
-                )
+                pending_list.append(media.add(ChatMessageSegmentFile, file_url))
             elif "file" in seg.data or "file_id" in seg.data:
                 file_seg = await _build_file_segment_from_onebot_file(
                     seg=seg,
@@ -968,7 +1041,7 @@ async def convert_chat_message(
                     group_id=ob_event.group_id if isinstance(ob_event, GroupMessageEvent) else None,
                 )
                 if file_seg:
-                    ret_list.append(file_seg)
+                    pending_list.append(file_seg)
                 else:
                     logger.warning(f"无法转换文件消息，已跳过: {seg}")
             else:
@@ -980,14 +1053,14 @@ async def convert_chat_message(
                 voice_transcript_text = await _fetch_voice_transcript(bot=bot, message_id=message_id)
 
             if voice_transcript_text:
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegment(
                         type=ChatMessageSegmentType.TEXT,
                         text=f"[语音转文字] {voice_transcript_text}",
                     ),
                 )
             else:
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegment(
                         type=ChatMessageSegmentType.TEXT,
                         text=VOICE_FALLBACK_TEXT,
@@ -1002,17 +1075,12 @@ async def convert_chat_message(
                         bot=bot,
                         forward_id=forward_id,
                         chat_key=db_chat_channel.chat_key,
+                        media=media,
                     )
-                    ret_list.append(
-                        ChatMessageSegmentForward(
-                            type=ChatMessageSegmentType.FORWARD,
-                            text=forward_text,
-                            forward_content=forward_content,
-                        ),
-                    )
+                    pending_list.append(_PendingForward(text=forward_text, forward_content=forward_content))
                 except Exception as e:
                     logger.warning(f"合并转发消息解析失败: {e}")
-                    ret_list.append(
+                    pending_list.append(
                         ChatMessageSegment(
                             type=ChatMessageSegmentType.TEXT,
                             text=FORWARD_FALLBACK_TEXT,
@@ -1023,7 +1091,7 @@ async def convert_chat_message(
             try:
                 text_summary, card_info, json_data = parse_onebot_json_segment(seg.data)
 
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegmentJsonCard(
                         type=ChatMessageSegmentType.JSON_CARD,
                         text=text_summary,
@@ -1039,7 +1107,7 @@ async def convert_chat_message(
             except json.JSONDecodeError as e:
                 logger.warning(f"JSON卡片解析失败（格式错误）: {e}")
                 # 降级为纯文本
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegment(
                         type=ChatMessageSegmentType.TEXT,
                         text=JSON_CARD_FALLBACK_TEXT,
@@ -1048,13 +1116,16 @@ async def convert_chat_message(
             except Exception as e:
                 logger.error(f"处理JSON卡片时发生意外错误: {e}", exc_info=True)
                 # 降级为纯文本
-                ret_list.append(
+                pending_list.append(
                     ChatMessageSegment(
                         type=ChatMessageSegmentType.TEXT,
                         text=JSON_CARD_FALLBACK_TEXT,
                     ),
                 )
 
+    await media.resolve()
+    ret_list = [item.to_segment() if isinstance(item, (_MediaJob, _PendingForward)) else item for item in pending_list]
+
     if msg_to_me and not is_tome:
         is_tome = True
         ret_list.insert(
@@ -1062,7 +1133,7 @@ async def convert_chat_message(
             ChatMessageSegmentAt(
                 type=ChatMessageSegmentType.AT,
                 text="",
-                target_platform_userid=(await adapter.get_self_info()).user_id,
+                target_platform_userid=str(bot.self_id),
                 target_nickname=(await db_chat_channel.get_preset()).name,
             ),
         )
@@ -0,0 +1,113 @@
+"""OneBot 群成员目录缓存
+
+入站消息的 @ 解析、发送者昵称与出站 @ 文本化都需要群名片 / 昵称，逐条调用
+`get_group_member_info` 在活跃群中会产生大量重复请求：
+- 按群缓存成员目录，首次访问通过 `get_group_member_list` 批量预热，过期后整体重建
+- 目录中缺失的成员（新入群、列表拉取失败）单独查询并补入目录
+- 同一群的目录加载与同一成员的单独查询均为单飞，并发消息共享一次请求
+- 入群 / 退群 / 群名片变更通知到达时失效对应成员
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, TypeVar, Union
+
+from nonebot.adapters.onebot.v11 import Bot
+
+from nekro_agent.core.logger import get_sub_logger
+
+logger = get_sub_logger("adapter.onebot_v11")
+
+T = TypeVar("T")
+
+# 成员目录有效期（秒）
+MEMBER_DIRECTORY_TTL_SECONDS = 30 * 60
+# 成员列表拉取失败后的重试间隔（秒），期间仅按需单独查询成员
+MEMBER_LIST_RETRY_SECONDS = 60
+# 最多缓存的群数量，超出时淘汰最久未访问的群
+MAX_CACHED_GROUPS = 512
+
+
+@dataclass
+class _GroupDirectory:
+    expires_at: float
+    members: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+
+class GroupMemberDirectory:
+    """按群缓存的成员目录"""
+
+    def __init__(self, ttl: float = MEMBER_DIRECTORY_TTL_SECONDS, max_groups: int = MAX_CACHED_GROUPS) -> None:
+        self.ttl = ttl
+        self.max_groups = max_groups
+        self._groups: "OrderedDict[int, _GroupDirectory]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def _single_flight(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(loader())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load_group(self, bot: Bot, group_id: int) -> _GroupDirectory:
+        try:
+            member_list = await bot.get_group_member_list(group_id=group_id)
+        except Exception as e:
+            logger.warning(f"获取群成员列表失败，改为按需查询: group_id={group_id}, error={e}")
+            return _GroupDirectory(expires_at=time.monotonic() + MEMBER_LIST_RETRY_SECONDS)
+        members = {int(m["user_id"]): m for m in member_list if isinstance(m, dict) and m.get("user_id") is not None}
+        return _GroupDirectory(expires_at=time.monotonic() + self.ttl, members=members)
+
+    async def _get_directory(self, bot: Bot, group_id: int) -> _GroupDirectory:
+        directory = self._groups.get(group_id)
+        if directory is not None and directory.expires_at > time.monotonic():
+            self._groups.move_to_end(group_id)
+            return directory
+        directory = await self._single_flight(("group", group_id), lambda: self._load_group(bot, group_id))
+        self._groups[group_id] = directory
+        self._groups.move_to_end(group_id)
+        while len(self._groups) > self.max_groups:
+            self._groups.popitem(last=False)
+        return directory
+
+    async def get_member(self, bot: Bot, group_id: Union[int, str], user_id: Union[int, str]) -> Dict[str, Any]:
+        """获取群成员信息，目录中缺失时单独查询"""
+        group_id, user_id = int(group_id), int(user_id)
+        directory = await self._get_directory(bot, group_id)
+        member = directory.members.get(user_id)
+        if member is not None:
+            return member
+        member = await self._single_flight(
+            ("member", group_id, user_id),
+            lambda: bot.get_group_member_info(group_id=group_id, user_id=user_id, no_cache=False),
+        )
+        directory.members[user_id] = member
+        return member
+
+    async def get_display_name(self, bot: Bot, group_id: Union[int, str], user_id: Union[int, str]) -> str:
+        """群名片优先，其次昵称"""
+        member = await self.get_member(bot, group_id, user_id)
+        return member.get("card") or member.get("nickname") or ""
+
+    def invalidate_member(self, group_id: Union[int, str], user_id: Union[int, str]) -> None:
+        directory = self._groups.get(int(group_id))
+        if directory is not None:
+            directory.members.pop(int(user_id), None)
+
+    def invalidate_group(self, group_id: Union[int, str]) -> None:
+        self._groups.pop(int(group_id), None)
+
+    def handle_notice(self, event: Mapping[str, Any]) -> None:
+        """入群 / 退群 / 群名片变更时失效对应成员"""
+        if event.get("notice_type") not in {"group_increase", "group_decrease", "group_card"}:
+            return
+        try:
+            self.invalidate_member(event["group_id"], event["user_id"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+
+group_member_directory = GroupMemberDirectory()
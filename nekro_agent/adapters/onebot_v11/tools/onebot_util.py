@@ -1,5 +1,5 @@
 import json
-from typing import Tuple, Union, cast
+from typing import Any, Tuple, Union, cast
 
 
 from nonebot.adapters import Bot
@@ -13,6 +13,7 @@ from nonebot.adapters.onebot.v11 import (
 )
 
 from nekro_agent.adapters.onebot_v11.core.bot import get_bot
+from nekro_agent.adapters.onebot_v11.tools.group_member_cache import group_member_directory
 from nekro_agent.core.logger import get_sub_logger
 from nekro_agent.models.db_chat_channel import DBChatChannel
 from nekro_agent.schemas.chat_message import ChatType
@@ -88,7 +89,7 @@ async def get_user_name(
     db_chat_channel: DBChatChannel,
 ) -> str:
     """获取QQ用户名"""
-    if str(user_id) == (await db_chat_channel.adapter.get_self_info()).user_id:
+    if str(user_id) == str(bot.self_id):
         return (await db_chat_channel.get_preset()).name
 
     if isinstance(event, GroupMessageEvent) and event.sub_type == "anonymous" and event.anonymous:  # 匿名消息
@@ -96,16 +97,9 @@ async def get_user_name(
 
     if isinstance(event, (GroupMessageEvent, GroupIncreaseNoticeEvent, NoticeEvent)):
         group_id = getattr(event, "group_id", None)
-        if group_id:
-            user_info = await bot.get_group_member_info(
-                group_id=group_id,
-                user_id=user_id,
-                no_cache=False,
-            )
-        else:
+        if not group_id:
             raise ValueError("获取群成员信息失败")
-        user_name = user_info.get("nickname", None)
-        user_name = user_info.get("card", None) or user_name
+        user_name = await group_member_directory.get_display_name(cast(Any, bot), group_id, user_id)
     else:
         user_name = (
             event.sender.nickname if not isinstance(event, GroupUploadNoticeEvent) and event.sender else event.get_user_id()
@@ -123,16 +117,12 @@ async def get_user_group_card_name(
     db_chat_channel: DBChatChannel,
 ) -> str:
     """获取用户所在群的群名片"""
-    if str(user_id) == (await db_chat_channel.adapter.get_self_info()).user_id:
+    bot = get_bot()
+    if str(user_id) == str(bot.self_id):
         return (await db_chat_channel.get_preset()).name
     if str(user_id) == "all" or str(user_id) == "0":
         return "全体成员"
-    user_info = await get_bot().get_group_member_info(
-        group_id=int(group_id),
-        user_id=int(user_id),
-        no_cache=False,
-    )
-    return user_info.get("card") or user_info.get("nickname", "未知")
+    return await group_member_directory.get_display_name(bot, group_id, user_id) or "未知"
 
 
 async def get_chat_info(
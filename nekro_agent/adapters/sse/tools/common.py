@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import mimetypes
 from pathlib import Path
@@ -6,6 +7,8 @@ from typing import Optional, Tuple
 import aiofiles
 import magic
 
+from nekro_agent.tools.upload_blob_store import upload_blob_store
+
 
 async def get_file_info(file_path: str) -> Tuple[bytes, str, str]:
     """获取文件信息
@@ -137,6 +140,11 @@ async def bytes_to_file(
     save_dir.mkdir(parents=True, exist_ok=True)
     file_path = save_dir / file_name
 
+    # 上传目录内的同名文件可能是多个频道共享的硬链接，经由内容寻址存储原子替换，不就地覆写
+    if file_path.resolve().is_relative_to(Path(USER_UPLOAD_DIR).resolve()):
+        await asyncio.to_thread(upload_blob_store.store_bytes, file_bytes, file_path)
+        return str(file_path), file_name
+
     # 写入文件
     async with aiofiles.open(file_path, "wb") as f:
         await f.write(file_bytes)
@@ -12,7 +12,7 @@ from typing import TYPE_CHECKING, List, Optional, Tuple
 from telegram import Bot
 from telegram.ext import Application, MessageHandler, filters
 
-from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter
+from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter, SendRateLimit
 from nekro_agent.adapters.interface.schemas.platform import (
     ChatType,
     PlatformChannel,
@@ -22,6 +22,7 @@ from nekro_agent.adapters.interface.schemas.platform import (
     PlatformUser,
 )
 from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.outbox import extract_retry_after
 
 from .config import TelegramConfig
 from .message_processor import MessageProcessor
@@ -55,6 +56,8 @@ class TelegramAdapter(BaseAdapter[TelegramConfig]):
             version="2.0.0",
             author="NekroAI",
             tags=["telegram", "chat", "bot"],
+            # Bot API 全局约 30 条/秒，群组内 20 条/分钟
+            send_rate_limit=SendRateLimit(per_minute=1800, per_channel_per_minute=20),
         )
 
     @property
@@ -214,13 +217,13 @@ class TelegramAdapter(BaseAdapter[TelegramConfig]):
                 error_message="Telegram 适配器未初始化",
             )
 
+        message_ids: List[str] = []
         try:
             # 解析聊天键获取频道ID
             _, channel_id = self.parse_chat_key(request.chat_key)
             # 提取实际的 chat_id
             chat_id = int(channel_id.split("_", 1)[1]) if "_" in channel_id else int(channel_id)
 
-            message_ids = []
             bot = self.application.bot
 
             # 处理消息段
@@ -282,7 +285,12 @@ class TelegramAdapter(BaseAdapter[TelegramConfig]):
         except Exception as e:
             error_msg = f"Telegram 消息发送失败: {e!s}"
             logger.error(error_msg)
-            return PlatformSendResponse(success=False, error_message=error_msg)
+            # RetryAfter 限流且尚未发出任何消息时交由出站队列等待重试
+            return PlatformSendResponse(
+                success=False,
+                error_message=error_msg,
+                retry_after=None if message_ids else extract_retry_after(e),
+            )
 
     async def get_self_info(self) -> PlatformUser:
         """获取自身信息"""
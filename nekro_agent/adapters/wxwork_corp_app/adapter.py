@@ -7,7 +7,7 @@ from typing import Any, List, Optional, Type
 
 from fastapi import APIRouter
 
-from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter
+from nekro_agent.adapters.interface.base import AdapterMetadata, BaseAdapter, SendRateLimit
 from nekro_agent.adapters.interface.collector import collect_message
 from nekro_agent.adapters.interface.schemas.platform import (
     PlatformChannel,
@@ -34,6 +34,7 @@ from nekro_agent.schemas.agent_message import AgentMessageSegmentType
 from nekro_agent.models.db_chat_channel import DBChatChannel
 
 from .config import WxWorkCorpAppConfig
+from .kf_sync import KfSyncEngine
 
 if TYPE_CHECKING:
     from nekro_agent.schemas.agent_message import AgentMessageSegment
@@ -44,6 +45,8 @@ logger = get_sub_logger("adapter.wxwork_corp_app")
 WXWORK_CORP_APP_SEND_INTERVAL_SECONDS = 0.35
 WXWORK_CORP_APP_TEXT_MAX_LENGTH = 2048
 WXWORK_CORP_APP_KF_COMMAND_MAX_MESSAGES = 5
+# 客服消息来源：微信客户发送的消息（其余为系统事件、接待人员或本应用发出的消息）
+WXWORK_KF_ORIGIN_CUSTOMER = 3
 
 
 class WxWorkCorpAppAdapter(BaseAdapter[WxWorkCorpAppConfig]):
@@ -53,8 +56,8 @@ class WxWorkCorpAppAdapter(BaseAdapter[WxWorkCorpAppConfig]):
     def __init__(self, config_cls: Type[WxWorkCorpAppConfig] = WxWorkCorpAppConfig):
         super().__init__(config_cls)
         self._send_lock = asyncio.Lock()
-        self._recent_kf_message_ids: list[str] = []
         self.corp_app_client = WxWorkCorpAppClient(self)
+        self._kf_sync = KfSyncEngine(fetch=self.corp_app_client.sync_kf_messages, handle=self._handle_kf_message)
         if not self.corp_app_client.is_configured():
             logger.warning("企业微信自建应用模式未完全配置，需要设置 CORP_ID / CORP_APP_SECRET / CORP_APP_AGENT_ID")
 
@@ -81,6 +84,8 @@ class WxWorkCorpAppAdapter(BaseAdapter[WxWorkCorpAppConfig]):
             author="NekroAI",
             homepage="https://github.com/KroMiose/nekro-agent",
             tags=["wxwork", "wecom", "企业微信", "corp_app"],
+            # 应用消息对同一成员 30 次/分钟
+            send_rate_limit=SendRateLimit(per_channel_per_minute=30),
         )
 
     @property
@@ -394,33 +399,20 @@ class WxWorkCorpAppAdapter(BaseAdapter[WxWorkCorpAppConfig]):
     async def _handle_kf_event(self, *, token: str, open_kfid: str) -> None:
         if not self.corp_app_client:
             return
+        await self._kf_sync.sync(token=token, open_kfid=open_kfid)
 
-        cursor = ""
-        latest_item: dict[str, Any] | None = None
-        while True:
-            response = await self.corp_app_client.sync_kf_messages(token=token, open_kfid=open_kfid, cursor=cursor)
-            msg_list = response.get("msg_list") or []
-            for item in msg_list:
-                if isinstance(item, dict):
-                    latest_item = item
-
-            has_more = bool(response.get("has_more"))
-            cursor = str(response.get("next_cursor") or "").strip()
-            if not has_more or not cursor:
-                break
-
-        if latest_item is None:
+    async def _handle_kf_message(self, item: dict[str, Any]) -> None:
+        origin = item.get("origin")
+        if origin is not None and origin != WXWORK_KF_ORIGIN_CUSTOMER:
             return
 
         parsed = parse_corp_app_kf_message(
-            latest_item,
+            item,
             treat_all_as_tome=self.config.TREAT_ALL_RECEIVED_MESSAGES_AS_TOME,
         )
         if parsed is None:
             return
-        if self._is_duplicate_kf_message(parsed.message.message_id):
-            return
-        await self._bind_kf_channel(parsed, open_kfid=open_kfid)
+        await self._bind_kf_channel(parsed, open_kfid=str(item.get("open_kfid") or ""))
         if self.config.ENABLE_TEXT_MESSAGE_COLLECTION:
             await collect_message(
                 self,
@@ -452,15 +444,6 @@ class WxWorkCorpAppAdapter(BaseAdapter[WxWorkCorpAppConfig]):
             str(channel_data.get("kf_external_userid") or "").strip(),
         )
 
-    def _is_duplicate_kf_message(self, message_id: str) -> bool:
-        if not message_id:
-            return False
-        if message_id in self._recent_kf_message_ids:
-            return True
-        self._recent_kf_message_ids.append(message_id)
-        self._recent_kf_message_ids = self._recent_kf_message_ids[-256:]
-        return False
-
     async def _send_text_content(self, *, channel_id: str, content: str) -> None:
         for chunk in self._split_text_message_chunks(content):
             await self.corp_app_client.send_text_message(channel_id=channel_id, content=chunk)
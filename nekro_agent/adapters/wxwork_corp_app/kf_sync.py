@@ -0,0 +1,151 @@
+"""微信客服消息增量同步
+
+企业微信的客服回调只携带同步令牌，消息需通过 `kf/sync_msg` 按游标拉取：
+- 每个 `open_kfid` 的 `next_cursor` 持久化到本地，回调只拉取上次同步之后的新消息，
+  成本不随历史消息增长；同一批到达的多条消息按顺序全部处理
+- 首次同步（本地无游标）时跳过过旧的历史消息，避免把整段积压交给 AI
+- 同一 `open_kfid` 的并发回调合并为一次进行中的同步，同步期间到达的回调在本轮结束后再补拉一轮
+- 消息 ID 使用有界集合 + 队列去重，覆盖回调重试与游标未及时落盘时的重复投递
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import OsEnv
+
+logger = get_sub_logger("adapter.wxwork_corp_app")
+
+# 去重记录的最大消息数
+KF_DEDUP_CAPACITY = 4096
+# 首次同步时只处理该时长内的消息
+KF_BOOTSTRAP_MAX_AGE_SECONDS = 300
+
+KfFetcher = Callable[..., Awaitable[Dict[str, Any]]]
+KfHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class KfCursorStore:
+    """按 open_kfid 持久化同步游标"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path(OsEnv.DATA_DIR) / "adapters" / "wxwork_corp_app" / "kf_cursors.json"
+        self._cursors: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._cursors is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._cursors = {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+            except FileNotFoundError:
+                self._cursors = {}
+            except Exception as e:
+                logger.warning(f"微信客服同步游标加载失败，将从头同步: {e}")
+                self._cursors = {}
+        return self._cursors
+
+    def get(self, open_kfid: str) -> str:
+        return self._load().get(open_kfid, "")
+
+    async def set(self, open_kfid: str, cursor: str) -> None:
+        cursors = self._load()
+        if cursors.get(open_kfid) == cursor:
+            return
+        cursors[open_kfid] = cursor
+        await asyncio.to_thread(self._write, dict(cursors))
+
+    def _write(self, cursors: Dict[str, str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cursors, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class KfMessageDeduper:
+    """有界消息 ID 去重，超出容量时淘汰最早记录"""
+
+    def __init__(self, capacity: int = KF_DEDUP_CAPACITY) -> None:
+        self.capacity = capacity
+        self._seen: Set[str] = set()
+        self._order: Deque[str] = deque()
+
+    def check_and_add(self, message_id: str) -> bool:
+        """返回消息是否重复，未见过的消息会被记录"""
+        if not message_id:
+            return False
+        if message_id in self._seen:
+            return True
+        self._seen.add(message_id)
+        self._order.append(message_id)
+        if len(self._order) > self.capacity:
+            self._seen.discard(self._order.popleft())
+        return False
+
+
+class KfSyncEngine:
+    """微信客服消息同步引擎"""
+
+    def __init__(
+        self,
+        fetch: KfFetcher,
+        handle: KfHandler,
+        cursor_store: Optional[KfCursorStore] = None,
+        deduper: Optional[KfMessageDeduper] = None,
+    ) -> None:
+        self._fetch = fetch
+        self._handle = handle
+        self.cursor_store = cursor_store or KfCursorStore()
+        self.deduper = deduper or KfMessageDeduper()
+        # open_kfid -> 进行中的同步任务
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # open_kfid -> 待补拉一轮时使用的最新令牌
+        self._pending_tokens: Dict[str, str] = {}
+
+    async def sync(self, *, token: str, open_kfid: str) -> None:
+        """处理一次客服回调，等待包含本次回调的同步完成"""
+        self._pending_tokens[open_kfid] = token
+        task = self._tasks.get(open_kfid)
+        if task is None or task.done():
+            task = self._tasks[open_kfid] = asyncio.create_task(self._run(open_kfid))
+        await asyncio.shield(task)
+
+    async def _run(self, open_kfid: str) -> None:
+        try:
+            while open_kfid in self._pending_tokens:
+                token = self._pending_tokens.pop(open_kfid)
+                try:
+                    await self._sync_once(token=token, open_kfid=open_kfid)
+                except Exception as e:
+                    logger.exception(f"微信客服消息同步失败: open_kfid={open_kfid}, error={e}")
+        finally:
+            self._tasks.pop(open_kfid, None)
+
+    async def _sync_once(self, *, token: str, open_kfid: str) -> None:
+        cursor = self.cursor_store.get(open_kfid)
+        min_send_time = 0 if cursor else int(time.time()) - KF_BOOTSTRAP_MAX_AGE_SECONDS
+        while True:
+            response = await self._fetch(token=token, open_kfid=open_kfid, cursor=cursor)
+            for item in response.get("msg_list") or []:
+                if not isinstance(item, dict):
+                    continue
+                if min_send_time and int(item.get("send_time") or 0) < min_send_time:
+                    continue
+                if self.deduper.check_and_add(str(item.get("msgid") or "")):
+                    continue
+                item.setdefault("open_kfid", open_kfid)
+                try:
+                    await self._handle(item)
+                except Exception as e:
+                    logger.exception(f"处理微信客服消息失败: msgid={item.get('msgid')}, error={e}")
+
+            next_cursor = str(response.get("next_cursor") or "").strip()
+            if next_cursor:
+                cursor = next_cursor
+                await self.cursor_store.set(open_kfid, cursor)
+            if not response.get("has_more") or not next_cursor:
+                break
@@ -5,7 +5,7 @@ from pydantic import Field
 
 from nekro_agent.schemas.i18n import SupportedLang, i18n_text, set_system_lang
 
-from .core_utils import ConfigBase, ExtraField
+from .core_utils import ConfigBase, ConfigManager, ExtraField
 from .os_env import OsEnv
 
 CONFIG_DIR = Path(OsEnv.DATA_DIR) / "configs"
@@ -47,6 +47,24 @@ class ModelConfigGroup(ConfigBase):
     PRESENCE_PENALTY: Optional[float] = Field(default=None, title="提示重复惩罚")
     FREQUENCY_PENALTY: Optional[float] = Field(default=None, title="补全重复惩罚")
     EXTRA_BODY: Optional[str] = Field(default=None, title="额外参数 (JSON)")
+    MAX_CONCURRENCY: int = Field(default=0, title="最大并发请求数", description="同一模型组同时进行的请求数上限，0 表示不限制")
+    RPM_LIMIT: int = Field(default=0, title="每分钟请求数限制 (RPM)", description="0 表示不限制")
+    TPM_LIMIT: int = Field(default=0, title="每分钟 Token 数限制 (TPM)", description="按提示词长度预估，请求完成后按实际消耗校正，0 表示不限制")
+    CONTEXT_TOKEN_BUDGET: int = Field(
+        default=0,
+        title="上下文 Token 预算",
+        description="单次请求提示词的 Token 上限，按本地分词器计量并据此分配记忆、图片与历史记录，0 表示沿用按字符长度裁剪",
+    )
+    TOKENIZER: str = Field(
+        default="",
+        title="分词器",
+        description="计量 Token 使用的 tiktoken 编码名（如 o200k_base），留空按模型名称自动选择，编码不可用时按字符比例估算",
+    )
+    ROUTING_POOL: str = Field(
+        default="",
+        title="路由池",
+        description="填写相同路由池名称的聊天模型组视为可相互替换，请求时按近期耗时、错误率与剩余限额择优，留空表示不参与路由",
+    )
 
 
 class CoreConfig(ConfigBase):
@@ -898,6 +916,42 @@ class CoreConfig(ConfigBase):
             ),
         ).model_dump(),
     )
+    MEMORY_REBUILD_CONCURRENCY: int = Field(
+        default=4,
+        title="记忆重建并发频道数",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(zh_CN="记忆系统", en_US="Memory System"),
+            i18n_title=i18n_text(zh_CN="记忆重建并发频道数", en_US="Memory Rebuild Concurrency"),
+            i18n_description=i18n_text(
+                zh_CN="重建工作区记忆时同时回放的频道数量。单个频道内仍按消息顺序逐批处理",
+                en_US="Number of channels replayed concurrently when rebuilding workspace memory. Messages within a single channel are still processed in order",
+            ),
+        ).model_dump(),
+    )
+    MEMORY_REBUILD_LLM_RATE_PER_MINUTE: int = Field(
+        default=60,
+        title="记忆重建 LLM 调用限速",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(zh_CN="记忆系统", en_US="Memory System"),
+            i18n_title=i18n_text(zh_CN="记忆重建 LLM 调用限速", en_US="Memory Rebuild LLM Rate Limit"),
+            i18n_description=i18n_text(
+                zh_CN="记忆重建期间所有频道共享的每分钟 LLM 请求上限；设为 0 表示不限制",
+                en_US="Maximum LLM requests per minute shared by all channels during memory rebuild; set to 0 for unlimited",
+            ),
+        ).model_dump(),
+    )
+    MEMORY_REBUILD_EMBEDDING_RATE_PER_MINUTE: int = Field(
+        default=600,
+        title="记忆重建向量化限速",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(zh_CN="记忆系统", en_US="Memory System"),
+            i18n_title=i18n_text(zh_CN="记忆重建向量化限速", en_US="Memory Rebuild Embedding Rate Limit"),
+            i18n_description=i18n_text(
+                zh_CN="记忆重建期间所有频道共享的每分钟向量化文本条数上限；设为 0 表示不限制",
+                en_US="Maximum number of texts embedded per minute, shared by all channels during memory rebuild; set to 0 for unlimited",
+            ),
+        ).model_dump(),
+    )
     MEMORY_PRUNE_ENABLED: bool = Field(
         default=True,
         title="启用自动记忆清理",
@@ -1324,6 +1378,78 @@ class CoreConfig(ConfigBase):
             ),
         ).model_dump(),
     )
+    AI_MAX_CONCURRENT_AGENT_RUNS: int = Field(
+        default=16,
+        title="最大并发 Agent 运行数",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(
+                zh_CN="聊天配置",
+                en_US="Chat Configuration",
+            ),
+            i18n_title=i18n_text(
+                zh_CN="最大并发 Agent 运行数",
+                en_US="Max Concurrent Agent Runs",
+            ),
+            i18n_description=i18n_text(
+                zh_CN="全局同时执行回复流程的频道数上限，超出的频道排队等待并按适配器轮流分配；设为 0 表示不限制",
+                en_US="Global limit on channels running the reply process at the same time. Extra channels queue and are served round-robin by adapter; set to 0 for unlimited",
+            ),
+        ).model_dump(),
+    )
+    OUTBOX_MAX_RETRIES: int = Field(
+        default=3,
+        title="消息发送最大重试次数",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(
+                zh_CN="聊天配置",
+                en_US="Chat Configuration",
+            ),
+            i18n_title=i18n_text(
+                zh_CN="消息发送最大重试次数",
+                en_US="Max Message Send Retries",
+            ),
+            i18n_description=i18n_text(
+                zh_CN="回复被平台限流或连接平台失败时的最大重试次数，按平台给出的等待时间或指数退避等待；其他发送错误可能已被平台接收，不会重试；设为 0 表示不重试",
+                en_US="Maximum retries when a reply is rate limited by the platform or the connection to the platform fails. Waits for the platform retry-after hint or with exponential backoff; other send errors may already have been accepted and are not retried; set to 0 to disable retries",
+            ),
+        ).model_dump(),
+    )
+    OUTBOX_RETRY_MAX_DELAY_SECONDS: float = Field(
+        default=30.0,
+        title="消息发送重试最大等待 (秒)",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(
+                zh_CN="聊天配置",
+                en_US="Chat Configuration",
+            ),
+            i18n_title=i18n_text(
+                zh_CN="消息发送重试最大等待 (秒)",
+                en_US="Max Send Retry Delay (seconds)",
+            ),
+            i18n_description=i18n_text(
+                zh_CN="单次重试的最长等待时间，平台要求等待更久时放弃重试",
+                en_US="Longest wait before a single retry. Retries are abandoned when the platform asks to wait longer",
+            ),
+        ).model_dump(),
+    )
+    OUTBOX_PERSIST_ENABLED: bool = Field(
+        default=False,
+        title="持久化待发送消息",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(
+                zh_CN="聊天配置",
+                en_US="Chat Configuration",
+            ),
+            i18n_title=i18n_text(
+                zh_CN="持久化待发送消息",
+                en_US="Persist Outgoing Messages",
+            ),
+            i18n_description=i18n_text(
+                zh_CN="发送前将消息写入数据库，重启后补发未送达的消息（仅补发 10 分钟内的消息）",
+                en_US="Write messages to the database before sending and resend undelivered ones after a restart (only messages from the last 10 minutes)",
+            ),
+        ).model_dump(),
+    )
     AI_GENERATE_TIMEOUT: int = Field(
         default=180,
         title="AI 对话内容生成超时时间 (秒)",
@@ -1742,6 +1868,26 @@ class CoreConfig(ConfigBase):
         ).model_dump(),
         description="仅在启用流式请求时生效。若供应商在指定时间内未返回首个有效流式片段（空块不计入），则立即判定本次请求失败并进入后续重试，用于减少长时间无响应等待。",
     )
+    AI_STREAM_EARLY_EXEC: bool = Field(
+        default=False,
+        title="流式提前执行代码",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(
+                zh_CN="模型配置",
+                en_US="Model Configuration",
+            ),
+            overridable=True,
+            i18n_title=i18n_text(
+                zh_CN="流式提前执行代码",
+                en_US="Early Code Execution While Streaming",
+            ),
+            i18n_description=i18n_text(
+                zh_CN="仅在启用流式请求时生效；代码块开始输出时预先准备沙盒，代码块闭合后立即停止生成并执行",
+                en_US="Only effective when stream mode is enabled; prepares the sandbox once the code block opens and executes as soon as it closes",
+            ),
+        ).model_dump(),
+        description="仅在启用流式请求时生效。代码块开始输出时即预留沙盒并提前创建容器，代码块闭合且语法完整后立即停止生成并开始执行，代码块之后的多余输出将被丢弃。",
+    )
 
     """聊天设置"""
     SESSION_GROUP_ACTIVE_DEFAULT: bool = Field(
@@ -1874,6 +2020,25 @@ class CoreConfig(ConfigBase):
             ),
         ).model_dump(),
     )
+    SANDBOX_PACKAGE_PREFETCH: bool = Field(
+        default=True,
+        title="沙盒依赖包预下载",
+        description="沙盒内 dynamic_importer 从远程源安装依赖后，由主机在后台将对应 wheel 下载到本地 wheelhouse，后续安装可离线完成；完全离线部署可关闭并手动放入 wheel 文件",
+        json_schema_extra=ExtraField(
+            i18n_category=i18n_text(
+                zh_CN="沙盒配置",
+                en_US="Sandbox Configuration",
+            ),
+            i18n_title=i18n_text(
+                zh_CN="沙盒依赖包预下载",
+                en_US="Sandbox Package Prefetch",
+            ),
+            i18n_description=i18n_text(
+                zh_CN="主机在后台将沙盒请求过的依赖包下载到本地 wheelhouse，后续安装无需访问远程源",
+                en_US="The host downloads packages requested by sandboxes into a local wheelhouse in the background so later installs work offline",
+            ),
+        ).model_dump(),
+    )
 
     """CC Workspace 配置"""
     CC_SANDBOX_IMAGE: str = Field(
@@ -2350,4 +2515,5 @@ def reload_config():
     for field_name in CoreConfig.model_fields:
         value = getattr(new_config, field_name)
         setattr(config, field_name, value)
+    ConfigManager.bump_version()
     set_system_lang(SupportedLang(config.SYSTEM_LANG))
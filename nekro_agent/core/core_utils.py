@@ -193,11 +193,24 @@ class ConfigManager:
     """配置管理器 - 统一管理所有配置实例"""
 
     _configs: Dict[str, "ConfigBase"] = {}
+    # 配置版本号：任意配置实例注册、修改或落盘时递增，供有效配置缓存判断是否失效
+    _version: int = 0
 
     @classmethod
     def register_config(cls, config_key: str, config_instance: "ConfigBase") -> None:
         """注册配置实例"""
         cls._configs[config_key] = config_instance
+        cls.bump_version()
+
+    @classmethod
+    def bump_version(cls) -> None:
+        """标记配置已变更"""
+        cls._version += 1
+
+    @classmethod
+    def get_version(cls) -> int:
+        """获取当前配置版本号"""
+        return cls._version
 
     @classmethod
     def get_config(cls, config_key: str) -> Optional["ConfigBase"]:
@@ -213,6 +226,7 @@ class ConfigManager:
     def unregister_config(cls, config_key: str) -> None:
         """注销配置实例"""
         cls._configs.pop(config_key, None)
+        cls.bump_version()
 
 
 T_ConfigBase = TypeVar("T_ConfigBase", bound="ConfigBase")
@@ -381,6 +395,7 @@ class ConfigBase(BaseModel):
             target_path.write_text(yaml_str, encoding="utf-8")
         else:
             raise ValueError(f"Unsupported file type: {target_path}")
+        ConfigManager.bump_version()
 
     @classmethod
     def get_field_title(cls, field_name: str) -> str:
@@ -64,12 +64,17 @@ class OsEnv:
     """数据库迁移"""
     AUTO_DB_MIGRATE: bool = OsEnvTypes.Bool("AUTO_DB_MIGRATE", default=True)
 
+    """多实例协调后端：memory 为单实例，postgres 使用共享数据库协调多个实例"""
+    COORDINATION_BACKEND: str = OsEnvTypes.Str("COORDINATION_BACKEND", default="memory")
+
 
 APP_SYSTEM_DIR: str = OsEnv.DATA_DIR + "/system"  # 系统目录
 USER_UPLOAD_DIR: str = OsEnv.DATA_DIR + "/uploads"  # 用户资源上传目录
+USER_UPLOAD_BLOB_DIR: str = OsEnv.DATA_DIR + "/upload_blobs"  # 上传资源内容寻址存储目录（需与上传目录同一文件系统）
 SANDBOX_SHARED_HOST_DIR: str = OsEnv.DATA_DIR + "/sandboxes"  # 沙盒共享目录
 SANDBOX_PIP_CACHE_DIR: str = OsEnv.DATA_DIR + "/sandboxes/.pip_cache"  # 沙盒动态 PIP 缓存目录
 SANDBOX_PACKAGE_DIR: str = OsEnv.DATA_DIR + "/sandboxes/.packages"  # 沙盒动态包目录
+SANDBOX_WHEELHOUSE_DIR: str = OsEnv.DATA_DIR + "/sandboxes/.wheelhouse"  # 沙盒离线 wheel 仓库与包清单目录
 PLUGIN_DYNAMIC_PACKAGE_DIR: str = OsEnv.DATA_DIR + "/plugins/.dynamic_packages"  # 插件动态包目录
 PROMPT_LOG_DIR: str = OsEnv.DATA_DIR + "/logs/prompts"  # 提示词日志目录
 PROMPT_ERROR_LOG_DIR: str = OsEnv.DATA_DIR + "/logs/prompts_error"  # 提示词错误日志目录
@@ -96,6 +101,18 @@ TIMER_ONE_SHOT_PERSIST_PATH: str = TIMER_SYSTEM_DIR + "/one_shot_timers.json"
 CALENDAR_SYSTEM_DIR: str = APP_SYSTEM_DIR + "/calendar"
 CALENDAR_CN_HOLIDAY_DIR: str = CALENDAR_SYSTEM_DIR + "/cn_holidays"
 
+# =============================================================================
+# Quota data paths (under DATA_DIR)
+# =============================================================================
+QUOTA_SYSTEM_DIR: str = APP_SYSTEM_DIR + "/quota"
+QUOTA_BOOST_PERSIST_PATH: str = QUOTA_SYSTEM_DIR + "/boosts.json"
+
+# =============================================================================
+# Agent scheduler data paths (under DATA_DIR)
+# =============================================================================
+AGENT_SCHEDULER_SYSTEM_DIR: str = APP_SYSTEM_DIR + "/agent_scheduler"
+AGENT_PENDING_TRIGGERS_PERSIST_DIR: str = AGENT_SCHEDULER_SYSTEM_DIR + "/pending_triggers"
+
 # =============================================================================
 # Command data paths (under DATA_DIR/configs)
 # =============================================================================
@@ -18,6 +18,7 @@ from .db_mem_media_resource import DBMemMediaResource  # noqa: F401
 from .db_mem_paragraph import DBMemParagraph  # noqa: F401
 from .db_mem_reinforcement_log import DBMemReinforcementLog  # noqa: F401
 from .db_mem_relation import DBMemRelation  # noqa: F401
+from .db_outbox_message import DBOutboxMessage  # noqa: F401
 from .db_plugin_data import DBPluginData  # noqa: F401
 from .db_preset import DBPreset  # noqa: F401
 from .db_recurring_timer_job import DBRecurringTimerJob  # noqa: F401
@@ -56,8 +56,6 @@ class DBChatChannel(Model):
     create_time = fields.DatetimeField(auto_now_add=True, description="创建时间")
     update_time = fields.DatetimeField(auto_now=True, description="更新时间")
 
-    _effective_config: Optional["CoreConfig"] = None
-
     class Meta:  # type: ignore
         table = "chat_channel"
 
@@ -213,13 +211,15 @@ class DBChatChannel(Model):
 
     async def get_preset(self) -> Union[DBPreset, DefaultPreset]:
         """获取人设"""
+        from nekro_agent.services.admission_cache import admission_cache
+
         # 先尝试频道自身的 preset_id
-        preset = await DBPreset.get_or_none(id=self.preset_id)
+        preset = await admission_cache.get_preset(self.preset_id)
         if preset:
             return preset
         # 再尝试系统默认人设 ID
         if config.AI_CHAT_DEFAULT_PRESET_ID is not None:
-            default_preset = await DBPreset.get_or_none(id=config.AI_CHAT_DEFAULT_PRESET_ID)
+            default_preset = await admission_cache.get_preset(config.AI_CHAT_DEFAULT_PRESET_ID)
             if default_preset:
                 return default_preset
         # 最终回退到内置默认人设
@@ -233,9 +233,8 @@ class DBChatChannel(Model):
         return adapter_utils.get_adapter(self.adapter_key)
 
     async def get_effective_config(self) -> "CoreConfig":
-        if self._effective_config is None:
-            self._effective_config = await config_resolver.get_effective_config(self.chat_key)
-        return self._effective_config
+        # 有效配置由 config_resolver 按配置版本号缓存，这里不再做实例级缓存，避免长期缓存的频道实例读到旧配置
+        return await config_resolver.get_effective_config(self.chat_key)
 
     async def set_preset(self, preset_id: Optional[int] = None) -> str:
         """设置聊天频道人设
@@ -1,6 +1,9 @@
 from tortoise import fields
 from tortoise.models import Model
 
+# 早期版本以会随删除变化的 IMAP 序号作为 email_uid，迁移时为这些记录加上此前缀，由适配器按 Message-ID 对账为 UID
+LEGACY_SEQ_PREFIX = "seq:"
+
 
 class DBEmail(Model):
     """邮件模型，用于存储已处理的邮件信息"""
@@ -22,6 +25,16 @@ class DBEmail(Model):
     create_time = fields.DatetimeField(auto_now_add=True, description="创建时间")
     update_time = fields.DatetimeField(auto_now=True, description="更新时间")
 
+    @property
+    def is_legacy_seq(self) -> bool:
+        """email_uid 是否仍为迁移前的序号"""
+        return self.email_uid.startswith(LEGACY_SEQ_PREFIX)
+
+    @property
+    def storage_key(self) -> str:
+        """附件目录名，旧记录的附件仍位于以序号命名的目录下"""
+        return self.email_uid.removeprefix(LEGACY_SEQ_PREFIX)
+
     class Meta:  # type: ignore
         table = "email"
         unique_together = (("account_username", "email_uid"),)
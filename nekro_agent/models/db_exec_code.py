@@ -33,6 +33,7 @@ class DBExecCode(Model):
     exec_time_ms = fields.IntField(default=0, description="执行时间(毫秒)")
     generation_time_ms = fields.IntField(default=0, description="生成时间(毫秒)")
     total_time_ms = fields.IntField(default=0, description="响应总耗时(毫秒)")
+    first_reply_time_ms = fields.IntField(default=0, description="首条回复耗时(毫秒)")
 
     extra_data = fields.TextField(default="", description="额外数据")
 
@@ -0,0 +1,20 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class DBOutboxMessage(Model):
+    """待投递的出站消息"""
+
+    id = fields.IntField(pk=True, generated=True)
+    adapter_key = fields.CharField(max_length=64, description="适配器标识")
+    chat_key = fields.CharField(max_length=256, index=True, description="目标聊天频道唯一标识")
+    payload = fields.TextField(description="发送请求 JSON（PlatformSendRequest）")
+    status = fields.CharField(max_length=16, default="pending", index=True, description="状态：pending/failed")
+    attempts = fields.IntField(default=0, description="已尝试次数")
+    last_error = fields.TextField(null=True, description="最近一次失败原因")
+    create_time = fields.DatetimeField(auto_now_add=True, index=True, description="创建时间")
+    update_time = fields.DatetimeField(auto_now=True, description="更新时间")
+
+    class Meta:
+        table = "outbox_message"
+        ordering = ["id"]
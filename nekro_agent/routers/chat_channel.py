@@ -22,7 +22,9 @@ from nekro_agent.models.db_recurring_timer_job import DBRecurringTimerJob
 from nekro_agent.models.db_user import DBUser
 from nekro_agent.schemas.agent_message import AgentMessageSegment, AgentMessageSegmentType
 from nekro_agent.schemas.errors import AdapterUnavailableError, NotFoundError, ValidationError
+from nekro_agent.services.admission_cache import admission_cache
 from nekro_agent.services.channel_broadcaster import channel_broadcaster
+from nekro_agent.services.chat.history_search import chat_history_search
 from nekro_agent.services.config_resolver import config_resolver
 from nekro_agent.services.message_service import message_service
 from nekro_agent.services.user.deps import get_current_active_user
@@ -467,19 +469,36 @@ async def get_chat_channel_messages(
     chat_key: str,
     before_id: Optional[int] = None,
     page_size: int = 32,
+    search: Optional[str] = None,
     _current_user: DBUser = Depends(get_current_active_user),
 ) -> ChatMessageListResponse:
-    """获取聊天频道消息列表"""
+    """获取聊天频道消息列表
+
+    传入 `search` 时按关键词检索（空格分隔，支持 `+词` / `-词`），结果同样按时间倒序分页
+    """
     channel = await DBChatChannel.filter(chat_key=chat_key).first()
     if not channel:
         raise NotFoundError(resource="聊天频道")
 
-    query = DBChatMessage.filter(chat_key=chat_key, create_time__gte=channel.conversation_start_time)
-    if before_id:
-        query = query.filter(id__lt=before_id)
+    keywords = search.split() if search else []
+    if keywords:
+        start_timestamp = int(channel.conversation_start_time.timestamp())
+        messages = await chat_history_search.search_messages(
+            chat_key,
+            keywords,
+            start_timestamp=start_timestamp,
+            limit=page_size,
+            before_id=before_id,
+            rank=False,
+        )
+        total = await chat_history_search.count(chat_key, keywords, start_timestamp=start_timestamp, before_id=before_id)
+    else:
+        query = DBChatMessage.filter(chat_key=chat_key, create_time__gte=channel.conversation_start_time)
+        if before_id:
+            query = query.filter(id__lt=before_id)
 
-    total = await query.count()
-    messages = await query.order_by("-id").limit(page_size)
+        total = await query.count()
+        messages = await query.order_by("-id").limit(page_size)
 
     def _parse_content_data(raw: str) -> List[Dict[str, Any]]:
         try:
@@ -803,6 +822,8 @@ async def _send_message_via_webui(
             save_path = upload_dir / safe_filename
             max_upload_size = 100 * 1024 * 1024
             total_size = 0
+            # 同名文件可能是指向共享内容的硬链接，先解除链接再写入，避免就地覆写其他频道的内容
+            save_path.unlink(missing_ok=True)
             with save_path.open("wb") as f:
                 while chunk := await file.read(1024 * 1024):
                     total_size += len(chunk)
@@ -1062,9 +1083,11 @@ async def delete_chat_channel(
     # 4. 分批删除消息，防止大频道超时
     while await DBChatMessage.filter(chat_key=chat_key).limit(1000).delete():
         pass
+    chat_history_search.invalidate(chat_key)
 
     # 5. 删除频道主记录
     await DBChatChannel.filter(chat_key=chat_key).delete()
+    admission_cache.invalidate_chat_key(chat_key)
 
     # 6. 清理文件系统（容错处理）
     upload_dir = Path(USER_UPLOAD_DIR) / sanitize_chat_key_for_path(chat_key)
@@ -14,6 +14,11 @@ from nekro_agent.models.db_chat_message import DBChatMessage
 from nekro_agent.models.db_exec_code import DBExecCode, ExecStopType
 from nekro_agent.models.db_user import DBUser
 from nekro_agent.schemas.chat_message import ChatType
+from nekro_agent.services.agent.model_router import ModelRouterSnapshot, model_router
+from nekro_agent.services.agent_run_scheduler import RunSchedulerSnapshot
+from nekro_agent.services.message_rules import RuleHitStat, message_rule_engine
+from nekro_agent.services.message_service import message_service
+from nekro_agent.services.perf_metrics import PerfSnapshot, perf_metrics
 from nekro_agent.services.runtime_state import is_shutting_down
 from nekro_agent.services.user.deps import get_current_active_user
 
@@ -480,3 +485,37 @@ async def get_distributions(
         stop_type=stop_type_data,
         message_type=message_type_data,
     )
+
+
+@router.get("/perf", summary="获取进程内性能指标")
+async def get_perf_metrics(
+    prefix: str = Query("", description="指标名前缀过滤，如 admission."),
+    _current_user: DBUser = Depends(get_current_active_user),
+) -> PerfSnapshot:
+    """获取消息准入等热路径的分阶段耗时与缓存命中计数（进程内统计，重启清零）"""
+    return perf_metrics.snapshot(prefix)
+
+
+@router.get("/message-rules", summary="获取消息准入规则命中统计")
+async def get_message_rule_stats(
+    kind: str = Query("", description="规则类型过滤：trigger / ignore / fake"),
+    _current_user: DBUser = Depends(get_current_active_user),
+) -> List[RuleHitStat]:
+    """获取触发、忽略与伪造消息规则的逐条命中次数（进程内统计，重启清零）"""
+    return [stat for stat in message_rule_engine.hit_stats() if not kind or stat.kind == kind]
+
+
+@router.get("/agent-scheduler", summary="获取 Agent 运行调度状态")
+async def get_agent_scheduler_status(
+    _current_user: DBUser = Depends(get_current_active_user),
+) -> RunSchedulerSnapshot:
+    """获取运行槽位占用、各优先级排队数量与各适配器背压状态"""
+    return message_service.run_scheduler.snapshot()
+
+
+@router.get("/model-router", summary="获取模型组路由状态")
+async def get_model_router_status(
+    _current_user: DBUser = Depends(get_current_active_user),
+) -> ModelRouterSnapshot:
+    """获取各模型组的近期耗时、错误率、熔断状态与最近的路由决策（进程内统计，重启清零）"""
+    return model_router.snapshot()
@@ -165,11 +165,12 @@ def _build_attachment_items(account_username: str, email_uid: str, raw_attachmen
         return []
 
     base_dir = Path(OsEnv.DATA_DIR) / "uploads" / "email_attachment" / account_username / email_uid
+    lazy_names = _get_lazy_attachment_names(account_username, email_uid)
     items: list[EmailAttachmentItem] = []
     for name in attachment_names:
         safe_name = Path(name).name
         file_path = base_dir / safe_name
-        if not file_path.exists() or not file_path.is_file():
+        if (not file_path.exists() or not file_path.is_file()) and safe_name not in lazy_names:
             continue
 
         extension = file_path.suffix.lower()
@@ -186,6 +187,16 @@ def _build_attachment_items(account_username: str, email_uid: str, raw_attachmen
     return items
 
 
+def _get_lazy_attachment_names(account_username: str, email_uid: str) -> set[str]:
+    """大邮件中尚未下载、可按需拉取的附件名"""
+    from nekro_agent.adapters.email.routers import get_email_adapter
+
+    list_lazy_attachments = getattr(get_email_adapter(), "list_lazy_attachments", None)
+    if list_lazy_attachments is None:
+        return set()
+    return set(list_lazy_attachments(account_username, email_uid))
+
+
 def parse_json_names(raw_value: str) -> List[str]:
     if not raw_value:
         return []
@@ -264,7 +275,7 @@ async def get_email_detail(
         body_text=email.body_text,
         has_attachments=email.has_attachments,
         attachment_names=email.attachment_names,
-        attachments=_build_attachment_items(email.account_username, email.email_uid, email.attachment_names),
+        attachments=_build_attachment_items(email.account_username, email.storage_key, email.attachment_names),
         in_reply_to=email.in_reply_to,
         references=email.references,
         create_time=email.create_time.isoformat(),
@@ -284,7 +295,14 @@ async def get_email_raw_content(
     from nekro_agent.adapters.email.routers import get_email_adapter
 
     adapter = get_email_adapter()
-    raw_content = await adapter.get_raw_email_content(email.account_username, email.email_uid)
+    email_uid = email.email_uid
+    if email.is_legacy_seq:
+        # 旧记录存的是序号，先按 Message-ID 对账出 UID
+        reconcile_legacy_email = getattr(adapter, "reconcile_legacy_email", None)
+        email_uid = await reconcile_legacy_email(email) if reconcile_legacy_email else None
+        if email_uid is None:
+            raise NotFoundError(resource="邮件正文")
+    raw_content = await adapter.get_raw_email_content(email.account_username, email_uid)
     return EmailRawContent(
         html_content=str(raw_content.get("html_content") or ""),
         text_content=str(raw_content.get("text_content") or ""),
@@ -305,7 +323,15 @@ async def get_email_attachment(
     filepath = Path(OsEnv.DATA_DIR) / "uploads" / "email_attachment" / safe_account / safe_uid / safe_filename
 
     if not filepath.exists() or not filepath.is_file():
-        raise NotFoundError(resource="附件")
+        from nekro_agent.adapters.email.routers import get_email_adapter
+
+        # 大邮件的附件在首次查看时才从服务器下载
+        download_lazy_attachment = getattr(get_email_adapter(), "download_lazy_attachment", None)
+        downloaded = (
+            await download_lazy_attachment(safe_account, safe_uid, safe_filename) if download_lazy_attachment else None
+        )
+        if downloaded is None or not filepath.is_file():
+            raise NotFoundError(resource="附件")
 
     suffix = filepath.suffix.lower().lstrip(".")
     media_map = {
@@ -1,5 +1,6 @@
 import json
 import pickle
+from typing import Any, Dict, List, Tuple
 
 from fastapi import APIRouter, Depends, Header, Request, Response
 
@@ -9,14 +10,23 @@ from nekro_agent.core.os_env import OsEnv
 from nekro_agent.schemas.errors import NotFoundError, UnauthorizedError
 from nekro_agent.schemas.rpc import RPCRequest
 from nekro_agent.services.message_service import message_service
+from nekro_agent.services.perf_metrics import perf_metrics
 from nekro_agent.services.plugin.collector import plugin_collector
 from nekro_agent.services.plugin.schema import SandboxMethodType
 from nekro_agent.services.plugin.utils import get_sandbox_method_type
-from nekro_agent.services.rpc_service import decode_rpc_request, execute_rpc_method
+from nekro_agent.services.rpc_service import (
+    decode_rpc_batch_request,
+    decode_rpc_request,
+    encode_rpc_payload,
+    execute_rpc_method,
+    is_framed_payload,
+)
 
 logger = get_sub_logger("rpc_bridge")
 router = APIRouter(prefix="/ext", tags=["Tools"])
 
+_BATCH_STOP_METHOD_TYPES = (SandboxMethodType.AGENT, SandboxMethodType.MULTIMODAL_AGENT)
+
 
 async def verify_rpc_token(x_rpc_token: str = Header(...)):
     """验证 RPC 调用令牌"""
@@ -26,20 +36,16 @@ async def verify_rpc_token(x_rpc_token: str = Header(...)):
     return True
 
 
-@router.post("/rpc_exec", summary="RPC 命令执行", dependencies=[Depends(verify_rpc_token)])
-async def rpc_exec(container_key: str, from_chat_key: str, data: Request) -> Response:
-    rpc_request: RPCRequest = decode_rpc_request(await data.body())
-
-    logger.info(f"收到 RPC 执行请求: {rpc_request.method}")
-
+async def _dispatch_rpc(
+    container_key: str,
+    from_chat_key: str,
+    rpc_request: RPCRequest,
+) -> Tuple[Any, str, SandboxMethodType]:
     method = plugin_collector.get_method(rpc_request.method)
     if not method:
         raise NotFoundError(resource="RPC 方法")
     method_type: SandboxMethodType = get_sandbox_method_type(method=method)
 
-    if not method:
-        raise NotFoundError(resource="RPC 方法")
-
     ctx: AgentCtx = await AgentCtx.create_by_chat_key(
         chat_key=from_chat_key,
         container_key=container_key,
@@ -47,14 +53,50 @@ async def rpc_exec(container_key: str, from_chat_key: str, data: Request) -> Res
     args = [ctx, *rpc_request.args] if rpc_request.args else [ctx]
     kwargs = rpc_request.kwargs or {}
 
-    result, error_message = await execute_rpc_method(method, args, kwargs)
+    with perf_metrics.timer(f"rpc.{rpc_request.method}"):
+        result, error_message = await execute_rpc_method(method, args, kwargs)
 
     if method_type in [SandboxMethodType.AGENT, SandboxMethodType.BEHAVIOR]:
         await message_service.push_system_message(chat_key=from_chat_key, agent_messages=str(result))
     if method_type == SandboxMethodType.MULTIMODAL_AGENT:
         result = f"<AGENT_RESULT>{json.dumps(result, ensure_ascii=False)}</AGENT_RESULT>"
+    return result, error_message, method_type
+
+
+@router.post("/rpc_exec", summary="RPC 命令执行", dependencies=[Depends(verify_rpc_token)])
+async def rpc_exec(container_key: str, from_chat_key: str, data: Request) -> Response:
+    raw_body = await data.body()
+    rpc_request: RPCRequest = decode_rpc_request(raw_body)
+
+    logger.info(f"收到 RPC 执行请求: {rpc_request.method}")
+
+    result, error_message, method_type = await _dispatch_rpc(container_key, from_chat_key, rpc_request)
+
+    if error_message:
+        content = error_message
+    elif is_framed_payload(raw_body):
+        content = encode_rpc_payload(result)
+    else:
+        # 旧版 api_caller 只能解析裸 pickle
+        content = pickle.dumps(result)
     return Response(
-        content=error_message or pickle.dumps(result),
+        content=content,
         media_type="application/octet-stream",
         headers={"Method-Type": method_type.value, "Run-Error": "True" if error_message else "False"},
     )
+
+
+@router.post("/rpc_batch", summary="RPC 批量命令执行", dependencies=[Depends(verify_rpc_token)])
+async def rpc_batch(container_key: str, from_chat_key: str, data: Request) -> Response:
+    """按顺序执行一批调用，遇到错误或 Agent 类方法时停止（沙盒会在该处退出，后续调用不应执行）"""
+    rpc_requests = decode_rpc_batch_request(await data.body())
+
+    logger.info(f"收到 RPC 批量执行请求: {[rpc_request.method for rpc_request in rpc_requests]}")
+
+    items: List[Dict[str, Any]] = []
+    for rpc_request in rpc_requests:
+        result, error_message, method_type = await _dispatch_rpc(container_key, from_chat_key, rpc_request)
+        items.append({"method_type": method_type.value, "error": error_message, "result": result})
+        if error_message or method_type in _BATCH_STOP_METHOD_TYPES:
+            break
+    return Response(content=encode_rpc_payload(items), media_type="application/octet-stream")
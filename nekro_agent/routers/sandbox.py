@@ -30,6 +30,7 @@ class SandboxLog(BaseModel):
     exec_time_ms: int
     generation_time_ms: int
     total_time_ms: int
+    first_reply_time_ms: int
     use_model: str
     extra_data: str
 
@@ -96,6 +97,7 @@ async def get_sandbox_logs(
                 exec_time_ms=log.exec_time_ms,
                 generation_time_ms=log.generation_time_ms,
                 total_time_ms=log.total_time_ms,
+                first_reply_time_ms=log.first_reply_time_ms,
                 use_model=log.use_model,
                 extra_data=log.extra_data,
             )
@@ -5,3 +5,7 @@ class RPCRequest(BaseModel):
     method: str = Field(..., description="远程调用的方法名")
     args: list = Field(default_factory=list, description="远程调用方法的参数")
     kwargs: dict = Field(default_factory=dict, description="远程调用方法的关键字参数")
+
+
+class RPCBatchRequest(BaseModel):
+    calls: list[RPCRequest] = Field(default_factory=list, description="按顺序执行的远程调用列表")
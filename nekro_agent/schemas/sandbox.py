@@ -1,10 +1,23 @@
 import json
+from typing import Dict, Optional
 
 from pydantic import BaseModel
 
 from nekro_agent.services.agent.openai import OpenAIResponse
 
 
+class RPCMethodLatency(BaseModel):
+    """沙盒内单个扩展方法的 RPC 往返耗时统计"""
+
+    calls: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return round(self.total_ms / self.calls, 2) if self.calls else 0
+
+
 class SandboxCodeExtData(BaseModel):
     message_cnt: int
     token_consumption: int
@@ -22,12 +35,14 @@ class SandboxCodeExtData(BaseModel):
     log_path: str = ""
     llm_retry_count: int = 0
     llm_retry_errors: list[str] = []
+    rpc_latency: Dict[str, RPCMethodLatency] = {}
 
     @classmethod
     def create_from_llm_response(
         cls,
         llm_response: OpenAIResponse,
         llm_retry_errors: list[str] | None = None,
+        rpc_latency: Optional[Dict[str, RPCMethodLatency]] = None,
     ) -> "SandboxCodeExtData":
         speed_chars_per_second = (
             len(llm_response.response_content) / (llm_response.generation_time_ms / 1000)
@@ -69,6 +84,7 @@ class SandboxCodeExtData(BaseModel):
             log_path=str(llm_response.log_path) if llm_response.log_path else "",
             llm_retry_count=len(llm_retry_errors) if llm_retry_errors else 0,
             llm_retry_errors=llm_retry_errors or [],
+            rpc_latency=rpc_latency or {},
         )
 
     def model_dump_json(self) -> str:
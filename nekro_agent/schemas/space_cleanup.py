@@ -13,6 +13,7 @@ class ResourceType(str, Enum):
     """资源类型枚举"""
 
     USER_UPLOADS = "user_uploads"  # 用户上传资源
+    UPLOAD_BLOBS = "upload_blobs"  # 上传资源内容存储（仅回收未被引用的内容）
     SANDBOX_SHARED = "sandbox_shared"  # 沙盒共享目录
     SANDBOX_PIP_CACHE = "sandbox_pip_cache"  # pip缓存
     SANDBOX_PACKAGES = "sandbox_packages"  # 沙盒包
@@ -0,0 +1,222 @@
+"""消息准入缓存
+
+入站消息准入链路（频道 → 用户 → 人设）的进程内 TTL 缓存。
+
+每条平台消息都需要解析所属频道、发送者与频道人设，原先每次都直接查询数据库。
+这里按主键缓存模型实例，并通过 Tortoise 的 post_save / post_delete 信号在写入时失效，
+TTL 仅作为绕过模型实例的批量写入（`filter().update()`）的兜底。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar, Union
+
+from tortoise.signals import post_delete, post_save
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.models.db_chat_channel import DBChatChannel
+from nekro_agent.models.db_preset import DBPreset
+from nekro_agent.models.db_user import DBUser
+from nekro_agent.schemas.chat_message import ChatType
+from nekro_agent.services.perf_metrics import perf_metrics
+
+logger = get_sub_logger("admission_cache")
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CHANNEL_TTL_SECONDS = 60.0
+USER_TTL_SECONDS = 60.0
+PRESET_TTL_SECONDS = 300.0
+MAX_CACHE_ENTRIES = 20000
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """带过期时间与容量上限的 LRU 缓存"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = MAX_CACHE_ENTRIES) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K, default: Union[V, object] = _MISSING) -> Union[V, object]:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class AdmissionCache:
+    """入站消息准入缓存"""
+
+    def __init__(self) -> None:
+        self._channels: TTLCache[Tuple[str, str], DBChatChannel] = TTLCache(CHANNEL_TTL_SECONDS)
+        self._chat_key_index: Dict[str, Tuple[str, str]] = {}
+        self._users: TTLCache[Tuple[str, str], DBUser] = TTLCache(USER_TTL_SECONDS)
+        self._presets: TTLCache[int, Optional[DBPreset]] = TTLCache(PRESET_TTL_SECONDS)
+
+    # ------------------------------------------------------------------
+    # 频道
+    # ------------------------------------------------------------------
+
+    async def get_or_create_channel(
+        self,
+        adapter_key: str,
+        channel_id: str,
+        channel_type: ChatType,
+        channel_name: str = "",
+        chat_key: Optional[str] = None,
+    ) -> DBChatChannel:
+        """带缓存的 `DBChatChannel.get_or_create`
+
+        频道名称或类型发生变化时仍走原有的更新逻辑，保证数据库与平台信息一致。
+        """
+        key = (adapter_key, channel_id)
+        cached = self._channels.get(key)
+        if isinstance(cached, DBChatChannel):
+            name_changed = bool(channel_name) and cached.channel_name != channel_name
+            type_changed = bool(channel_type) and cached.channel_type != channel_type.value
+            if not name_changed and not type_changed:
+                perf_metrics.incr("admission.cache.channel.hit")
+                return cached
+
+        perf_metrics.incr("admission.cache.channel.miss")
+        channel = await DBChatChannel.get_or_create(
+            adapter_key=adapter_key,
+            channel_id=channel_id,
+            channel_type=channel_type,
+            channel_name=channel_name,
+            chat_key=chat_key,
+        )
+        self._put_channel(key, channel)
+        return channel
+
+    async def get_channel(self, chat_key: str) -> DBChatChannel:
+        """带缓存的 `DBChatChannel.get_channel`"""
+        key = self._chat_key_index.get(chat_key)
+        if key is not None:
+            cached = self._channels.get(key)
+            if isinstance(cached, DBChatChannel):
+                perf_metrics.incr("admission.cache.channel.hit")
+                return cached
+
+        perf_metrics.incr("admission.cache.channel.miss")
+        channel = await DBChatChannel.get_channel(chat_key=chat_key)
+        self._put_channel((channel.adapter_key, channel.channel_id), channel)
+        return channel
+
+    def _put_channel(self, key: Tuple[str, str], channel: DBChatChannel) -> None:
+        self._channels.set(key, channel)
+        self._chat_key_index[channel.chat_key] = key
+
+    def invalidate_channel(self, channel: DBChatChannel) -> None:
+        self._channels.pop((channel.adapter_key, channel.channel_id))
+        self._chat_key_index.pop(channel.chat_key, None)
+
+    def invalidate_chat_key(self, chat_key: str) -> None:
+        key = self._chat_key_index.pop(chat_key, None)
+        if key is not None:
+            self._channels.pop(key)
+
+    # ------------------------------------------------------------------
+    # 用户
+    # ------------------------------------------------------------------
+
+    async def get_user(self, adapter_key: str, platform_userid: str) -> Optional[DBUser]:
+        """带缓存的 `DBUser.get_by_union_id`，未注册用户不缓存"""
+        key = (adapter_key, platform_userid)
+        cached = self._users.get(key)
+        if isinstance(cached, DBUser):
+            perf_metrics.incr("admission.cache.user.hit")
+            return cached
+
+        perf_metrics.incr("admission.cache.user.miss")
+        user = await DBUser.get_by_union_id(adapter_key=adapter_key, platform_userid=platform_userid)
+        if user:
+            self._users.set(key, user)
+        return user
+
+    def invalidate_user(self, user: DBUser) -> None:
+        self._users.pop((user.adapter_key, user.platform_userid))
+
+    # ------------------------------------------------------------------
+    # 人设
+    # ------------------------------------------------------------------
+
+    async def get_preset(self, preset_id: Optional[int]) -> Optional[DBPreset]:
+        """带缓存的人设查询，不存在的人设同样缓存为 None"""
+        if preset_id is None:
+            return None
+        cached = self._presets.get(preset_id)
+        if cached is not _MISSING:
+            perf_metrics.incr("admission.cache.preset.hit")
+            return cached if isinstance(cached, DBPreset) else None
+
+        perf_metrics.incr("admission.cache.preset.miss")
+        preset = await DBPreset.get_or_none(id=preset_id)
+        self._presets.set(preset_id, preset)
+        return preset
+
+    def invalidate_preset(self, preset_id: int) -> None:
+        self._presets.pop(preset_id)
+
+    def clear(self) -> None:
+        self._channels.clear()
+        self._chat_key_index.clear()
+        self._users.clear()
+        self._presets.clear()
+
+
+admission_cache = AdmissionCache()
+
+
+@post_save(DBChatChannel)
+async def _on_channel_saved(sender, instance: DBChatChannel, created, using_db, update_fields) -> None:  # noqa: ARG001
+    admission_cache.invalidate_channel(instance)
+
+
+@post_delete(DBChatChannel)
+async def _on_channel_deleted(sender, instance: DBChatChannel, using_db) -> None:  # noqa: ARG001
+    admission_cache.invalidate_channel(instance)
+
+
+@post_save(DBUser)
+async def _on_user_saved(sender, instance: DBUser, created, using_db, update_fields) -> None:  # noqa: ARG001
+    admission_cache.invalidate_user(instance)
+
+
+@post_delete(DBUser)
+async def _on_user_deleted(sender, instance: DBUser, using_db) -> None:  # noqa: ARG001
+    admission_cache.invalidate_user(instance)
+
+
+@post_save(DBPreset)
+async def _on_preset_saved(sender, instance: DBPreset, created, using_db, update_fields) -> None:  # noqa: ARG001
+    admission_cache.invalidate_preset(instance.id)
+
+
+@post_delete(DBPreset)
+async def _on_preset_deleted(sender, instance: DBPreset, using_db) -> None:  # noqa: ARG001
+    admission_cache.invalidate_preset(instance.id)
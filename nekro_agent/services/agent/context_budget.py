@@ -0,0 +1,236 @@
+"""上下文 Token 预算
+
+历史记录按条数 / 字符长度裁剪时，提示词的真实 Token 开销直到请求被模型拒绝或截断才暴露。
+模型组配置 `CONTEXT_TOKEN_BUDGET` 后，提示词组装改为按本地分词器计量并分段分配预算：
+- 分词器按模型族选择 tiktoken 编码；编码不可用（本地无缓存且无法下载）或模型族无对应编码时按字符比例估算
+- system 与插件提示词为固定开销，先行扣除
+- 图片与记忆在剩余预算中各有占比上限，历史记录从新到旧贪心装入余下部分
+- 分配结果随 `AgentRuntimeStatusEvent` 广播并写入提示词日志
+"""
+
+import asyncio
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import tiktoken
+
+from nekro_agent.core.config import ModelConfigGroup
+from nekro_agent.core.logger import get_sub_logger
+
+from .creator import OpenAIChatMessage
+
+logger = get_sub_logger("context_budget")
+
+# 图片在剩余预算中的最大占比
+IMAGE_BUDGET_SHARE = 0.25
+# 记忆在剩余预算中的最大占比
+MEMORY_BUDGET_SHARE = 0.15
+# 单张图片的 Token 估算（约为 1024x1024 图片在高细节模式下的开销）
+IMAGE_TOKEN_ESTIMATE = 765
+# 每条消息的角色与分隔格式开销
+MESSAGE_TOKEN_OVERHEAD = 4
+
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+
+class TokenCounter:
+    """Token 计数器"""
+
+    name: str = ""
+
+    def count(self, text: str) -> int:
+        raise NotImplementedError
+
+
+class TiktokenCounter(TokenCounter):
+    """基于 tiktoken BPE 编码的精确计数"""
+
+    def __init__(self, encoding: Any) -> None:
+        self._encoding = encoding
+        self.name = f"tiktoken:{encoding.name}"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+class RatioTokenCounter(TokenCounter):
+    """按字符比例估算：CJK 字符按每字 Token 数计，其余字符按每 Token 字符数计"""
+
+    def __init__(self, chars_per_token: float = 4.0, tokens_per_cjk_char: float = 1.0) -> None:
+        self.chars_per_token = chars_per_token
+        self.tokens_per_cjk_char = tokens_per_cjk_char
+        self.name = f"ratio:{chars_per_token:g}/{tokens_per_cjk_char:g}"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        cjk_chars = len(_CJK_PATTERN.findall(text))
+        return math.ceil(cjk_chars * self.tokens_per_cjk_char + (len(text) - cjk_chars) / self.chars_per_token)
+
+
+@dataclass(frozen=True)
+class TokenizerFamily:
+    """模型族的分词配置，`encoding` 为空表示只按字符比例估算"""
+
+    prefixes: Tuple[str, ...]
+    encoding: str = ""
+    chars_per_token: float = 4.0
+    tokens_per_cjk_char: float = 1.0
+
+
+# 按顺序匹配模型名前缀，更具体的前缀需排在前面
+TOKENIZER_FAMILIES: List[TokenizerFamily] = [
+    TokenizerFamily(("gpt-4o", "gpt-4.1", "gpt-4.5", "gpt-5", "chatgpt-4o", "o1", "o3", "o4"), encoding="o200k_base"),
+    TokenizerFamily(("gpt-4", "gpt-3.5"), encoding="cl100k_base"),
+    TokenizerFamily(("claude",), chars_per_token=3.5, tokens_per_cjk_char=1.2),
+    TokenizerFamily(("gemini", "gemma"), chars_per_token=4.0, tokens_per_cjk_char=0.8),
+    TokenizerFamily(
+        ("deepseek", "qwen", "qwq", "glm", "chatglm", "moonshot", "kimi", "doubao", "hunyuan", "ernie", "yi-"),
+        chars_per_token=3.5,
+        tokens_per_cjk_char=0.7,
+    ),
+]
+DEFAULT_TOKENIZER_FAMILY = TokenizerFamily((), chars_per_token=3.5, tokens_per_cjk_char=1.0)
+
+# 编码名 -> 计数器，加载失败记为 None，进程内不再重试
+_encoding_counters: Dict[str, Optional[TokenCounter]] = {}
+
+
+def register_tokenizer_family(family: TokenizerFamily) -> None:
+    """注册模型族分词配置，优先于内置配置匹配"""
+    TOKENIZER_FAMILIES.insert(0, family)
+
+
+def resolve_tokenizer_family(model_name: str) -> TokenizerFamily:
+    name = model_name.rsplit("/", 1)[-1].strip().lower()
+    for family in TOKENIZER_FAMILIES:
+        if any(name.startswith(prefix) for prefix in family.prefixes):
+            return family
+    return DEFAULT_TOKENIZER_FAMILY
+
+
+async def _load_encoding_counter(encoding_name: str) -> Optional[TokenCounter]:
+    if encoding_name in _encoding_counters:
+        return _encoding_counters[encoding_name]
+    counter: Optional[TokenCounter] = None
+    try:
+        # 首次使用可能需要下载编码文件，放到线程中避免阻塞事件循环
+        counter = TiktokenCounter(await asyncio.to_thread(tiktoken.get_encoding, encoding_name))
+    except Exception as e:
+        logger.warning(f"加载 tiktoken 编码 {encoding_name} 失败，改为按字符比例估算 Token: {e}")
+    _encoding_counters[encoding_name] = counter
+    return counter
+
+
+async def get_token_counter(model_group: ModelConfigGroup) -> TokenCounter:
+    """获取模型组使用的 Token 计数器"""
+    family = resolve_tokenizer_family(model_group.CHAT_MODEL)
+    encoding_name = model_group.TOKENIZER.strip() or family.encoding
+    if encoding_name:
+        counter = await _load_encoding_counter(encoding_name)
+        if counter is not None:
+            return counter
+    return RatioTokenCounter(family.chars_per_token, family.tokens_per_cjk_char)
+
+
+def count_message_tokens(counter: TokenCounter, messages: Sequence[OpenAIChatMessage]) -> int:
+    """统计消息列表的 Token 数，图片按固定开销估算"""
+    total = 0
+    for message in messages:
+        total += MESSAGE_TOKEN_OVERHEAD
+        for part in message.content:
+            if part.get("type") == "text":
+                total += counter.count(part.get("text", ""))
+            else:
+                total += IMAGE_TOKEN_ESTIMATE
+    return total
+
+
+@dataclass
+class ContextBudget:
+    """单次提示词组装的 Token 预算账本"""
+
+    total: int
+    counter: TokenCounter
+    sections: Dict[str, int] = field(default_factory=dict)
+    history_kept: int = 0
+    history_dropped: int = 0
+    images_dropped: int = 0
+    memory_trimmed: bool = False
+    # 首次分配弹性分段（图片 / 记忆）时的剩余预算，各分段占比以此为基数
+    _elastic_base: Optional[int] = None
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    @property
+    def used(self) -> int:
+        return sum(self.sections.values())
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.total - self.used)
+
+    def charge(self, section: str, tokens: int) -> None:
+        """记入固定开销"""
+        self.sections[section] = self.sections.get(section, 0) + max(0, tokens)
+
+    def _section_cap(self, share: float) -> int:
+        if self._elastic_base is None:
+            self._elastic_base = self.remaining
+        return min(self.remaining, int(self._elastic_base * share))
+
+    def allot_images(self, count: int) -> int:
+        """返回可保留的图片数量（调用方保留最新的图片）"""
+        kept = min(count, self._section_cap(IMAGE_BUDGET_SHARE) // IMAGE_TOKEN_ESTIMATE)
+        self.images_dropped += count - kept
+        self.charge("images", kept * IMAGE_TOKEN_ESTIMATE)
+        return kept
+
+    def fit_memory(self, text: str) -> str:
+        """按行截取记忆上下文，记忆按重要性排列，超出上限时丢弃靠后的行"""
+        cap = self._section_cap(MEMORY_BUDGET_SHARE)
+        kept_lines: List[str] = []
+        used = 0
+        for line in text.splitlines(keepends=True):
+            cost = self.count(line)
+            if used + cost > cap:
+                self.memory_trimmed = True
+                break
+            kept_lines.append(line)
+            used += cost
+        self.charge("memory", used)
+        return "".join(kept_lines)
+
+    def pack_history(self, prompts: Sequence[str], separator: str = "") -> int:
+        """从新到旧贪心装入历史记录，返回保留部分的起始下标"""
+        separator_cost = self.count(separator)
+        budget = self.remaining
+        used = 0
+        start = len(prompts)
+        for index in range(len(prompts) - 1, -1, -1):
+            cost = self.count(prompts[index]) + separator_cost
+            if used + cost > budget:
+                break
+            used += cost
+            start = index
+        self.charge("history", used)
+        self.history_kept = len(prompts) - start
+        self.history_dropped = start
+        return start
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "tokenizer": self.counter.name,
+            "budget": self.total,
+            "used": self.used,
+            "sections": dict(self.sections),
+            "history_kept": self.history_kept,
+            "history_dropped": self.history_dropped,
+            "images_dropped": self.images_dropped,
+            "memory_trimmed": self.memory_trimmed,
+        }
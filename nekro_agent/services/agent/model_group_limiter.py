@@ -0,0 +1,119 @@
+"""模型组并发与速率限制
+
+按 `ModelConfigGroup` 中的 `MAX_CONCURRENCY` / `RPM_LIMIT` / `TPM_LIMIT` 对同一模型组的 LLM 请求限流：
+- 并发数通过信号量控制，RPM 与 TPM 各使用一个令牌桶
+- TPM 在请求前按提示词长度预估扣减，请求完成后按实际 Token 消耗校正
+- 限制值变更后重建对应模型组的限流器，已在途的请求不受影响
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from nekro_agent.core.config import ModelConfigGroup
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.perf_metrics import perf_metrics
+from nekro_agent.services.token_bucket import TokenBucket
+
+from .creator import OpenAIChatMessage
+
+logger = get_sub_logger("model_group_limiter")
+
+
+def estimate_prompt_tokens(messages: List[OpenAIChatMessage]) -> int:
+    """粗略估算提示词 Token 数（按 4 字符 / Token）"""
+    chars = sum(len(part.get("text", "")) for message in messages for part in message.content)
+    return max(1, chars // 4)
+
+
+@dataclass
+class ModelGroupLease:
+    """一次已放行的请求，用于在完成后校正 Token 用量"""
+
+    limiter: "ModelGroupLimiter"
+    estimated_tokens: int
+
+    def settle(self, actual_tokens: int) -> None:
+        """按实际 Token 消耗校正预扣额度"""
+        if actual_tokens > 0:
+            self.limiter.tpm.consume(actual_tokens - self.estimated_tokens)
+
+
+class ModelGroupLimiter:
+    """单个模型组的限流器，各项限制 <= 0 表示不限制"""
+
+    def __init__(self, name: str, max_concurrency: int, rpm_limit: int, tpm_limit: int) -> None:
+        self.name = name
+        self.limits = (max_concurrency, rpm_limit, tpm_limit)
+        self.semaphore: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self.rpm = TokenBucket(rpm_limit)
+        # 单次请求可能占用较多 Token，TPM 桶容量放宽到一分钟配额
+        self.tpm = TokenBucket(tpm_limit, burst=tpm_limit)
+
+    @property
+    def saturated(self) -> bool:
+        """并发槽位是否已占满"""
+        return self.semaphore is not None and self.semaphore.locked()
+
+    def quota_wait_seconds(self, estimated_tokens: int) -> float:
+        """按 RPM / TPM 余额估算本次请求需等待的秒数"""
+        return max(self.rpm.wait_seconds(), self.tpm.wait_seconds(estimated_tokens))
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int) -> AsyncIterator[ModelGroupLease]:
+        started = time.perf_counter()
+        if self.semaphore is not None:
+            await self.semaphore.acquire()
+        try:
+            await self.rpm.acquire()
+            await self.tpm.acquire(estimated_tokens)
+            perf_metrics.observe(f"llm.model_group_wait.{self.name}", (time.perf_counter() - started) * 1000)
+            yield ModelGroupLease(limiter=self, estimated_tokens=estimated_tokens)
+        finally:
+            if self.semaphore is not None:
+                self.semaphore.release()
+
+
+class ModelGroupLimiterRegistry:
+    """按模型组名缓存限流器"""
+
+    def __init__(self) -> None:
+        self._limiters: Dict[str, ModelGroupLimiter] = {}
+
+    @staticmethod
+    def _limits_of(group: ModelConfigGroup) -> Tuple[int, int, int]:
+        return group.MAX_CONCURRENCY, group.RPM_LIMIT, group.TPM_LIMIT
+
+    def get(self, name: str, group: ModelConfigGroup) -> Optional[ModelGroupLimiter]:
+        """获取模型组限流器，未配置任何限制时返回 None"""
+        limits = self._limits_of(group)
+        if not any(limit > 0 for limit in limits):
+            self._limiters.pop(name, None)
+            return None
+        limiter = self._limiters.get(name)
+        if limiter is None or limiter.limits != limits:
+            if limiter is not None:
+                logger.info(f"模型组 {name} 限流配置已变更: {limiter.limits} -> {limits}")
+            limiter = self._limiters[name] = ModelGroupLimiter(name, *limits)
+        return limiter
+
+    @asynccontextmanager
+    async def limit(
+        self,
+        name: str,
+        group: ModelConfigGroup,
+        messages: List[OpenAIChatMessage],
+    ) -> AsyncIterator[Optional[ModelGroupLease]]:
+        """在模型组限额内执行一次请求；未配置限制时直接放行"""
+        limiter = self.get(name, group)
+        if limiter is None:
+            yield None
+            return
+        estimated = estimate_prompt_tokens(messages) if group.TPM_LIMIT > 0 else 0
+        async with limiter.acquire(estimated) as lease:
+            yield lease
+
+
+model_group_limiters = ModelGroupLimiterRegistry()
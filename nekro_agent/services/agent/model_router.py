@@ -0,0 +1,383 @@
+"""模型组路由与熔断
+
+原先每次请求固定「主模型组重试 N-1 次、最后一次改用备用模型组」，主模型组持续故障时每轮对话都要先耗尽重试：
+- 按模型组记录滚动窗口内的请求耗时、首 Token 耗时与错误率
+- 熔断器：连续失败或窗口错误率过高时熔断，冷却后进入半开状态只放行一个探测请求，探测成功恢复，失败则加倍冷却
+- 只有 5xx、429、超时与连接错误计为模型组故障，请求内容导致的 4xx 等错误不影响熔断
+- 选中半开模型组时即预留探测名额，并发请求不会同时探测；请求未能发出时归还名额
+- 配置了相同 `ROUTING_POOL` 的聊天模型组视为等价，每次尝试按「熔断状态 > 本次请求是否已失败 > 预期耗时」择优，
+  预期耗时为按错误率折算重试开销后的近期平均耗时，再加上 RPM / TPM 限额的预计等待
+- 主模型组所在路由池全部熔断时提前切换到备用模型组，最后一次尝试仍优先使用备用模型组
+- 全部候选都处于熔断时仍按排序选择一个发出请求，不因熔断直接拒绝对话
+- 最近的路由决策保留在内存中，供仪表盘查看
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Collection, Deque, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+import httpx
+import openai
+from pydantic import BaseModel
+
+from nekro_agent.core.config import ModelConfigGroup
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.perf_metrics import perf_metrics
+
+from .creator import OpenAIChatMessage
+from .model_group_limiter import ModelGroupLimiter, estimate_prompt_tokens, model_group_limiters
+
+logger = get_sub_logger("model_router")
+
+# 统计窗口：最多保留的样本数与样本有效期（秒）
+STATS_WINDOW_SIZE = 50
+STATS_WINDOW_SECONDS = 10 * 60
+# 连续失败达到该次数时熔断
+BREAKER_CONSECUTIVE_FAILURES = 3
+# 窗口内样本数不少于该值且错误率达到阈值时熔断
+BREAKER_MIN_SAMPLES = 10
+BREAKER_ERROR_RATE = 0.5
+# 熔断冷却时间（秒），半开探测失败后加倍，不超过上限
+BREAKER_COOLDOWN_SECONDS = 30.0
+BREAKER_MAX_COOLDOWN_SECONDS = 300.0
+# 折算重试开销时成功率的下限
+MIN_SUCCESS_RATE = 0.1
+# 保留的路由决策条数
+MAX_ROUTING_DECISIONS = 100
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """是否为模型组自身的故障：5xx、429、超时与连接错误"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+    if isinstance(status_code, int):
+        return status_code >= 500 or status_code == 429
+    return isinstance(
+        error,
+        (openai.APIConnectionError, httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError),
+    )
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class _Sample:
+    at: float
+    ok: bool
+    latency_ms: float = 0.0
+    ttft_ms: float = 0.0
+
+
+class EndpointStatus(BaseModel):
+    """单个模型组的健康状态"""
+
+    name: str
+    state: BreakerState
+    samples: int
+    error_rate: float
+    latency_ms: Optional[float]
+    ttft_ms: Optional[float]
+    consecutive_failures: int
+    open_remaining_seconds: float
+    last_error: str
+
+
+class RouteCandidate(BaseModel):
+    name: str
+    state: BreakerState
+    failed_this_request: bool
+    expected_ms: float
+    quota_wait_ms: float
+
+
+class RoutingDecision(BaseModel):
+    """一次模型组选择"""
+
+    timestamp: float
+    chat_key: str
+    attempt: int
+    chosen: str
+    reason: str
+    candidates: List[RouteCandidate]
+
+
+class ModelRouterSnapshot(BaseModel):
+    endpoints: List[EndpointStatus]
+    decisions: List[RoutingDecision]
+
+
+class EndpointHealth:
+    """单个模型组的滚动统计与熔断器"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = BREAKER_COOLDOWN_SECONDS
+        self.opened_until = 0.0
+        self.probing = False
+        self.last_error = ""
+        self._samples: Deque[_Sample] = deque(maxlen=STATS_WINDOW_SIZE)
+
+    def _recent(self) -> List[_Sample]:
+        expire_before = time.monotonic() - STATS_WINDOW_SECONDS
+        while self._samples and self._samples[0].at < expire_before:
+            self._samples.popleft()
+        return list(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        samples = self._recent()
+        return sum(not s.ok for s in samples) / len(samples) if samples else 0.0
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        latencies = [s.latency_ms for s in self._recent() if s.ok]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        ttfts = [s.ttft_ms for s in self._recent() if s.ok and s.ttft_ms > 0]
+        return sum(ttfts) / len(ttfts) if ttfts else None
+
+    def current_state(self) -> BreakerState:
+        if self.state == BreakerState.OPEN and time.monotonic() >= self.opened_until:
+            self.state = BreakerState.HALF_OPEN
+            logger.info(f"模型组 {self.name} 熔断冷却结束，进入半开状态等待探测")
+        return self.state
+
+    @property
+    def available(self) -> bool:
+        state = self.current_state()
+        return state == BreakerState.CLOSED or (state == BreakerState.HALF_OPEN and not self.probing)
+
+    def reserve(self) -> bool:
+        """半开状态下预留唯一的探测名额"""
+        if self.current_state() == BreakerState.HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def begin(self) -> None:
+        if self.current_state() == BreakerState.HALF_OPEN:
+            self.probing = True
+
+    def release(self) -> None:
+        """请求被取消或失败原因与模型组无关，不计入统计"""
+        self.probing = False
+
+    def _trip(self, cooldown: float) -> None:
+        self.state = BreakerState.OPEN
+        self.cooldown = min(cooldown, BREAKER_MAX_COOLDOWN_SECONDS)
+        self.opened_until = time.monotonic() + self.cooldown
+        perf_metrics.incr(f"llm.breaker_open.{self.name}")
+        logger.warning(
+            f"模型组 {self.name} 熔断 {self.cooldown:.0f} 秒: 连续失败 {self.consecutive_failures} 次，"
+            f"近期错误率 {self.error_rate:.0%}，最近错误: {self.last_error}",
+        )
+
+    def record_success(self, latency_ms: float, ttft_ms: float = 0.0) -> None:
+        self._samples.append(_Sample(at=time.monotonic(), ok=True, latency_ms=latency_ms, ttft_ms=ttft_ms))
+        self.consecutive_failures = 0
+        self.probing = False
+        if self.state != BreakerState.CLOSED:
+            logger.info(f"模型组 {self.name} 探测成功，解除熔断")
+            self.state = BreakerState.CLOSED
+            self.cooldown = BREAKER_COOLDOWN_SECONDS
+
+    def record_failure(self, error: str) -> None:
+        self._samples.append(_Sample(at=time.monotonic(), ok=False))
+        self.consecutive_failures += 1
+        self.last_error = error[:200]
+        was_probing, self.probing = self.probing, False
+        state = self.current_state()
+        if state == BreakerState.OPEN:
+            return
+        if state == BreakerState.HALF_OPEN or was_probing:
+            self._trip(self.cooldown * 2)
+            return
+        samples = self._recent()
+        if self.consecutive_failures >= BREAKER_CONSECUTIVE_FAILURES or (
+            len(samples) >= BREAKER_MIN_SAMPLES and self.error_rate >= BREAKER_ERROR_RATE
+        ):
+            self._trip(BREAKER_COOLDOWN_SECONDS)
+
+    def status(self) -> EndpointStatus:
+        state = self.current_state()
+        latency, ttft = self.latency_ms, self.ttft_ms
+        return EndpointStatus(
+            name=self.name,
+            state=state,
+            samples=len(self._recent()),
+            error_rate=round(self.error_rate, 4),
+            latency_ms=round(latency, 1) if latency is not None else None,
+            ttft_ms=round(ttft, 1) if ttft is not None else None,
+            consecutive_failures=self.consecutive_failures,
+            open_remaining_seconds=round(max(0.0, self.opened_until - time.monotonic()), 1)
+            if state == BreakerState.OPEN
+            else 0.0,
+            last_error=self.last_error,
+        )
+
+
+class RouteAttempt:
+    """一次已选定模型组的请求，退出时记录结果"""
+
+    def __init__(self, health: EndpointHealth) -> None:
+        self.health = health
+        self.ttft_ms = 0.0
+
+
+class ModelRouter:
+    """按模型组统计健康状态并在等价模型组间择优"""
+
+    def __init__(self) -> None:
+        self._health: Dict[str, EndpointHealth] = {}
+        self._decisions: Deque[RoutingDecision] = deque(maxlen=MAX_ROUTING_DECISIONS)
+
+    def health(self, name: str) -> EndpointHealth:
+        health = self._health.get(name)
+        if health is None:
+            health = self._health[name] = EndpointHealth(name)
+        return health
+
+    @staticmethod
+    def pool_of(model_groups: Mapping[str, ModelConfigGroup], primary: str) -> List[str]:
+        """主模型组及与其同一路由池的聊天模型组，主模型组排在最前"""
+        pool_name = model_groups[primary].ROUTING_POOL.strip()
+        if not pool_name:
+            return [primary]
+        peers = sorted(
+            name
+            for name, group in model_groups.items()
+            if name != primary and group.MODEL_TYPE == "chat" and group.ROUTING_POOL.strip() == pool_name
+        )
+        return [primary, *peers]
+
+    def _expected_ms(self, name: str, limiter: Optional[ModelGroupLimiter], baseline_ms: float) -> float:
+        health = self.health(name)
+        latency = health.latency_ms
+        expected = latency if latency is not None else baseline_ms
+        # 按近期错误率折算重试开销，持续出错的模型组在熔断前就会排到后面
+        expected /= max(1 - health.error_rate, MIN_SUCCESS_RATE)
+        if limiter is not None and limiter.saturated:
+            # 并发槽位已满，至少要等一个在途请求完成
+            expected *= 2
+        return expected
+
+    def choose(
+        self,
+        model_groups: Mapping[str, ModelConfigGroup],
+        primary: str,
+        fallback: str,
+        messages: List[OpenAIChatMessage],
+        failed: Collection[str] = (),
+        final_attempt: bool = False,
+        chat_key: str = "",
+        attempt: int = 1,
+        reserved: Optional[Set[str]] = None,
+    ) -> str:
+        """为本次尝试选择模型组并记录决策
+
+        选中半开模型组时预留探测名额并记入 `reserved`，请求未能发出时由调用方通过 `release` 归还
+        """
+        pool = self.pool_of(model_groups, primary)
+        names = pool if fallback in pool else [*pool, fallback]
+        estimated_tokens = estimate_prompt_tokens(messages)
+        known = [latency for latency in (self.health(name).latency_ms for name in names) if latency is not None]
+        # 没有样本的模型组按其余候选的平均耗时估计，排序上与已知候选持平
+        baseline_ms = sum(known) / len(known) if known else 0.0
+
+        candidates: List[RouteCandidate] = []
+        ranks: Dict[str, Tuple[int, int, int, float]] = {}
+        for name in names:
+            health = self.health(name)
+            limiter = model_group_limiters.get(name, model_groups[name])
+            quota_wait_ms = limiter.quota_wait_seconds(estimated_tokens) * 1000 if limiter is not None else 0.0
+            expected_ms = self._expected_ms(name, limiter, baseline_ms) + quota_wait_ms
+            if final_attempt:
+                role = 0 if name == fallback else 1
+            else:
+                role = 0 if name in pool else 1
+            # 熔断中的模型组排最后；备用模型组只在路由池全部熔断或最后一次尝试时优先
+            ranks[name] = (0 if health.available else 1, role, 1 if name in failed else 0, expected_ms)
+            candidates.append(
+                RouteCandidate(
+                    name=name,
+                    state=health.current_state(),
+                    failed_this_request=name in failed,
+                    expected_ms=round(expected_ms, 1),
+                    quota_wait_ms=round(quota_wait_ms, 1),
+                ),
+            )
+
+        chosen = min(names, key=lambda name: ranks[name])
+        if ranks[chosen][0] == 1:
+            reason = "all_open"
+        elif final_attempt and chosen == fallback and fallback != primary:
+            reason = "fallback"
+        elif chosen == primary:
+            reason = "primary"
+        elif ranks[primary][0] or ranks[primary][2]:
+            reason = "failover"
+        else:
+            reason = "score"
+
+        perf_metrics.incr(f"llm.route.{reason}")
+        self._decisions.append(
+            RoutingDecision(
+                timestamp=time.time(),
+                chat_key=chat_key,
+                attempt=attempt,
+                chosen=chosen,
+                reason=reason,
+                candidates=candidates,
+            ),
+        )
+        if self.health(chosen).reserve() and reserved is not None:
+            reserved.add(chosen)
+        if chosen != primary:
+            logger.info(f"[model_router] {chat_key} | 第 {attempt} 次尝试路由到模型组 {chosen}（{reason}）")
+        return chosen
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[RouteAttempt]:
+        """记录一次请求的耗时与成败，请求被取消或因非模型组故障失败时不计入统计"""
+        health = self.health(name)
+        health.begin()
+        route_attempt = RouteAttempt(health)
+        started = time.perf_counter()
+        try:
+            yield route_attempt
+        except Exception as e:
+            if is_endpoint_failure(e):
+                health.record_failure(str(e) or type(e).__name__)
+            else:
+                health.release()
+            raise
+        except BaseException:
+            health.release()
+            raise
+        health.record_success((time.perf_counter() - started) * 1000, route_attempt.ttft_ms)
+
+    def release(self, name: str) -> None:
+        """归还 `choose` 预留但未发出请求的探测名额"""
+        self.health(name).release()
+
+    def snapshot(self) -> ModelRouterSnapshot:
+        return ModelRouterSnapshot(
+            endpoints=[health.status() for _, health in sorted(self._health.items())],
+            decisions=list(reversed(self._decisions)),
+        )
+
+
+model_router = ModelRouter()
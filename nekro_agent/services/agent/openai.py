@@ -216,8 +216,9 @@ class OpenAIResponse(BaseModel):
         top_p: Optional[float] = None,
         max_tokens: Optional[int] = None,
         stop_words: Optional[List[str]] = None,
+        extra: Optional[Dict[str, Any]] = None,
     ) -> bool:
-        """保存日志到文件"""
+        """保存日志到文件，`extra` 中的字段原样附加到日志中"""
         if not log_path:
             return False
 
@@ -238,6 +239,8 @@ class OpenAIResponse(BaseModel):
                 max_tokens,
                 stop_words,
             )
+            if extra:
+                log_data.update(extra)
             async with aiofiles.open(path, "w", encoding="utf-8") as f:
                 await f.write(
                     json.dumps(
@@ -257,6 +260,10 @@ class OpenAIResponse(BaseModel):
                 top_p,
                 max_tokens,
             )
+            if extra:
+                log_text += "".join(
+                    f"[{key}] {json.dumps(value, ensure_ascii=False, default=str)}\n" for key, value in extra.items()
+                )
             async with aiofiles.open(path, "w", encoding="utf-8") as f:
                 await f.write(log_text)
 
@@ -413,6 +420,7 @@ async def gen_openai_chat_response(
     log_path: Optional[Union[str, Path]] = None,
     error_log_path: Optional[Union[str, Path]] = None,
     log_style: Literal["json", "text", "auto"] = "auto",
+    log_extra: Optional[Dict[str, Any]] = None,
 ) -> OpenAIResponse:
     """生成聊天回复内容"""
 
@@ -586,6 +594,7 @@ async def gen_openai_chat_response(
                 log_style=log_style,
                 messages=messages,
                 message_cnt=len(messages) + 1,
+                extra=log_extra,
             )
         raise
 
@@ -625,6 +634,7 @@ async def gen_openai_chat_response(
             top_p=top_p,
             max_tokens=max_tokens,
             stop_words=stop_words,
+            extra=log_extra,
         )
 
     return response
@@ -679,6 +689,46 @@ async def gen_openai_embeddings(
         return res.json()["data"][0]["embedding"]
 
 
+async def gen_openai_embeddings_batch(
+    model: str,
+    inputs: List[str],
+    api_key: str,
+    base_url: str,
+    dimensions: Optional[int] = None,
+    proxy_url: Optional[str] = None,
+    endpoint: str = "/embeddings",
+    timeout: int = 10,
+) -> List[List[float]]:
+    """在一次请求中生成多条文本的向量表示
+
+    Returns:
+        与输入顺序一致的嵌入向量列表
+    """
+    async with _create_http_client(
+        proxy_url=proxy_url,
+        read_timeout=timeout,
+        write_timeout=timeout,
+    ) as client:
+        payload: dict[str, object] = {"model": model, "input": inputs}
+        if dimensions is not None:
+            payload["dimensions"] = dimensions
+
+        res = await client.post(
+            f"{base_url}{endpoint}",
+            headers={
+                "Content-Type": "application/json; charset=utf-8",
+                "Authorization": f"Bearer {api_key.strip()}",
+            },
+            content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        )
+        res.raise_for_status()
+
+        data = sorted(res.json()["data"], key=lambda item: item.get("index", 0))
+        if len(data) != len(inputs):
+            raise ValueError(f"Embedding 返回数量不匹配: 期望 {len(inputs)}, 实际 {len(data)}")
+        return [item["embedding"] for item in data]
+
+
 async def gen_openai_chat_stream(
     model: str,
     messages: List[Union[OpenAIChatMessage, Dict[str, Any]]],
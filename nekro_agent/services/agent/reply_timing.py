@@ -0,0 +1,32 @@
+"""首条回复耗时统计
+
+记录每个频道最近一次 LLM 生成的开始时间，以及此后第一条成功发出的机器人消息时间，
+用于在沙盒执行记录中给出用户可感知的响应延迟（生成 + 执行到第一条消息送达）。
+"""
+
+import time
+from typing import Dict
+
+_generation_started: Dict[str, float] = {}
+_first_reply_at: Dict[str, float] = {}
+
+
+def mark_generation_started(chat_key: str) -> None:
+    """标记一次 LLM 生成开始，重置该频道的首条回复时间"""
+    _generation_started[chat_key] = time.time()
+    _first_reply_at.pop(chat_key, None)
+
+
+def mark_reply_sent(chat_key: str) -> None:
+    """标记机器人消息发送成功，仅记录生成开始后的第一条"""
+    if chat_key in _generation_started and chat_key not in _first_reply_at:
+        _first_reply_at[chat_key] = time.time()
+
+
+def get_first_reply_ms(chat_key: str) -> int:
+    """获取首条回复耗时（毫秒），尚未发出回复时返回 0"""
+    started = _generation_started.get(chat_key)
+    replied = _first_reply_at.get(chat_key)
+    if started is None or replied is None:
+        return 0
+    return max(int((replied - started) * 1000), 0)
@@ -1,35 +1,49 @@
+import asyncio
 import datetime
 import json
 import os
 import time
 from collections import deque
 from pathlib import Path
-from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
+from jinja2 import Environment
+
+from nekro_agent.adapters.interface.schemas.platform import PlatformUser
 from nekro_agent.core.config import CoreConfig, ModelConfigGroup
 from nekro_agent.core.logger import get_sub_logger
 from nekro_agent.core.os_env import PROMPT_ERROR_LOG_DIR, PROMPT_LOG_DIR
 from nekro_agent.models.db_chat_channel import DBChatChannel
+from nekro_agent.models.db_chat_message import DBChatMessage
 from nekro_agent.models.db_exec_code import ExecStopType
 from nekro_agent.schemas.agent_ctx import AgentCtx
 from nekro_agent.schemas.chat_message import ChatMessage
+from nekro_agent.services.perf_metrics import perf_metrics
 from nekro_agent.services.plugin.call_priority import build_plugin_call_priority_rules
 from nekro_agent.services.plugin.collector import plugin_collector
 from nekro_agent.services.plugin.prompt_activation import build_plugin_activation_rules
 from nekro_agent.services.sandbox.runner import limited_run_code
 
+from .context_budget import ContextBudget, count_message_tokens, get_token_counter
 from .creator import OpenAIChatMessage
+from .model_group_limiter import model_group_limiters
+from .model_router import model_router
 from .openai import OpenAIResponse, gen_openai_chat_response
+from .reply_timing import mark_generation_started
 from .resolver import ParsedCodeRunData, parse_chat_response
+from .stream_exec import EarlyExecSession
+from .templates.base import PromptTemplate
 from .templates.compiler import PromptCompiler
-from .templates.history import render_history_data
-from .templates.plugin import render_plugins_prompt
+from .templates.history import fetch_recent_chat_messages, recall_memory_context, render_history_data
+from .templates.plugin import RenderedPluginPrompts, render_plugins_prompt
 
 # 使用deque保存最近100条错误日志路径
 
 logger = get_sub_logger("agent_runtime")
 RECENT_ERR_LOGS = deque(maxlen=100)
 
+T = TypeVar("T")
+
 
 def _summarize_runtime_text(text: str, limit: int = 160) -> str:
     compact = " ".join(text.strip().split())
@@ -38,6 +52,17 @@ def _summarize_runtime_text(text: str, limit: int = 160) -> str:
     return compact if len(compact) <= limit else compact[: limit - 1] + "…"
 
 
+async def _timed_stage(timings: Dict[str, float], stage: str, awaitable: Awaitable[T]) -> T:
+    """执行上下文构建阶段并记录耗时（毫秒）"""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timings[stage] = round(elapsed_ms, 2)
+        perf_metrics.observe(f"prompt.build.{stage}", elapsed_ms)
+
+
 class AllLLMRequestsFailedError(ValueError):
     """All LLM API retries are exhausted for a single agent request."""
 
@@ -61,29 +86,68 @@ async def run_agent(
         db_chat_channel = await DBChatChannel.get(chat_key=chat_key)
         ctx = AgentCtx.create_by_db_chat_channel(db_chat_channel=db_chat_channel)
 
-    config = await db_chat_channel.get_effective_config()
-    preset = await db_chat_channel.get_preset()
-    adapter_dialog_examples = await ctx.adapter.set_dialog_example()
-    adapter_jinja_env = await ctx.adapter.get_jinja_env()
-    self_info = await ctx.adapter.get_self_info()
-    logger.debug(f"[run_agent] {chat_key} | 适配器信息就绪，开始渲染插件 prompt")
-
-    # 获取当前使用的模型组
-    used_model_group: ModelConfigGroup = config.MODEL_GROUPS[config.USE_MODEL_GROUP]
+    # 上下文构建按依赖关系并行：配置 → 历史消息 → 记忆召回 一条链，与人设、适配器信息、插件提示词并行执行
+    stage_timings: Dict[str, float] = {}
+    prompt_build_started = time.perf_counter()
     activation_plugin = plugin_collector.get_plugin_by_module_name("plugin_activation")
     activation_enabled = bool(activation_plugin and activation_plugin.is_enabled)
+    config_task = asyncio.create_task(_timed_stage(stage_timings, "config", db_chat_channel.get_effective_config()))
+
+    history_fetched_at = time.time()
+
+    async def load_history_and_memory() -> Tuple[List[DBChatMessage], str]:
+        nonlocal history_fetched_at
+        config = await config_task
+        history_fetched_at = time.time()
+        recent_chat_messages = await _timed_stage(
+            stage_timings,
+            "history_fetch",
+            fetch_recent_chat_messages(chat_key, db_chat_channel, config),
+        )
+        memory_context = await _timed_stage(
+            stage_timings,
+            "memory_recall",
+            recall_memory_context(db_chat_channel, recent_chat_messages),
+        )
+        return recent_chat_messages, memory_context
 
-    rendered_plugins = await render_plugins_prompt(
-        plugin_collector.get_all_active_plugins(),
-        ctx,
-        activation_enabled=activation_enabled,
-    )
-    adapter_runtime_prompt = await ctx.adapter.render_runtime_prompt()
+    async def load_adapter_info() -> Tuple[Optional[List[PromptTemplate]], Optional[Environment], PlatformUser]:
+        return await asyncio.gather(
+            ctx.adapter.set_dialog_example(),
+            ctx.adapter.get_jinja_env(),
+            ctx.adapter.get_self_info(),
+        )
+
+    async def render_plugins() -> Tuple[RenderedPluginPrompts, str]:
+        return await asyncio.gather(
+            render_plugins_prompt(plugin_collector.get_all_active_plugins(), ctx, activation_enabled=activation_enabled),
+            ctx.adapter.render_runtime_prompt(),
+        )
+
+    try:
+        (
+            (recent_chat_messages, memory_context),
+            preset,
+            (adapter_dialog_examples, adapter_jinja_env, self_info),
+            (rendered_plugins, adapter_runtime_prompt),
+        ) = await asyncio.gather(
+            load_history_and_memory(),
+            _timed_stage(stage_timings, "preset", db_chat_channel.get_preset()),
+            _timed_stage(stage_timings, "adapter", load_adapter_info()),
+            _timed_stage(stage_timings, "plugins", render_plugins()),
+        )
+    finally:
+        if not config_task.done():
+            config_task.cancel()
+    config = config_task.result()
+    logger.debug(f"[run_agent] {chat_key} | 上下文并行构建完成: {stage_timings}")
+
+    # 获取当前使用的模型组
+    used_model_group: ModelConfigGroup = config.MODEL_GROUPS[config.USE_MODEL_GROUP]
     runtime_prompts = [
         prompt for prompt in (adapter_runtime_prompt, rendered_plugins.runtime_prompt) if prompt.strip()
     ]
     runtime_prompt = "\n\n".join(runtime_prompts)
-    logger.debug(f"[run_agent] {chat_key} | 插件 prompt 渲染完成，开始构建 system prompt")
 
     from nekro_agent.services.system_broadcast import AgentRuntimeStatusEvent, publish_system_event
 
@@ -119,6 +183,8 @@ async def run_agent(
                     sandbox_stop_type=sandbox_stop_type,
                     model_name=model_name,
                     error_summary=error_summary,
+                    stage_timings=stage_timings,
+                    context_budget=context_budget.report() if context_budget is not None else None,
                 )
             )
         except Exception as e:
@@ -137,224 +203,265 @@ async def run_agent(
         enable_at=db_chat_channel.adapter.config.SESSION_ENABLE_AT,
     )
 
-    messages = [prompt_compiler.render_system_message()]
-    messages.extend(prompt_compiler.render_practice_messages(adapter_dialog_examples, adapter_jinja_env))
+    # system 消息与示例对话构成逐字节稳定的静态前缀，仅历史消息与运行时注入内容每轮渲染
+    with perf_metrics.timer("prompt.build.static"):
+        messages = prompt_compiler.render_static_prefix(
+            db_chat_channel.adapter_key,
+            adapter_dialog_examples,
+            adapter_jinja_env,
+        )
+    # 模型组配置了 Token 预算时，按分词器计量固定开销，余下预算在历史渲染中分配给图片、记忆与历史记录
+    context_budget: Optional[ContextBudget] = None
+    if used_model_group.CONTEXT_TOKEN_BUDGET > 0:
+        context_budget = ContextBudget(
+            total=used_model_group.CONTEXT_TOKEN_BUDGET,
+            counter=await get_token_counter(used_model_group),
+        )
+        plugin_tokens = context_budget.count(rendered_plugins.system_prompt)
+        context_budget.charge("plugins", plugin_tokens)
+        context_budget.charge("system", count_message_tokens(context_budget.counter, messages) - plugin_tokens)
     messages.append(
-        await prompt_compiler.render_history_message(
-            chat_key=chat_key,
-            db_chat_channel=db_chat_channel,
-            one_time_code=one_time_code,
-            config=config,
-            model_group=used_model_group,
+        await _timed_stage(
+            stage_timings,
+            "history",
+            prompt_compiler.render_history_message(
+                chat_key=chat_key,
+                db_chat_channel=db_chat_channel,
+                one_time_code=one_time_code,
+                config=config,
+                model_group=used_model_group,
+                recent_chat_messages=recent_chat_messages,
+                memory_context=memory_context,
+                budget=context_budget,
+            ),
         ),
     )
+    stage_timings["total"] = round((time.perf_counter() - prompt_build_started) * 1000, 2)
+    perf_metrics.observe("prompt.build.total", stage_timings["total"])
+    if context_budget is not None:
+        logger.info(f"[run_agent] {chat_key} | 上下文 Token 预算分配: {context_budget.report()}")
 
     logger.debug(f"[run_agent] {chat_key} | 历史记录渲染完成，发送 LLM 请求 (model={used_model_group.CHAT_MODEL})")
-    history_render_until_time = time.time()
-    llm_retry_errors: list[str] = []
+    stream_session: Optional[EarlyExecSession] = (
+        EarlyExecSession(chat_key, ctx) if config.AI_REQUEST_STREAM_MODE and config.AI_STREAM_EARLY_EXEC else None
+    )
     try:
-        llm_response, used_model_group, llm_retry_errors = await send_agent_request(
-            messages=messages,
-            config=config,
-            chat_key=chat_key,
-            on_llm_retry=lambda retry_index, retry_total, model_name, error_summary: publish_runtime_state(
-                phase="llm_retrying",
-                iteration_index=1,
-                llm_retry_index=retry_index,
-                model_name=model_name,
-                error_summary=error_summary,
-            ),
-            on_llm_attempt=lambda retry_index, _retry_total, model_name: publish_runtime_state(
-                phase="llm_generating",
-                iteration_index=1,
-                llm_retry_index=retry_index,
-                model_name=model_name,
-            ),
-        )
-    except AllLLMRequestsFailedError as e:
-        await publish_runtime_state(
-            phase="failed",
-            iteration_index=1,
-            llm_retry_index=llm_retry_total,
-            error_summary=_summarize_runtime_text(str(e)),
-        )
-        raise
-    logger.debug(f"[run_agent] {chat_key} | LLM 请求完成，开始解析响应")
-    parsed_code_data: ParsedCodeRunData = parse_chat_response(llm_response.response_content)
-
-    for i in range(config.AI_SCRIPT_MAX_RETRY_TIMES):
-        addition_prompt_message: List[OpenAIChatMessage] = []
-        sandbox_output = ""
-        raw_output = ""
-        current_iteration = i + 1
-        if one_time_code in parsed_code_data.code_content:
-            stop_type = ExecStopType.SECURITY
-        else:
-            await publish_runtime_state(
-                phase="sandbox_running",
-                iteration_index=current_iteration,
-                model_name=llm_response.use_model,
+        # 历史消息在并行构建阶段已提前获取，此后到达的消息由迭代轮次补充
+        history_render_until_time = history_fetched_at
+        llm_retry_errors: list[str] = []
+        try:
+            llm_response, used_model_group, llm_retry_errors = await send_agent_request(
+                messages=messages,
+                config=config,
+                chat_key=chat_key,
+                stream_session=stream_session,
+                context_budget=context_budget.report() if context_budget is not None else None,
+                on_llm_retry=lambda retry_index, retry_total, model_name, error_summary: publish_runtime_state(
+                    phase="llm_retrying",
+                    iteration_index=1,
+                    llm_retry_index=retry_index,
+                    model_name=model_name,
+                    error_summary=error_summary,
+                ),
+                on_llm_attempt=lambda retry_index, _retry_total, model_name: publish_runtime_state(
+                    phase="llm_generating",
+                    iteration_index=1,
+                    llm_retry_index=retry_index,
+                    model_name=model_name,
+                ),
             )
-            sandbox_output, raw_output, stop_type_value = await limited_run_code(
-                code_run_data=parsed_code_data,
-                from_chat_key=chat_key,
-                chat_message=chat_message,
-                llm_response=llm_response,
-                ctx=ctx,
-                llm_retry_errors=llm_retry_errors,
+        except AllLLMRequestsFailedError as e:
+            await publish_runtime_state(
+                phase="failed",
+                iteration_index=1,
+                llm_retry_index=llm_retry_total,
+                error_summary=_summarize_runtime_text(str(e)),
             )
-            stop_type = ExecStopType(stop_type_value)
+            raise
+        logger.debug(f"[run_agent] {chat_key} | LLM 请求完成，开始解析响应")
+        parsed_code_data: ParsedCodeRunData = parse_chat_response(llm_response.response_content)
+
+        for i in range(config.AI_SCRIPT_MAX_RETRY_TIMES):
+            addition_prompt_message: List[OpenAIChatMessage] = []
+            sandbox_output = ""
+            raw_output = ""
+            current_iteration = i + 1
+            if one_time_code in parsed_code_data.code_content:
+                stop_type = ExecStopType.SECURITY
+                if stream_session is not None:
+                    await stream_session.discard()
+            else:
+                await publish_runtime_state(
+                    phase="sandbox_running",
+                    iteration_index=current_iteration,
+                    model_name=llm_response.use_model,
+                )
+                sandbox_output, raw_output, stop_type_value = await limited_run_code(
+                    code_run_data=parsed_code_data,
+                    from_chat_key=chat_key,
+                    chat_message=chat_message,
+                    llm_response=llm_response,
+                    ctx=ctx,
+                    llm_retry_errors=llm_retry_errors,
+                    reservation=await stream_session.take_reservation() if stream_session is not None else None,
+                )
+                stop_type = ExecStopType(stop_type_value)
+
+            if stop_type == ExecStopType.NORMAL:
+                await publish_runtime_state(
+                    phase="completed",
+                    iteration_index=current_iteration,
+                    model_name=llm_response.use_model,
+                )
+                return
 
-        if stop_type == ExecStopType.NORMAL:
             await publish_runtime_state(
-                phase="completed",
+                phase="sandbox_stopped",
                 iteration_index=current_iteration,
                 model_name=llm_response.use_model,
+                sandbox_stop_type=stop_type.value,
+                error_summary=_summarize_runtime_text(sandbox_output),
             )
-            return
-
-        await publish_runtime_state(
-            phase="sandbox_stopped",
-            iteration_index=current_iteration,
-            model_name=llm_response.use_model,
-            sandbox_stop_type=stop_type.value,
-            error_summary=_summarize_runtime_text(sandbox_output),
-        )
 
-        # 添加 AI 回复的原始内容到上下文
-        addition_prompt_message.append(OpenAIChatMessage.from_text("assistant", llm_response.response_content))
+            # 添加 AI 回复的原始内容到上下文
+            addition_prompt_message.append(OpenAIChatMessage.from_text("assistant", llm_response.response_content))
 
-        msg: OpenAIChatMessage = OpenAIChatMessage.create_empty("user")  # 待添加到迭代上下文的用户消息
+            msg: OpenAIChatMessage = OpenAIChatMessage.create_empty("user")  # 待添加到迭代上下文的用户消息
 
-        # Agent 类型的迭代对话
-        if stop_type == ExecStopType.AGENT:
-            msg = msg.extend(
-                OpenAIChatMessage.from_text(
-                    "user",
-                    f"[Agent Method Response] {sandbox_output}\nPlease continue based on this agent response. Attention: the code after the agent method is NOT EXECUTED!",
-                ),
-            )
+            # Agent 类型的迭代对话
+            if stop_type == ExecStopType.AGENT:
+                msg = msg.extend(
+                    OpenAIChatMessage.from_text(
+                        "user",
+                        f"[Agent Method Response] {sandbox_output}\nPlease continue based on this agent response. Attention: the code after the agent method is NOT EXECUTED!",
+                    ),
+                )
 
-        # 多模态类型的迭代对话
-        elif stop_type == ExecStopType.MULTIMODAL_AGENT:
-            multimodal_agent_result = json.loads(raw_output.split("<AGENT_RESULT>")[1].split("</AGENT_RESULT>")[0])
-            if isinstance(multimodal_agent_result, list):
-                msg = msg.extend(OpenAIChatMessage("user", multimodal_agent_result))
-            elif isinstance(multimodal_agent_result, str):
-                msg = msg.extend(OpenAIChatMessage.from_text("user", multimodal_agent_result))
-            elif isinstance(multimodal_agent_result, dict):
-                msg = msg.extend(OpenAIChatMessage(**multimodal_agent_result))
-            else:
-                raise ValueError(f"Multimodal agent result is not a list or string: {multimodal_agent_result}")
-            msg = msg.extend(OpenAIChatMessage.from_text("user", "Attention: the code AFTER THE AGENT METHOD is NOT EXECUTED!"))
-
-        # 异常类型的迭代对话
-        exception_reason_map: Dict[ExecStopType, str] = {
-            ExecStopType.TIMEOUT: "Sandbox exited due to timeout",
-            ExecStopType.ERROR: "Sandbox exited due to error occurred",
-            ExecStopType.MANUAL: "Sandbox exited due to manual stop by you",
-            ExecStopType.AGENT: "Sandbox exited due to agent method",
-            ExecStopType.MULTIMODAL_AGENT: "Sandbox exited due to multimodal agent method",
-        }
-
-        # 异常处理建议
-        exception_suggestion_map: Dict[str, str] = {
-            "SyntaxError": "You are prohibited from adding anything other than the content of the code that might break the syntax of the code. Please ensure your output specification and try again",
-        }
-
-        new_message_notification = "During the generation and execution, the following messages were sent (You **CANT NOT** send any messages which you have sent before!):"
-
-        if stop_type in exception_reason_map:
-            for suggestion_key in exception_suggestion_map:
-                if suggestion_key in sandbox_output:
-                    suggestion_text = f"\nResolve Suggestion: {exception_suggestion_map[suggestion_key]}"
-                    break
-            else:
-                suggestion_text = ""
+            # 多模态类型的迭代对话
+            elif stop_type == ExecStopType.MULTIMODAL_AGENT:
+                multimodal_agent_result = json.loads(raw_output.split("<AGENT_RESULT>")[1].split("</AGENT_RESULT>")[0])
+                if isinstance(multimodal_agent_result, list):
+                    msg = msg.extend(OpenAIChatMessage("user", multimodal_agent_result))
+                elif isinstance(multimodal_agent_result, str):
+                    msg = msg.extend(OpenAIChatMessage.from_text("user", multimodal_agent_result))
+                elif isinstance(multimodal_agent_result, dict):
+                    msg = msg.extend(OpenAIChatMessage(**multimodal_agent_result))
+                else:
+                    raise ValueError(f"Multimodal agent result is not a list or string: {multimodal_agent_result}")
+                msg = msg.extend(OpenAIChatMessage.from_text("user", "Attention: the code AFTER THE AGENT METHOD is NOT EXECUTED!"))
+
+            # 异常类型的迭代对话
+            exception_reason_map: Dict[ExecStopType, str] = {
+                ExecStopType.TIMEOUT: "Sandbox exited due to timeout",
+                ExecStopType.ERROR: "Sandbox exited due to error occurred",
+                ExecStopType.MANUAL: "Sandbox exited due to manual stop by you",
+                ExecStopType.AGENT: "Sandbox exited due to agent method",
+                ExecStopType.MULTIMODAL_AGENT: "Sandbox exited due to multimodal agent method",
+            }
+
+            # 异常处理建议
+            exception_suggestion_map: Dict[str, str] = {
+                "SyntaxError": "You are prohibited from adding anything other than the content of the code that might break the syntax of the code. Please ensure your output specification and try again",
+            }
+
+            new_message_notification = "During the generation and execution, the following messages were sent (You **CANT NOT** send any messages which you have sent before!):"
+
+            if stop_type in exception_reason_map:
+                for suggestion_key in exception_suggestion_map:
+                    if suggestion_key in sandbox_output:
+                        suggestion_text = f"\nResolve Suggestion: {exception_suggestion_map[suggestion_key]}"
+                        break
+                else:
+                    suggestion_text = ""
+                msg = msg.extend(
+                    OpenAIChatMessage.from_text(
+                        "user",
+                        f"[Sandbox Output] {sandbox_output}\n---\n{exception_reason_map[stop_type]}\n{suggestion_text}. {new_message_notification}",
+                    ),
+                )
+
+            # 安全类型的迭代对话
+            if stop_type == ExecStopType.SECURITY:
+                msg = msg.extend(
+                    OpenAIChatMessage.from_text(
+                        "user",
+                        f"\n\n[System Automatic Detection] Invalid response detected. You should not reveal the one-time code in your reply. This is just a tag to help you mark trustworthy information. please DO NOT give any extra explanation or apology and keep the response format for retry. {new_message_notification}",
+                    ),
+                )
+
+            # 为所有迭代对话添加新记录背景
             msg = msg.extend(
-                OpenAIChatMessage.from_text(
-                    "user",
-                    f"[Sandbox Output] {sandbox_output}\n---\n{exception_reason_map[stop_type]}\n{suggestion_text}. {new_message_notification}",
+                await render_history_data(
+                    chat_key=chat_key,
+                    db_chat_channel=db_chat_channel,
+                    one_time_code=one_time_code,
+                    plugin_injected_prompt=runtime_prompt,
+                    record_sta_timestamp=history_render_until_time,
+                    model_group=used_model_group,
+                    config=config,
                 ),
             )
 
-        # 安全类型的迭代对话
-        if stop_type == ExecStopType.SECURITY:
             msg = msg.extend(
                 OpenAIChatMessage.from_text(
                     "user",
-                    f"\n\n[System Automatic Detection] Invalid response detected. You should not reveal the one-time code in your reply. This is just a tag to help you mark trustworthy information. please DO NOT give any extra explanation or apology and keep the response format for retry. {new_message_notification}",
+                    "\nplease DO NOT give any extra explanation or apology and keep the response format for retry."
+                    + (
+                        f" This is the last retry. Describe the reason if you can't finish the task. (Iteration times: {i + 1}/{config.AI_SCRIPT_MAX_RETRY_TIMES})"
+                        if i == config.AI_SCRIPT_MAX_RETRY_TIMES - 1
+                        else "(Iteration times: {i + 1}/{config.AI_SCRIPT_MAX_RETRY_TIMES})"
+                    ),
                 ),
             )
 
-        # 为所有迭代对话添加新记录背景
-        msg = msg.extend(
-            await render_history_data(
-                chat_key=chat_key,
-                db_chat_channel=db_chat_channel,
-                one_time_code=one_time_code,
-                plugin_injected_prompt=runtime_prompt,
-                record_sta_timestamp=history_render_until_time,
-                model_group=used_model_group,
-                config=config,
-            ),
-        )
-
-        msg = msg.extend(
-            OpenAIChatMessage.from_text(
-                "user",
-                "\nplease DO NOT give any extra explanation or apology and keep the response format for retry."
-                + (
-                    f" This is the last retry. Describe the reason if you can't finish the task. (Iteration times: {i + 1}/{config.AI_SCRIPT_MAX_RETRY_TIMES})"
-                    if i == config.AI_SCRIPT_MAX_RETRY_TIMES - 1
-                    else "(Iteration times: {i + 1}/{config.AI_SCRIPT_MAX_RETRY_TIMES})"
-                ),
-            ),
-        )
-
-        # 将迭代对话添加到上下文
-        addition_prompt_message.append(msg.tidy())
-        messages.extend(addition_prompt_message)
-
-        await publish_runtime_state(
-            phase="iterating",
-            iteration_index=i + 2,
-            model_name=llm_response.use_model,
-            sandbox_stop_type=stop_type.value,
-            error_summary=_summarize_runtime_text(sandbox_output),
-        )
+            # 将迭代对话添加到上下文
+            addition_prompt_message.append(msg.tidy())
+            messages.extend(addition_prompt_message)
 
-        history_render_until_time = time.time()
-        try:
-            llm_response, used_model_group, llm_retry_errors = await send_agent_request(
-                messages=messages,
-                config=config,
-                is_debug_iteration=True,
-                chat_key=chat_key,
-                on_llm_retry=lambda retry_index, retry_total, model_name, error_summary, iteration_index=i + 2: publish_runtime_state(
-                    phase="llm_retrying",
-                    iteration_index=iteration_index,
-                    llm_retry_index=retry_index,
-                    model_name=model_name,
-                    error_summary=error_summary,
-                ),
-                on_llm_attempt=lambda retry_index, _retry_total, model_name, iteration_index=i + 2: publish_runtime_state(
-                    phase="llm_generating",
-                    iteration_index=iteration_index,
-                    llm_retry_index=retry_index,
-                    model_name=model_name,
-                ),
-            )
-        except AllLLMRequestsFailedError as e:
             await publish_runtime_state(
-                phase="failed",
+                phase="iterating",
                 iteration_index=i + 2,
-                llm_retry_index=llm_retry_total,
-                error_summary=_summarize_runtime_text(str(e)),
+                model_name=llm_response.use_model,
+                sandbox_stop_type=stop_type.value,
+                error_summary=_summarize_runtime_text(sandbox_output),
             )
-            raise
-        parsed_code_data = parse_chat_response(llm_response.response_content)
 
+            history_render_until_time = time.time()
+            try:
+                llm_response, used_model_group, llm_retry_errors = await send_agent_request(
+                    messages=messages,
+                    config=config,
+                    is_debug_iteration=True,
+                    chat_key=chat_key,
+                    stream_session=stream_session,
+                    on_llm_retry=lambda retry_index, retry_total, model_name, error_summary, iteration_index=i + 2: publish_runtime_state(
+                        phase="llm_retrying",
+                        iteration_index=iteration_index,
+                        llm_retry_index=retry_index,
+                        model_name=model_name,
+                        error_summary=error_summary,
+                    ),
+                    on_llm_attempt=lambda retry_index, _retry_total, model_name, iteration_index=i + 2: publish_runtime_state(
+                        phase="llm_generating",
+                        iteration_index=iteration_index,
+                        llm_retry_index=retry_index,
+                        model_name=model_name,
+                    ),
+                )
+            except AllLLMRequestsFailedError as e:
+                await publish_runtime_state(
+                    phase="failed",
+                    iteration_index=i + 2,
+                    llm_retry_index=llm_retry_total,
+                    error_summary=_summarize_runtime_text(str(e)),
+                )
+                raise
+            parsed_code_data = parse_chat_response(llm_response.response_content)
+
+    finally:
+        # 未被执行消费的沙盒预留（安全检查未通过、请求失败等）需要归还并发槽位
+        if stream_session is not None:
+            await stream_session.discard()
 
 async def send_agent_request(
     messages: List[OpenAIChatMessage],
@@ -363,15 +470,16 @@ async def send_agent_request(
     chat_key: str = "",
     on_llm_attempt: Optional[Callable[[int, int, str], Awaitable[None]]] = None,
     on_llm_retry: Optional[Callable[[int, int, str, str], Awaitable[None]]] = None,
+    stream_session: Optional[EarlyExecSession] = None,
+    context_budget: Optional[Dict[str, Any]] = None,
 ) -> Tuple[OpenAIResponse, ModelConfigGroup, list[str]]:
-    model_group: ModelConfigGroup = (
-        config.MODEL_GROUPS[config.DEBUG_MIGRATION_MODEL_GROUP]
+    model_group_name = (
+        config.DEBUG_MIGRATION_MODEL_GROUP
         if is_debug_iteration and config.DEBUG_MIGRATION_MODEL_GROUP
-        else config.MODEL_GROUPS[config.USE_MODEL_GROUP]
-    )
-    fallback_model_group: ModelConfigGroup = (
-        config.MODEL_GROUPS[config.FALLBACK_MODEL_GROUP] if config.FALLBACK_MODEL_GROUP else model_group
+        else config.USE_MODEL_GROUP
     )
+    fallback_model_group_name = config.FALLBACK_MODEL_GROUP or model_group_name
+    model_group: ModelConfigGroup = config.MODEL_GROUPS[model_group_name]
 
     if config.SAVE_PROMPTS_LOG:
         log_path = f"{PROMPT_LOG_DIR}/chat_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json"
@@ -383,51 +491,86 @@ async def send_agent_request(
 
     used_model_group: ModelConfigGroup = model_group  # 记录实际使用的模型组
     retry_errors: list[str] = []
+    failed_model_groups: set[str] = set()
+    probe_reservations: set[str] = set()
 
     for i in range(config.AI_CHAT_LLM_API_MAX_RETRIES):
-        use_model_group: ModelConfigGroup = model_group if i < config.AI_CHAT_LLM_API_MAX_RETRIES - 1 else fallback_model_group
+        is_fallback_attempt = i == config.AI_CHAT_LLM_API_MAX_RETRIES - 1
         retry_index = i + 1
-        if on_llm_attempt is not None:
-            await on_llm_attempt(retry_index, config.AI_CHAT_LLM_API_MAX_RETRIES, use_model_group.CHAT_MODEL)
-
-        logger.info(
-            f"[send_agent_request] {chat_key} | 发送 LLM 请求 model={use_model_group.CHAT_MODEL} retry={i}/{config.AI_CHAT_LLM_API_MAX_RETRIES}"
+        use_model_group_name = model_router.choose(
+            config.MODEL_GROUPS,
+            primary=model_group_name,
+            fallback=fallback_model_group_name,
+            messages=messages,
+            failed=failed_model_groups,
+            final_attempt=is_fallback_attempt,
+            chat_key=chat_key,
+            attempt=retry_index,
+            reserved=probe_reservations,
         )
+        use_model_group: ModelConfigGroup = config.MODEL_GROUPS[use_model_group_name]
+        tracked = False
         try:
-            llm_response: OpenAIResponse = await gen_openai_chat_response(
-                model=use_model_group.CHAT_MODEL,
-                messages=messages,
-                temperature=use_model_group.TEMPERATURE,
-                top_p=use_model_group.TOP_P,
-                top_k=use_model_group.TOP_K,
-                frequency_penalty=use_model_group.FREQUENCY_PENALTY,
-                presence_penalty=use_model_group.PRESENCE_PENALTY,
-                extra_body=use_model_group.EXTRA_BODY,
-                base_url=use_model_group.BASE_URL,
-                api_key=use_model_group.API_KEY,
-                stream_mode=config.AI_REQUEST_STREAM_MODE,
-                proxy_url=use_model_group.CHAT_PROXY,
-                max_wait_time=config.AI_GENERATE_TIMEOUT,
-                first_token_timeout=config.AI_STREAM_FIRST_TOKEN_TIMEOUT,
-                log_path=log_path,
-                error_log_path=err_log_path,
-            )
-        except Exception as e:
-            error_summary = _summarize_runtime_text(str(e))
-            retry_errors.append(str(e))
-            logger.error(
-                f"LLM 请求失败: {e} ｜ 使用模型: {use_model_group.CHAT_MODEL} {'(fallback)' if i == config.AI_CHAT_LLM_API_MAX_RETRIES - 1 else ''}",
+            if on_llm_attempt is not None:
+                await on_llm_attempt(retry_index, config.AI_CHAT_LLM_API_MAX_RETRIES, use_model_group.CHAT_MODEL)
+
+            logger.info(
+                f"[send_agent_request] {chat_key} | 发送 LLM 请求 model={use_model_group.CHAT_MODEL} retry={i}/{config.AI_CHAT_LLM_API_MAX_RETRIES}"
             )
-            if on_llm_retry is not None:
-                await on_llm_retry(retry_index, config.AI_CHAT_LLM_API_MAX_RETRIES, use_model_group.CHAT_MODEL, error_summary)
-            # 避免重复添加，转换为Path对象并比较绝对路径
-            err_log_path_obj = Path(err_log_path)
-            if not any(str(log_path.absolute()) == str(err_log_path_obj.absolute()) for log_path in RECENT_ERR_LOGS):
-                RECENT_ERR_LOGS.append(err_log_path_obj)
-            continue
-        else:
-            used_model_group = use_model_group  # 记录成功使用的模型组
-            break
+            if chat_key:
+                mark_generation_started(chat_key)
+            if stream_session is not None:
+                stream_session.begin_attempt()
+            try:
+                async with model_group_limiters.limit(use_model_group_name, use_model_group, messages) as lease:
+                    with model_router.track(use_model_group_name) as route_attempt:
+                        tracked = True
+                        llm_response: OpenAIResponse = await gen_openai_chat_response(
+                            model=use_model_group.CHAT_MODEL,
+                            messages=messages,
+                            temperature=use_model_group.TEMPERATURE,
+                            top_p=use_model_group.TOP_P,
+                            top_k=use_model_group.TOP_K,
+                            frequency_penalty=use_model_group.FREQUENCY_PENALTY,
+                            presence_penalty=use_model_group.PRESENCE_PENALTY,
+                            extra_body=use_model_group.EXTRA_BODY,
+                            base_url=use_model_group.BASE_URL,
+                            api_key=use_model_group.API_KEY,
+                            stream_mode=config.AI_REQUEST_STREAM_MODE,
+                            proxy_url=use_model_group.CHAT_PROXY,
+                            max_wait_time=config.AI_GENERATE_TIMEOUT,
+                            first_token_timeout=config.AI_STREAM_FIRST_TOKEN_TIMEOUT,
+                            chunk_callback=stream_session.on_chunk if stream_session is not None else None,
+                            log_path=log_path,
+                            error_log_path=err_log_path,
+                            log_extra={"context_budget": context_budget} if context_budget else None,
+                        )
+                        route_attempt.ttft_ms = llm_response.first_token_cost_ms
+                    if lease is not None:
+                        lease.settle(llm_response.token_consumption)
+            except Exception as e:
+                error_summary = _summarize_runtime_text(str(e))
+                retry_errors.append(str(e))
+                failed_model_groups.add(use_model_group_name)
+                logger.error(
+                    f"LLM 请求失败: {e} ｜ 使用模型: {use_model_group.CHAT_MODEL} {'(fallback)' if use_model_group_name == fallback_model_group_name != model_group_name else ''}",
+                )
+                if on_llm_retry is not None:
+                    await on_llm_retry(retry_index, config.AI_CHAT_LLM_API_MAX_RETRIES, use_model_group.CHAT_MODEL, error_summary)
+                # 避免重复添加，转换为Path对象并比较绝对路径
+                err_log_path_obj = Path(err_log_path)
+                if not any(str(log_path.absolute()) == str(err_log_path_obj.absolute()) for log_path in RECENT_ERR_LOGS):
+                    RECENT_ERR_LOGS.append(err_log_path_obj)
+                continue
+            else:
+                used_model_group = use_model_group  # 记录成功使用的模型组
+                break
+        finally:
+            # 请求未发出（如等待限额时被取消）时归还选择时预留的半开探测名额
+            if use_model_group_name in probe_reservations:
+                probe_reservations.discard(use_model_group_name)
+                if not tracked:
+                    model_router.release(use_model_group_name)
     else:
         err_log = Path(f"{PROMPT_LOG_DIR}/chat_err_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.log")
         err_log.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,144 @@
+"""流式提前执行
+
+流式请求时逐块解析模型输出：
+- 代码块开始输出时预留沙盒（占用并发槽位、写入共享目录、预创建容器）
+- 代码块闭合且语法完整时立即中止生成，随后直接启动已准备好的容器
+
+代码块之后的输出会被丢弃，执行前仍由 run_agent 完成 one_time_code 安全检查。
+"""
+
+import ast
+import asyncio
+import re
+import time
+from typing import Optional
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.schemas.agent_ctx import AgentCtx
+from nekro_agent.services.perf_metrics import perf_metrics
+from nekro_agent.services.sandbox.runner import SandboxReservation, reserve_sandbox
+
+from .openai import OpenAIStreamChunk
+
+logger = get_sub_logger("agent_runtime")
+
+_CODE_OPEN_PATTERN = re.compile(r"(?:^|\n)[ \t]*```(?:python|py)?[ \t]*\n")
+_CODE_CLOSE_PATTERN = re.compile(r"\n[ \t]*```[ \t]*(?=\n|$)")
+
+
+def _is_complete_code(code: str) -> bool:
+    """代码内容中可能出现 ``` 字符串，闭合标记之前的内容能通过编译才视为代码块结束"""
+    if not code.strip():
+        return False
+    try:
+        compile(code, "<stream>", "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT, dont_inherit=True)
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+class StreamingCodeDetector:
+    """增量检测回复中的代码块边界"""
+
+    def __init__(self) -> None:
+        self.buffer: str = ""
+        self.code_start: int = -1
+        self.code_end: int = -1
+        self._scan_from: int = 0
+
+    @property
+    def opened(self) -> bool:
+        return self.code_start >= 0
+
+    @property
+    def closed(self) -> bool:
+        return self.code_end >= 0
+
+    @property
+    def code(self) -> str:
+        if not self.closed:
+            return ""
+        return self.buffer[self.code_start : self.code_end]
+
+    def feed(self, text: str) -> None:
+        if self.closed or not text:
+            return
+        self.buffer += text
+        if not self.opened:
+            self._detect_open()
+        if self.opened:
+            self._detect_close()
+
+    def _detect_open(self) -> None:
+        search_from = 0
+        if "<think>" in self.buffer:
+            think_end = self.buffer.find("</think>")
+            if think_end < 0:
+                return  # 思维链内的代码块不参与执行
+            search_from = think_end + len("</think>")
+        match = _CODE_OPEN_PATTERN.search(self.buffer, search_from)
+        if match:
+            self.code_start = match.end()
+            self._scan_from = self.code_start - 1
+
+    def _detect_close(self) -> None:
+        for match in _CODE_CLOSE_PATTERN.finditer(self.buffer, max(self._scan_from, self.code_start - 1)):
+            if _is_complete_code(self.buffer[self.code_start : match.start()]):
+                self.code_end = match.start()
+                return
+        # 闭合标记可能跨越数据块，保留末尾一行重新扫描
+        self._scan_from = max(self.buffer.rfind("\n", 0, len(self.buffer) - 1), self.code_start - 1)
+
+
+class EarlyExecSession:
+    """单次 Agent 请求的流式提前执行会话，跨 LLM 重试复用同一份沙盒预留"""
+
+    def __init__(self, chat_key: str, ctx: Optional[AgentCtx]) -> None:
+        self.chat_key = chat_key
+        self.ctx = ctx
+        self.detector = StreamingCodeDetector()
+        self._reservation_task: Optional[asyncio.Task[SandboxReservation]] = None
+        self._attempt_started: float = 0.0
+
+    def begin_attempt(self) -> None:
+        """每次 LLM 请求（含重试）开始前重置解析状态"""
+        self.detector = StreamingCodeDetector()
+        self._attempt_started = time.perf_counter()
+
+    async def on_chunk(self, chunk: OpenAIStreamChunk) -> bool:
+        """流式块回调，返回 True 时中止生成"""
+        was_opened = self.detector.opened
+        self.detector.feed(chunk.chunk_text)
+        if self.detector.opened and not was_opened:
+            perf_metrics.observe("agent.stream_exec.code_open", (time.perf_counter() - self._attempt_started) * 1000)
+            if self._reservation_task is None:
+                self._reservation_task = asyncio.create_task(reserve_sandbox(self.chat_key, self.ctx))
+        if self.detector.closed:
+            perf_metrics.observe("agent.stream_exec.code_close", (time.perf_counter() - self._attempt_started) * 1000)
+            logger.debug(f"[stream_exec] {self.chat_key} | 代码块已闭合，提前结束生成")
+            return True
+        return False
+
+    async def take_reservation(self) -> Optional[SandboxReservation]:
+        """取出已预留的沙盒，交由 limited_run_code 使用并释放"""
+        task, self._reservation_task = self._reservation_task, None
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.warning(f"[stream_exec] {self.chat_key} | 预留沙盒失败，回退到常规执行: {e}")
+            return None
+
+    async def discard(self) -> None:
+        """放弃本轮预留（未执行代码、安全检查未通过或请求失败）"""
+        task, self._reservation_task = self._reservation_task, None
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        try:
+            reservation = await task
+        except (asyncio.CancelledError, Exception):
+            return
+        await reservation.release()
@@ -0,0 +1,99 @@
+"""Prompt 渲染缓存
+
+系统提示词、示例对话与插件提示单元在绝大多数轮次之间完全相同，
+同一人设、插件集合与适配器下的不同频道也会得到相同的结果。
+
+- 模板级缓存：按模板类型与全部字段内容的摘要缓存 Jinja 渲染结果
+- 静态前缀缓存：按人设、插件渲染结果、适配器与模型组开关缓存 system + 示例消息
+
+两级缓存的键都由实际输入推导，人设修改或插件重载后自然失效，不会返回过期内容。
+前缀逐字节稳定，有利于模型服务端的 Prompt Cache 命中。
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Tuple
+
+from jinja2 import Environment, FileSystemLoader
+
+from nekro_agent.services.perf_metrics import perf_metrics
+
+from ..creator import OpenAIChatMessage
+from .base import PromptTemplate
+
+MAX_TEMPLATE_ENTRIES = 4096
+MAX_PREFIX_ENTRIES = 256
+
+
+def _env_key(env: Environment) -> Hashable:
+    """同一模板目录的 Environment 视为等价（部分适配器每次都会新建 Environment）"""
+    loader = env.loader
+    if isinstance(loader, FileSystemLoader):
+        return ("fs", tuple(loader.searchpath))
+    return ("id", id(env))
+
+
+def digest(*parts: object) -> str:
+    """计算缓存键摘要"""
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(str(part).encode("utf-8", errors="surrogatepass"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def _copy_messages(messages: List[OpenAIChatMessage]) -> List[OpenAIChatMessage]:
+    # 下游会向消息追加内容片段，返回浅拷贝避免污染缓存
+    return [OpenAIChatMessage(message.role, [dict(segment) for segment in message.content]) for message in messages]
+
+
+class PromptRenderCache:
+    """Prompt 渲染缓存"""
+
+    def __init__(self) -> None:
+        self._templates: "OrderedDict[Tuple[Hashable, str, str], Tuple[Environment, str]]" = OrderedDict()
+        self._prefixes: "OrderedDict[str, List[OpenAIChatMessage]]" = OrderedDict()
+
+    def render(self, template: PromptTemplate, env: Environment) -> str:
+        """渲染模板，相同模板与字段内容直接复用上次结果"""
+        template_cls = type(template)
+        key = (
+            _env_key(env),
+            f"{template_cls.__module__}.{template_cls.__qualname__}",
+            digest(template.model_dump_json()),
+        )
+        cached = self._templates.get(key)
+        if cached is not None:
+            self._templates.move_to_end(key)
+            perf_metrics.incr("prompt.cache.template.hit")
+            return cached[1]
+
+        perf_metrics.incr("prompt.cache.template.miss")
+        text = template.render(env)
+        # 以 id 区分的 Environment 需要持有引用，防止对象回收后 id 被复用
+        self._templates[key] = (env, text)
+        while len(self._templates) > MAX_TEMPLATE_ENTRIES:
+            self._templates.popitem(last=False)
+        return text
+
+    def get_static_prefix(self, key: str, builder: Callable[[], List[OpenAIChatMessage]]) -> List[OpenAIChatMessage]:
+        """获取静态前缀消息，未命中时调用 builder 构建"""
+        cached = self._prefixes.get(key)
+        if cached is not None:
+            self._prefixes.move_to_end(key)
+            perf_metrics.incr("prompt.cache.prefix.hit")
+            return _copy_messages(cached)
+
+        perf_metrics.incr("prompt.cache.prefix.miss")
+        messages = builder()
+        self._prefixes[key] = _copy_messages(messages)
+        while len(self._prefixes) > MAX_PREFIX_ENTRIES:
+            self._prefixes.popitem(last=False)
+        return messages
+
+    def clear(self) -> None:
+        self._templates.clear()
+        self._prefixes.clear()
+
+
+prompt_render_cache = PromptRenderCache()
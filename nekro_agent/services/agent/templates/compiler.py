@@ -5,9 +5,12 @@ from jinja2 import Environment
 
 from nekro_agent.core.config import CoreConfig, ModelConfigGroup
 from nekro_agent.models.db_chat_channel import DBChatChannel
+from nekro_agent.models.db_chat_message import DBChatMessage
 
+from ..context_budget import ContextBudget, count_message_tokens
 from ..creator import OpenAIChatMessage
 from .base import env as default_env
+from .cache import digest, prompt_render_cache
 from .history import HistoryFirstStart, render_history_data
 from .practice import (
     BasePracticePrompt_question,
@@ -57,30 +60,69 @@ class PromptCompiler:
 
     def compile_segments(self) -> PromptSegments:
         return PromptSegments(
-            stable_static=PolicyKernelPrompt().render(default_env),
-            channel_static=PersonaPrompt(chat_preset=self.chat_preset).render(default_env),
-            runtime_dynamic=RuntimeContractPrompt(
-                platform_name=self.platform_name,
-                bot_platform_id=self.bot_platform_id,
-                enable_cot=self.enable_cot,
-                chat_key_rules=self.chat_key_rules,
-                enable_at=self.enable_at,
-                plugin_activation_rules=self.plugin_activation_rules,
-                plugin_call_priority_rules=self.plugin_call_priority_rules,
-            ).render(default_env),
+            stable_static=prompt_render_cache.render(PolicyKernelPrompt(), default_env),
+            channel_static=prompt_render_cache.render(PersonaPrompt(chat_preset=self.chat_preset), default_env),
+            runtime_dynamic=prompt_render_cache.render(
+                RuntimeContractPrompt(
+                    platform_name=self.platform_name,
+                    bot_platform_id=self.bot_platform_id,
+                    enable_cot=self.enable_cot,
+                    chat_key_rules=self.chat_key_rules,
+                    enable_at=self.enable_at,
+                    plugin_activation_rules=self.plugin_activation_rules,
+                    plugin_call_priority_rules=self.plugin_call_priority_rules,
+                ),
+                default_env,
+            ),
         )
 
     def render_system_message(self) -> OpenAIChatMessage:
         segments = self.compile_segments()
-        return OpenAIChatMessage.from_template(
+        return OpenAIChatMessage.from_text(
             "system",
-            SystemPrompt(
-                stable_static=segments.stable_static,
-                channel_static=segments.channel_static,
-                runtime_dynamic=segments.runtime_dynamic,
-                plugins_prompt=self.plugins_prompt,
+            prompt_render_cache.render(
+                SystemPrompt(
+                    stable_static=segments.stable_static,
+                    channel_static=segments.channel_static,
+                    runtime_dynamic=segments.runtime_dynamic,
+                    plugins_prompt=self.plugins_prompt,
+                ),
+                default_env,
             ),
-            default_env,
+        )
+
+    def static_prefix_key(self, adapter_key: str, adapter_dialog_examples: Optional[List[object]]) -> str:
+        """静态前缀缓存键：人设、插件渲染结果、适配器与模型组开关
+
+        插件运行时注入内容与历史消息不属于静态前缀，每轮单独渲染。
+        """
+        return digest(
+            adapter_key,
+            self.platform_name,
+            self.bot_platform_id,
+            self.chat_preset,
+            self.plugins_prompt,
+            self.plugin_activation_rules,
+            self.plugin_call_priority_rules,
+            self.enable_cot,
+            self.enable_at,
+            self.chat_key_rules,
+            [type(example).__qualname__ for example in adapter_dialog_examples or []],
+        )
+
+    def render_static_prefix(
+        self,
+        adapter_key: str,
+        adapter_dialog_examples: Optional[List[object]],
+        adapter_jinja_env: Optional[Environment],
+    ) -> List[OpenAIChatMessage]:
+        """渲染 system 消息与示例对话，命中缓存时直接复用"""
+        return prompt_render_cache.get_static_prefix(
+            self.static_prefix_key(adapter_key, adapter_dialog_examples),
+            lambda: [
+                self.render_system_message(),
+                *self.render_practice_messages(adapter_dialog_examples, adapter_jinja_env),
+            ],
         )
 
     def render_practice_messages(
@@ -137,8 +179,14 @@ class PromptCompiler:
         one_time_code: str,
         config: CoreConfig,
         model_group: ModelConfigGroup,
+        recent_chat_messages: Optional[List[DBChatMessage]] = None,
+        memory_context: Optional[str] = None,
+        budget: Optional[ContextBudget] = None,
     ) -> OpenAIChatMessage:
-        return OpenAIChatMessage.from_template("user", HistoryFirstStart(enable_cot=self.enable_cot), default_env).extend(
+        first_start = OpenAIChatMessage.from_template("user", HistoryFirstStart(enable_cot=self.enable_cot), default_env)
+        if budget is not None:
+            budget.charge("system", count_message_tokens(budget.counter, [first_start]))
+        return first_start.extend(
             await render_history_data(
                 chat_key=chat_key,
                 db_chat_channel=db_chat_channel,
@@ -146,5 +194,8 @@ class PromptCompiler:
                 plugin_injected_prompt=self.plugins_runtime_prompt,
                 model_group=model_group,
                 config=config,
+                recent_chat_messages=recent_chat_messages,
+                memory_context=memory_context,
+                budget=budget,
             ),
         )
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import json
 import re
@@ -32,6 +33,7 @@ from nekro_agent.tools.path_convertor import (
     convert_filename_to_sandbox_upload_path,
 )
 
+from ..context_budget import ContextBudget, count_message_tokens
 from ..creator import ContentSegment, OpenAIChatMessage
 from .base import PromptTemplate, env, register_template
 
@@ -315,6 +317,7 @@ async def _inject_memory_context(
         max_length = config.MEMORY_CONTEXT_MAX_LENGTH
 
     try:
+        from nekro_agent.services.memory.embedding_service import embed_batch
         from nekro_agent.services.memory.retriever import (
             MemoryRecallQuery,
             compile_memories_for_context,
@@ -341,6 +344,7 @@ async def _inject_memory_context(
             f"max_memories={max_memories}, max_length={max_length}",
         )
 
+        recall_queries: list[MemoryRecallQuery] = []
         for index, query_spec in enumerate(recall_plan.queries, 1):
             recall_query = MemoryRecallQuery(
                 query_text=query_spec.query_text,
@@ -356,6 +360,7 @@ async def _inject_memory_context(
                 time_from=query_spec.time_from,
                 time_to=query_spec.time_to,
             )
+            recall_queries.append(recall_query)
             logger.debug(
                 f"执行记忆注入检索[{index}/{len(recall_plan.queries)}]: "
                 f"query={_preview_text(recall_query.query_text)}, "
@@ -381,13 +386,25 @@ async def _inject_memory_context(
                 if knowledge_type not in aggregated_target_knowledge_types:
                     aggregated_target_knowledge_types.append(knowledge_type)
 
-            memories = await retrieve_memories(
-                workspace_id=workspace_id,
-                query=recall_query.query_text,
-                limit=max_memories,
-                time_from=recall_query.time_from,
-                time_to=recall_query.time_to,
-            )
+        # 多条检索语句合并为一次 Embedding 请求，随后并行检索；合并请求失败的语句由检索器逐条向量化
+        query_embeddings: list[list[float] | None] = [None] * len(recall_queries)
+        if len(recall_queries) > 1:
+            query_embeddings = await embed_batch([query.query_text for query in recall_queries])
+        results = await asyncio.gather(
+            *(
+                retrieve_memories(
+                    workspace_id=workspace_id,
+                    query=recall_query.query_text,
+                    limit=max_memories,
+                    time_from=recall_query.time_from,
+                    time_to=recall_query.time_to,
+                    query_embedding=query_embedding,
+                )
+                for recall_query, query_embedding in zip(recall_queries, query_embeddings)
+            ),
+        )
+
+        for index, (query_spec, memories) in enumerate(zip(recall_plan.queries, results), 1):
             if query_spec.importance > 0 and query_spec.importance != 1.0:
                 for memory in memories:
                     memory.effective_weight *= max(0.2, min(2.0, query_spec.importance))
@@ -483,22 +500,16 @@ def _resolve_image_access_path(seg: ChatMessageSegmentImage, chat_key: str) -> O
     return None
 
 
-async def render_history_data(
+async def fetch_recent_chat_messages(
     chat_key: str,
     db_chat_channel: DBChatChannel,
-    one_time_code: str,
     config: CoreConfig,
-    plugin_injected_prompt: str = "",
     record_sta_timestamp: Optional[float] = None,
-    model_group: Optional[ModelConfigGroup] = None,
-) -> OpenAIChatMessage:
+) -> List[DBChatMessage]:
+    """获取用于渲染上下文的近期消息（按时间正序）"""
     if record_sta_timestamp is None:
         record_sta_timestamp = int(time.time() - config.AI_CHAT_CONTEXT_EXPIRE_SECONDS)
 
-    # 获取当前使用的模型组，如果没有传入则使用默认模型组
-    if model_group is None:
-        model_group = config.MODEL_GROUPS[config.USE_MODEL_GROUP]
-
     recent_chat_messages: List[DBChatMessage] = await (
         DBChatMessage.filter(
             send_timestamp__gte=max(record_sta_timestamp, db_chat_channel.conversation_start_time.timestamp()),
@@ -518,7 +529,42 @@ async def render_history_data(
                 _to_remove_msgs.append(msg)
     recent_chat_messages = [msg for msg in recent_chat_messages if msg not in _to_remove_msgs]
     # 反转列表顺序并确保不超过最大长度
-    recent_chat_messages = recent_chat_messages[::-1][-config.AI_CHAT_CONTEXT_MAX_LENGTH :]
+    return recent_chat_messages[::-1][-config.AI_CHAT_CONTEXT_MAX_LENGTH :]
+
+
+async def recall_memory_context(db_chat_channel: DBChatChannel, recent_chat_messages: List[DBChatMessage]) -> str:
+    """根据近期消息召回记忆上下文，可在提示词其余部分构建期间提前执行"""
+    if not recent_chat_messages:
+        return ""
+    return await _inject_memory_context(
+        workspace_id=db_chat_channel.workspace_id,
+        recent_messages=recent_chat_messages,
+    )
+
+
+async def render_history_data(
+    chat_key: str,
+    db_chat_channel: DBChatChannel,
+    one_time_code: str,
+    config: CoreConfig,
+    plugin_injected_prompt: str = "",
+    record_sta_timestamp: Optional[float] = None,
+    model_group: Optional[ModelConfigGroup] = None,
+    recent_chat_messages: Optional[List[DBChatMessage]] = None,
+    memory_context: Optional[str] = None,
+    budget: Optional[ContextBudget] = None,
+) -> OpenAIChatMessage:
+    """渲染历史消息提示词
+
+    `recent_chat_messages` 与 `memory_context` 可由调用方预先并行获取，未传入时在此处获取。
+    传入 `budget` 时图片、记忆与历史记录按 Token 预算裁剪，否则历史记录按字符长度裁剪。
+    """
+    # 获取当前使用的模型组，如果没有传入则使用默认模型组
+    if model_group is None:
+        model_group = config.MODEL_GROUPS[config.USE_MODEL_GROUP]
+
+    if recent_chat_messages is None:
+        recent_chat_messages = await fetch_recent_chat_messages(chat_key, db_chat_channel, config, record_sta_timestamp)
 
     # 预先构建包含 plugin_injected_prompt 的基础消息，无论是否有历史记录都需要保留注入提示词
     base_message: OpenAIChatMessage = OpenAIChatMessage.from_template(
@@ -531,6 +577,10 @@ async def render_history_data(
         ),
         env,
     )
+    if budget is not None:
+        plugin_tokens = budget.count(plugin_injected_prompt)
+        budget.charge("plugins", plugin_tokens)
+        budget.charge("system", count_message_tokens(budget.counter, [base_message]) - plugin_tokens)
 
     if not recent_chat_messages:
         return base_message.extend(OpenAIChatMessage.from_text("user", "[Not new message revived yet]"))
@@ -595,6 +645,8 @@ async def render_history_data(
 
     openai_chat_message: OpenAIChatMessage = base_message
 
+    if budget is not None:
+        img_seg_pairs = img_seg_pairs[: budget.allot_images(len(img_seg_pairs))]
     logger.debug(f"已加载到 {len(img_seg_pairs)} 张图片")
     img_seg_pairs = img_seg_pairs[::-1]  # 反转得到正确排序的 描述-图片 对
 
@@ -626,10 +678,10 @@ async def render_history_data(
         )
 
     # 注入记忆上下文
-    memory_context = await _inject_memory_context(
-        workspace_id=db_chat_channel.workspace_id,
-        recent_messages=recent_chat_messages,
-    )
+    if memory_context is None:
+        memory_context = await recall_memory_context(db_chat_channel, recent_chat_messages)
+    if memory_context and budget is not None:
+        memory_context = budget.fit_memory(memory_context)
     if memory_context:
         logger.debug(f"历史提示词已注入记忆块: workspace={db_chat_channel.workspace_id}, length={len(memory_context)}")
         openai_chat_message.add(ContentSegment.text_content(memory_context))
@@ -658,19 +710,24 @@ async def render_history_data(
             ),
         )
 
-    # 确保总记录长度不超过最大字符长度（从后往前累积，保留较新的消息）
-    total_length = 0
-    start_idx = 0
-    for i in range(len(chat_history_prompts) - 1, -1, -1):
-        prompt_length = len(chat_history_prompts[i])
-        if total_length + prompt_length > config.AI_CONTEXT_LENGTH_PER_SESSION:
-            start_idx = i + 1  # 从下一条消息开始保留
-            break
-        total_length += prompt_length
+    message_separator = f"\n<{one_time_code} | message separator>\n"
+    if budget is not None:
+        budget.charge("history", budget.count("Recent Messages:\n"))
+        start_idx = budget.pack_history(chat_history_prompts, message_separator)
+    else:
+        # 确保总记录长度不超过最大字符长度（从后往前累积，保留较新的消息）
+        total_length = 0
+        start_idx = 0
+        for i in range(len(chat_history_prompts) - 1, -1, -1):
+            prompt_length = len(chat_history_prompts[i])
+            if total_length + prompt_length > config.AI_CONTEXT_LENGTH_PER_SESSION:
+                start_idx = i + 1  # 从下一条消息开始保留
+                break
+            total_length += prompt_length
     chat_history_prompts = chat_history_prompts[start_idx:]
 
-    chat_history_prompt = f"\n<{one_time_code} | message separator>\n".join(chat_history_prompts)
-    chat_history_prompt += f"\n<{one_time_code} | message separator>\n"
+    chat_history_prompt = message_separator.join(chat_history_prompts)
+    chat_history_prompt += message_separator
     openai_chat_message.add(ContentSegment.text_content(chat_history_prompt))
 
     logger.info(f"加载最近 {len(recent_chat_messages)} 条对话记录 ({len(ref_msg_set)} 条引用相关消息)")
@@ -9,6 +9,7 @@ from nekro_agent.services.plugin.call_priority import PluginCallPriority, get_pl
 from nekro_agent.services.plugin.prompt_activation import build_prompt_disclosure_view
 
 from .base import PromptTemplate, env, register_template
+from .cache import prompt_render_cache
 
 
 @register_template("plugin.j2", "plugin_prompt")
@@ -43,17 +44,20 @@ class RenderedPluginPrompts:
 
 
 async def _render_plugin_prompt(unit: PluginPromptRenderUnit) -> str:
-    return PluginPrompt(
-        plugin_name=unit.plugin_name,
-        module_name=unit.module_name,
-        call_priority=unit.call_priority,
-        state=unit.state,
-        rounds_left=unit.rounds_left,
-        activation_hint=unit.activation_hint,
-        plugin_brief=unit.plugin_brief,
-        plugin_injected_prompt=unit.plugin_injected_prompt,
-        plugin_method_prompt=unit.plugin_method_prompt,
-    ).render(env)
+    return prompt_render_cache.render(
+        PluginPrompt(
+            plugin_name=unit.plugin_name,
+            module_name=unit.module_name,
+            call_priority=unit.call_priority,
+            state=unit.state,
+            rounds_left=unit.rounds_left,
+            activation_hint=unit.activation_hint,
+            plugin_brief=unit.plugin_brief,
+            plugin_injected_prompt=unit.plugin_injected_prompt,
+            plugin_method_prompt=unit.plugin_method_prompt,
+        ),
+        env,
+    )
 
 
 def _render_plugin_runtime_prompt(units: List[PluginPromptRenderUnit]) -> str:
@@ -0,0 +1,268 @@
+"""频道信箱调度器
+
+替代按消息创建防抖任务的调度方式，每个活跃频道对应一个长驻 actor 协程：
+- 入站触发写入频道信箱，执行前的所有触发合并为一次 Agent 运行（仅保留最新一条）
+- 防抖以最后一条触发的到达时间计算，突发消息只产生一次运行，不再堆积休眠任务
+- 频道空闲超过一定时长后 actor 自动退出，下次触发时重新创建
+- 运行前向 `AgentRunScheduler` 申请槽位，按触发优先级与频道 / 适配器 / 工作区公平排队
+- 待执行的触发按实例分文件定期落盘，重启后由一个实例在有效期内恢复已退出实例遗留的触发
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.schemas.agent_ctx import AgentCtx
+from nekro_agent.schemas.chat_message import ChatMessage
+from nekro_agent.services.agent_run_scheduler import AgentRunScheduler, RunPriority, RunTicket
+from nekro_agent.services.perf_metrics import perf_metrics
+
+logger = get_sub_logger("agent_mailbox")
+
+# 频道空闲多久后回收 actor（秒）
+MAILBOX_IDLE_SECONDS = 300.0
+# 待执行触发落盘的合并间隔（秒）
+PERSIST_FLUSH_DELAY_SECONDS = 1.0
+# 重启后恢复触发的有效期（秒），过旧的触发不再回复
+PERSISTED_TRIGGER_MAX_AGE_SECONDS = 600.0
+
+WorkerAliveCheck = Callable[[str], Awaitable[bool]]
+AgentRunner = Callable[[str, Optional[ChatMessage], Optional[AgentCtx]], Awaitable[None]]
+TicketResolver = Callable[[str, RunPriority], Awaitable[RunTicket]]
+
+
+@dataclass
+class _PendingTrigger:
+    message: Optional[ChatMessage]
+    ctx: Optional[AgentCtx]
+    priority: RunPriority = RunPriority.NORMAL
+    queued_at: float = field(default_factory=time.time)
+    coalesced: int = 0
+
+
+@dataclass
+class _Mailbox:
+    chat_key: str
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    pending: Optional[_PendingTrigger] = None
+    last_received: float = 0.0
+    actor: Optional["asyncio.Task[None]"] = None
+    run_task: Optional["asyncio.Task[None]"] = None
+
+
+class ChannelMailboxScheduler:
+    """频道信箱调度器
+
+    Args:
+        runner: 执行一次 Agent 运行的协程函数
+        debounce_seconds: 获取频道防抖时长，每轮运行只调用一次
+        ticket_of: 生成频道的调度申请（所属适配器、工作区与优先级）
+        run_scheduler: 运行槽位调度器
+        persist_dir: 待执行触发的落盘目录，每个实例写入各自的文件，为空时不落盘
+        worker_id: 当前实例标识，用于区分落盘文件
+    """
+
+    def __init__(
+        self,
+        runner: AgentRunner,
+        debounce_seconds: Callable[[str], Awaitable[float]],
+        ticket_of: TicketResolver,
+        run_scheduler: AgentRunScheduler,
+        persist_dir: Optional[Path] = None,
+        worker_id: str = "local",
+        idle_seconds: float = MAILBOX_IDLE_SECONDS,
+    ) -> None:
+        self._runner = runner
+        self._debounce_seconds = debounce_seconds
+        self._ticket_of = ticket_of
+        self._run_scheduler = run_scheduler
+        self._persist_dir = persist_dir
+        self._worker_id = worker_id
+        self._persist_path = persist_dir / f"{re.sub(r'[^0-9A-Za-z_.-]', '_', worker_id)}.json" if persist_dir else None
+        self._idle_seconds = idle_seconds
+        self._mailboxes: Dict[str, _Mailbox] = {}
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def run_scheduler(self) -> AgentRunScheduler:
+        return self._run_scheduler
+
+    def submit(
+        self,
+        chat_key: str,
+        message: Optional[ChatMessage] = None,
+        ctx: Optional[AgentCtx] = None,
+        priority: RunPriority = RunPriority.NORMAL,
+    ) -> None:
+        """投递触发，与信箱中尚未执行的触发合并（合并后取较高的优先级）"""
+        mailbox = self._mailboxes.get(chat_key)
+        if mailbox is None or mailbox.actor is None or mailbox.actor.done():
+            mailbox = self._mailboxes[chat_key] = _Mailbox(chat_key=chat_key)
+            mailbox.actor = asyncio.create_task(self._actor(mailbox))
+        if mailbox.pending is not None:
+            perf_metrics.incr("agent.trigger.coalesced")
+            mailbox.pending = _PendingTrigger(
+                message=message,
+                ctx=ctx,
+                priority=min(priority, mailbox.pending.priority),
+                queued_at=mailbox.pending.queued_at,
+                coalesced=mailbox.pending.coalesced + 1,
+            )
+        else:
+            mailbox.pending = _PendingTrigger(message=message, ctx=ctx, priority=priority)
+            self._schedule_flush()
+        mailbox.last_received = time.monotonic()
+        mailbox.wakeup.set()
+
+    def is_running(self, chat_key: str) -> bool:
+        mailbox = self._mailboxes.get(chat_key)
+        return bool(mailbox and mailbox.run_task and not mailbox.run_task.done())
+
+    def has_pending(self, chat_key: str) -> bool:
+        mailbox = self._mailboxes.get(chat_key)
+        return bool(mailbox and mailbox.pending)
+
+    def cancel_running(self, chat_key: str) -> bool:
+        """取消频道正在执行的运行，信箱中待执行的触发保留"""
+        mailbox = self._mailboxes.get(chat_key)
+        if mailbox is None or mailbox.run_task is None or mailbox.run_task.done():
+            return False
+        mailbox.run_task.cancel()
+        return True
+
+    def active_channels(self) -> List[str]:
+        return list(self._mailboxes)
+
+    async def _actor(self, mailbox: _Mailbox) -> None:
+        chat_key = mailbox.chat_key
+        try:
+            while True:
+                if mailbox.pending is None:
+                    mailbox.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(mailbox.wakeup.wait(), timeout=self._idle_seconds)
+                    except asyncio.TimeoutError:
+                        if mailbox.pending is None:
+                            return
+                    continue
+
+                try:
+                    debounce = max(0.0, float(await self._debounce_seconds(chat_key)))
+                except Exception as e:
+                    logger.warning(f"获取频道 {chat_key} 防抖配置失败，不做防抖: {e}")
+                    debounce = 0.0
+                while (remaining := mailbox.last_received + debounce - time.monotonic()) > 0:
+                    await asyncio.sleep(remaining)
+
+                trigger = mailbox.pending
+                if trigger is None:
+                    continue
+                try:
+                    ticket = await self._ticket_of(chat_key, trigger.priority)
+                except Exception as e:
+                    logger.warning(f"生成频道 {chat_key} 调度信息失败，按默认分组排队: {e}")
+                    ticket = RunTicket(chat_key=chat_key, priority=trigger.priority)
+                await self._run_scheduler.acquire(ticket)
+                # 取得槽位后再取出触发，等待期间到达的新触发一并合并
+                trigger = mailbox.pending or trigger
+                mailbox.pending = None
+                self._schedule_flush()
+                try:
+                    message = trigger.message if trigger.message and not trigger.message.is_empty() else None
+                    mailbox.run_task = asyncio.create_task(self._runner(chat_key, message, trigger.ctx))
+                    try:
+                        await asyncio.wait({mailbox.run_task})
+                    except asyncio.CancelledError:
+                        mailbox.run_task.cancel()
+                        raise
+                    if not mailbox.run_task.cancelled() and mailbox.run_task.exception() is not None:
+                        logger.error(f"频道 {chat_key} Agent 运行异常: {mailbox.run_task.exception()!r}")
+                finally:
+                    mailbox.run_task = None
+                    self._run_scheduler.release(ticket)
+        finally:
+            if self._mailboxes.get(chat_key) is mailbox:
+                del self._mailboxes[chat_key]
+
+    # ------------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------------
+
+    def _pending_snapshot(self) -> Dict[str, float]:
+        return {key: box.pending.queued_at for key, box in self._mailboxes.items() if box.pending is not None}
+
+    def _schedule_flush(self) -> None:
+        if self._persist_path is None or (self._flush_task and not self._flush_task.done()):
+            return
+
+        async def _flush() -> None:
+            await asyncio.sleep(PERSIST_FLUSH_DELAY_SECONDS)
+            self.flush()
+
+        self._flush_task = asyncio.create_task(_flush())
+
+    def flush(self) -> None:
+        """将本实例待执行的触发写入磁盘"""
+        if self._persist_path is None:
+            return
+        try:
+            self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+            self._persist_path.write_text(
+                json.dumps({"worker_id": self._worker_id, "triggers": self._pending_snapshot()}),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logger.warning(f"保存待执行触发失败: {e}")
+
+    async def restore(self, is_worker_alive: Optional[WorkerAliveCheck] = None) -> int:
+        """恢复已退出实例未执行的触发（仅恢复频道，不恢复原始消息对象）
+
+        多实例共享数据目录时只应在一个实例上调用；仍在运行的实例的文件会被跳过，
+        已接管的文件随即删除，避免其他实例重启时重复回放。
+        """
+        if self._persist_dir is None or not self._persist_dir.is_dir():
+            return 0
+        triggers: Dict[str, float] = {}
+        for path in sorted(self._persist_dir.glob("*.json")):
+            if path == self._persist_path:
+                continue
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"加载待执行触发失败: {path.name}: {e}")
+                continue
+            if not isinstance(raw, dict) or not isinstance(raw.get("triggers"), dict):
+                continue
+            owner = raw.get("worker_id")
+            if is_worker_alive is not None and isinstance(owner, str) and await is_worker_alive(owner):
+                continue
+            for chat_key, queued_at in raw["triggers"].items():
+                if isinstance(queued_at, (int, float)):
+                    triggers[chat_key] = max(queued_at, triggers.get(chat_key, 0.0))
+            path.unlink(missing_ok=True)
+        deadline = time.time() - PERSISTED_TRIGGER_MAX_AGE_SECONDS
+        restored = 0
+        for chat_key, queued_at in triggers.items():
+            if queued_at >= deadline and chat_key not in self._mailboxes:
+                self.submit(chat_key)
+                restored += 1
+        if restored:
+            logger.info(f"已恢复 {restored} 个频道的待执行触发")
+        self.flush()
+        return restored
+
+    async def stop(self) -> None:
+        """停止所有 actor，停止前将待执行触发落盘"""
+        self.flush()
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        actors = [box.actor for box in self._mailboxes.values() if box.actor and not box.actor.done()]
+        for actor in actors:
+            actor.cancel()
+        if actors:
+            await asyncio.gather(*actors, return_exceptions=True)
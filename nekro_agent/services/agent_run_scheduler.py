@@ -0,0 +1,279 @@
+"""Agent 运行公平调度器
+
+信箱 actor 在执行 Agent 前向调度器申请运行槽位，调度器负责在全局并发上限内决定放行顺序：
+- 优先级：显式触发（@ / 指令 / 强制触发）优先于关键词触发，关键词触发优先于随机触发；
+  等待超过 `PRIORITY_AGING_SECONDS` 后逐级提升，低优先级触发不会被永久饿死
+- 同优先级内按起始时间公平排队（Start-time Fair Queuing）：每次放行按频道、适配器、工作区三个维度
+  累加虚拟完成时间，活跃度高的频道 / 适配器 / 工作区排在后面，避免单一来源占满槽位
+- 按适配器统计排队长度，变化时向监听者发出背压信号（normal / busy / overloaded），
+  适配器可据此暂缓拉取消息或降低回执频率
+- 排队耗时按优先级记录到性能指标 `agent.queue_wait.<priority>`
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.perf_metrics import perf_metrics
+
+logger = get_sub_logger("agent_run_scheduler")
+
+# 排队多久提升一级优先级（秒）
+PRIORITY_AGING_SECONDS = 30.0
+# 单个适配器排队达到该数量时视为过载
+OVERLOAD_QUEUE_LENGTH = 32
+# 虚拟完成时间表超过该规模时清理已落后于虚拟时钟的条目
+FINISH_TAG_PRUNE_THRESHOLD = 1024
+
+DIMENSION_CHANNEL = "channel"
+DIMENSION_ADAPTER = "adapter"
+DIMENSION_WORKSPACE = "workspace"
+
+
+class RunPriority(IntEnum):
+    """运行优先级，数值越小越优先"""
+
+    EXPLICIT = 0
+    NORMAL = 1
+    RANDOM = 2
+
+
+class BackpressureLevel(str, Enum):
+    NORMAL = "normal"
+    BUSY = "busy"
+    OVERLOADED = "overloaded"
+
+
+@dataclass(frozen=True)
+class RunTicket:
+    """一次运行申请的调度信息"""
+
+    chat_key: str
+    adapter_key: str = ""
+    workspace_key: str = ""
+    priority: RunPriority = RunPriority.NORMAL
+
+    def flow_keys(self) -> Tuple[Tuple[str, str], ...]:
+        keys = [(DIMENSION_CHANNEL, self.chat_key), (DIMENSION_ADAPTER, self.adapter_key)]
+        if self.workspace_key:
+            keys.append((DIMENSION_WORKSPACE, self.workspace_key))
+        return tuple(keys)
+
+
+@dataclass(frozen=True)
+class BackpressureSignal:
+    """适配器背压信号"""
+
+    adapter_key: str
+    level: BackpressureLevel
+    queued: int
+    running: int
+
+
+@dataclass
+class _Waiter:
+    ticket: RunTicket
+    seq: int
+    start_tag: float
+    enqueued_at: float
+    future: "asyncio.Future[None]" = field(repr=False)
+
+    def effective_priority(self, now: float) -> int:
+        aged = int((now - self.enqueued_at) / PRIORITY_AGING_SECONDS)
+        return max(int(RunPriority.EXPLICIT), int(self.ticket.priority) - aged)
+
+
+class AdapterLoad(BaseModel):
+    running: int
+    queued: int
+    level: BackpressureLevel
+
+
+class RunSchedulerSnapshot(BaseModel):
+    """调度器状态快照"""
+
+    capacity: int
+    running: int
+    queued: int
+    queued_by_priority: Dict[str, int]
+    oldest_wait_seconds: float
+    adapters: Dict[str, AdapterLoad]
+
+
+BackpressureListener = Callable[[BackpressureSignal], None]
+
+
+class AgentRunScheduler:
+    """按优先级与多维度加权公平排队的运行槽位调度器
+
+    Args:
+        capacity: 获取全局最大并发运行数，<= 0 表示不限制
+    """
+
+    def __init__(self, capacity: Callable[[], int]) -> None:
+        self._capacity = capacity
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[Tuple[str, str], float] = {}
+        self._weights: Dict[Tuple[str, str], float] = {}
+        self._running: Dict[str, int] = {}
+        self._levels: Dict[str, BackpressureLevel] = {}
+        self._listeners: List[BackpressureListener] = []
+
+    # ------------------------------------------------------------------
+    # 配置
+    # ------------------------------------------------------------------
+
+    def set_weight(self, dimension: str, key: str, weight: float) -> None:
+        """设置频道 / 适配器 / 工作区的调度权重（默认 1，权重越大分到的槽位越多）"""
+        if weight <= 0:
+            raise ValueError("调度权重必须大于 0")
+        self._weights[(dimension, key)] = weight
+
+    def add_backpressure_listener(self, listener: BackpressureListener) -> None:
+        self._listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    # 槽位
+    # ------------------------------------------------------------------
+
+    @property
+    def in_use(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _has_free_slot(self) -> bool:
+        capacity = self._capacity()
+        return capacity <= 0 or self.in_use < capacity
+
+    def _stamp(self, ticket: RunTicket) -> float:
+        """计算起始标签并推进各维度的虚拟完成时间"""
+        flows = ticket.flow_keys()
+        start = max([self._virtual_time, *(self._finish_tags.get(flow, 0.0) for flow in flows)])
+        for flow in flows:
+            self._finish_tags[flow] = start + 1.0 / self._weights.get(flow, 1.0)
+        return start
+
+    def _mark_running(self, ticket: RunTicket, enqueued_at: float) -> None:
+        self._running[ticket.adapter_key] = self._running.get(ticket.adapter_key, 0) + 1
+        priority = ticket.priority.name.lower()
+        perf_metrics.observe(f"agent.queue_wait.{priority}", (time.monotonic() - enqueued_at) * 1000)
+
+    async def acquire(self, ticket: RunTicket) -> None:
+        """申请运行槽位，槽位不足时排队等待"""
+        now = time.monotonic()
+        start_tag = self._stamp(ticket)
+        if not self._waiters and self._has_free_slot():
+            self._virtual_time = start_tag
+            self._mark_running(ticket, now)
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(ticket=ticket, seq=next(self._seq), start_tag=start_tag, enqueued_at=now, future=future)
+        self._waiters.append(waiter)
+        self._update_backpressure(ticket.adapter_key)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 槽位已分配但等待方被取消，归还槽位
+                self.release(ticket)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._update_backpressure(ticket.adapter_key)
+            raise
+
+    def release(self, ticket: RunTicket) -> None:
+        running = self._running.get(ticket.adapter_key, 0) - 1
+        if running > 0:
+            self._running[ticket.adapter_key] = running
+        else:
+            self._running.pop(ticket.adapter_key, None)
+        self._dispatch()
+        self._update_backpressure(ticket.adapter_key)
+
+    def _pick(self) -> _Waiter:
+        now = time.monotonic()
+        return min(self._waiters, key=lambda w: (w.effective_priority(now), w.start_tag, w.seq))
+
+    def _dispatch(self) -> None:
+        while self._waiters and self._has_free_slot():
+            waiter = self._pick()
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            self._mark_running(waiter.ticket, waiter.enqueued_at)
+            waiter.future.set_result(None)
+            self._update_backpressure(waiter.ticket.adapter_key)
+        if len(self._finish_tags) > FINISH_TAG_PRUNE_THRESHOLD:
+            # 落后于虚拟时钟的完成时间不再影响排序
+            self._finish_tags = {k: v for k, v in self._finish_tags.items() if v > self._virtual_time}
+
+    # ------------------------------------------------------------------
+    # 背压与状态
+    # ------------------------------------------------------------------
+
+    def _queued_of(self, adapter_key: str) -> int:
+        return sum(1 for w in self._waiters if w.ticket.adapter_key == adapter_key)
+
+    def backpressure_level(self, adapter_key: str) -> BackpressureLevel:
+        return self._levels.get(adapter_key, BackpressureLevel.NORMAL)
+
+    def _update_backpressure(self, adapter_key: str) -> None:
+        queued = self._queued_of(adapter_key)
+        if queued >= OVERLOAD_QUEUE_LENGTH:
+            level = BackpressureLevel.OVERLOADED
+        elif queued > 0:
+            level = BackpressureLevel.BUSY
+        else:
+            level = BackpressureLevel.NORMAL
+        if level == self.backpressure_level(adapter_key):
+            return
+        if level == BackpressureLevel.NORMAL:
+            self._levels.pop(adapter_key, None)
+        else:
+            self._levels[adapter_key] = level
+        signal = BackpressureSignal(
+            adapter_key=adapter_key,
+            level=level,
+            queued=queued,
+            running=self._running.get(adapter_key, 0),
+        )
+        for listener in self._listeners:
+            try:
+                listener(signal)
+            except Exception as e:
+                logger.warning(f"背压信号处理失败 ({adapter_key}): {e}")
+
+    def snapshot(self) -> RunSchedulerSnapshot:
+        now = time.monotonic()
+        queued_by_priority = {p.name.lower(): 0 for p in RunPriority}
+        for waiter in self._waiters:
+            queued_by_priority[waiter.ticket.priority.name.lower()] += 1
+        adapter_keys = set(self._running) | {w.ticket.adapter_key for w in self._waiters}
+        return RunSchedulerSnapshot(
+            capacity=self._capacity(),
+            running=self.in_use,
+            queued=len(self._waiters),
+            queued_by_priority=queued_by_priority,
+            oldest_wait_seconds=round(max((now - w.enqueued_at for w in self._waiters), default=0.0), 3),
+            adapters={
+                key: AdapterLoad(
+                    running=self._running.get(key, 0),
+                    queued=self._queued_of(key),
+                    level=self.backpressure_level(key),
+                )
+                for key in sorted(adapter_keys)
+            },
+        )
@@ -1,17 +1,22 @@
 """频道实时广播服务
 
 用于管理频道列表的实时更新，将频道创建、更新、删除事件推送给所有连接的客户端。
+多实例部署时事件经 `coordinator` 扇出，订阅者连接到任一实例都能收到。
 """
 
 import asyncio
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
 
 from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.coordination import coordinator
 
 logger = get_sub_logger("channel_broadcaster")
 
+# 跨实例扇出使用的协调事件主题
+CHANNEL_EVENT_TOPIC = "channel_event"
+
 
 class ChannelEvent(BaseModel):
     """频道事件"""
@@ -89,7 +94,15 @@ class ChannelBroadcaster:
             is_active=is_active,
             status=status,
         )
+        self._deliver(event)
+        await coordinator.publish(CHANNEL_EVENT_TOPIC, event.model_dump(mode="json"))
+
+    def _on_remote_event(self, payload: Dict[str, Any]) -> None:
+        self._deliver(ChannelEvent.model_validate(payload))
 
+    def _deliver(self, event: ChannelEvent) -> None:
+        """推送事件到本实例的订阅者"""
+        event_type, chat_key = event.event_type, event.chat_key
         logger.debug(f"广播频道事件 {event_type} 到 {len(self.queues)} 个订阅者, chat_key={chat_key}")
 
         # 异步发送到所有队列，不阻塞
@@ -110,3 +123,4 @@ class ChannelBroadcaster:
 
 # 全局频道广播器实例
 channel_broadcaster = ChannelBroadcaster()
+coordinator.subscribe(CHANNEL_EVENT_TOPIC, channel_broadcaster._on_remote_event)
@@ -0,0 +1,481 @@
+"""聊天记录全文检索
+
+为历史漫游、WebUI 消息搜索与记忆系统提供统一的聊天记录检索接口：
+- 关键词语法：普通关键词为 OR（任一命中），`+词` 为 AND（必须包含），`-词` 为 NOT（必须排除）
+- 排序：按命中的 OR 关键词数量降序，同分按发送时间由新到旧
+- PostgreSQL：单条 SQL 完成过滤、打分与分页，`ILIKE` 由 pg_trgm GIN 索引加速（见迁移 16）
+- 其他数据库（SQLite / 测试）：进程内字符二元组倒排索引，按频道懒加载，新消息经 post_save 信号增量写入；
+  每个频道只索引最近 `MAX_INDEXED_MESSAGES_PER_CHANNEL` 条消息，更早的消息检索时直接查库
+
+pg_trgm 按三字符切分，短于 `TRGM_MIN_KEYWORD_LENGTH` 的关键词无法使用 GIN 索引，只能在频道内顺序扫描；
+中文检索词多为两个字，因此 PostgreSQL 上没有任何可走索引的关键词时（OR 关键词中有短词且没有足够长的 AND 关键词），
+同样改由进程内二元组索引检索，超出索引窗口的更早消息照常查库补齐。
+
+检索只返回消息主键与得分，调用方再按主键取回模型，已删除的消息会在这一步自然剔除。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from tortoise import connections
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+from tortoise.signals import post_delete, post_save
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.models.db_chat_message import DBChatMessage
+from nekro_agent.services.perf_metrics import perf_metrics
+
+logger = get_sub_logger("chat_search")
+
+MAX_INDEXED_CHANNELS = 32  # 进程内索引最多缓存的频道数
+MAX_INDEXED_MESSAGES_PER_CHANNEL = 20000  # 单个频道索引最多保留的最近消息数
+INDEX_LOAD_BATCH_SIZE = 5000
+TRGM_MIN_KEYWORD_LENGTH = 3  # pg_trgm GIN 索引可服务的最短关键词长度
+
+
+@dataclass
+class ChatSearchQuery:
+    """解析后的检索条件"""
+
+    or_keywords: List[str] = field(default_factory=list)
+    and_keywords: List[str] = field(default_factory=list)
+    not_keywords: List[str] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, keywords: Iterable[str]) -> "ChatSearchQuery":
+        query = cls()
+        for raw in keywords:
+            keyword = raw.strip()
+            if keyword.startswith("+"):
+                target = query.and_keywords
+                keyword = keyword[1:].strip()
+            elif keyword.startswith("-"):
+                target = query.not_keywords
+                keyword = keyword[1:].strip()
+            else:
+                target = query.or_keywords
+            if keyword and keyword.lower() not in (k.lower() for k in target):
+                target.append(keyword)
+        return query
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.or_keywords or self.and_keywords or self.not_keywords)
+
+    @property
+    def trgm_indexable(self) -> bool:
+        """是否至少有一个检索条件能走 pg_trgm 索引：任一 AND 关键词足够长，或 OR 关键词全部足够长"""
+        if any(len(k) >= TRGM_MIN_KEYWORD_LENGTH for k in self.and_keywords):
+            return True
+        return bool(self.or_keywords) and all(len(k) >= TRGM_MIN_KEYWORD_LENGTH for k in self.or_keywords)
+
+    def describe(self) -> str:
+        or_msg = f"OR: {', '.join(self.or_keywords)}" if self.or_keywords else "no keywords"
+        and_msg = f", AND: {', '.join(self.and_keywords)}" if self.and_keywords else ""
+        not_msg = f", NOT: {', '.join(self.not_keywords)}" if self.not_keywords else ""
+        return f"{or_msg}{and_msg}{not_msg}"
+
+
+@dataclass
+class ChatSearchHit:
+    id: int
+    send_timestamp: int
+    score: int
+
+
+def char_bigrams(text: str) -> Set[str]:
+    """字符二元组切分，对中日韩文本无需分词即可检索，英文等同样适用"""
+    text = text.lower()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class _ChannelIndex:
+    """单个频道最近消息的倒排索引
+
+    消息数超过容量时淘汰最旧的一批，`floor_id` 记录索引覆盖的最小主键，更早的消息由调用方查库补齐。
+    """
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        self.capacity = capacity or MAX_INDEXED_MESSAGES_PER_CHANNEL
+        self.floor_id = 0  # 为 0 表示索引覆盖整个频道
+        self.texts: Dict[int, str] = {}
+        self.timestamps: Dict[int, int] = {}
+        self.postings: Dict[str, Set[int]] = {}
+
+    def add(self, msg_id: int, text: str, send_timestamp: int) -> None:
+        if msg_id < self.floor_id:
+            return
+        if msg_id in self.texts:
+            self.remove(msg_id)
+        lowered = text.lower()
+        self.texts[msg_id] = lowered
+        self.timestamps[msg_id] = send_timestamp
+        for gram in char_bigrams(lowered):
+            self.postings.setdefault(gram, set()).add(msg_id)
+        if len(self.texts) > self.capacity:
+            self._trim()
+
+    def _trim(self) -> None:
+        """淘汰最旧的消息，一次降到容量的九成以摊薄排序开销"""
+        keep = max(1, self.capacity * 9 // 10)
+        evicted = sorted(self.texts)[: len(self.texts) - keep]
+        for msg_id in evicted:
+            self.remove(msg_id)
+        self.floor_id = evicted[-1] + 1
+
+    def remove(self, msg_id: int) -> None:
+        text = self.texts.pop(msg_id, None)
+        self.timestamps.pop(msg_id, None)
+        if text is None:
+            return
+        for gram in char_bigrams(text):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(msg_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def match(self, keyword: str) -> Set[int]:
+        """返回包含关键词的消息，先以二元组求交缩小候选，再做子串校验"""
+        keyword = keyword.lower()
+        grams = char_bigrams(keyword)
+        if not grams:
+            candidates: Iterable[int] = self.texts.keys()
+        else:
+            posting_lists = sorted((self.postings.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*posting_lists) if posting_lists[0] else set()
+        return {msg_id for msg_id in candidates if keyword in self.texts[msg_id]}
+
+    def filter(
+        self,
+        query: ChatSearchQuery,
+        start_timestamp: Optional[int],
+        end_timestamp: Optional[int],
+        before_id: Optional[int] = None,
+    ) -> List[ChatSearchHit]:
+        """返回索引内全部命中，不排序"""
+        scores: Dict[int, int] = {}
+        if query.or_keywords:
+            for keyword in query.or_keywords:
+                for msg_id in self.match(keyword):
+                    scores[msg_id] = scores.get(msg_id, 0) + 1
+            candidates = set(scores)
+        else:
+            candidates = set(self.texts)
+        for keyword in query.and_keywords:
+            candidates &= self.match(keyword)
+        for keyword in query.not_keywords:
+            candidates -= self.match(keyword)
+
+        return [
+            ChatSearchHit(id=msg_id, send_timestamp=self.timestamps[msg_id], score=scores.get(msg_id, 0))
+            for msg_id in candidates
+            if (start_timestamp is None or self.timestamps[msg_id] >= start_timestamp)
+            and (end_timestamp is None or self.timestamps[msg_id] < end_timestamp)
+            and (before_id is None or msg_id < before_id)
+        ]
+
+    def search(
+        self,
+        query: ChatSearchQuery,
+        start_timestamp: Optional[int],
+        end_timestamp: Optional[int],
+        limit: int,
+        before_id: Optional[int] = None,
+        rank: bool = True,
+    ) -> List[ChatSearchHit]:
+        return _sort_hits(self.filter(query, start_timestamp, end_timestamp, before_id), rank)[:limit]
+
+
+def _sort_hits(hits: List[ChatSearchHit], rank: bool) -> List[ChatSearchHit]:
+    if rank:
+        hits.sort(key=lambda h: (-h.score, -h.send_timestamp, -h.id))
+    else:
+        hits.sort(key=lambda h: -h.id)
+    return hits
+
+
+def _escape_like(keyword: str) -> str:
+    return keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _build_postgres_conditions(
+    chat_key: str,
+    query: ChatSearchQuery,
+    start_timestamp: Optional[int],
+    end_timestamp: Optional[int],
+    before_id: Optional[int],
+) -> Tuple[List[str], str, List[object]]:
+    """构建 WHERE 条件与 OR 关键词打分表达式"""
+    params: List[object] = [chat_key]
+    conditions = ['"chat_key" = $1']
+
+    def _bind(value: object) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    def _like(keyword: str) -> str:
+        return f"\"content_text\" ILIKE {_bind(f'%{_escape_like(keyword)}%')}"
+
+    if start_timestamp is not None:
+        conditions.append(f'"send_timestamp" >= {_bind(start_timestamp)}')
+    if end_timestamp is not None:
+        conditions.append(f'"send_timestamp" < {_bind(end_timestamp)}')
+    if before_id is not None:
+        conditions.append(f'"id" < {_bind(before_id)}')
+
+    score_expr = "0"
+    if query.or_keywords:
+        or_likes = [_like(keyword) for keyword in query.or_keywords]
+        conditions.append(f"({' OR '.join(or_likes)})")
+        score_expr = " + ".join(f"(CASE WHEN {like} THEN 1 ELSE 0 END)" for like in or_likes)
+    conditions.extend(_like(keyword) for keyword in query.and_keywords)
+    conditions.extend(f"NOT {_like(keyword)}" for keyword in query.not_keywords)
+    return conditions, score_expr, params
+
+
+def build_postgres_search_sql(
+    chat_key: str,
+    query: ChatSearchQuery,
+    start_timestamp: Optional[int],
+    end_timestamp: Optional[int],
+    limit: int,
+    before_id: Optional[int] = None,
+    rank: bool = True,
+) -> Tuple[str, List[object]]:
+    """构建 PostgreSQL 检索语句，过滤、打分与截断在一次查询内完成"""
+    conditions, score_expr, params = _build_postgres_conditions(
+        chat_key, query, start_timestamp, end_timestamp, before_id
+    )
+    order_by = '"score" DESC, "send_timestamp" DESC, "id" DESC' if rank else '"id" DESC'
+    sql = (
+        f'SELECT "id", "send_timestamp", {score_expr} AS "score" FROM "chat_message" '
+        f"WHERE {' AND '.join(conditions)} ORDER BY {order_by} LIMIT ${len(params) + 1}"
+    )
+    return sql, [*params, limit]
+
+
+def build_postgres_count_sql(
+    chat_key: str,
+    query: ChatSearchQuery,
+    start_timestamp: Optional[int],
+    end_timestamp: Optional[int],
+    before_id: Optional[int] = None,
+) -> Tuple[str, List[object]]:
+    """构建 PostgreSQL 命中总数统计语句"""
+    conditions, _, params = _build_postgres_conditions(chat_key, query, start_timestamp, end_timestamp, before_id)
+    return f'SELECT COUNT(*) AS "total" FROM "chat_message" WHERE {" AND ".join(conditions)}', params
+
+
+class ChatHistorySearchService:
+    """聊天记录检索服务"""
+
+    def __init__(self, max_channels: int = MAX_INDEXED_CHANNELS) -> None:
+        self.max_channels = max_channels
+        self._indexes: "OrderedDict[str, _ChannelIndex]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Lock] = {}
+        self._building: Dict[str, _ChannelIndex] = {}  # 构建中的索引同样接收增量写入，避免遗漏加载期间的新消息
+
+    @staticmethod
+    def _use_postgres() -> bool:
+        try:
+            return connections.get("default").capabilities.dialect == "postgres"
+        except Exception:
+            return False
+
+    def _use_postgres_for(self, query: ChatSearchQuery) -> bool:
+        """无关键词或有可走索引的关键词时在 PostgreSQL 内检索，仅含短词时改用进程内二元组索引"""
+        return self._use_postgres() and (not (query.or_keywords or query.and_keywords) or query.trgm_indexable)
+
+    async def search(
+        self,
+        chat_key: str,
+        keywords: Union[Iterable[str], ChatSearchQuery],
+        start_timestamp: Optional[int] = None,
+        end_timestamp: Optional[int] = None,
+        limit: int = 20,
+        before_id: Optional[int] = None,
+        rank: bool = True,
+    ) -> List[ChatSearchHit]:
+        """检索频道消息，返回按相关度排序的命中列表
+
+        Args:
+            chat_key: 聊天频道标识
+            keywords: 关键词列表（支持 `+词` / `-词` 前缀）或已解析的检索条件
+            start_timestamp: 发送时间下限（包含）
+            end_timestamp: 发送时间上限（不包含）
+            limit: 返回的最大条数
+            before_id: 仅返回主键小于该值的消息，用于按时间倒序分页
+            rank: 为 False 时不按相关度排序，直接按时间倒序返回
+        """
+        query = keywords if isinstance(keywords, ChatSearchQuery) else ChatSearchQuery.parse(keywords)
+        if limit <= 0:
+            return []
+        with perf_metrics.timer("chat_search.query"):
+            if self._use_postgres_for(query):
+                sql, params = build_postgres_search_sql(
+                    chat_key, query, start_timestamp, end_timestamp, limit, before_id, rank
+                )
+                rows = await connections.get("default").execute_query_dict(sql, params)
+                return [
+                    ChatSearchHit(id=int(row["id"]), send_timestamp=int(row["send_timestamp"]), score=int(row["score"]))
+                    for row in rows
+                ]
+            index = await self._get_index(chat_key)
+            hits = index.search(query, start_timestamp, end_timestamp, limit, before_id, rank)
+            if not index.floor_id or (not rank and len(hits) >= limit):
+                return hits
+            # 更早的消息不在索引内，按时间倒序查库补齐；相关度排序时更早的消息至多取 limit 条参与排序
+            older = self._unindexed_query(chat_key, query, start_timestamp, end_timestamp, before_id, index)
+            rows = await older.order_by("-id").limit(limit - len(hits) if not rank else limit).values_list(
+                "id", "send_timestamp", "content_text"
+            )
+            hits.extend(
+                ChatSearchHit(
+                    id=msg_id,
+                    send_timestamp=send_timestamp,
+                    score=sum(keyword.lower() in (text or "").lower() for keyword in query.or_keywords),
+                )
+                for msg_id, send_timestamp, text in rows
+            )
+            return _sort_hits(hits, rank)[:limit]
+
+    async def count(
+        self,
+        chat_key: str,
+        keywords: Union[Iterable[str], ChatSearchQuery],
+        start_timestamp: Optional[int] = None,
+        end_timestamp: Optional[int] = None,
+        before_id: Optional[int] = None,
+    ) -> int:
+        """统计命中总数，参数含义同 `search`"""
+        query = keywords if isinstance(keywords, ChatSearchQuery) else ChatSearchQuery.parse(keywords)
+        if self._use_postgres_for(query):
+            sql, params = build_postgres_count_sql(chat_key, query, start_timestamp, end_timestamp, before_id)
+            rows = await connections.get("default").execute_query_dict(sql, params)
+            return int(rows[0]["total"]) if rows else 0
+        index = await self._get_index(chat_key)
+        total = len(index.filter(query, start_timestamp, end_timestamp, before_id))
+        if index.floor_id:
+            older = self._unindexed_query(chat_key, query, start_timestamp, end_timestamp, before_id, index)
+            total += await older.count()
+        return total
+
+    @staticmethod
+    def _unindexed_query(
+        chat_key: str,
+        query: ChatSearchQuery,
+        start_timestamp: Optional[int],
+        end_timestamp: Optional[int],
+        before_id: Optional[int],
+        index: _ChannelIndex,
+    ) -> QuerySet[DBChatMessage]:
+        """索引窗口之前的消息直接按子串过滤查库"""
+        upper_id = index.floor_id if before_id is None else min(before_id, index.floor_id)
+        queryset = DBChatMessage.filter(chat_key=chat_key, id__lt=upper_id)
+        if start_timestamp is not None:
+            queryset = queryset.filter(send_timestamp__gte=start_timestamp)
+        if end_timestamp is not None:
+            queryset = queryset.filter(send_timestamp__lt=end_timestamp)
+        if query.or_keywords:
+            queryset = queryset.filter(Q(*(Q(content_text__icontains=k) for k in query.or_keywords), join_type="OR"))
+        for keyword in query.and_keywords:
+            queryset = queryset.filter(content_text__icontains=keyword)
+        for keyword in query.not_keywords:
+            queryset = queryset.exclude(content_text__icontains=keyword)
+        return queryset
+
+    async def search_messages(
+        self,
+        chat_key: str,
+        keywords: Union[Iterable[str], ChatSearchQuery],
+        start_timestamp: Optional[int] = None,
+        end_timestamp: Optional[int] = None,
+        limit: int = 20,
+        before_id: Optional[int] = None,
+        rank: bool = True,
+    ) -> List[DBChatMessage]:
+        """检索并取回消息模型，保持相关度顺序"""
+        hits = await self.search(chat_key, keywords, start_timestamp, end_timestamp, limit, before_id, rank)
+        if not hits:
+            return []
+        messages = {msg.id: msg for msg in await DBChatMessage.filter(id__in=[hit.id for hit in hits])}
+        return [messages[hit.id] for hit in hits if hit.id in messages]
+
+    async def _get_index(self, chat_key: str) -> _ChannelIndex:
+        index = self._indexes.get(chat_key)
+        if index is not None:
+            self._indexes.move_to_end(chat_key)
+            return index
+        lock = self._loading.setdefault(chat_key, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(chat_key)
+            if index is None:
+                index = self._building[chat_key] = _ChannelIndex()
+                try:
+                    await self._load_index(chat_key, index)
+                finally:
+                    self._building.pop(chat_key, None)
+                self._indexes[chat_key] = index
+                while len(self._indexes) > self.max_channels:
+                    self._indexes.popitem(last=False)
+            # 在锁内移除，避免后到的请求在锁释放与移除之间创建新锁、重复构建索引
+            if self._loading.get(chat_key) is lock:
+                del self._loading[chat_key]
+        return index
+
+    async def _load_index(self, chat_key: str, index: _ChannelIndex) -> None:
+        """由新到旧加载最近的消息，达到容量后其余消息留给查库补齐"""
+        started = time.perf_counter()
+        loaded = 0
+        queryset = DBChatMessage.filter(chat_key=chat_key)
+        while True:
+            batch_size = min(INDEX_LOAD_BATCH_SIZE, index.capacity - loaded)
+            rows = await queryset.order_by("-id").limit(batch_size).values_list("id", "content_text", "send_timestamp")
+            for msg_id, text, send_timestamp in rows:
+                if msg_id not in index.texts:
+                    index.add(msg_id, text or "", send_timestamp)
+            loaded += len(rows)
+            if len(rows) < batch_size:
+                break
+            if loaded >= index.capacity:
+                index.floor_id = max(index.floor_id, rows[-1][0])
+                break
+            queryset = DBChatMessage.filter(chat_key=chat_key, id__lt=rows[-1][0])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        perf_metrics.observe("chat_search.index_load", elapsed_ms)
+        logger.debug(f"已构建频道 {chat_key} 的聊天记录索引: {len(index.texts)} 条, 耗时 {elapsed_ms:.1f}ms")
+
+    def index_message(self, message: DBChatMessage) -> None:
+        """增量写入已加载频道的索引，未加载的频道在首次检索时整体构建"""
+        index = self._indexes.get(message.chat_key) or self._building.get(message.chat_key)
+        if index is not None:
+            index.add(message.id, message.content_text or "", message.send_timestamp)
+
+    def remove_message(self, message: DBChatMessage) -> None:
+        index = self._indexes.get(message.chat_key) or self._building.get(message.chat_key)
+        if index is not None:
+            index.remove(message.id)
+
+    def invalidate(self, chat_key: Optional[str] = None) -> None:
+        if chat_key is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(chat_key, None)
+
+
+chat_history_search = ChatHistorySearchService()
+
+
+@post_save(DBChatMessage)
+async def _on_message_saved(sender, instance: DBChatMessage, created, using_db, update_fields) -> None:  # noqa: ARG001
+    chat_history_search.index_message(instance)
+
+
+@post_delete(DBChatMessage)
+async def _on_message_deleted(sender, instance: DBChatMessage, using_db) -> None:  # noqa: ARG001
+    chat_history_search.remove_message(instance)
@@ -2,7 +2,8 @@
 """通用消息服务
 
 这个服务负责处理跨平台的消息发送逻辑，包含所有与具体协议端无关的通用处理。
-协议端特定的逻辑通过 adapter.forward_message 接口委托给各自的适配器实现。
+协议端特定的逻辑通过 adapter.forward_message 接口委托给各自的适配器实现，
+Agent 回复经由出站队列（`services/outbox.py`）按频道有序、限速并重试投递。
 """
 
 from pathlib import Path
@@ -23,7 +24,9 @@ from nekro_agent.schemas.agent_message import (
     AgentMessageSegment,
     AgentMessageSegmentType,
 )
+from nekro_agent.services.agent.reply_timing import mark_reply_sent
 from nekro_agent.services.agent.resolver import fix_raw_response
+from nekro_agent.services.outbox import outbox_service
 from nekro_agent.tools.common_util import download_file
 from nekro_agent.tools.message_id import normalize_ref_msg_id
 from nekro_agent.tools.path_convertor import (
@@ -107,9 +110,12 @@ class UniversalChatService:
             ref_msg_id=ref_msg_id,
         )
 
-        # 发送消息
+        # 发送消息；需要记录的消息附带记录信息，重启补发成功后由出站队列写入聊天记录
+        history = (
+            {"messages": [m.model_dump(mode="json") for m in messages], "ref_msg_id": ref_msg_id} if record else None
+        )
         try:
-            plt_response: PlatformSendResponse = await adapter.forward_message(send_request)
+            plt_response: PlatformSendResponse = await outbox_service.send(adapter, send_request, history=history)
         except Exception as e:
             logger.exception(f"发送消息失败: {e}")
             if config.DEBUG_IN_CHAT:
@@ -130,28 +136,40 @@ class UniversalChatService:
             logger.error(f"适配器发送消息失败，错误: {plt_response.error_message}")
             raise ValueError(f"适配器发送消息失败，错误: {plt_response.error_message}")
 
+        mark_reply_sent(chat_key)
+
         # 记录聊天记录
         if record and not plt_response.recorded:
-            from nekro_agent.services.message_service import message_service
-
-            try:
-                await message_service.push_bot_message(
-                    chat_key,
-                    messages,
-                    plt_response,
-                    ref_msg_id=ref_msg_id,
-                    normalize_at_markup=False,
-                )
-            except TypeError as exc:
-                if "normalize_at_markup" not in str(exc):
-                    raise
-                logger.warning("push_bot_message 运行时钩子不兼容 normalize_at_markup，已使用旧签名重试")
-                await message_service.push_bot_message(
-                    chat_key,
-                    messages,
-                    plt_response,
-                    ref_msg_id=ref_msg_id,
-                )
+            await self.record_bot_message(chat_key, messages, plt_response, ref_msg_id=ref_msg_id)
+
+    async def record_bot_message(
+        self,
+        chat_key: str,
+        messages: List[AgentMessageSegment],
+        plt_response: PlatformSendResponse,
+        ref_msg_id: Optional[str] = None,
+    ) -> None:
+        """将已送达的机器人消息写入聊天记录"""
+        from nekro_agent.services.message_service import message_service
+
+        try:
+            await message_service.push_bot_message(
+                chat_key,
+                messages,
+                plt_response,
+                ref_msg_id=ref_msg_id,
+                normalize_at_markup=False,
+            )
+        except TypeError as exc:
+            if "normalize_at_markup" not in str(exc):
+                raise
+            logger.warning("push_bot_message 运行时钩子不兼容 normalize_at_markup，已使用旧签名重试")
+            await message_service.push_bot_message(
+                chat_key,
+                messages,
+                plt_response,
+                ref_msg_id=ref_msg_id,
+            )
 
     async def _preprocess_messages(
         self,
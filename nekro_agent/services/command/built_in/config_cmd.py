@@ -77,6 +77,7 @@ class ConfSetCommand(BaseCommand):
         expr: Annotated[str, Arg("配置表达式 (key=value)", positional=True, greedy=True)] = "",
     ) -> CommandResponse:
         from nekro_agent.core.config import config
+        from nekro_agent.core.core_utils import ConfigManager
 
         if not expr or "=" not in expr:
             return CmdCtl.failed(
@@ -124,6 +125,7 @@ class ConfSetCommand(BaseCommand):
                 )
             )
 
+        ConfigManager.bump_version()
         return CmdCtl.success(
             t(zh_CN=f"已设置 `{key}` 的值为 `{value}`", en_US=f"Set `{key}` to `{value}`")
         )
@@ -1,6 +1,5 @@
 """内置命令 - 配额类: quota, quota_boost, quota_reset, quota_set, quota_whitelist"""
 
-import time
 from typing import Annotated
 
 from nekro_agent.schemas.i18n import i18n_text, t
@@ -35,19 +34,10 @@ class QuotaCommand(BaseCommand):
         boost = quota_service.get_boost(context.chat_key)
         effective_limit = daily_limit + boost
 
-        today_start = time.time() - (time.time() % 86400)
-        daily_bot_count = (
-            await DBChatMessage.filter(
-                chat_key=context.chat_key,
-                sender_id=-1,
-                send_timestamp__gte=int(today_start),
-            )
-            .exclude(sender_name="SYSTEM")
-            .count()
-        )
+        daily_bot_count = await quota_service.get_daily_count(context.chat_key)
         daily_total_count = await DBChatMessage.filter(
             chat_key=context.chat_key,
-            send_timestamp__gte=int(today_start),
+            send_timestamp__gte=quota_service.day_start_timestamp(),
         ).count()
 
         session_msg_count = await DBChatMessage.filter(
@@ -83,16 +73,7 @@ class QuotaCommand(BaseCommand):
 
             if effective_config.AI_CHAT_ENABLE_HOURLY_LIMIT:
                 hourly_limit = quota_service.calculate_hourly_quota(effective_limit)
-                hour_start = time.time() - (time.time() % 3600)
-                hourly_count = (
-                    await DBChatMessage.filter(
-                        chat_key=context.chat_key,
-                        sender_id=-1,
-                        send_timestamp__gte=int(hour_start),
-                    )
-                    .exclude(sender_name="SYSTEM")
-                    .count()
-                )
+                hourly_count = await quota_service.get_hourly_count(context.chat_key)
                 hourly_label = t(zh_CN="小时限额", en_US="Hourly limit")
                 hourly_used = t(zh_CN="本小时已用", en_US="Used this hour")
                 lines.append(f"{hourly_label}: {hourly_limit}")
@@ -204,7 +185,6 @@ class QuotaSetCommand(BaseCommand):
         context: CommandExecutionContext,
         amount_str: Annotated[str, Arg("每日配额限制（0表示不限制）", positional=True)] = "",
     ) -> CommandResponse:
-        from nekro_agent.models.db_chat_channel import DBChatChannel
         from nekro_agent.services.config_service import UnifiedConfigService
 
         if not amount_str or not amount_str.lstrip("-").isdigit():
@@ -230,9 +210,6 @@ class QuotaSetCommand(BaseCommand):
         if not success:
             return CmdCtl.failed(t(zh_CN=f"保存失败: {msg}", en_US=f"Save failed: {msg}"))
 
-        db_chat_channel = await DBChatChannel.get_channel(chat_key=context.chat_key)
-        db_chat_channel._effective_config = None  # noqa: SLF001
-
         unlimited = t(zh_CN="无限制", en_US="Unlimited")
         display = unlimited if amount <= 0 else str(amount)
         return CmdCtl.success(
@@ -1,14 +1,28 @@
+import time
+from typing import Dict, Tuple
+
 from nekro_agent.core.config import CoreConfig
 from nekro_agent.core.config import config as system_config
+from nekro_agent.core.core_utils import ConfigManager
 from nekro_agent.core.overridable_config import OverridableConfig
 from nekro_agent.services.config_service import UnifiedConfigService
 
+# 有效配置缓存的兜底过期时间（秒），配置版本号变化时会立即失效
+EFFECTIVE_CONFIG_TTL_SECONDS = 30.0
+
 
 class ConfigResolver:
     """配置解析器
     根据 频道 > 适配器 > 系统 的优先级解析最终生效的配置。
+
+    解析结果按 chat_key 缓存，任意配置实例注册、修改或落盘都会递增
+    `ConfigManager` 版本号使缓存失效；返回的实例为共享对象，调用方不应修改。
     """
 
+    def __init__(self) -> None:
+        # {chat_key: (配置版本号, 过期时间, 有效配置)}
+        self._cache: Dict[str, Tuple[int, float, CoreConfig]] = {}
+
     async def get_effective_config(self, chat_key: str) -> CoreConfig:
         """获取指定频道的最终有效配置
 
@@ -16,8 +30,30 @@ class ConfigResolver:
             chat_key: 频道标识
 
         Returns:
-            CoreConfig: 一个包含已解析配置的新 CoreConfig 实例
+            CoreConfig: 已解析的有效配置（缓存共享实例，只读）
         """
+        version = ConfigManager.get_version()
+        cached = self._cache.get(chat_key)
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            return cached[2]
+
+        effective_config = self._resolve_effective_config(chat_key)
+        # 解析过程中可能首次加载覆盖配置文件导致版本号递增，以解析后的版本入缓存
+        self._cache[chat_key] = (
+            ConfigManager.get_version(),
+            time.monotonic() + EFFECTIVE_CONFIG_TTL_SECONDS,
+            effective_config,
+        )
+        return effective_config
+
+    def invalidate(self, chat_key: str | None = None) -> None:
+        """使有效配置缓存失效，未指定 chat_key 时清空全部"""
+        if chat_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(chat_key, None)
+
+    def _resolve_effective_config(self, chat_key: str) -> CoreConfig:
         # 1. 获取所有配置层
         # 通过别名感知的解析获取 adapter_key（部分适配器的 chat_key 短前缀 != adapter_key）
         from nekro_agent.adapters import resolve_adapter_key_from_chat_key
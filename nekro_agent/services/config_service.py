@@ -616,6 +616,7 @@ class ConfigService:
         except Exception as e:
             return False, f"设置配置值时发生错误: {e}"
         else:
+            ConfigManager.bump_version()
             return True, ""
 
     @staticmethod
@@ -0,0 +1,28 @@
+"""多实例协调服务统一入口。
+
+- `coordinator`: 频道租约、跨实例事件扇出与主节点选举
+- 后端由环境变量 `COORDINATION_BACKEND` 选择：`memory`（默认，单实例）或 `postgres`（advisory lock + LISTEN/NOTIFY）
+"""
+
+from .base import CoordinationBackend
+from .coordinator import (
+    LEADER_CLEANUP,
+    LEADER_MEMORY,
+    LEADER_ROLES,
+    LEADER_TIMERS,
+    Coordinator,
+    coordinator,
+)
+from .memory import MemoryCoordinationBackend, MemoryHub
+
+__all__ = [
+    "LEADER_CLEANUP",
+    "LEADER_MEMORY",
+    "LEADER_ROLES",
+    "LEADER_TIMERS",
+    "CoordinationBackend",
+    "Coordinator",
+    "MemoryCoordinationBackend",
+    "MemoryHub",
+    "coordinator",
+]
@@ -0,0 +1,36 @@
+"""多实例协调后端接口"""
+
+from typing import Callable
+
+NotifyCallback = Callable[[str], None]
+LostCallback = Callable[[], None]
+
+
+class CoordinationBackend:
+    """跨实例的互斥锁与通知原语
+
+    锁按持有者会话计：同一实例重复获取同一把锁视为已持有（可重入），实例内的互斥由 `Coordinator` 负责；
+    实例退出或与后端断开时，其持有的锁应由后端自动释放。
+    """
+
+    name: str = ""
+    # 是否可能存在其他实例接收通知；为 False 时 `Coordinator.publish` 跳过序列化与广播
+    fanout: bool = True
+
+    async def start(self, on_notify: NotifyCallback, on_lost: LostCallback) -> None:
+        """建立连接；`on_notify` 接收所有实例（含自身）发出的通知，`on_lost` 在连接意外断开时调用"""
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    async def try_lock(self, key: str) -> bool:
+        """尝试获取锁，不等待"""
+        raise NotImplementedError
+
+    async def unlock(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def notify(self, payload: str) -> None:
+        """向所有实例广播一条通知"""
+        raise NotImplementedError
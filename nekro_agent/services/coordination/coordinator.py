@@ -0,0 +1,288 @@
+"""多实例协调器
+
+防抖信箱、运行中的任务、广播订阅者与定时器堆都是进程内状态，多个实例直接挂在负载均衡后会重复执行。
+协调器在可替换的后端之上提供以下能力：
+- 频道租约：同一频道的 Agent 同一时刻只在一个实例上运行，其余实例等待租约释放
+- 事件扇出：实例内发布的事件经后端广播给其他实例，由各实例投递给本地 SSE 订阅者
+- 主节点选举：定时器、清理与记忆维护等全局任务只在各自角色的主节点上执行，主节点退出后由其他实例接管
+- 实例存活锁：每个实例运行期间持有自身的存活锁，接管方据此判断落盘状态的原属实例是否已退出
+
+协调器未启动时按单实例处理：租约直接放行、事件不外发、所有角色均视为主节点。
+与后端断开时放弃全部租约与主节点身份并在后台重连；期间频道租约直接放行，优先保证对话可用。
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import secrets
+import socket
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import OsEnv
+from nekro_agent.services.perf_metrics import perf_metrics
+
+from .base import CoordinationBackend
+from .memory import MemoryCoordinationBackend
+
+logger = get_sub_logger("coordination")
+
+# 主节点角色
+LEADER_TIMERS = "timers"
+LEADER_CLEANUP = "cleanup"
+LEADER_MEMORY = "memory"
+LEADER_ROLES = (LEADER_TIMERS, LEADER_CLEANUP, LEADER_MEMORY)
+
+# 频道租约被其他实例持有时的轮询间隔（秒）
+LEASE_POLL_SECONDS = 0.5
+# 非主节点竞选间隔（秒），即主节点退出后的最长接管延迟
+ELECTION_INTERVAL_SECONDS = 5.0
+# 断线重连的退避间隔（秒），超出后按最后一项重复
+RECONNECT_BACKOFF_SECONDS = (1.0, 2.0, 5.0, 10.0, 30.0)
+
+EventHandler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+def _presence_key(worker_id: str) -> str:
+    return f"worker:{worker_id}"
+
+
+class Coordinator:
+    """多实例协调器"""
+
+    def __init__(self, backend: CoordinationBackend, worker_id: Optional[str] = None) -> None:
+        self.backend = backend
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(3)}"
+        self._started = False
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        # 本实例持有的锁，后端锁可重入，实例内互斥在此判断
+        self._held: Set[str] = set()
+        self._leader_roles: Set[str] = set()
+        self._election_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._handler_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        await self.backend.start(self._on_notify, self._on_lost)
+        self._started = True
+        await self._campaign()
+        self._election_task = asyncio.create_task(self._election_loop())
+        logger.info(
+            f"协调器已启动: backend={self.backend.name}, worker={self.worker_id}, "
+            f"leader_roles={sorted(self._leader_roles)}",
+        )
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        for task in (self._election_task, self._reconnect_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._election_task = self._reconnect_task = None
+        # 后端断开后由其释放全部锁，其他实例在下一轮竞选中接管
+        await self.backend.stop()
+        self._held.clear()
+        self._leader_roles.clear()
+
+    # ------------------------------------------------------------------
+    # 锁
+    # ------------------------------------------------------------------
+
+    async def _try_hold(self, key: str) -> bool:
+        if key in self._held:
+            return False
+        # 先占位再等待后端，避免实例内并发获取同一把锁
+        self._held.add(key)
+        try:
+            acquired = await self.backend.try_lock(key)
+        except Exception:
+            self._held.discard(key)
+            raise
+        if not acquired:
+            self._held.discard(key)
+        return acquired
+
+    async def _release(self, key: str) -> None:
+        if key not in self._held:
+            return
+        self._held.discard(key)
+        try:
+            await self.backend.unlock(key)
+        except Exception as e:
+            logger.warning(f"释放协调锁 {key} 失败: {e}")
+
+    @asynccontextmanager
+    async def channel_lease(self, chat_key: str) -> AsyncIterator[None]:
+        """持有频道租约期间执行，租约被其他实例持有时等待"""
+        if not self._started:
+            yield
+            return
+        key = f"channel:{chat_key}"
+        started = time.monotonic()
+        acquired = False
+        while self._started:
+            try:
+                acquired = await self._try_hold(key)
+            except Exception as e:
+                logger.warning(f"获取频道 {chat_key} 租约失败，直接执行: {e}")
+                break
+            if acquired:
+                break
+            await asyncio.sleep(LEASE_POLL_SECONDS)
+        waited_ms = (time.monotonic() - started) * 1000
+        if waited_ms >= LEASE_POLL_SECONDS * 1000:
+            perf_metrics.observe("coordination.channel_lease_wait", waited_ms)
+            logger.info(f"频道 {chat_key} 租约等待 {waited_ms:.0f}ms 后取得")
+        try:
+            yield
+        finally:
+            if acquired:
+                await self._release(key)
+
+    # ------------------------------------------------------------------
+    # 主节点
+    # ------------------------------------------------------------------
+
+    def is_leader(self, role: str) -> bool:
+        """当前实例是否为指定角色的主节点"""
+        return not self._started or role in self._leader_roles
+
+    async def _campaign(self) -> None:
+        presence = _presence_key(self.worker_id)
+        if presence not in self._held:
+            try:
+                await self._try_hold(presence)
+            except Exception as e:
+                logger.warning(f"登记实例存活锁失败: {e}")
+                return
+        for role in LEADER_ROLES:
+            if role in self._leader_roles:
+                continue
+            try:
+                acquired = await self._try_hold(f"leader:{role}")
+            except Exception as e:
+                logger.warning(f"竞选 {role} 主节点失败: {e}")
+                return
+            if acquired:
+                self._leader_roles.add(role)
+                logger.info(f"实例 {self.worker_id} 成为 {role} 主节点")
+
+    async def _election_loop(self) -> None:
+        while True:
+            await asyncio.sleep(ELECTION_INTERVAL_SECONDS)
+            if len(self._leader_roles) < len(LEADER_ROLES) or _presence_key(self.worker_id) not in self._held:
+                await self._campaign()
+
+    def _on_lost(self) -> None:
+        if not self._started:
+            return
+        logger.error("与协调后端的连接已断开，放弃全部租约与主节点身份并尝试重连")
+        self._held.clear()
+        self._leader_roles.clear()
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while self._started:
+            await asyncio.sleep(RECONNECT_BACKOFF_SECONDS[min(attempt, len(RECONNECT_BACKOFF_SECONDS) - 1)])
+            attempt += 1
+            try:
+                await self.backend.stop()
+                await self.backend.start(self._on_notify, self._on_lost)
+            except Exception as e:
+                logger.warning(f"重连协调后端失败（第 {attempt} 次）: {e}")
+                continue
+            await self._campaign()
+            logger.info(f"已重新连接协调后端，leader_roles={sorted(self._leader_roles)}")
+            return
+
+    # ------------------------------------------------------------------
+    # 实例存活
+    # ------------------------------------------------------------------
+
+    async def is_worker_alive(self, worker_id: str) -> bool:
+        """指定实例是否仍持有存活锁，用于接管已退出实例遗留的状态
+
+        协调器未启动时按单实例处理，其他实例均视为已退出；查询失败时保守地视为存活。
+        """
+        if worker_id == self.worker_id:
+            return True
+        if not self._started:
+            return False
+        key = _presence_key(worker_id)
+        try:
+            acquired = await self._try_hold(key)
+        except Exception as e:
+            logger.warning(f"查询实例 {worker_id} 存活状态失败: {e}")
+            return True
+        if acquired:
+            await self._release(key)
+        return not acquired
+
+    # ------------------------------------------------------------------
+    # 事件扇出
+    # ------------------------------------------------------------------
+
+    def subscribe(self, topic: str, handler: EventHandler) -> None:
+        """订阅其他实例发布的事件，本实例发布的事件不会回送"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def publish(self, topic: str, payload: Dict[str, Any]) -> None:
+        """将事件广播给其他实例，失败只记录日志"""
+        if not self._started or not self.backend.fanout:
+            return
+        envelope = json.dumps({"topic": topic, "origin": self.worker_id, "payload": payload}, ensure_ascii=False)
+        try:
+            await self.backend.notify(envelope)
+        except Exception as e:
+            logger.warning(f"广播协调事件 {topic} 失败: {e}")
+
+    def _on_notify(self, raw: str) -> None:
+        try:
+            envelope = json.loads(raw)
+            topic, origin, payload = envelope["topic"], envelope["origin"], envelope["payload"]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"无法解析协调事件: {e}")
+            return
+        if origin == self.worker_id:
+            return
+        for handler in self._handlers.get(topic, []):
+            try:
+                result = handler(payload)
+            except Exception:
+                logger.exception(f"处理协调事件 {topic} 失败")
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._handler_tasks.add(task)
+                task.add_done_callback(self._on_handler_done)
+
+    def _on_handler_done(self, task: "asyncio.Task[Any]") -> None:
+        self._handler_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"处理协调事件失败: {task.exception()!r}")
+
+
+def create_backend() -> CoordinationBackend:
+    """按环境变量 `COORDINATION_BACKEND` 创建协调后端"""
+    if OsEnv.COORDINATION_BACKEND.strip().lower() == "postgres":
+        from nekro_agent.core.tortoise_config import resolve_db_url
+
+        from .postgres import PostgresCoordinationBackend
+
+        return PostgresCoordinationBackend(resolve_db_url())
+    return MemoryCoordinationBackend()
+
+
+coordinator = Coordinator(create_backend())
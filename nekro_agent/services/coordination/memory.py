@@ -0,0 +1,51 @@
+"""进程内协调后端
+
+单实例部署的默认后端，锁与通知只在当前进程内生效，行为与引入协调层之前一致。
+多个后端共享同一个 `MemoryHub` 时可在单进程内模拟多实例；未传入共享总线时没有其他实例，不广播通知。
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from .base import CoordinationBackend, LostCallback, NotifyCallback
+
+
+class MemoryHub:
+    """进程内共享的锁表与通知总线"""
+
+    def __init__(self) -> None:
+        self.locks: Dict[str, "MemoryCoordinationBackend"] = {}
+        self.listeners: List[NotifyCallback] = []
+
+
+class MemoryCoordinationBackend(CoordinationBackend):
+    name = "memory"
+
+    def __init__(self, hub: Optional[MemoryHub] = None) -> None:
+        self.fanout = hub is not None
+        self.hub = hub or MemoryHub()
+        self._on_notify: Optional[NotifyCallback] = None
+
+    async def start(self, on_notify: NotifyCallback, on_lost: LostCallback) -> None:
+        self._on_notify = on_notify
+        self.hub.listeners.append(on_notify)
+
+    async def stop(self) -> None:
+        if self._on_notify in self.hub.listeners:
+            self.hub.listeners.remove(self._on_notify)
+        self._on_notify = None
+        for key in [key for key, owner in self.hub.locks.items() if owner is self]:
+            del self.hub.locks[key]
+
+    async def try_lock(self, key: str) -> bool:
+        owner = self.hub.locks.setdefault(key, self)
+        return owner is self
+
+    async def unlock(self, key: str) -> None:
+        if self.hub.locks.get(key) is self:
+            del self.hub.locks[key]
+
+    async def notify(self, payload: str) -> None:
+        loop = asyncio.get_running_loop()
+        for listener in list(self.hub.listeners):
+            loop.call_soon(listener, payload)
@@ -0,0 +1,83 @@
+"""Postgres 协调后端
+
+- 锁使用会话级 advisory lock，全部持有在一条专用连接上，实例退出或断线时由数据库自动释放
+- 通知使用 `LISTEN/NOTIFY`，监听占用另一条专用连接，避免与加解锁查询互相阻塞
+"""
+
+import asyncio
+import hashlib
+from typing import Optional
+
+import asyncpg
+
+from nekro_agent.core.logger import get_sub_logger
+
+from .base import CoordinationBackend, LostCallback, NotifyCallback
+
+logger = get_sub_logger("coordination")
+
+NOTIFY_CHANNEL = "nekro_agent_coordination"
+# Postgres 单条 NOTIFY 载荷上限为 8000 字节，超出的通知直接丢弃
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+
+def advisory_key(key: str) -> int:
+    """将锁名映射为 advisory lock 使用的有符号 64 位整数"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+class PostgresCoordinationBackend(CoordinationBackend):
+    name = "postgres"
+
+    def __init__(self, dsn: str) -> None:
+        # tortoise 连接串末尾可能带空查询串，asyncpg 不需要
+        self.dsn = dsn.rstrip("?")
+        self._lock_conn: Optional[asyncpg.Connection] = None
+        self._listen_conn: Optional[asyncpg.Connection] = None
+        # 单条连接不支持并发查询
+        self._query_lock = asyncio.Lock()
+        self._stopping = False
+
+    async def start(self, on_notify: NotifyCallback, on_lost: LostCallback) -> None:
+        self._stopping = False
+
+        def handle_terminated(_: asyncpg.Connection) -> None:
+            if not self._stopping:
+                on_lost()
+
+        self._lock_conn = await asyncpg.connect(self.dsn)
+        self._listen_conn = await asyncpg.connect(self.dsn)
+        await self._listen_conn.add_listener(NOTIFY_CHANNEL, lambda _conn, _pid, _channel, payload: on_notify(payload))
+        self._lock_conn.add_termination_listener(handle_terminated)
+        self._listen_conn.add_termination_listener(handle_terminated)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for conn in (self._listen_conn, self._lock_conn):
+            if conn is not None and not conn.is_closed():
+                try:
+                    await conn.close(timeout=5)
+                except Exception as e:
+                    logger.warning(f"关闭协调连接失败: {e}")
+                    conn.terminate()
+        self._lock_conn = self._listen_conn = None
+
+    def _conn(self) -> asyncpg.Connection:
+        if self._lock_conn is None or self._lock_conn.is_closed():
+            raise ConnectionError("协调后端未连接")
+        return self._lock_conn
+
+    async def try_lock(self, key: str) -> bool:
+        async with self._query_lock:
+            return bool(await self._conn().fetchval("SELECT pg_try_advisory_lock($1)", advisory_key(key)))
+
+    async def unlock(self, key: str) -> None:
+        async with self._query_lock:
+            await self._conn().fetchval("SELECT pg_advisory_unlock($1)", advisory_key(key))
+
+    async def notify(self, payload: str) -> None:
+        if len(payload.encode("utf-8")) > MAX_NOTIFY_PAYLOAD_BYTES:
+            logger.warning(f"协调通知超过 {MAX_NOTIFY_PAYLOAD_BYTES} 字节，未广播到其他实例: {payload[:120]}")
+            return
+        async with self._query_lock:
+            await self._conn().execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, payload)
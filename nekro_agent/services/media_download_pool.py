@@ -0,0 +1,63 @@
+"""入站媒体下载池
+
+适配器入站消息中的图片 / 文件经由共享下载池并发下载：
+- 全局并发上限避免大批合并转发图片同时占满带宽与文件句柄
+- 单主机并发上限避免集中请求同一 CDN 触发限流；先占主机槽位再占全局槽位，
+  排队等待同一主机时不会占用其他主机可用的全局槽位
+- 下载本身沿用 `download_file` 的超时与重试策略，耗时与失败次数记录到性能指标 `media.download*`
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, TypeVar
+from urllib.parse import urlparse
+
+from nekro_agent.services.perf_metrics import perf_metrics
+
+T = TypeVar("T")
+
+# 全局最大并发下载数
+MAX_CONCURRENT_DOWNLOADS = 16
+# 单个主机最大并发下载数
+MAX_DOWNLOADS_PER_HOST = 4
+
+
+class MediaDownloadPool:
+    """带全局与单主机并发上限的下载池"""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_DOWNLOADS, per_host: int = MAX_DOWNLOADS_PER_HOST) -> None:
+        self.per_host = per_host
+        self._global = asyncio.Semaphore(max_concurrency)
+        # 主机 -> [信号量, 使用中 + 等待中的任务数]，无任务时移除
+        self._hosts: Dict[str, List] = {}
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[None]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = [asyncio.Semaphore(self.per_host), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._hosts.pop(host, None)
+
+    async def run(self, url: str, download: Callable[[], Awaitable[T]]) -> T:
+        """在并发上限内执行一次下载"""
+        host = urlparse(url).hostname or ""
+        async with self._host_slot(host), self._global:
+            started = time.perf_counter()
+            try:
+                return await download()
+            except Exception:
+                perf_metrics.incr("media.download_failed")
+                raise
+            finally:
+                perf_metrics.observe("media.download", (time.perf_counter() - started) * 1000)
+
+
+media_download_pool = MediaDownloadPool()
@@ -15,6 +15,9 @@ from pathlib import Path
 from typing import Any
 
 import json5
+from tortoise import timezone
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
 
 from nekro_agent.core.config import config
 from nekro_agent.core.logger import get_sub_logger
@@ -29,14 +32,33 @@ from nekro_agent.models.db_mem_paragraph import (
     OriginKind,
 )
 from nekro_agent.models.db_mem_relation import DBMemRelation
-from nekro_agent.services.memory.embedding_service import embed_text
+from nekro_agent.services.memory.embedding_service import embed_batch, embed_text
 from nekro_agent.services.memory.feature_flags import is_memory_system_enabled
 from nekro_agent.services.memory.qdrant_manager import memory_qdrant_manager
+from nekro_agent.services.memory.rate_limiter import acquire_llm_quota
+from nekro_agent.services.perf_metrics import perf_metrics
 
 logger = get_sub_logger("memory.consolidator")
 MEMORY_PARSE_LOG_DIR = Path(APP_LOG_DIR) / "memory_parse_failures"
 MEMORY_PARSE_LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+_KNOWLEDGE_TYPE_MAP: dict[str, KnowledgeType] = {
+    "conversation": KnowledgeType.CONVERSATION,
+    "preference": KnowledgeType.PREFERENCE,
+    "fact": KnowledgeType.FACT,
+    "experience": KnowledgeType.EXPERIENCE,
+    "decision": KnowledgeType.DECISION,
+    "emotion": KnowledgeType.EMOTION,
+}
+
+# 实体/关系按 (workspace_id, canonical_name) 等非唯一键匹配，同一工作区并发写入（如记忆重建的多个 worker）
+# 会重复创建实体与关系，写入阶段按工作区串行
+_workspace_write_locks: dict[int, asyncio.Lock] = {}
+
+
+def _workspace_write_lock(workspace_id: int) -> asyncio.Lock:
+    return _workspace_write_locks.setdefault(workspace_id, asyncio.Lock())
+
 
 @dataclass
 class PersonaContext:
@@ -220,23 +242,13 @@ class EpisodicConsolidator:
                 logger.debug("没有提取到有价值的记忆")
                 return result
 
-            # 存储记忆
-            for item in memory_items:
+            # 存储记忆：优先批量写入，失败时回退为逐条写入，避免单条异常导致整批丢失
+            with perf_metrics.timer("memory.consolidate.store"):
                 try:
-                    paragraph, entities, relations = await self._store_memory(item, chat_key, messages)
-                    if paragraph:
-                        result.paragraphs_created += 1
-                    result.entities_created += len([e for e, created in entities if created])
-                    result.entities_updated += len([e for e, created in entities if not created])
-                    result.relations_created += len([r for r, created in relations if created])
-                    result.relations_updated += len([r for r, created in relations if not created])
+                    await self._store_memories(memory_items, chat_key, messages, result)
                 except Exception as e:
-                    logger.exception(f"存储记忆失败: {e}")
-                    if result.errors is None:
-                        result.errors = []
-                        result.errors.append(str(e))
-                # 主动让出事件循环，避免长批次沉淀连续占用处理时机。
-                await asyncio.sleep(0)
+                    logger.warning(f"批量存储记忆失败，回退为逐条存储: {e}")
+                    await self._store_memories_one_by_one(memory_items, chat_key, messages, result)
 
             logger.info(
                 f"沉淀完成: paragraphs={result.paragraphs_created}, "
@@ -430,6 +442,7 @@ class EpisodicConsolidator:
                         model_group.CHAT_MODEL,
                         use_fallback_model,
                     )
+                await acquire_llm_quota()
                 response = await gen_openai_chat_response(
                     model=model_group.CHAT_MODEL,
                     messages=[
@@ -598,6 +611,308 @@ class EpisodicConsolidator:
         )
         return str(path)
 
+    async def _store_memories_one_by_one(
+        self,
+        memory_items: list[dict[str, Any]],
+        chat_key: str,
+        messages: list[DBChatMessage],
+        result: ConsolidationResult,
+    ) -> None:
+        for item in memory_items:
+            try:
+                async with _workspace_write_lock(self.workspace_id):
+                    paragraph, entities, relations = await self._store_memory(item, chat_key, messages)
+                if paragraph:
+                    result.paragraphs_created += 1
+                result.entities_created += len([e for e, created in entities if created])
+                result.entities_updated += len([e for e, created in entities if not created])
+                result.relations_created += len([r for r, created in relations if created])
+                result.relations_updated += len([r for r, created in relations if not created])
+            except Exception as e:
+                logger.exception(f"存储记忆失败: {e}")
+                if result.errors is None:
+                    result.errors = []
+                    result.errors.append(str(e))
+            # 主动让出事件循环，避免长批次沉淀连续占用处理时机。
+            await asyncio.sleep(0)
+
+    def _new_paragraph(self, memory_item: dict[str, Any], chat_key: str, messages: list[DBChatMessage]) -> DBMemParagraph:
+        anchor_start = messages[0] if messages else None
+        anchor_end = messages[-1] if messages else None
+        return DBMemParagraph(
+            workspace_id=self.workspace_id,
+            memory_source="na",
+            cognitive_type=CognitiveType.EPISODIC,
+            knowledge_type=_KNOWLEDGE_TYPE_MAP.get(memory_item.get("knowledge_type", "conversation"), KnowledgeType.CONVERSATION),
+            content=memory_item["content"],
+            summary=memory_item["summary"][: config.MEMORY_CONSOLIDATION_MAX_SUMMARY_LENGTH],
+            event_time=datetime.fromtimestamp(anchor_end.send_timestamp) if anchor_end else datetime.now(),
+            origin_kind=OriginKind.CONSOLIDATION,
+            origin_chat_key=chat_key,
+            anchor_msg_id_start=anchor_start.message_id if anchor_start else None,
+            anchor_msg_id_end=anchor_end.message_id if anchor_end else None,
+            anchor_timestamp_start=anchor_start.send_timestamp if anchor_start else None,
+            anchor_timestamp_end=anchor_end.send_timestamp if anchor_end else None,
+        )
+
+    def _entity_key(self, name: str) -> tuple[EntityType, str]:
+        entity_type = EntityType.PERSON if self._is_person_name(name) else EntityType.CONCEPT
+        return entity_type, name.strip().lower()
+
+    async def _store_memories(
+        self,
+        memory_items: list[dict[str, Any]],
+        chat_key: str,
+        messages: list[DBChatMessage],
+        result: ConsolidationResult,
+    ) -> None:
+        """批量存储一批记忆
+
+        向量在一次请求中生成并一次性写入 Qdrant；段落、实体与关系在单个事务内批量写入，
+        实体与关系各用一次 `IN` 查询匹配已有记录。计数语义与逐条写入保持一致。
+        """
+        if not memory_items or not messages:
+            await self._store_memories_one_by_one(memory_items, chat_key, messages, result)
+            return
+        anchor_start, anchor_end = messages[0], messages[-1]
+
+        # 去重：防止崩溃恢复后重复创建相同的记忆段落（同一锚点范围 + 内容前缀）
+        anchor_filter = {
+            "workspace_id": self.workspace_id,
+            "origin_chat_key": chat_key,
+            "anchor_msg_id_start": anchor_start.message_id,
+            "anchor_msg_id_end": anchor_end.message_id,
+        }
+        existing_paragraphs = await DBMemParagraph.filter(**anchor_filter).only("id", "content")
+        existing_ids = {p.id for p in existing_paragraphs}
+        seen_prefixes = {p.content[:100] for p in existing_paragraphs}
+
+        pending: list[tuple[dict[str, Any], DBMemParagraph]] = []
+        for item in memory_items:
+            prefix = item["content"][:100]
+            if prefix in seen_prefixes:
+                logger.debug(f"跳过重复记忆段落: anchor={anchor_start.message_id}-{anchor_end.message_id}")
+                result.paragraphs_created += 1
+                continue
+            seen_prefixes.add(prefix)
+            pending.append((item, self._new_paragraph(item, chat_key, messages)))
+        if not pending:
+            return
+
+        embeddings = await embed_batch([paragraph.content for _, paragraph in pending])
+
+        # 汇总实体：每条记忆中出现的实体（含仅出现在关系中的）各计一次出现
+        listed_names: list[list[tuple[EntityType, str]]] = []
+        appearances: dict[tuple[EntityType, str], int] = {}
+        display_names: dict[tuple[EntityType, str], str] = {}
+        item_entity_maps: list[dict[str, tuple[EntityType, str]]] = []
+        for item, _ in pending:
+            entity_map: dict[str, tuple[EntityType, str]] = {}
+            listed: list[tuple[EntityType, str]] = []
+            for name in item.get("entities", []):
+                if not isinstance(name, str) or len(name) < 2:
+                    continue
+                key = self._entity_key(name)
+                listed.append(key)
+                entity_map[key[1]] = key
+                display_names.setdefault(key, name.strip())
+                appearances[key] = appearances.get(key, 0) + 1
+            for rel in item.get("relations", []):
+                if not isinstance(rel, dict):
+                    continue
+                names = [str(rel.get(role, "")).strip() for role in ("subject", "predicate", "object")]
+                if not all(names):
+                    continue
+                for name in (names[0], names[2]):
+                    if name.lower() not in entity_map:
+                        key = self._entity_key(name)
+                        entity_map[key[1]] = key
+                        display_names.setdefault(key, name)
+                        appearances[key] = appearances.get(key, 0) + 1
+            listed_names.append(listed)
+            item_entity_maps.append(entity_map)
+
+        async with _workspace_write_lock(self.workspace_id), in_transaction() as conn:
+            await DBMemParagraph.bulk_create([paragraph for _, paragraph in pending], using_db=conn)
+            created_by_prefix = {
+                p.content[:100]: p
+                for p in await DBMemParagraph.filter(**anchor_filter).using_db(conn).order_by("id")
+                if p.id not in existing_ids
+            }
+            paragraphs = [created_by_prefix[paragraph.content[:100]] for _, paragraph in pending]
+
+            entities, created_entities = await self._resolve_entities(appearances, display_names, conn)
+
+            # 关系：同一三元组在批次内首次出现时创建，其余出现与已有关系一样强化
+            triples: dict[tuple[int, str, int], tuple[int, int]] = {}  # triple -> (首次出现的段落 ID, 出现次数)
+            for (item, _), paragraph, entity_map in zip(pending, paragraphs, item_entity_maps):
+                for rel in item.get("relations", []):
+                    if not isinstance(rel, dict):
+                        continue
+                    subject_name = str(rel.get("subject", "")).strip()
+                    predicate = str(rel.get("predicate", "")).strip().lower()
+                    object_name = str(rel.get("object", "")).strip()
+                    if not subject_name or not predicate or not object_name:
+                        continue
+                    subject = entities[entity_map[subject_name.lower()]]
+                    obj = entities[entity_map[object_name.lower()]]
+                    if subject.id == obj.id:
+                        continue
+                    triple = (subject.id, predicate, obj.id)
+                    first_paragraph_id, count = triples.get(triple, (paragraph.id, 0))
+                    triples[triple] = (first_paragraph_id, count + 1)
+            relations_created, relations_updated = await self._upsert_relations(triples, conn)
+
+        # 向量写入放在事务外，失败不影响已保存的记忆
+        points = [
+            (paragraph.id, embedding, paragraph.to_qdrant_payload())
+            for paragraph, embedding in zip(paragraphs, embeddings)
+            if embedding is not None
+        ]
+        if points:
+            try:
+                if await memory_qdrant_manager.batch_upsert(points) == len(points):
+                    indexed = {pid for pid, _, _ in points}
+                    for paragraph in paragraphs:
+                        if paragraph.id in indexed:
+                            paragraph.embedding_ref = str(paragraph.id)
+                    await DBMemParagraph.bulk_update(
+                        [p for p in paragraphs if p.id in indexed],
+                        fields=["embedding_ref"],
+                    )
+                else:
+                    logger.warning("向量化失败，记忆仍已保存: Qdrant 批量写入未全部成功")
+            except Exception as e:
+                logger.warning(f"向量化失败，记忆仍已保存: {e}")
+        if len(points) < len(paragraphs):
+            logger.warning(f"向量化失败，记忆仍已保存: {len(paragraphs) - len(points)} 条段落未生成向量")
+
+        result.paragraphs_created += len(paragraphs)
+        for listed in listed_names:
+            for key in listed:
+                # 与逐条写入一致：新实体首次出现计为创建，其余出现计为更新
+                if key in created_entities:
+                    created_entities.discard(key)
+                    result.entities_created += 1
+                else:
+                    result.entities_updated += 1
+        result.relations_created += relations_created
+        result.relations_updated += relations_updated
+
+    async def _resolve_entities(
+        self,
+        appearances: dict[tuple[EntityType, str], int],
+        display_names: dict[tuple[EntityType, str], str],
+        conn: Any,
+    ) -> tuple[dict[tuple[EntityType, str], DBMemEntity], set[tuple[EntityType, str]]]:
+        """一次查询匹配已有实体，累加出现次数并批量创建缺失的实体
+
+        Returns:
+            (实体映射, 新建实体的键集合)
+        """
+        if not appearances:
+            return {}, set()
+        canonical_names = list({canonical for _, canonical in appearances})
+
+        async def _load() -> dict[tuple[EntityType, str], DBMemEntity]:
+            found: dict[tuple[EntityType, str], DBMemEntity] = {}
+            rows = await DBMemEntity.filter(
+                workspace_id=self.workspace_id,
+                canonical_name__in=canonical_names,
+                is_inactive=False,
+            ).using_db(conn).order_by("id")
+            for entity in rows:
+                found.setdefault((entity.entity_type, entity.canonical_name), entity)
+            return found
+
+        entities = await _load()
+        by_increment: dict[int, list[int]] = {}
+        for key, entity in entities.items():
+            if key in appearances:
+                by_increment.setdefault(appearances[key], []).append(entity.id)
+        for increment, ids in by_increment.items():
+            await DBMemEntity.filter(id__in=ids).using_db(conn).update(
+                appearance_count=F("appearance_count") + increment,
+                update_time=timezone.now(),
+            )
+
+        missing = [key for key in appearances if key not in entities]
+        if missing:
+            await DBMemEntity.bulk_create(
+                [
+                    DBMemEntity(
+                        workspace_id=self.workspace_id,
+                        entity_type=entity_type,
+                        name=display_names[(entity_type, canonical)],
+                        canonical_name=canonical,
+                        source_hint=MemorySource.NA,
+                        appearance_count=appearances[(entity_type, canonical)],
+                    )
+                    for entity_type, canonical in missing
+                ],
+                using_db=conn,
+            )
+            created = await _load()
+            for key in missing:
+                entities[key] = created[key]
+        return entities, set(missing)
+
+    async def _upsert_relations(
+        self,
+        triples: dict[tuple[int, str, int], tuple[int, int]],
+        conn: Any,
+    ) -> tuple[int, int]:
+        """批量创建或强化关系，返回 (新建数, 强化次数)"""
+        if not triples:
+            return 0, 0
+        existing: dict[tuple[int, str, int], DBMemRelation] = {}
+        rows = await DBMemRelation.filter(
+            workspace_id=self.workspace_id,
+            subject_entity_id__in=list({subject_id for subject_id, _, _ in triples}),
+            predicate__in=list({predicate for _, predicate, _ in triples}),
+            is_inactive=False,
+        ).using_db(conn).order_by("id")
+        for relation in rows:
+            existing.setdefault((relation.subject_entity_id, relation.predicate, relation.object_entity_id), relation)
+
+        now = datetime.now()
+        reinforced: list[DBMemRelation] = []
+        new_relations: list[DBMemRelation] = []
+        updated = 0
+        for triple, (paragraph_id, count) in triples.items():
+            relation = existing.get(triple)
+            if relation is None:
+                relation = DBMemRelation(
+                    workspace_id=self.workspace_id,
+                    subject_entity_id=triple[0],
+                    predicate=triple[1],
+                    object_entity_id=triple[2],
+                    paragraph_id=paragraph_id,
+                    memory_source="na",
+                    cognitive_type=CognitiveType.EPISODIC.value,
+                    half_life_seconds=config.MEMORY_RELATION_HALF_LIFE_SECONDS,
+                )
+                reinforce_times = count - 1
+                new_relations.append(relation)
+            else:
+                reinforce_times = count
+                relation.update_time = timezone.now()
+                reinforced.append(relation)
+            if reinforce_times > 0:
+                relation.base_weight = min(relation.base_weight + 0.1 * reinforce_times, 2.0)
+                relation.last_reinforced_at = now
+            updated += reinforce_times
+
+        if new_relations:
+            await DBMemRelation.bulk_create(new_relations, using_db=conn)
+        if reinforced:
+            await DBMemRelation.bulk_update(
+                reinforced,
+                fields=["base_weight", "last_reinforced_at", "update_time"],
+                using_db=conn,
+            )
+        return len(new_relations), updated
+
     async def _store_memory(
         self,
         memory_item: dict[str, Any],
@@ -616,15 +931,7 @@ class EpisodicConsolidator:
         relation_items = memory_item.get("relations", [])
 
         # 映射 knowledge_type
-        kt_map = {
-            "conversation": KnowledgeType.CONVERSATION,
-            "preference": KnowledgeType.PREFERENCE,
-            "fact": KnowledgeType.FACT,
-            "experience": KnowledgeType.EXPERIENCE,
-            "decision": KnowledgeType.DECISION,
-            "emotion": KnowledgeType.EMOTION,
-        }
-        kt = kt_map.get(knowledge_type, KnowledgeType.CONVERSATION)
+        kt = _KNOWLEDGE_TYPE_MAP.get(knowledge_type, KnowledgeType.CONVERSATION)
 
         # 计算锚定信息
         anchor_start = messages[0] if messages else None
@@ -12,7 +12,8 @@ import httpx
 
 from nekro_agent.core.config import ModelConfigGroup, config
 from nekro_agent.core.logger import get_sub_logger
-from nekro_agent.services.agent.openai import gen_openai_embeddings
+from nekro_agent.services.agent.openai import gen_openai_embeddings, gen_openai_embeddings_batch
+from nekro_agent.services.memory.rate_limiter import acquire_embedding_quota
 
 logger = get_sub_logger("memory.embedding")
 
@@ -126,6 +127,7 @@ class EmbeddingService:
 
         for attempt in range(MAX_RETRIES):
             try:
+                await acquire_embedding_quota()
                 embedding = await gen_openai_embeddings(
                     model=model_config["model"],
                     input=text.strip(),
@@ -165,36 +167,58 @@ class EmbeddingService:
 
         raise last_error or Exception("Embedding 请求失败")
 
+    async def _embed_in_one_request(self, texts: list[str]) -> list[list[float]]:
+        model_config = self._get_model_config()
+        await acquire_embedding_quota(len(texts))
+        return await gen_openai_embeddings_batch(
+            model=model_config["model"],
+            inputs=[t.strip() for t in texts],
+            dimensions=self.resolved_dimension,
+            api_key=model_config["api_key"],
+            base_url=model_config["base_url"],
+            timeout=self.timeout,
+        )
+
     async def embed_batch(
         self,
         texts: list[str],
         batch_size: int = 10,
+        request_size: int = 64,
     ) -> list[list[float] | None]:
         """批量生成文本向量
 
+        每 `request_size` 条文本合并为一次 API 请求；
+        合并请求失败（如接口不支持数组输入）时，该批次回退为逐条并发请求。
+
         Args:
             texts: 文本列表
-            batch_size: 并发批次大小
+            batch_size: 逐条回退时的并发批次大小
+            request_size: 单次 API 请求包含的最大文本数
 
         Returns:
             向量列表（失败的位置为 None）
         """
         results: list[list[float] | None] = [None] * len(texts)
+        valid_indexes = [i for i, t in enumerate(texts) if t and t.strip()]
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            tasks = [self.embed_text(t) for t in batch]
-
+        for start in range(0, len(valid_indexes), request_size):
+            chunk_indexes = valid_indexes[start : start + request_size]
             try:
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                for j, result in enumerate(batch_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"批量 Embedding 第 {i + j} 条失败: {result}")
-                        results[i + j] = None
-                    else:
-                        results[i + j] = result
+                embeddings = await self._embed_in_one_request([texts[i] for i in chunk_indexes])
+                for i, embedding in zip(chunk_indexes, embeddings):
+                    results[i] = embedding
+                continue
             except Exception as e:
-                logger.exception(f"批量 Embedding 失败: {e}")
+                logger.warning(f"合并 Embedding 请求失败，回退为逐条请求: {e}")
+
+            for i in range(0, len(chunk_indexes), batch_size):
+                batch = chunk_indexes[i : i + batch_size]
+                batch_results = await asyncio.gather(*[self.embed_text(texts[j]) for j in batch], return_exceptions=True)
+                for j, result in zip(batch, batch_results):
+                    if isinstance(result, BaseException):
+                        logger.error(f"批量 Embedding 第 {j} 条失败: {result}")
+                    else:
+                        results[j] = result
 
         success_count = sum(1 for r in results if r is not None)
         logger.info(f"批量 Embedding 完成: {success_count}/{len(texts)} 成功")
@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import timedelta
 
@@ -193,9 +194,14 @@ class EpisodeAggregator:
         return phase_map
 
 
+# 同一工作区的聚合会读写同一批 Episode，并发执行会重复创建，按工作区串行
+_aggregation_locks: dict[int, asyncio.Lock] = {}
+
+
 async def aggregate_workspace_episodes(workspace_id: int, chat_key: str | None = None) -> EpisodeAggregationResult:
     if not is_memory_system_enabled():
         return EpisodeAggregationResult()
 
     aggregator = EpisodeAggregator(workspace_id)
-    return await aggregator.auto_consolidate_episodes(chat_key)
+    async with _aggregation_locks.setdefault(workspace_id, asyncio.Lock()):
+        return await aggregator.auto_consolidate_episodes(chat_key)
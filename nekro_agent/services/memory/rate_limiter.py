@@ -0,0 +1,64 @@
+"""记忆重建限流器
+
+重建时多个频道并发回放，LLM 与 Embedding 调用通过共享令牌桶统一限速：
+- 令牌桶按「每分钟次数」匀速补充，允许少量突发
+- 限流器通过 ContextVar 激活，只作用于重建任务派生的调用链，
+  日常对话触发的记忆沉淀不受影响
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from nekro_agent.core.config import config
+from nekro_agent.services.token_bucket import TokenBucket
+
+
+class RebuildRateLimiter:
+    """重建任务共享的 LLM / Embedding 限流器"""
+
+    def __init__(self, llm_rate_per_minute: float, embedding_rate_per_minute: float) -> None:
+        self.llm = TokenBucket(llm_rate_per_minute)
+        self.embedding = TokenBucket(embedding_rate_per_minute)
+
+
+_active_limiter: ContextVar[RebuildRateLimiter | None] = ContextVar("memory_rebuild_rate_limiter", default=None)
+_shared_limiter: RebuildRateLimiter | None = None
+
+
+def get_rebuild_rate_limiter() -> RebuildRateLimiter:
+    """获取进程内共享的重建限流器，配置变更后重新创建"""
+    global _shared_limiter
+    llm_rate = float(config.MEMORY_REBUILD_LLM_RATE_PER_MINUTE)
+    embedding_rate = float(config.MEMORY_REBUILD_EMBEDDING_RATE_PER_MINUTE)
+    if (
+        _shared_limiter is None
+        or _shared_limiter.llm.rate_per_minute != llm_rate
+        or _shared_limiter.embedding.rate_per_minute != embedding_rate
+    ):
+        _shared_limiter = RebuildRateLimiter(llm_rate, embedding_rate)
+    return _shared_limiter
+
+
+@contextmanager
+def use_rebuild_rate_limiter(limiter: RebuildRateLimiter) -> Iterator[None]:
+    """在当前上下文（及其创建的子任务）中激活限流器"""
+    token = _active_limiter.set(limiter)
+    try:
+        yield
+    finally:
+        _active_limiter.reset(token)
+
+
+async def acquire_llm_quota() -> None:
+    limiter = _active_limiter.get()
+    if limiter is not None:
+        await limiter.llm.acquire()
+
+
+async def acquire_embedding_quota(texts: int = 1) -> None:
+    limiter = _active_limiter.get()
+    if limiter is not None:
+        await limiter.embedding.acquire(texts)
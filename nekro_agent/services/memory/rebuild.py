@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from pydantic import BaseModel
@@ -24,6 +25,7 @@ from nekro_agent.services.memory.feature_flags import (
     is_memory_system_enabled,
 )
 from nekro_agent.services.memory.qdrant_manager import memory_qdrant_manager
+from nekro_agent.services.memory.rate_limiter import get_rebuild_rate_limiter, use_rebuild_rate_limiter
 from nekro_agent.services.memory.rebuild_state_store import (
     MemoryRebuildChannelsFile,
     MemoryRebuildChannelState,
@@ -103,6 +105,10 @@ class MemoryRebuildStatus(BaseModel):
     semantic_replayed: bool = False
     cancel_requested: bool = False
     current_chat_key: str | None = None
+    active_chat_keys: list[str] = []
+    worker_count: int = 0
+    throughput_messages_per_minute: float = 0.0
+    eta_seconds: int | None = None
     last_heartbeat_at: str | None = None
     failure_code: str | None = None
     failure_reason: str | None = None
@@ -189,6 +195,27 @@ def _refresh_progress(state: MemoryRebuildJobState, channels_file: MemoryRebuild
     )
     state.progress.processed_messages = sum(channel.message_count_processed for channel in channels_file.channels.values())
     state.progress.overall_percent = _compute_overall_progress(state, channels_file)
+    _refresh_throughput(state, channels_file)
+
+
+def _refresh_throughput(state: MemoryRebuildJobState, channels_file: MemoryRebuildChannelsFile) -> None:
+    progress = state.progress
+    if state.status != RebuildJobStatus.REBUILDING_CHANNELS or not progress.rate_window_started_at:
+        progress.eta_seconds = None
+        return
+    elapsed = (utcnow() - datetime.fromisoformat(progress.rate_window_started_at)).total_seconds()
+    processed = progress.processed_messages - progress.rate_window_base_messages
+    if elapsed <= 0 or processed <= 0:
+        progress.throughput_messages_per_minute = 0.0
+        progress.eta_seconds = None
+        return
+    per_second = processed / elapsed
+    remaining = sum(
+        max(0, channel.message_count_total - channel.message_count_processed)
+        for channel in channels_file.channels.values()
+    )
+    progress.throughput_messages_per_minute = round(per_second * 60, 2)
+    progress.eta_seconds = int(remaining / per_second)
 
 
 def _mark_heartbeat(state: MemoryRebuildJobState) -> None:
@@ -198,7 +225,17 @@ def _mark_heartbeat(state: MemoryRebuildJobState) -> None:
     state.lease_expires_at = lease_expiry_iso()
 
 
+def _sync_cancel_request(state: MemoryRebuildJobState) -> None:
+    """取消请求由接口直接写入状态文件，落盘前合并，避免被运行中的任务覆盖"""
+    if state.cancel_requested:
+        return
+    stored = read_job_state(state.job_id)
+    if stored is not None and stored.cancel_requested:
+        state.cancel_requested = True
+
+
 def _persist_state(state: MemoryRebuildJobState, channels_file: MemoryRebuildChannelsFile | None = None) -> None:
+    _sync_cancel_request(state)
     _mark_heartbeat(state)
     write_job_state(state)
     if channels_file is not None:
@@ -359,98 +396,107 @@ async def _replay_cc_semantic_memories(state: MemoryRebuildJobState, channels_fi
     return replayed
 
 
-async def _rebuild_channels(
-    state: MemoryRebuildJobState,
-    channels_file: MemoryRebuildChannelsFile,
-) -> tuple[int, int]:
-    state.status = RebuildJobStatus.REBUILDING_CHANNELS
-    state.phase = RebuildJobPhase.CHANNEL_BATCH
-    _persist_state(state, channels_file)
+@dataclass
+class _ChannelRebuildRun:
+    """频道回放阶段各 worker 共享的运行状态（同一事件循环内读写，无需加锁）"""
 
-    total_messages_processed = 0
-    total_paragraphs_created = 0
-    for chat_key, channel_state in channels_file.channels.items():
-        if channel_state.status == RebuildChannelStatus.COMPLETED:
-            continue
-        if state.cancel_requested:
-            _mark_cancelled(state, channels_file)
-            return total_messages_processed, total_paragraphs_created
-
-        state.current_chat_key = chat_key
-        _persist_state(state, channels_file)
+    state: MemoryRebuildJobState
+    channels_file: MemoryRebuildChannelsFile
+    messages_processed: int = 0
+    paragraphs_created: int = 0
+    failure: tuple[RebuildFailureCode, str] | None = None
+    error: Exception | None = None
 
-        while True:
-            if state.cancel_requested:
-                _mark_cancelled(state, channels_file)
-                return total_messages_processed, total_paragraphs_created
+    @property
+    def stopped(self) -> bool:
+        return self.failure is not None or self.error is not None or self.state.cancel_requested
 
-            before_cursor = channel_state.cursor_current_db_id
-            upper_bound = channel_state.cursor_upper_bound_db_id
-            if upper_bound <= before_cursor or channel_state.message_count_total <= channel_state.message_count_processed:
-                channel_state.status = RebuildChannelStatus.COMPLETED
-                break
 
-            channel_state.status = RebuildChannelStatus.RUNNING
-            channel_state.last_batch_started_at = utcnow_iso()
-            _persist_state(state, channels_file)
+def _fail_channel(
+    run: _ChannelRebuildRun,
+    chat_key: str,
+    channel_state: MemoryRebuildChannelState,
+    *,
+    code: RebuildFailureCode,
+    error: str,
+    reason: str,
+) -> None:
+    channel_state.status = RebuildChannelStatus.FAILED
+    channel_state.last_error = error
+    channel_state.retry_count += 1
+    _persist_state(run.state, run.channels_file)
+    if run.failure is None:
+        run.failure = (code, f"{chat_key}: {reason}")
+
+
+async def _rebuild_channel(run: _ChannelRebuildRun, chat_key: str) -> None:
+    """按游标逐批回放单个频道，每批结束即写入检查点，恢复时从游标处继续"""
+    state, channels_file = run.state, run.channels_file
+    channel_state = channels_file.channels[chat_key]
+    while not run.stopped:
+        before_cursor = channel_state.cursor_current_db_id
+        upper_bound = channel_state.cursor_upper_bound_db_id
+        if upper_bound <= before_cursor or channel_state.message_count_total <= channel_state.message_count_processed:
+            channel_state.status = RebuildChannelStatus.COMPLETED
+            break
+
+        channel_state.status = RebuildChannelStatus.RUNNING
+        channel_state.last_batch_started_at = utcnow_iso()
+        _persist_state(state, channels_file)
 
-            consolidation = await consolidate_workspace(
-                state.workspace_id,
+        consolidation = await consolidate_workspace(
+            state.workspace_id,
+            chat_key,
+            max_message_db_id=upper_bound or None,
+            start_after_db_id=before_cursor,
+            persist_progress=False,
+        )
+        next_cursor = max(before_cursor, consolidation.last_processed_message_db_id)
+        if consolidation.errors:
+            error = "; ".join(consolidation.errors)
+            _fail_channel(
+                run,
                 chat_key,
-                max_message_db_id=upper_bound or None,
-                start_after_db_id=before_cursor,
-                persist_progress=False,
+                channel_state,
+                code=RebuildFailureCode.CHANNEL_BATCH_FAILED,
+                error=error,
+                reason=error,
             )
-            next_cursor = max(before_cursor, consolidation.last_processed_message_db_id)
-            if consolidation.errors:
-                channel_state.status = RebuildChannelStatus.FAILED
-                channel_state.last_error = "; ".join(consolidation.errors)
-                channel_state.retry_count += 1
-                _persist_state(state, channels_file)
-                _mark_failed(
-                    state,
-                    code=RebuildFailureCode.CHANNEL_BATCH_FAILED,
-                    reason=f"{chat_key}: {channel_state.last_error}",
-                    channels_file=channels_file,
-                )
-                return total_messages_processed, total_paragraphs_created
-
-            if consolidation.messages_processed <= 0 or next_cursor <= before_cursor:
-                channel_state.status = RebuildChannelStatus.FAILED
-                channel_state.last_error = "rebuild batch finished without forward progress"
-                channel_state.retry_count += 1
-                _persist_state(state, channels_file)
-                _mark_failed(
-                    state,
-                    code=RebuildFailureCode.NO_FORWARD_PROGRESS,
-                    reason=f"{chat_key}: no forward progress",
-                    channels_file=channels_file,
-                )
-                return total_messages_processed, total_paragraphs_created
+            return
 
-            channel_state.cursor_current_db_id = next_cursor
-            channel_state.message_count_processed = min(
-                channel_state.message_count_total,
-                channel_state.message_count_processed + consolidation.messages_processed,
+        if consolidation.messages_processed <= 0 or next_cursor <= before_cursor:
+            _fail_channel(
+                run,
+                chat_key,
+                channel_state,
+                code=RebuildFailureCode.NO_FORWARD_PROGRESS,
+                error="rebuild batch finished without forward progress",
+                reason="no forward progress",
             )
-            channel_state.last_batch_finished_at = utcnow_iso()
-            channel_state.last_error = None
-            total_messages_processed += consolidation.messages_processed
-            total_paragraphs_created += consolidation.paragraphs_created
-            _refresh_progress(state, channels_file)
-            _persist_state(state, channels_file)
+            return
 
-            if (
-                channel_state.cursor_current_db_id >= upper_bound
-                or channel_state.message_count_processed >= channel_state.message_count_total
-            ):
-                channel_state.status = RebuildChannelStatus.COMPLETED
-                channel_state.last_batch_finished_at = utcnow_iso()
-                _refresh_progress(state, channels_file)
-                _persist_state(state, channels_file)
-                break
-            await asyncio.sleep(0.05)
+        channel_state.cursor_current_db_id = next_cursor
+        channel_state.message_count_processed = min(
+            channel_state.message_count_total,
+            channel_state.message_count_processed + consolidation.messages_processed,
+        )
+        channel_state.last_batch_finished_at = utcnow_iso()
+        channel_state.last_error = None
+        run.messages_processed += consolidation.messages_processed
+        run.paragraphs_created += consolidation.paragraphs_created
+
+        if (
+            channel_state.cursor_current_db_id >= upper_bound
+            or channel_state.message_count_processed >= channel_state.message_count_total
+        ):
+            channel_state.status = RebuildChannelStatus.COMPLETED
+        _refresh_progress(state, channels_file)
+        _persist_state(state, channels_file)
+        if channel_state.status == RebuildChannelStatus.COMPLETED:
+            break
+        await asyncio.sleep(0)
 
+    if channel_state.status == RebuildChannelStatus.COMPLETED:
         append_job_event(
             state.job_id,
             "channel_completed",
@@ -458,7 +504,58 @@ async def _rebuild_channels(
             processed=channel_state.message_count_processed,
             total=channel_state.message_count_total,
         )
-    return total_messages_processed, total_paragraphs_created
+
+
+async def _channel_worker(run: _ChannelRebuildRun, pending: list[str]) -> None:
+    state = run.state
+    while pending and not run.stopped:
+        chat_key = pending.pop(0)
+        state.active_chat_keys.append(chat_key)
+        state.current_chat_key = chat_key
+        _persist_state(state, run.channels_file)
+        try:
+            await _rebuild_channel(run, chat_key)
+        except Exception as e:
+            if run.error is None:
+                run.error = e
+        finally:
+            state.active_chat_keys.remove(chat_key)
+
+
+async def _rebuild_channels(
+    state: MemoryRebuildJobState,
+    channels_file: MemoryRebuildChannelsFile,
+) -> tuple[int, int]:
+    """多个频道由 worker 池并发回放，LLM / Embedding 调用经共享令牌桶限速"""
+    pending = [
+        chat_key
+        for chat_key, channel_state in channels_file.channels.items()
+        if channel_state.status != RebuildChannelStatus.COMPLETED
+    ]
+    state.status = RebuildJobStatus.REBUILDING_CHANNELS
+    state.phase = RebuildJobPhase.CHANNEL_BATCH
+    state.worker_count = max(1, min(int(config.MEMORY_REBUILD_CONCURRENCY), len(pending)))
+    state.active_chat_keys = []
+    _refresh_progress(state, channels_file)
+    state.progress.rate_window_started_at = utcnow_iso()
+    state.progress.rate_window_base_messages = state.progress.processed_messages
+    state.progress.throughput_messages_per_minute = 0.0
+    _persist_state(state, channels_file)
+
+    run = _ChannelRebuildRun(state=state, channels_file=channels_file)
+    with use_rebuild_rate_limiter(get_rebuild_rate_limiter()):
+        await asyncio.gather(*(_channel_worker(run, pending) for _ in range(state.worker_count)))
+
+    state.active_chat_keys = []
+    if run.error is not None:
+        _persist_state(state, channels_file)
+        raise run.error
+    if run.failure is not None:
+        code, reason = run.failure
+        _mark_failed(state, code=code, reason=reason, channels_file=channels_file)
+    elif state.cancel_requested:
+        _mark_cancelled(state, channels_file)
+    return run.messages_processed, run.paragraphs_created
 
 
 async def rebuild_workspace_memories(job_id: str) -> MemoryRebuildResult:
@@ -663,6 +760,10 @@ async def get_workspace_memory_rebuild_status(workspace_id: int) -> MemoryRebuil
         semantic_replayed=state.checkpoints.semantic_replayed,
         cancel_requested=state.cancel_requested,
         current_chat_key=state.current_chat_key,
+        active_chat_keys=list(state.active_chat_keys),
+        worker_count=state.worker_count,
+        throughput_messages_per_minute=state.progress.throughput_messages_per_minute,
+        eta_seconds=state.progress.eta_seconds,
         last_heartbeat_at=state.last_heartbeat_at,
         failure_code=None if state.failure_code == RebuildFailureCode.NONE else state.failure_code.value,
         failure_reason=state.failure_reason,
@@ -83,6 +83,11 @@ class RebuildProgress(BaseModel):
     processed_semantic_logs: int = 0
     completed_channels: int = 0
     total_channels: int = 0
+    # 吞吐统计窗口：每次进入频道回放阶段（含恢复）时重置，只统计本次运行的处理速度
+    rate_window_started_at: str | None = None
+    rate_window_base_messages: int = 0
+    throughput_messages_per_minute: float = 0.0
+    eta_seconds: int | None = None
 
 
 class MemoryRebuildChannelState(BaseModel):
@@ -127,6 +132,8 @@ class MemoryRebuildJobState(BaseModel):
     failure_code: RebuildFailureCode = RebuildFailureCode.NONE
     failure_reason: str | None = None
     current_chat_key: str | None = None
+    active_chat_keys: list[str] = Field(default_factory=list)
+    worker_count: int = 0
     checkpoints: RebuildCheckpoints = Field(default_factory=RebuildCheckpoints)
     snapshot: RebuildSnapshot = Field(default_factory=RebuildSnapshot)
     progress: RebuildProgress = Field(default_factory=RebuildProgress)
@@ -110,6 +110,7 @@ class MemoryRetriever:
         record_access: bool = True,
         time_from: datetime | None = None,
         time_to: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> RetrievalResult:
         """检索相关记忆
 
@@ -120,6 +121,7 @@ class MemoryRetriever:
             cognitive_type: 可选，过滤认知类型
             include_inactive: 是否包含已失活记忆
             record_access: 是否记录访问日志
+            query_embedding: 预先计算的查询向量，为空时按查询文本生成
 
         Returns:
             检索结果
@@ -139,7 +141,8 @@ class MemoryRetriever:
         # 生成查询向量
         t0 = time.perf_counter()
         try:
-            query_embedding = await embed_text(query)
+            if query_embedding is None:
+                query_embedding = await embed_text(query)
         except Exception as e:
             logger.warning(f"查询向量化失败: {e}")
             return RetrievalResult(
@@ -612,10 +615,17 @@ async def retrieve_memories(
     limit: int | None = None,
     time_from: datetime | None = None,
     time_to: datetime | None = None,
+    query_embedding: list[float] | None = None,
 ) -> list[RetrievedMemory]:
     """便捷函数：检索记忆"""
     retriever = MemoryRetriever(workspace_id)
-    result = await retriever.retrieve(query, limit=limit, time_from=time_from, time_to=time_to)
+    result = await retriever.retrieve(
+        query,
+        limit=limit,
+        time_from=time_from,
+        time_to=time_to,
+        query_embedding=query_embedding,
+    )
     return result.memories
 
 
@@ -16,6 +16,7 @@ from typing import Callable
 
 from nekro_agent.core.config import config
 from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.coordination import LEADER_MEMORY, coordinator
 from nekro_agent.services.memory.feature_flags import is_memory_system_enabled
 from nekro_agent.services.memory.maintenance import prune_all_workspaces
 
@@ -279,6 +280,9 @@ class MemoryMaintenanceScheduler:
                 await asyncio.sleep(interval_seconds)
                 if not self._running:
                     return
+                # 多实例部署时只由记忆主节点执行全局清理
+                if not coordinator.is_leader(LEADER_MEMORY):
+                    continue
                 results = await prune_all_workspaces()
                 total_paragraphs = sum(item.paragraphs_pruned for item in results.values())
                 total_relations = sum(item.relations_pruned for item in results.values())
@@ -389,6 +393,9 @@ class MemoryMaintenanceScheduler:
 
             # 等待一段时间，确保数据库和其他服务就绪
             await asyncio.sleep(3)
+            if not coordinator.is_leader(LEADER_MEMORY):
+                logger.info("当前实例不是记忆主节点，跳过待沉淀任务恢复")
+                return
 
             workspaces = await DBWorkspace.filter(status="active").all()
             recovered_count = 0
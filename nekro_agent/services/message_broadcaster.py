@@ -1,16 +1,21 @@
 """消息实时广播服务
 
 用于管理每个聊天频道的消息订阅，将新消息推送给所有连接的客户端。
+多实例部署时消息经 `coordinator` 扇出，订阅者连接到任一实例都能收到。
 """
 
 import asyncio
-from typing import Dict
+from typing import Any, Dict
 
 from nekro_agent.core.logger import get_sub_logger
 from nekro_agent.schemas.chat_message import ChatMessage
+from nekro_agent.services.coordination import coordinator
 
 logger = get_sub_logger("message_broadcaster")
 
+# 跨实例扇出使用的协调事件主题
+MESSAGE_TOPIC = "chat_message"
+
 
 class MessageSubscription:
     """消息订阅句柄，封装队列操作，避免 async generator + wait_for 的兼容性问题"""
@@ -67,6 +72,14 @@ class MessageBroadcaster:
             chat_key: 聊天频道唯一标识
             message: 要发布的消息
         """
+        self._deliver(chat_key, message)
+        await coordinator.publish(MESSAGE_TOPIC, {"chat_key": chat_key, "message": message.model_dump(mode="json")})
+
+    def _on_remote_message(self, payload: Dict[str, Any]) -> None:
+        self._deliver(payload["chat_key"], ChatMessage.model_validate(payload["message"]))
+
+    def _deliver(self, chat_key: str, message: ChatMessage) -> None:
+        """推送消息到本实例的订阅者"""
         if chat_key not in self.queues:
             return
 
@@ -101,3 +114,4 @@ class MessageBroadcaster:
 
 # 全局消息广播器实例
 message_broadcaster = MessageBroadcaster()
+coordinator.subscribe(MESSAGE_TOPIC, message_broadcaster._on_remote_message)
@@ -0,0 +1,174 @@
+"""消息准入规则引擎
+
+将触发正则（AI_CHAT_TRIGGER_REGEX）、忽略正则（AI_CHAT_IGNORE_REGEX）与伪造消息规则
+预编译为合并匹配器，避免每条入站消息重复编译：
+- 同一组规则合并为一条多选正则，一次扫描判定是否命中；命中后在命中位置用带命名分组的
+  版本定位具体规则。含命名分组、反向引用或全局内联标志的规则无法安全合并，单独编译
+- 编译结果按 `ConfigManager` 配置版本号缓存，任意配置变更后重新编译
+- 记录每条规则的命中次数，通过仪表盘 `/dashboard/message-rules` 查看
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from nekro_agent.core.config import CoreConfig
+from nekro_agent.core.core_utils import ConfigManager
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.services.perf_metrics import perf_metrics
+
+logger = get_sub_logger("message_rules")
+
+RULE_KIND_TRIGGER = "trigger"
+RULE_KIND_IGNORE = "ignore"
+RULE_KIND_FAKE = "fake"
+
+# 伪造消息规则，作用于去除空白并转小写后的文本
+FAKE_MESSAGE_PATTERNS: Tuple[str, ...] = (
+    r"^<.{4,12}\|messagese(?:pa|pe)rator>",
+    r"from_id:",
+)
+# 伪造消息关键词规则：文本同时包含组内全部子串即命中。
+# 不写成 `a[\s\S]*b` 形式的正则，这类正则在长文本上是二次方复杂度，会阻塞事件循环
+FAKE_MESSAGE_KEYWORDS: Tuple[Tuple[str, ...], ...] = (("message", "(id:"),)
+
+_UNMERGEABLE_PATTERN = re.compile(r"\\[1-9]|\(\?P=|^\(\?[aiLmsux]+\)")
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    """规则命中结果"""
+
+    kind: str
+    rule: str
+    matched: str
+
+
+class RuleHitStat(BaseModel):
+    """单条规则命中统计"""
+
+    kind: str
+    rule: str
+    hits: int
+
+
+class CompiledRuleSet:
+    """一组规则编译后的匹配器（任一规则命中即视为命中）"""
+
+    def __init__(self, kind: str, patterns: Sequence[str]) -> None:
+        self.kind = kind
+        self.invalid_rules: List[str] = []
+        self._combined: Optional[Pattern[str]] = None
+        self._named: Optional[Pattern[str]] = None
+        self._group_rules: Dict[str, str] = {}
+        self._separate: List[Tuple[str, Pattern[str]]] = []
+
+        mergeable: List[str] = []
+        for rule in dict.fromkeys(patterns):
+            try:
+                compiled = re.compile(rule)
+            except re.error as e:
+                self.invalid_rules.append(rule)
+                logger.warning(f"无效的{kind}规则已跳过: {rule!r} - {e}")
+                continue
+            if compiled.groupindex or _UNMERGEABLE_PATTERN.search(rule):
+                self._separate.append((rule, compiled))
+            else:
+                mergeable.append(rule)
+
+        if mergeable:
+            self._group_rules = {f"r{i}": rule for i, rule in enumerate(mergeable)}
+            try:
+                # 捕获分组会使 sre 放弃多选分支的前缀优化，扫描用非捕获版本，命中后再用命名版本定位规则
+                self._combined = re.compile("|".join(f"(?:{rule})" for rule in mergeable))
+                self._named = re.compile("|".join(f"(?P<{name}>{rule})" for name, rule in self._group_rules.items()))
+            except re.error:
+                self._combined = self._named = None
+                self._group_rules = {}
+                self._separate = [(rule, re.compile(rule)) for rule in mergeable] + self._separate
+
+    def search(self, text: str) -> Optional[RuleHit]:
+        if self._combined is not None:
+            match = self._combined.search(text)
+            named = self._named.match(text, match.start()) if match and self._named is not None else None
+            if named:
+                name = named.lastgroup
+                if name not in self._group_rules:
+                    name = next(n for n in self._group_rules if named.group(n) is not None)
+                return RuleHit(kind=self.kind, rule=self._group_rules[name], matched=named.group(0))
+        for rule, compiled in self._separate:
+            match = compiled.search(text)
+            if match:
+                return RuleHit(kind=self.kind, rule=rule, matched=match.group(0))
+        return None
+
+
+class MessageRuleEngine:
+    """按配置版本缓存的消息准入规则引擎"""
+
+    def __init__(self) -> None:
+        self._version = -1
+        self._rule_sets: Dict[Tuple[str, Tuple[str, ...]], CompiledRuleSet] = {}
+        self._fake_rules = CompiledRuleSet(RULE_KIND_FAKE, FAKE_MESSAGE_PATTERNS)
+        self._hits: Dict[Tuple[str, str], int] = {}
+
+    def get_rule_set(self, kind: str, patterns: Sequence[str]) -> CompiledRuleSet:
+        version = ConfigManager.get_version()
+        if version != self._version:
+            self._rule_sets.clear()
+            self._version = version
+        key = (kind, tuple(patterns))
+        rule_set = self._rule_sets.get(key)
+        if rule_set is None:
+            perf_metrics.incr("rules.compile.miss")
+            rule_set = self._rule_sets[key] = CompiledRuleSet(kind, key[1])
+        else:
+            perf_metrics.incr("rules.compile.hit")
+        return rule_set
+
+    def _search(self, rule_set: CompiledRuleSet, text: str) -> Optional[RuleHit]:
+        return self._record(rule_set.search(text))
+
+    def _record(self, hit: Optional[RuleHit]) -> Optional[RuleHit]:
+        if hit is not None:
+            key = (hit.kind, hit.rule)
+            self._hits[key] = self._hits.get(key, 0) + 1
+        return hit
+
+    def match_trigger(self, content: str, config: CoreConfig) -> Optional[RuleHit]:
+        """匹配触发正则"""
+        if not config.AI_CHAT_TRIGGER_REGEX:
+            return None
+        return self._search(self.get_rule_set(RULE_KIND_TRIGGER, config.AI_CHAT_TRIGGER_REGEX), content)
+
+    def match_ignore(self, content: str, config: CoreConfig) -> Optional[RuleHit]:
+        """匹配忽略正则"""
+        if not config.AI_CHAT_IGNORE_REGEX:
+            return None
+        return self._search(self.get_rule_set(RULE_KIND_IGNORE, config.AI_CHAT_IGNORE_REGEX), content)
+
+    def match_fake(self, content: str) -> Optional[RuleHit]:
+        """匹配伪造消息规则"""
+        text = content.strip().replace(" ", "").lower()
+        hit = self._search(self._fake_rules, text)
+        if hit is not None:
+            return hit
+        for keywords in FAKE_MESSAGE_KEYWORDS:
+            if all(keyword in text for keyword in keywords):
+                return self._record(RuleHit(kind=RULE_KIND_FAKE, rule=" & ".join(keywords), matched=keywords[0]))
+        return None
+
+    def hit_stats(self) -> List[RuleHitStat]:
+        """按命中次数降序返回规则命中统计"""
+        return [
+            RuleHitStat(kind=kind, rule=rule, hits=hits)
+            for (kind, rule), hits in sorted(self._hits.items(), key=lambda item: -item[1])
+        ]
+
+    def reset_stats(self) -> None:
+        self._hits.clear()
+
+
+message_rule_engine = MessageRuleEngine()
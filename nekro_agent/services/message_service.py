@@ -1,9 +1,8 @@
 import asyncio
 import json
-import re
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import List, Optional, Union
 
 import magic
 
@@ -15,7 +14,9 @@ from nekro_agent.adapters.interface.schemas.platform import (
     PlatformSendSegmentType,
 )
 from nekro_agent.adapters.utils import adapter_utils
+from nekro_agent.core.config import config as system_config
 from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import AGENT_PENDING_TRIGGERS_PERSIST_DIR
 from nekro_agent.models.db_chat_channel import DBChatChannel
 from nekro_agent.models.db_chat_message import DBChatMessage
 from nekro_agent.models.db_user import DBUser
@@ -28,9 +29,20 @@ from nekro_agent.schemas.agent_message import (
 from nekro_agent.schemas.chat_message import ChatMessage, ChatType
 from nekro_agent.schemas.errors import AdapterUnavailableError
 from nekro_agent.schemas.signal import MsgSignal
+from nekro_agent.services.admission_cache import admission_cache
+from nekro_agent.services.agent_mailbox import ChannelMailboxScheduler
+from nekro_agent.services.agent_run_scheduler import (
+    AgentRunScheduler,
+    BackpressureSignal,
+    RunPriority,
+    RunTicket,
+)
 from nekro_agent.services.channel_broadcaster import channel_broadcaster
+from nekro_agent.services.coordination import coordinator
 from nekro_agent.services.memory.feature_flags import is_memory_system_enabled
 from nekro_agent.services.message_broadcaster import message_broadcaster
+from nekro_agent.services.message_rules import message_rule_engine
+from nekro_agent.services.perf_metrics import perf_metrics
 from nekro_agent.services.plugin.collector import plugin_collector
 from nekro_agent.services.quota_service import quota_service
 from nekro_agent.tools.at_markup import AT_MARKUP_PATTERN, normalize_malformed_at_markup
@@ -64,10 +76,46 @@ class MessageService:
     """消息服务类，处理所有类型的消息推送"""
 
     def __init__(self):
-        # 全局状态追踪
-        self.running_tasks: Dict[str, asyncio.Task] = {}  # 记录每个频道正在执行的agent任务
-        self.debounce_timers: Dict[str, float] = {}  # 记录每个频道的防抖计时器
-        self.pending_messages: Dict[str, ChatMessage] = {}  # 记录每个频道待处理的最新消息
+        # 全局运行槽位按触发优先级与频道 / 适配器 / 工作区公平分配
+        self.run_scheduler = AgentRunScheduler(capacity=lambda: system_config.AI_MAX_CONCURRENT_AGENT_RUNS)
+        self.run_scheduler.add_backpressure_listener(self._notify_adapter_backpressure)
+        # 每个活跃频道一个信箱 actor，负责防抖与合并触发
+        self.scheduler = ChannelMailboxScheduler(
+            runner=self._run_leased_agent_task,
+            debounce_seconds=self._get_debounce_seconds,
+            ticket_of=self._get_run_ticket,
+            run_scheduler=self.run_scheduler,
+            persist_dir=Path(AGENT_PENDING_TRIGGERS_PERSIST_DIR),
+            worker_id=coordinator.worker_id,
+        )
+
+    @staticmethod
+    async def _get_debounce_seconds(chat_key: str) -> float:
+        db_chat_channel = await admission_cache.get_channel(chat_key=chat_key)
+        config = await db_chat_channel.get_effective_config()
+        return config.AI_DEBOUNCE_WAIT_SECONDS
+
+    @staticmethod
+    async def _get_run_ticket(chat_key: str, priority: RunPriority) -> RunTicket:
+        from nekro_agent.adapters import resolve_adapter_key_from_chat_key
+
+        db_chat_channel = await admission_cache.get_channel(chat_key=chat_key)
+        workspace_id = db_chat_channel.workspace_id
+        return RunTicket(
+            chat_key=chat_key,
+            adapter_key=resolve_adapter_key_from_chat_key(chat_key),
+            workspace_key=str(workspace_id) if workspace_id else "",
+            priority=priority,
+        )
+
+    @staticmethod
+    def _notify_adapter_backpressure(signal: BackpressureSignal) -> None:
+        try:
+            adapter = adapter_utils.get_adapter(signal.adapter_key)
+        except AdapterUnavailableError:
+            return
+        logger.info(f"适配器 {signal.adapter_key} Agent 排队状态: {signal.level.value} (排队 {signal.queued})")
+        adapter.on_agent_backpressure(signal)
 
     async def cancel_agent_task(self, chat_key: str) -> bool:
         """取消指定频道正在执行的 agent 任务
@@ -78,35 +126,15 @@ class MessageService:
         Returns:
             bool: 是否成功取消了任务
         """
-        cancelled = False
-
         # 仅取消正在执行的任务，不清理待处理消息队列
         # 这样排队中尚未触发的 @ 消息仍会正常处理
-        if chat_key in self.running_tasks and not self.running_tasks[chat_key].done():
-            self.running_tasks[chat_key].cancel()
-            cancelled = True
-        self.running_tasks.pop(chat_key, None)
-
-        return cancelled
+        return self.scheduler.cancel_running(chat_key)
 
     async def _message_validation_check(self, message: ChatMessage) -> bool:
         """消息校验"""
-        plaint_text = message.content_text.strip().replace(" ", "").lower()
-        is_fake_message = False
-
-        # 检查伪造消息
-        if re.match(r"<.{4,12}\|messageseparator>", plaint_text):
-            is_fake_message = True
-        if re.match(r"<.{4,12}\|messageseperator>", plaint_text):
-            is_fake_message = True
-
-        if "message" in plaint_text and "(id:" in plaint_text:
-            is_fake_message = True
-        if "from_id:" in plaint_text:  # noqa: SIM103
-            is_fake_message = True
-
-        if is_fake_message:
-            logger.warning(f"检测到伪造消息: {message.content_text} | 跳过本次处理...")
+        hit = message_rule_engine.match_fake(message.content_text)
+        if hit:
+            logger.warning(f"检测到伪造消息: {message.content_text} | 命中规则: {hit.rule} | 跳过本次处理...")
             return False
 
         return True
@@ -116,58 +144,25 @@ class MessageService:
         chat_key: Optional[str] = None,
         message: Optional[ChatMessage] = None,
         ctx: Optional[AgentCtx] = None,
+        priority: RunPriority = RunPriority.EXPLICIT,
     ):
-        """调度 agent 任务，实现防抖和任务控制"""
+        """调度 agent 任务：投递到频道信箱，由信箱 actor 负责防抖、合并与并发控制"""
         if not message:
             if not chat_key:
                 logger.error("调度 Agent 执行失败，目标 chat_key 为空")
                 return
             message = ChatMessage.create_empty(chat_key)
-        chat_key = message.chat_key
-
-        current_time = time.time()
-
-        # 更新待处理消息和防抖计时器
-        self.pending_messages[chat_key] = message
-        self.debounce_timers[chat_key] = current_time
-
-        # 如果已有正在执行的任务，直接返回
-        if chat_key in self.running_tasks and not self.running_tasks[chat_key].done():
-            return
-
-        # 创建防抖任务
-        asyncio.create_task(self._debounce_task(chat_key, current_time, ctx))
+        self.scheduler.submit(message.chat_key, message, ctx, priority=priority)
 
-    async def _debounce_task(self, chat_key: str, start_time: float, ctx: Optional[AgentCtx] = None):
-        """防抖任务处理
-
-        Args:
-            chat_key (str): 频道标识
-            start_time (float): 任务开始时间
-        """
-        db_chat_channel = await DBChatChannel.get(chat_key=chat_key)
-        config = await db_chat_channel.get_effective_config()
-        # 等待防抖时间
-        await asyncio.sleep(config.AI_DEBOUNCE_WAIT_SECONDS)
-
-        # 检查是否在防抖期间有新消息
-        if start_time != self.debounce_timers[chat_key]:
-            return
-
-        # 获取最终要处理的消息
-        final_message = self.pending_messages.pop(chat_key, None)
-        if not final_message:
-            return
-
-        # 创建新的agent任务
-        task = asyncio.create_task(
-            self._run_chat_agent_task(
-                chat_key=chat_key,
-                message=final_message if not final_message.is_empty() else None,
-                ctx=ctx,
-            ),
-        )
-        self.running_tasks[chat_key] = task
+    async def _run_leased_agent_task(
+        self,
+        chat_key: str,
+        message: Optional[ChatMessage] = None,
+        ctx: Optional[AgentCtx] = None,
+    ):
+        """持有频道租约执行 agent 任务，多实例部署时同一频道同时只在一个实例上运行"""
+        async with coordinator.channel_lease(chat_key):
+            await self._run_chat_agent_task(chat_key, message, ctx)
 
     async def _run_chat_agent_task(self, chat_key: str, message: Optional[ChatMessage] = None, ctx: Optional[AgentCtx] = None):
         """执行agent任务"""
@@ -243,13 +238,6 @@ class MessageService:
                     f"[message_service] 频道 {chat_key} Agent 任务超过兜底超时 {_max_total_timeout}s，强制终止以释放频道锁"
                 )
         finally:
-            # 清理任务状态
-            if chat_key in self.running_tasks:
-                del self.running_tasks[chat_key]
-
-            final_message = self.pending_messages.pop(chat_key, None)
-            self.debounce_timers.pop(chat_key, None)
-
             # 取消处理emoji（如果设置过）；NapCat 断开时 get_bot() 可能抛 RuntimeError，不能影响后续清理
             if adapter and adapter.config.SESSION_PROCESSING_WITH_EMOJI and message and message.message_id:
                 try:
@@ -292,11 +280,6 @@ class MessageService:
             except Exception as _e:
                 logger.warning(f"[message_service] 广播 AgentRuntime 结束事件失败: {_e}")
 
-            # 如果有待处理消息，创建新的任务处理最后一条消息
-            if final_message:
-                new_task = asyncio.create_task(self._run_chat_agent_task(chat_key=chat_key, message=final_message, ctx=ctx))
-                self.running_tasks[chat_key] = new_task
-
     async def push_human_message(
         self,
         message: ChatMessage,
@@ -305,9 +288,10 @@ class MessageService:
         db_chat_channel: Optional[DBChatChannel] = None,
     ):
         """推送人类用户消息"""
-        db_chat_channel = db_chat_channel or await DBChatChannel.get_channel(chat_key=message.chat_key)
-        config = await db_chat_channel.get_effective_config()
-        preset = await db_chat_channel.get_preset()
+        with perf_metrics.timer("admission.resolve"):
+            db_chat_channel = db_chat_channel or await admission_cache.get_channel(chat_key=message.chat_key)
+            config = await db_chat_channel.get_effective_config()
+            preset = await db_chat_channel.get_preset()
 
         if not await self._message_validation_check(message):
             logger.warning("消息校验失败，跳过本次处理...")
@@ -317,15 +301,17 @@ class MessageService:
             logger.info(f"消息 {message.content_text} 被禁止，跳过本次处理...")
             return
 
-        ctx: AgentCtx = await AgentCtx.create_by_chat_key(chat_key=message.chat_key)
+        ctx: AgentCtx = AgentCtx.create_by_db_chat_channel(db_chat_channel)
         ctx._trigger_db_user = user  # noqa: SLF001
 
-        signal = await plugin_collector.handle_on_user_message(ctx, message)
+        with perf_metrics.timer("admission.plugin_hook"):
+            signal = await plugin_collector.handle_on_user_message(ctx, message)
         if signal == MsgSignal.BLOCK_ALL:
             logger.info(f"用户消息 {message.content_text} 被插件阻止响应，跳过本次处理...")
             return
 
-        await self._persist_human_message(message, db_chat_channel)
+        with perf_metrics.timer("admission.persist"):
+            await self._persist_human_message(message, db_chat_channel)
 
         should_ignore = (user and user.is_prevent_trigger) or (user and not user.is_active)
 
@@ -370,23 +356,14 @@ class MessageService:
 
             if not _is_quota_exempt:
                 # 配额检查（使用频道级 effective config）
-                effective_config = await db_chat_channel.get_effective_config()
+                effective_config = config
                 daily_limit = effective_config.AI_CHAT_DAILY_REPLY_LIMIT
                 if daily_limit > 0:
                     boost = quota_service.get_boost(message.chat_key)
                     effective_limit = daily_limit + boost
 
-                    # 查询今日已回复数
-                    today_start = time.time() - (time.time() % 86400)  # UTC 当天零点
-                    daily_count = (
-                        await DBChatMessage.filter(
-                            chat_key=message.chat_key,
-                            sender_id=-1,
-                            send_timestamp__gte=int(today_start),
-                        )
-                        .exclude(sender_name="SYSTEM")
-                        .count()
-                    )
+                    # 今日已回复数（内存计数器，UTC 当天零点起）
+                    daily_count = await quota_service.get_daily_count(message.chat_key)
 
                     if daily_count >= effective_limit:
                         logger.info(f"频道 {message.chat_key} 今日配额已用完 ({daily_count}/{effective_limit})，跳过回复")
@@ -418,16 +395,7 @@ class MessageService:
                     # 每小时限额检查
                     if effective_config.AI_CHAT_ENABLE_HOURLY_LIMIT:
                         hourly_limit = quota_service.calculate_hourly_quota(effective_limit)
-                        hour_start = time.time() - (time.time() % 3600)  # 当前小时零分
-                        hourly_count = (
-                            await DBChatMessage.filter(
-                                chat_key=message.chat_key,
-                                sender_id=-1,
-                                send_timestamp__gte=int(hour_start),
-                            )
-                            .exclude(sender_name="SYSTEM")
-                            .count()
-                        )
+                        hourly_count = await quota_service.get_hourly_count(message.chat_key)
 
                         if hourly_count >= hourly_limit:
                             logger.info(f"频道 {message.chat_key} 本小时配额已用完 ({hourly_count}/{hourly_limit})，跳过回复")
@@ -455,7 +423,13 @@ class MessageService:
                                 )
                             return
 
-            await self.schedule_agent_task(message=message, ctx=ctx)
+            if explicit_triggered:
+                priority = RunPriority.EXPLICIT
+            elif content_triggered:
+                priority = RunPriority.NORMAL
+            else:
+                priority = RunPriority.RANDOM
+            await self.schedule_agent_task(message=message, ctx=ctx, priority=priority)
 
     async def record_human_message(
         self,
@@ -664,6 +638,7 @@ class MessageService:
             ext_data=json.dumps(PlatformMessageExt(ref_msg_id=ref_msg_id or "").model_dump(), ensure_ascii=False),
             send_timestamp=int(time.time()),
         )
+        await quota_service.record_bot_reply(chat_key)
 
         # 通知记忆调度器（非阻塞）
         asyncio.create_task(
@@ -0,0 +1,178 @@
+"""近似重复消息检测
+
+为出站消息防刷屏等场景提供按频道（或任意键）隔离的有界滑动窗口：
+- 窗口同时受条数与时长约束，频道数量按 LRU 淘汰，内存占用有上限
+- 文本按字符 k-shingle 切分后计算 bottom-k MinHash 签名，签名大小固定，
+  两两比较的代价与消息长度无关，估算值为 shingle 集合的 Jaccard 相似度
+- 完全重复通过全文摘要判断
+"""
+
+import hashlib
+import heapq
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Set, Tuple
+
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_SKETCH_SIZE = 64
+DEFAULT_MAX_WINDOW_SIZE = 32
+DEFAULT_MAX_KEYS = 4096
+# 相似度警告的默认阈值。shingle Jaccard 对分散的改写比 difflib.SequenceMatcher 比值敏感得多
+# （SequenceMatcher 0.9 约对应 0.5，0.7 约对应 0.35），按旧版 0.7 的检出范围换算
+DEFAULT_SIMILARITY_THRESHOLD = 0.35
+# 旧版 SequenceMatcher 比值与 shingle Jaccard 的经验对应点，用于换算旧配置中的阈值
+_LEGACY_RATIO_TO_JACCARD = ((0.0, 0.0), (0.7, DEFAULT_SIMILARITY_THRESHOLD), (0.9, 0.5), (1.0, 1.0))
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def text_shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """字符 k-shingle，忽略空白与大小写差异"""
+    normalized = "".join(text.lower().split())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def minhash_signature(text: str, shingle_size: int = DEFAULT_SHINGLE_SIZE, sketch_size: int = DEFAULT_SKETCH_SIZE) -> Tuple[int, ...]:
+    """bottom-k MinHash 签名：取 shingle 哈希值中最小的 k 个（升序）"""
+    return tuple(heapq.nsmallest(sketch_size, {_hash64(s) for s in text_shingles(text, shingle_size)}))
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...], sketch_size: int = DEFAULT_SKETCH_SIZE) -> float:
+    """由两个 bottom-k 签名估算 Jaccard 相似度"""
+    if not sig_a or not sig_b:
+        return 0.0
+    set_a, set_b = set(sig_a), set(sig_b)
+    union_bottom = heapq.nsmallest(sketch_size, set_a | set_b)
+    shared = sum(1 for h in union_bottom if h in set_a and h in set_b)
+    return shared / len(union_bottom)
+
+
+def legacy_ratio_to_jaccard(ratio: float) -> float:
+    """将旧版 SequenceMatcher 比值阈值按经验对应点分段线性换算为 Jaccard 阈值"""
+    ratio = min(max(ratio, 0.0), 1.0)
+    for (x0, y0), (x1, y1) in zip(_LEGACY_RATIO_TO_JACCARD, _LEGACY_RATIO_TO_JACCARD[1:]):
+        if ratio <= x1:
+            return round(y0 + (y1 - y0) * (ratio - x0) / (x1 - x0), 4)
+    return 1.0
+
+
+@dataclass(frozen=True)
+class _WindowEntry:
+    timestamp: float
+    digest: int
+    length: int
+    signature: Tuple[int, ...]
+
+
+@dataclass
+class DuplicateCheckResult:
+    """检测结果"""
+
+    exact: bool = False
+    similarity: float = 0.0
+
+
+class NearDuplicateDetector:
+    """按键隔离的近似重复检测器
+
+    Args:
+        max_window_size: 每个键最多保留的记录数（单次检查可通过 `window_size` 进一步收窄）
+        max_keys: 最多跟踪的键数量，超出后淘汰最久未使用的键
+        shingle_size: shingle 字符数
+        sketch_size: MinHash 签名大小
+    """
+
+    def __init__(
+        self,
+        max_window_size: int = DEFAULT_MAX_WINDOW_SIZE,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        sketch_size: int = DEFAULT_SKETCH_SIZE,
+    ) -> None:
+        self.max_window_size = max_window_size
+        self.max_keys = max_keys
+        self.shingle_size = shingle_size
+        self.sketch_size = sketch_size
+        self._windows: "OrderedDict[str, Deque[_WindowEntry]]" = OrderedDict()
+
+    def _recent(self, key: str, window_size: Optional[int], window_seconds: Optional[float]) -> Tuple[_WindowEntry, ...]:
+        window = self._windows.get(key)
+        if not window:
+            return ()
+        self._windows.move_to_end(key)
+        if window_seconds:
+            deadline = time.monotonic() - window_seconds
+            while window and window[0].timestamp < deadline:
+                window.popleft()
+        entries = tuple(window)
+        if window_size is not None:
+            entries = entries[-window_size:] if window_size > 0 else ()
+        return entries
+
+    def check(
+        self,
+        key: str,
+        text: str,
+        window_size: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        min_length: int = 0,
+    ) -> DuplicateCheckResult:
+        """检查文本与窗口内记录的重复程度（不写入窗口）
+
+        Args:
+            key: 隔离键，通常为 chat_key
+            text: 待检查文本
+            window_size: 仅比较最近 N 条记录
+            window_seconds: 仅比较最近若干秒内的记录，为空或 0 时不限制
+            min_length: 任一方短于该长度时不计算相似度（完全重复仍会判定）
+        """
+        entries = self._recent(key, window_size, window_seconds)
+        if not entries:
+            return DuplicateCheckResult()
+        digest = _hash64(text)
+        if any(entry.digest == digest for entry in entries):
+            return DuplicateCheckResult(exact=True, similarity=1.0)
+        if len(text) < min_length:
+            return DuplicateCheckResult()
+        signature = minhash_signature(text, self.shingle_size, self.sketch_size)
+        similarity = max(
+            (
+                estimate_similarity(signature, entry.signature, self.sketch_size)
+                for entry in entries
+                if entry.length >= min_length
+            ),
+            default=0.0,
+        )
+        return DuplicateCheckResult(similarity=similarity)
+
+    def add(self, key: str, text: str) -> None:
+        """写入窗口"""
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = deque(maxlen=self.max_window_size)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+        window.append(
+            _WindowEntry(
+                timestamp=time.monotonic(),
+                digest=_hash64(text),
+                length=len(text),
+                signature=minhash_signature(text, self.shingle_size, self.sketch_size),
+            ),
+        )
+
+    def clear(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._windows.clear()
+        else:
+            self._windows.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._windows)
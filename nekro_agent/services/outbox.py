@@ -0,0 +1,375 @@
+"""出站消息投递队列
+
+Agent 回复经由出站队列投递到适配器，而不是直接调用 `adapter.forward_message`：
+- 每个 (适配器, 频道) 对应一条有序队列，同一频道的消息严格按提交顺序发送，
+  前一条重试期间后续消息排队等待
+- 适配器在 `AdapterMetadata.send_rate_limit` 中声明适配器级与频道级的每分钟发送上限，
+  发送前依次从两个令牌桶取令牌
+- 只重试确定未被平台接收的发送：平台返回限流（`PlatformSendResponse.retry_after` 或带 `retry_after`
+  的异常）时按平台给出的等待时间重试，连接建立阶段的传输错误按指数退避重试；
+  读超时、分段发送中途失败等其他异常可能已被平台接收，直接标记失败以免重复发送。
+  要求等待超过 `OUTBOX_RETRY_MAX_DELAY_SECONDS` 时放弃
+- 开启 `OUTBOX_PERSIST_ENABLED` 后发送前写入 `outbox_message` 表，送达后删除，
+  重启后补发有效期内未送达的消息，补发成功后按提交时附带的记录信息写入聊天记录
+- 排队耗时、发送耗时、重试与投递结果记录到性能指标 `outbox.*`
+"""
+
+import asyncio
+import json
+import random
+import socket
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Tuple
+
+import aiohttp
+import httpx
+
+from nekro_agent.adapters.interface.schemas.platform import PlatformSendRequest, PlatformSendResponse
+from nekro_agent.core.config import config
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.models.db_outbox_message import DBOutboxMessage
+from nekro_agent.services.perf_metrics import perf_metrics
+from nekro_agent.services.token_bucket import TokenBucket
+
+if TYPE_CHECKING:
+    from nekro_agent.adapters.interface.base import BaseAdapter, SendRateLimit
+
+logger = get_sub_logger("outbox")
+
+# 指数退避的初始等待（秒）
+RETRY_BASE_DELAY_SECONDS = 1.0
+# 退避等待的随机抖动比例，避免同一适配器的多个频道同时重试
+RETRY_JITTER_RATIO = 0.2
+# 重启后补发消息的有效期（秒），过旧的消息不再发送
+PERSISTED_MESSAGE_MAX_AGE_SECONDS = 600.0
+# 投递失败的记录保留时长，便于排查
+FAILED_MESSAGE_RETENTION = timedelta(days=7)
+# 频道级令牌桶缓存上限，超出后淘汰最久未使用的频道
+CHANNEL_BUCKET_CACHE_SIZE = 4096
+
+STATUS_PENDING = "pending"
+STATUS_FAILED = "failed"
+
+QueueKey = Tuple[str, str]
+
+# 连接建立阶段的传输错误，请求尚未到达平台
+_CONNECT_ERRORS = (
+    ConnectionRefusedError,
+    socket.gaierror,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    aiohttp.ClientConnectorError,
+)
+
+
+def extract_retry_after(error: BaseException) -> Optional[float]:
+    """从平台 SDK 的限流异常中提取建议等待秒数（兼容数值与 timedelta）"""
+    value = getattr(error, "retry_after", None)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (int, float)) and value >= 0:
+        return float(value)
+    return None
+
+
+def is_connect_error(error: BaseException) -> bool:
+    """是否为连接建立阶段的错误（消息确定未发出，重试不会重复发送）"""
+    return isinstance(error, _CONNECT_ERRORS)
+
+
+@dataclass
+class _Delivery:
+    adapter: "BaseAdapter"
+    request: PlatformSendRequest
+    future: "asyncio.Future[PlatformSendResponse]" = field(repr=False)
+    record_id: Optional[int] = None
+    # 落库任务，投递前等待其完成以取得记录 ID
+    persisting: "Optional[asyncio.Future[Optional[int]]]" = field(default=None, repr=False)
+    # 补发成功后写入聊天记录所需的信息，仅补发的消息携带
+    history: Optional[Dict[str, Any]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class OutboxService:
+    """按适配器与频道分队列的出站消息投递服务"""
+
+    def __init__(self) -> None:
+        self._queues: Dict[QueueKey, Deque[_Delivery]] = {}
+        self._workers: Dict[QueueKey, "asyncio.Task[None]"] = {}
+        self._adapter_buckets: Dict[str, TokenBucket] = {}
+        self._channel_buckets: "OrderedDict[QueueKey, TokenBucket]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # 投递
+    # ------------------------------------------------------------------
+
+    async def send(
+        self,
+        adapter: "BaseAdapter",
+        request: PlatformSendRequest,
+        history: Optional[Dict[str, Any]] = None,
+    ) -> PlatformSendResponse:
+        """提交一条消息并等待投递结果
+
+        重试耗尽后返回最后一次失败响应，或抛出最后一次发送异常。
+        调用方在消息开始发送前被取消时，该消息不再发送。
+        `history` 随消息落库，重启补发成功后据此写入聊天记录（实时发送由调用方记录）。
+        """
+        future: asyncio.Future[PlatformSendResponse] = asyncio.get_running_loop().create_future()
+        delivery = _Delivery(adapter=adapter, request=request, future=future)
+        if config.OUTBOX_PERSIST_ENABLED:
+            delivery.persisting = asyncio.ensure_future(self._persist(adapter.key, request, history))
+        # 同步入队以确定发送顺序，落库在投递前等待完成
+        self._enqueue(delivery)
+        return await future
+
+    def pending_count(self, adapter_key: Optional[str] = None) -> int:
+        return sum(len(queue) for key, queue in self._queues.items() if adapter_key is None or key[0] == adapter_key)
+
+    def _enqueue(self, delivery: _Delivery) -> None:
+        key = (delivery.adapter.key, delivery.request.chat_key)
+        self._queues.setdefault(key, deque()).append(delivery)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key))
+
+    async def _drain(self, key: QueueKey) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                delivery = queue[0]
+                if delivery.persisting is not None:
+                    delivery.record_id = await delivery.persisting
+                if delivery.future.done():
+                    # 调用方已取消，消息尚未发出
+                    await self._discard(delivery.record_id)
+                else:
+                    await self._deliver(delivery)
+                queue.popleft()
+        finally:
+            self._workers.pop(key, None)
+            if not queue:
+                self._queues.pop(key, None)
+
+    async def _deliver(self, delivery: _Delivery) -> None:
+        adapter_key = delivery.adapter.key
+        limit = delivery.adapter.metadata.send_rate_limit
+        attempt = 0
+        while True:
+            await self._adapter_bucket(adapter_key, limit).acquire()
+            await self._channel_bucket(adapter_key, delivery.request.chat_key, limit).acquire()
+            if delivery.future.done():
+                await self._discard(delivery.record_id)
+                return
+            if attempt == 0:
+                perf_metrics.observe(
+                    f"outbox.queue_wait.{adapter_key}",
+                    (time.monotonic() - delivery.enqueued_at) * 1000,
+                )
+
+            response: Optional[PlatformSendResponse] = None
+            error: Optional[Exception] = None
+            with perf_metrics.timer(f"outbox.send.{adapter_key}"):
+                try:
+                    response = await delivery.adapter.forward_message(delivery.request)
+                except Exception as e:
+                    error = e
+
+            reason = response.error_message if response is not None else repr(error)
+            if response is not None:
+                if response.success or response.retry_after is None:
+                    break
+                retry_after: Optional[float] = response.retry_after
+            else:
+                retry_after = extract_retry_after(error)  # type: ignore[arg-type]
+                # 平台可能已接收的发送不重试，避免重复消息
+                if retry_after is None and not is_connect_error(error):  # type: ignore[arg-type]
+                    break
+            delay = self._retry_delay(attempt, retry_after)
+            if delay is None:
+                break
+            attempt += 1
+            perf_metrics.incr(f"outbox.retry.{adapter_key}")
+            logger.warning(
+                f"消息发送失败，{delay:.1f} 秒后第 {attempt} 次重试 ({delivery.request.chat_key}): {reason}",
+            )
+            await self._mark_attempt(delivery.record_id, attempt, reason)
+            await asyncio.sleep(delay)
+
+        if response is not None and response.success:
+            perf_metrics.incr(f"outbox.sent.{adapter_key}")
+            await self._discard(delivery.record_id)
+            if delivery.history is not None:
+                await self._record_history(delivery.request, delivery.history, response)
+            if not delivery.future.done():
+                delivery.future.set_result(response)
+            return
+
+        perf_metrics.incr(f"outbox.failed.{adapter_key}")
+        await self._mark_failed(delivery.record_id, attempt + 1, reason)
+        if delivery.future.done():
+            return
+        if response is not None:
+            delivery.future.set_result(response)
+        else:
+            delivery.future.set_exception(error)  # type: ignore[arg-type]
+
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """计算下一次重试前的等待时间，返回 None 表示不再重试"""
+        if attempt >= config.OUTBOX_MAX_RETRIES:
+            return None
+        max_delay = config.OUTBOX_RETRY_MAX_DELAY_SECONDS
+        if retry_after is not None:
+            return retry_after if retry_after <= max_delay else None
+        delay = RETRY_BASE_DELAY_SECONDS * (2**attempt) * (1 + random.uniform(0, RETRY_JITTER_RATIO))
+        return min(max_delay, delay)
+
+    # ------------------------------------------------------------------
+    # 限速
+    # ------------------------------------------------------------------
+
+    def _adapter_bucket(self, adapter_key: str, limit: "SendRateLimit") -> TokenBucket:
+        bucket = self._adapter_buckets.get(adapter_key)
+        if bucket is None or bucket.rate_per_minute != limit.per_minute:
+            bucket = self._adapter_buckets[adapter_key] = TokenBucket(limit.per_minute, burst=limit.burst)
+        return bucket
+
+    def _channel_bucket(self, adapter_key: str, chat_key: str, limit: "SendRateLimit") -> TokenBucket:
+        key = (adapter_key, chat_key)
+        bucket = self._channel_buckets.get(key)
+        if bucket is None or bucket.rate_per_minute != limit.per_channel_per_minute:
+            bucket = self._channel_buckets[key] = TokenBucket(limit.per_channel_per_minute, burst=limit.burst)
+            if len(self._channel_buckets) > CHANNEL_BUCKET_CACHE_SIZE:
+                self._channel_buckets.popitem(last=False)
+        self._channel_buckets.move_to_end(key)
+        return bucket
+
+    # ------------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------------
+
+    async def _persist(
+        self,
+        adapter_key: str,
+        request: PlatformSendRequest,
+        history: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        payload = request.model_dump(mode="json")
+        if history is not None:
+            payload = {"request": payload, "history": history}
+        try:
+            record = await DBOutboxMessage.create(
+                adapter_key=adapter_key,
+                chat_key=request.chat_key,
+                payload=json.dumps(payload, ensure_ascii=False),
+            )
+        except Exception as e:
+            logger.warning(f"待发送消息落库失败，本次仅在内存中投递: {e}")
+            return None
+        return record.id
+
+    async def _discard(self, record_id: Optional[int]) -> None:
+        if record_id is None:
+            return
+        try:
+            await DBOutboxMessage.filter(id=record_id).delete()
+        except Exception as e:
+            logger.warning(f"删除已投递消息记录失败 ({record_id}): {e}")
+
+    async def _mark_attempt(self, record_id: Optional[int], attempts: int, error: Optional[str]) -> None:
+        if record_id is None:
+            return
+        try:
+            await DBOutboxMessage.filter(id=record_id).update(attempts=attempts, last_error=error)
+        except Exception as e:
+            logger.warning(f"更新待发送消息记录失败 ({record_id}): {e}")
+
+    async def _mark_failed(self, record_id: Optional[int], attempts: int, error: Optional[str]) -> None:
+        if record_id is None:
+            return
+        try:
+            await DBOutboxMessage.filter(id=record_id).update(
+                status=STATUS_FAILED,
+                attempts=attempts,
+                last_error=error,
+            )
+        except Exception as e:
+            logger.warning(f"标记消息投递失败记录失败 ({record_id}): {e}")
+
+    async def recover(self) -> int:
+        """补发上次退出前未送达的消息，返回补发数量"""
+        if not config.OUTBOX_PERSIST_ENABLED:
+            return 0
+        from nekro_agent.adapters.utils import adapter_utils
+
+        now = datetime.now(timezone.utc)
+        await DBOutboxMessage.filter(status=STATUS_FAILED, create_time__lt=now - FAILED_MESSAGE_RETENTION).delete()
+        expired = await DBOutboxMessage.filter(
+            status=STATUS_PENDING,
+            create_time__lt=now - timedelta(seconds=PERSISTED_MESSAGE_MAX_AGE_SECONDS),
+        ).update(status=STATUS_FAILED, last_error="重启后超过补发有效期")
+        if expired:
+            logger.info(f"{expired} 条待发送消息已超过补发有效期，不再发送")
+
+        recovered = 0
+        for record in await DBOutboxMessage.filter(status=STATUS_PENDING).order_by("id"):
+            try:
+                adapter = adapter_utils.get_adapter(record.adapter_key)
+                payload = json.loads(record.payload)
+                history = payload.get("history") if "request" in payload else None
+                request = PlatformSendRequest.model_validate(payload.get("request", payload))
+            except Exception as e:
+                logger.warning(f"待发送消息无法恢复 ({record.id}): {e}")
+                await self._mark_failed(record.id, record.attempts, str(e))
+                continue
+            future: asyncio.Future[PlatformSendResponse] = asyncio.get_running_loop().create_future()
+            # 补发无等待方，取走结果避免未读取异常告警
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._enqueue(
+                _Delivery(adapter=adapter, request=request, future=future, record_id=record.id, history=history),
+            )
+            recovered += 1
+        if recovered:
+            logger.info(f"已恢复 {recovered} 条待发送消息")
+        return recovered
+
+    async def _record_history(
+        self,
+        request: PlatformSendRequest,
+        history: Dict[str, Any],
+        response: PlatformSendResponse,
+    ) -> None:
+        if response.recorded:
+            return
+        from nekro_agent.schemas.agent_message import AgentMessageSegment
+        from nekro_agent.services.chat.universal_chat_service import universal_chat_service
+
+        try:
+            messages = [AgentMessageSegment.model_validate(item) for item in history["messages"]]
+            await universal_chat_service.record_bot_message(
+                request.chat_key,
+                messages,
+                response,
+                ref_msg_id=history.get("ref_msg_id"),
+            )
+        except Exception as e:
+            logger.warning(f"补发消息写入聊天记录失败 ({request.chat_key}): {e}")
+
+    async def stop(self) -> None:
+        """停止所有投递协程，已落库的消息在下次启动时补发"""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for queue in self._queues.values():
+            for delivery in queue:
+                if not delivery.future.done():
+                    delivery.future.cancel()
+        self._queues.clear()
+
+
+outbox_service = OutboxService()
@@ -0,0 +1,127 @@
+"""进程内性能指标
+
+为消息准入、Prompt 构建、RPC 调用等热路径提供轻量的耗时与计数统计。
+数据全部存储在内存中，重启清零，通过仪表盘 `/dashboard/perf` 查看。
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List
+
+from pydantic import BaseModel
+
+# 每个耗时指标保留的最近样本数，用于估算分位数
+_RECENT_SAMPLES = 512
+
+
+class LatencySnapshot(BaseModel):
+    """耗时指标快照（毫秒）"""
+
+    count: int
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    last_ms: float
+
+
+class PerfSnapshot(BaseModel):
+    """全部性能指标快照"""
+
+    latencies: Dict[str, LatencySnapshot]
+    counters: Dict[str, int]
+    hit_rates: Dict[str, float] = {}
+
+
+class _LatencyStat:
+    __slots__ = ("count", "last_ms", "max_ms", "recent", "total_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.recent: Deque[float] = deque(maxlen=_RECENT_SAMPLES)
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.recent.append(elapsed_ms)
+
+    def snapshot(self) -> LatencySnapshot:
+        samples: List[float] = sorted(self.recent)
+
+        def _pct(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+        return LatencySnapshot(
+            count=self.count,
+            avg_ms=round(self.total_ms / self.count, 3) if self.count else 0.0,
+            p50_ms=round(_pct(0.5), 3),
+            p95_ms=round(_pct(0.95), 3),
+            max_ms=round(self.max_ms, 3),
+            last_ms=round(self.last_ms, 3),
+        )
+
+
+class PerfMetrics:
+    """性能指标注册表
+
+    指标名使用点分层级，如 `admission.channel`、`prompt.build`。
+    """
+
+    def __init__(self) -> None:
+        self._latencies: Dict[str, _LatencyStat] = {}
+        self._counters: Dict[str, int] = {}
+
+    def observe(self, name: str, elapsed_ms: float) -> None:
+        """记录一次耗时样本"""
+        stat = self._latencies.get(name)
+        if stat is None:
+            stat = self._latencies[name] = _LatencyStat()
+        stat.observe(elapsed_ms)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """累加计数器"""
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get_counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """统计代码块耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def hit_rate(self, name: str) -> float:
+        """按 `<name>.hit` / `<name>.miss` 计数器计算命中率"""
+        hits = self.get_counter(f"{name}.hit")
+        total = hits + self.get_counter(f"{name}.miss")
+        return round(hits / total, 4) if total else 0.0
+
+    def snapshot(self, prefix: str = "") -> PerfSnapshot:
+        """获取指标快照，可按名称前缀过滤"""
+        counters = {k: v for k, v in sorted(self._counters.items()) if k.startswith(prefix)}
+        cache_names = sorted({k.rsplit(".", 1)[0] for k in counters if k.endswith((".hit", ".miss"))})
+        return PerfSnapshot(
+            latencies={k: v.snapshot() for k, v in sorted(self._latencies.items()) if k.startswith(prefix)},
+            counters=counters,
+            hit_rates={name: self.hit_rate(name) for name in cache_names},
+        )
+
+    def reset(self) -> None:
+        self._latencies.clear()
+        self._counters.clear()
+
+
+perf_metrics = PerfMetrics()
@@ -1,27 +1,54 @@
+import asyncio
+import json
 import math
+import time
 from datetime import datetime
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional
+
+from tortoise.functions import Count
 
 from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import QUOTA_BOOST_PERSIST_PATH
+from nekro_agent.services.coordination import coordinator
 
 logger = get_sub_logger("quota_service")
 
+# 计数器与数据库对账的间隔（秒），用于纠正多实例写入或计数遗漏带来的偏差
+QUOTA_RECONCILE_INTERVAL_SECONDS = 600.0
+# 其他实例的 Bot 回复计数经协调器广播的主题
+QUOTA_REPLY_TOPIC = "quota.reply"
+
 
 class QuotaService:
     """配额管理服务
 
     负责管理聊天频道的AI回复配额，包括：
-    - 临时提升额度（当天有效，重启失效）
+    - 每日 / 每小时 Bot 回复计数（内存计数器）
+    - 临时提升额度（当天有效，持久化到数据目录）
     - 每小时限额计算
     - 配额进度查询
 
-    数据全部存储在内存中，不依赖数据库。
+    回复计数在首次访问时由一次分组查询批量初始化，此后随 Bot 消息写入递增，
+    并每隔 `QUOTA_RECONCILE_INTERVAL_SECONDS` 与数据库对账一次，
+    避免在回复热路径上对消息表做 COUNT 扫描。
+    多实例部署时每次递增经协调器广播，其他实例同步累加，对账只用于纠正广播丢失。
     """
 
-    def __init__(self):
+    def __init__(self, boost_persist_path: str = QUOTA_BOOST_PERSIST_PATH):
         # 内存存储结构: {chat_key: {"date": "2024-01-15", "boost": 10}}
         # 临时提升仅当天有效，通过date字段判断是否过期
-        self._daily_boosts: Dict[str, Dict] = {}
+        self._boost_persist_path = Path(boost_persist_path)
+        self._daily_boosts: Dict[str, Dict] = self._load_boosts()
+
+        # 回复计数器：{chat_key: count}，按 UTC 天 / 小时分桶，桶切换时清零
+        self._daily_counts: Dict[str, int] = {}
+        self._hourly_counts: Dict[str, int] = {}
+        self._day_bucket: int = -1
+        self._hour_bucket: int = -1
+        self._seeded: bool = False
+        self._last_reconcile: float = 0.0
+        self._reconcile_lock = asyncio.Lock()
 
     # ------------------------------------------------------------------
     # 内部工具方法
@@ -35,6 +62,34 @@ class QuotaService:
         """返回当前小时 (0-23)"""
         return datetime.now().hour
 
+    def _load_boosts(self) -> Dict[str, Dict]:
+        """从数据目录加载当日仍有效的临时提升记录"""
+        if not self._boost_persist_path.exists():
+            return {}
+        try:
+            raw = json.loads(self._boost_persist_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"加载配额临时提升记录失败: {e}")
+            return {}
+        if not isinstance(raw, dict):
+            return {}
+        today = self._today_str()
+        return {
+            chat_key: info
+            for chat_key, info in raw.items()
+            if isinstance(info, dict) and info.get("date") == today and isinstance(info.get("boost"), int)
+        }
+
+    def _save_boosts(self) -> None:
+        """持久化临时提升记录（同时清理已过期的记录）"""
+        today = self._today_str()
+        self._daily_boosts = {k: v for k, v in self._daily_boosts.items() if v.get("date") == today}
+        try:
+            self._boost_persist_path.parent.mkdir(parents=True, exist_ok=True)
+            self._boost_persist_path.write_text(json.dumps(self._daily_boosts, ensure_ascii=False), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"保存配额临时提升记录失败: {e}")
+
     # ------------------------------------------------------------------
     # 临时提升 (boost) 相关方法
     # ------------------------------------------------------------------
@@ -66,6 +121,7 @@ class QuotaService:
             "date": self._today_str(),
             "boost": amount,
         }
+        self._save_boosts()
         logger.debug(f"[{chat_key}] 临时提升已设置为 {amount}")
 
     def add_boost(self, chat_key: str, amount: int) -> int:
@@ -96,8 +152,114 @@ class QuotaService:
         """
         removed = self._daily_boosts.pop(chat_key, None)
         if removed is not None:
+            self._save_boosts()
             logger.debug(f"[{chat_key}] 临时提升已清除（原值 {removed.get('boost', 0)}）")
 
+    # ------------------------------------------------------------------
+    # 回复计数器
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def day_start_timestamp(now: Optional[float] = None) -> int:
+        """当前 UTC 天零点的时间戳"""
+        now = time.time() if now is None else now
+        return int(now - (now % 86400))
+
+    @staticmethod
+    def hour_start_timestamp(now: Optional[float] = None) -> int:
+        """当前小时零分的时间戳"""
+        now = time.time() if now is None else now
+        return int(now - (now % 3600))
+
+    def _roll_buckets(self) -> None:
+        """跨天 / 跨小时时清空对应计数器"""
+        now = time.time()
+        day_bucket = int(now // 86400)
+        hour_bucket = int(now // 3600)
+        if day_bucket != self._day_bucket:
+            self._day_bucket = day_bucket
+            self._daily_counts.clear()
+        if hour_bucket != self._hour_bucket:
+            self._hour_bucket = hour_bucket
+            self._hourly_counts.clear()
+
+    async def _ensure_reconciled(self) -> None:
+        if self._seeded and time.monotonic() - self._last_reconcile < QUOTA_RECONCILE_INTERVAL_SECONDS:
+            return
+        async with self._reconcile_lock:
+            if self._seeded and time.monotonic() - self._last_reconcile < QUOTA_RECONCILE_INTERVAL_SECONDS:
+                return
+            await self.reconcile()
+
+    async def reconcile(self) -> None:
+        """以数据库为准重建所有频道的当日 / 当前小时回复计数
+
+        每个时间窗口各一次按 chat_key 分组的计数查询，覆盖全部频道。
+        """
+        from nekro_agent.models.db_chat_message import DBChatMessage
+
+        now = time.time()
+        daily_rows = (
+            await DBChatMessage.filter(sender_id=-1, send_timestamp__gte=self.day_start_timestamp(now))
+            .exclude(sender_name="SYSTEM")
+            .annotate(cnt=Count("id"))
+            .group_by("chat_key")
+            .values("chat_key", "cnt")
+        )
+        hourly_rows = (
+            await DBChatMessage.filter(sender_id=-1, send_timestamp__gte=self.hour_start_timestamp(now))
+            .exclude(sender_name="SYSTEM")
+            .annotate(cnt=Count("id"))
+            .group_by("chat_key")
+            .values("chat_key", "cnt")
+        )
+        self._day_bucket = int(now // 86400)
+        self._hour_bucket = int(now // 3600)
+        self._daily_counts = {row["chat_key"]: int(row["cnt"]) for row in daily_rows}
+        self._hourly_counts = {row["chat_key"]: int(row["cnt"]) for row in hourly_rows}
+        self._seeded = True
+        self._last_reconcile = time.monotonic()
+        logger.debug(f"配额计数器已与数据库对账: {len(self._daily_counts)} 个频道有今日回复")
+
+    async def record_bot_reply(self, chat_key: str) -> None:
+        """Bot 回复写入后递增计数，并广播给其他实例
+
+        计数器尚未初始化时跳过，初始化查询会把这条已落库的消息计入。
+        """
+        now = time.time()
+        day_bucket, hour_bucket = int(now // 86400), int(now // 3600)
+        self._increment(chat_key, day_bucket, hour_bucket)
+        await coordinator.publish(
+            QUOTA_REPLY_TOPIC,
+            {"chat_key": chat_key, "day_bucket": day_bucket, "hour_bucket": hour_bucket},
+        )
+
+    def _increment(self, chat_key: str, day_bucket: int, hour_bucket: int) -> None:
+        if not self._seeded:
+            return
+        self._roll_buckets()
+        if day_bucket == self._day_bucket:
+            self._daily_counts[chat_key] = self._daily_counts.get(chat_key, 0) + 1
+        if hour_bucket == self._hour_bucket:
+            self._hourly_counts[chat_key] = self._hourly_counts.get(chat_key, 0) + 1
+
+    def _on_remote_reply(self, payload: Dict) -> None:
+        chat_key, day_bucket, hour_bucket = payload.get("chat_key"), payload.get("day_bucket"), payload.get("hour_bucket")
+        if isinstance(chat_key, str) and isinstance(day_bucket, int) and isinstance(hour_bucket, int):
+            self._increment(chat_key, day_bucket, hour_bucket)
+
+    async def get_daily_count(self, chat_key: str) -> int:
+        """获取频道今日（UTC）Bot 回复数"""
+        await self._ensure_reconciled()
+        self._roll_buckets()
+        return self._daily_counts.get(chat_key, 0)
+
+    async def get_hourly_count(self, chat_key: str) -> int:
+        """获取频道本小时 Bot 回复数"""
+        await self._ensure_reconciled()
+        self._roll_buckets()
+        return self._hourly_counts.get(chat_key, 0)
+
     # ------------------------------------------------------------------
     # 配额计算方法
     # ------------------------------------------------------------------
@@ -157,3 +319,4 @@ class QuotaService:
 
 # 全局单例，供其他模块直接 import 使用
 quota_service = QuotaService()
+coordinator.subscribe(QUOTA_REPLY_TOPIC, quota_service._on_remote_reply)
@@ -1,24 +1,86 @@
 import asyncio
 import pickle
-from typing import Any, Tuple
+from typing import Any, List, Tuple
 
+import msgpack
 from pydantic import ValidationError as PydanticValidationError
 
 from nekro_agent.schemas.errors import ValidationError
-from nekro_agent.schemas.rpc import RPCRequest
+from nekro_agent.schemas.rpc import RPCBatchRequest, RPCRequest
 
+# 与沙盒 api_caller 约定的帧格式: MAGIC + 编码标识 + 负载
+# 未带帧头的请求按旧版 api_caller 的裸 pickle 处理
+RPC_FRAME_MAGIC = b"NRPC1"
+RPC_CODEC_MSGPACK = b"m"
+RPC_CODEC_PICKLE = b"p"
+# msgpack 数组默认解码为 list，元组用扩展类型单独标记以便原样还原
+RPC_EXT_TUPLE = 1
 
-def decode_rpc_request(raw_body: bytes) -> RPCRequest:
+
+def is_framed_payload(raw_body: bytes) -> bool:
+    return raw_body.startswith(RPC_FRAME_MAGIC)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    # strict_types 下容器子类（namedtuple、OrderedDict 等）同样进入这里，抛出 TypeError 交给 pickle 保留原类型
+    if type(obj) is tuple:
+        return msgpack.ExtType(RPC_EXT_TUPLE, _msgpack_pack(list(obj)))
+    raise TypeError(f"msgpack 无法编码 {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == RPC_EXT_TUPLE:
+        return tuple(_msgpack_unpack(data))
+    return msgpack.ExtType(code, data)
+
+
+def _msgpack_pack(payload: Any) -> bytes:
+    return msgpack.packb(payload, use_bin_type=True, strict_types=True, default=_msgpack_default)
+
+
+def _msgpack_unpack(body: bytes) -> Any:
+    return msgpack.unpackb(body, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook)
+
+
+def encode_rpc_payload(payload: Any) -> bytes:
+    """编码 RPC 负载，msgpack 无法表示的对象回退到 pickle"""
     try:
-        payload = pickle.loads(raw_body)
-    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+        return RPC_FRAME_MAGIC + RPC_CODEC_MSGPACK + _msgpack_pack(payload)
+    except (TypeError, ValueError, OverflowError):
+        return RPC_FRAME_MAGIC + RPC_CODEC_PICKLE + pickle.dumps(payload)
+
+
+def decode_rpc_payload(raw_body: bytes) -> Any:
+    try:
+        if not is_framed_payload(raw_body):
+            return pickle.loads(raw_body)
+        header_size = len(RPC_FRAME_MAGIC)
+        codec, body = raw_body[header_size : header_size + 1], raw_body[header_size + 1 :]
+        if codec == RPC_CODEC_MSGPACK:
+            return _msgpack_unpack(body)
+        if codec == RPC_CODEC_PICKLE:
+            return pickle.loads(body)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError, msgpack.UnpackException) as e:
         raise ValidationError(reason="RPC 请求格式错误") from e
+    raise ValidationError(reason="RPC 请求编码不受支持")
+
+
+def decode_rpc_request(raw_body: bytes) -> RPCRequest:
+    payload = decode_rpc_payload(raw_body)
     try:
         return RPCRequest.model_validate(payload)
     except PydanticValidationError as e:
         raise ValidationError(reason=str(e)) from e
 
 
+def decode_rpc_batch_request(raw_body: bytes) -> List[RPCRequest]:
+    payload = decode_rpc_payload(raw_body)
+    try:
+        return RPCBatchRequest.model_validate(payload).calls
+    except PydanticValidationError as e:
+        raise ValidationError(reason=str(e)) from e
+
+
 async def execute_rpc_method(method: Any, args: list[Any], kwargs: dict[str, Any]) -> Tuple[Any, str]:
     try:
         if asyncio.iscoroutinefunction(method):
@@ -1,13 +1,21 @@
 """沙盒环境下的扩展方法调用代理"""
 
+import asyncio
+import atexit
 import importlib
+import json
+import os
 import pickle as _pickle
+import re
 import subprocess
 import sys
+import threading
+import time
 import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
 from importlib.metadata import PackageNotFoundError, distributions
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import requests as _requests
@@ -24,45 +32,307 @@ FROM_CHAT_KEY = "{FROM_CHAT_KEY}"
 RPC_SECRET_KEY = "{RPC_SECRET_KEY}"
 
 
+RPC_STATS_PATH = "/app/shared/rpc_stats.json"
+
+# 帧格式: MAGIC + 编码标识 + 负载；msgpack 无法表示的复杂对象回退到 pickle
+_RPC_FRAME_MAGIC = b"NRPC1"
+_RPC_CODEC_MSGPACK = b"m"
+_RPC_CODEC_PICKLE = b"p"
+_RPC_EXT_TUPLE = 1  # 元组使用 msgpack 扩展类型，避免解码后变成 list
+
+try:
+    import msgpack as _msgpack
+except ImportError:  # 旧版沙盒镜像未安装 msgpack 时直接使用 pickle
+    _msgpack = None
+
+_rpc_local = threading.local()
+_rpc_executor: Optional[ThreadPoolExecutor] = None
+_rpc_stats: Dict[str, List[float]] = {}
+_rpc_stats_lock = threading.Lock()
+
+
+def _rpc_session() -> _requests.Session:
+    """每个线程复用一个 keep-alive 会话，避免每次调用重新建立连接"""
+    session = getattr(_rpc_local, "session", None)
+    if session is None:
+        session = _requests.Session()
+        session.headers.update({"Content-Type": "application/octet-stream", "X-RPC-Token": RPC_SECRET_KEY})
+        _rpc_local.session = session
+    return session
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if type(obj) is tuple:
+        return _msgpack.ExtType(_RPC_EXT_TUPLE, _msgpack_pack(list(obj)))
+    raise TypeError(type(obj).__name__)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _RPC_EXT_TUPLE:
+        return tuple(_msgpack_unpack(data))
+    return _msgpack.ExtType(code, data)
+
+
+def _msgpack_pack(payload: Any) -> bytes:
+    return _msgpack.packb(payload, use_bin_type=True, strict_types=True, default=_msgpack_default)
+
+
+def _msgpack_unpack(body: bytes) -> Any:
+    return _msgpack.unpackb(body, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook)
+
+
+def _rpc_encode(payload: Any) -> bytes:
+    if _msgpack is not None:
+        try:
+            return _RPC_FRAME_MAGIC + _RPC_CODEC_MSGPACK + _msgpack_pack(payload)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return _RPC_FRAME_MAGIC + _RPC_CODEC_PICKLE + _pickle.dumps(payload)
+
+
+def _rpc_decode(data: bytes) -> Any:
+    if data.startswith(_RPC_FRAME_MAGIC):
+        codec, body = data[len(_RPC_FRAME_MAGIC) : len(_RPC_FRAME_MAGIC) + 1], data[len(_RPC_FRAME_MAGIC) + 1 :]
+        if codec == _RPC_CODEC_MSGPACK and _msgpack is not None:
+            return _msgpack_unpack(body)
+        return _pickle.loads(body)
+    return _pickle.loads(data)
+
+
+def _rpc_record(method_name: str, cost_ms: float) -> None:
+    with _rpc_stats_lock:
+        stat = _rpc_stats.setdefault(method_name, [0, 0.0, 0.0])
+        stat[0] += 1
+        stat[1] += cost_ms
+        stat[2] = max(stat[2], cost_ms)
+
+
+def _rpc_dump_stats() -> None:
+    """进程退出时写出各方法的 RPC 往返耗时，由宿主机写入执行记录"""
+    with _rpc_stats_lock:
+        if not _rpc_stats:
+            return
+        stats = {
+            name: {"calls": int(stat[0]), "total_ms": round(stat[1], 2), "max_ms": round(stat[2], 2)}
+            for name, stat in _rpc_stats.items()
+        }
+    try:
+        Path(RPC_STATS_PATH).write_text(json.dumps(stats), encoding="utf-8")
+    except OSError:
+        pass
+
+
+atexit.register(_rpc_dump_stats)
+
+
+def _rpc_terminate(code: int) -> None:
+    """终止沙盒进程；在工作线程中 exit() 只会结束当前线程，因此需要直接退出进程"""
+    if threading.current_thread() is threading.main_thread():
+        exit(code)
+    sys.stdout.flush()
+    _rpc_dump_stats()
+    os._exit(code)
+
+
+def _rpc_post(path: str, payload: Any) -> _requests.Response:
+    return _rpc_session().post(
+        f"{CHAT_API}/ext/{path}?container_key={CONTAINER_KEY}&from_chat_key={FROM_CHAT_KEY}",
+        data=_rpc_encode(payload),
+    )
+
+
+def _rpc_handle_result(method_name: str, method_type: str, run_error: Optional[str], ret_data: Any) -> Any:
+    if run_error is not None:
+        print(
+            f"The method `{method_name}` returned an error:\n{run_error}",
+        )
+        _rpc_terminate(1)
+    if method_type == "agent":
+        print(
+            f"The agent method `{method_name}` returned:\n{ret_data}\n[result end]\nPlease continue to generate an appropriate response based on the above information.",
+        )
+        _rpc_terminate(8)
+    if method_type == "multimodal_agent":
+        print(
+            f"The multimodal agent method `{method_name}` returned:\n{ret_data}\n[result end]",
+        )
+        _rpc_terminate(11)
+    return ret_data
+
+
+def _rpc_call(method_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    start = time.perf_counter()
+    response = _rpc_post("rpc_exec", {"method": method_name, "args": list(args), "kwargs": kwargs})
+    _rpc_record(method_name, (time.perf_counter() - start) * 1000)
+    if response.status_code == 200:
+        run_error = None
+        if response.headers.get("Run-Error") and response.headers["Run-Error"].lower() == "true":
+            run_error = response.text
+        ret_data = None if run_error is not None else _rpc_decode(response.content)
+        return _rpc_handle_result(method_name, response.headers.get("Method-Type", ""), run_error, ret_data)
+    raise Exception(f"Plugin RPC method `{method_name}` call failed: {response.status_code}")
+
+
+class RPCBatchResult:
+    """批量调用中单次调用的结果占位，批次提交后可通过 value 获取返回值"""
+
+    def __init__(self, method_name: str) -> None:
+        self.method_name = method_name
+        self.value: Any = None
+        self.done = False
+
+    def __repr__(self) -> str:
+        return repr(self.value) if self.done else f"<pending {self.method_name}>"
+
+
+class rpc_batch:  # noqa: N801
+    """批量调用扩展方法
+
+    上下文内的扩展方法调用不会立即发送，而是在退出时合并为一次请求，由宿主机按顺序执行。
+    适用于连续发送多条消息等不依赖中间返回值的场景：
+
+        with rpc_batch() as batch:
+            for text in texts:
+                send_msg_text(_ck, text)
+        results = batch.results
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+        self.pending: List[RPCBatchResult] = []
+        self.results: List[Any] = []
+
+    def __enter__(self) -> "rpc_batch":
+        _rpc_local.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _rpc_local.batch = None
+        if exc_type is None:
+            self.flush()
+
+    def add(self, method_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> RPCBatchResult:
+        self.calls.append({"method": method_name, "args": list(args), "kwargs": kwargs})
+        pending = RPCBatchResult(method_name)
+        self.pending.append(pending)
+        return pending
+
+    def flush(self) -> List[Any]:
+        if not self.calls:
+            return self.results
+        calls, pending = self.calls, self.pending
+        self.calls, self.pending = [], []
+        start = time.perf_counter()
+        response = _rpc_post("rpc_batch", {"calls": calls})
+        cost_ms = (time.perf_counter() - start) * 1000
+        for call in calls:
+            _rpc_record(call["method"], cost_ms / len(calls))
+        if response.status_code != 200:
+            raise Exception(f"Plugin RPC batch call failed: {response.status_code}")
+        for placeholder, item in zip(pending, _rpc_decode(response.content)):
+            placeholder.value = _rpc_handle_result(
+                placeholder.method_name,
+                item.get("method_type", ""),
+                item.get("error") or None,
+                item.get("result"),
+            )
+            placeholder.done = True
+            self.results.append(placeholder.value)
+        return self.results
+
+
+def _rpc_get_executor() -> ThreadPoolExecutor:
+    global _rpc_executor
+    if _rpc_executor is None:
+        _rpc_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rpc")
+    return _rpc_executor
+
+
 def __extension_method_proxy(method: Callable):
     """扩展方法代理执行器"""
 
+    method_name = method.__name__
+
     def acutely_call_method(*args: Tuple[Any], **kwargs: Dict[str, Any]):
         """Agent 执行沙盒扩展方法时实际调用的方法"""
 
-        body = {"method": method.__name__, "args": args, "kwargs": kwargs}
-        data: bytes = _pickle.dumps(body)
-        response = _requests.post(
-            f"{CHAT_API}/ext/rpc_exec?container_key={CONTAINER_KEY}&from_chat_key={FROM_CHAT_KEY}",
-            data=data,
-            headers={
-                "Content-Type": "application/octet-stream",
-                "X-RPC-Token": RPC_SECRET_KEY,
-            },
-        )
-        if response.status_code == 200:
-            if response.headers.get("Run-Error") and response.headers["Run-Error"].lower() == "true":
-                print(
-                    f"The method `{method.__name__}` returned an error:\n{response.text}",
-                )
-                exit(1)
-            ret_data = _pickle.loads(response.content)
-            if response.headers.get("Method-Type") == "agent":
-                print(
-                    f"The agent method `{method.__name__}` returned:\n{ret_data}\n[result end]\nPlease continue to generate an appropriate response based on the above information.",
-                )
-                exit(8)
-            if response.headers.get("Method-Type") == "multimodal_agent":
-                print(
-                    f"The multimodal agent method `{method.__name__}` returned:\n{ret_data}\n[result end]",
-                )
-                exit(11)
-            return ret_data
-        raise Exception(f"Plugin RPC method `{method.__name__}` call failed: {response.status_code}")
+        batch = getattr(_rpc_local, "batch", None)
+        if batch is not None:
+            return batch.add(method_name, args, kwargs)
+        return _rpc_call(method_name, args, kwargs)
+
+    def submit(*args: Any, **kwargs: Any) -> Future:
+        """在后台线程中调用，返回 concurrent.futures.Future"""
+        return _rpc_get_executor().submit(_rpc_call, method_name, args, kwargs)
+
+    async def acall(*args: Any, **kwargs: Any) -> Any:
+        """异步调用，可配合 asyncio.gather 并发执行多个扩展方法"""
+        return await asyncio.wrap_future(submit(*args, **kwargs))
 
+    acutely_call_method.__name__ = method_name
+    acutely_call_method.submit = submit  # type: ignore[attr-defined]
+    acutely_call_method.acall = acall  # type: ignore[attr-defined]
     return acutely_call_method
 
 
+WHEELHOUSE_DIR = "/app/wheelhouse"
+PACKAGE_MANIFEST_PATH = f"{WHEELHOUSE_DIR}/manifest.json"
+PACKAGE_REQUESTS_PATH = "/app/shared/package_requests.json"
+
+_package_manifest: Optional[Dict[str, Dict[str, Dict[str, str]]]] = None
+
+
+def _normalize_package_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _load_package_manifest() -> Optional[Dict[str, Dict[str, Dict[str, str]]]]:
+    """加载主机生成的包清单（规范化包名 -> 版本 -> 路径），旧版主机未提供时返回 None"""
+    global _package_manifest
+    if _package_manifest is None:
+        try:
+            _package_manifest = json.loads(Path(PACKAGE_MANIFEST_PATH).read_text(encoding="utf-8")).get("packages", {})
+        except (OSError, ValueError):
+            return None
+    return _package_manifest
+
+
+def _match_manifest_version(package_name: str, version_spec: str, kind: str) -> Optional[str]:
+    manifest = _load_package_manifest()
+    versions = (manifest or {}).get(_normalize_package_name(package_name), {})
+    for version, paths in versions.items():
+        if kind in paths and (not version_spec or parse(version) in SpecifierSet(version_spec)):
+            return version
+    return None
+
+
+def _record_remote_install(package_spec: str, mirror: Optional[str]) -> None:
+    """记录从远程源安装的依赖，运行结束后由主机下载到 wheelhouse"""
+    try:
+        path = Path(PACKAGE_REQUESTS_PATH)
+        records = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+        records.append({"spec": package_spec, "mirror": mirror})
+        path.write_text(json.dumps(records), encoding="utf-8")
+    except (OSError, ValueError):
+        pass
+
+
+def _is_installed_by_scan(package_name: str, version_spec: str, repo_dir: Optional[str]) -> bool:
+    """逐个遍历已安装发行包判断是否满足要求（主机未提供包清单时使用）"""
+    try:
+        dists = distributions(path=[repo_dir]) if repo_dir else distributions()
+        for dist in dists:
+            metadata = dist.metadata
+            dist_name = getattr(metadata, "Name", None) or dist.name
+            if dist_name.lower() == package_name.lower() and (
+                not version_spec or parse(dist.version) in SpecifierSet(version_spec)
+            ):
+                return True
+    except PackageNotFoundError:
+        pass
+    return False
+
+
 def dynamic_importer(
     package_spec: str,
     import_name: Optional[str] = None,
@@ -73,6 +343,9 @@ def dynamic_importer(
 ) -> Any:
     """动态安装并导入Python包
 
+    优先查询主机提供的包清单：已安装的版本直接导入，本地 wheelhouse 中存在的版本离线安装，
+    两者都不满足时才访问远程镜像源。
+
     Args:
         package_spec: 包名称和版本规范 (如 "requests" 或 "numpy==1.21.0")
         import_name: 导入名称（如果与包名不同）
@@ -111,25 +384,11 @@ def dynamic_importer(
                 sys.path.insert(0, path)
 
     # 检查是否已安装符合条件的版本
-    need_install = True
-    try:
-        # 处理distributions函数的path参数
-        if repo_dir:
-            path_list = [repo_dir]
-            dists = distributions(path=path_list)
-        else:
-            dists = distributions()
-
-        for dist in dists:
-            metadata = dist.metadata
-            dist_name = getattr(metadata, "Name", None) or dist.name
-            if dist_name.lower() == package_name.lower() and (
-                not version_spec or parse(dist.version) in SpecifierSet(version_spec)
-            ):
-                need_install = False
-                break
-    except PackageNotFoundError:
-        pass
+    manifest = _load_package_manifest() if repo_dir == "/app/packages" else None
+    if manifest is not None:
+        need_install = _match_manifest_version(package_name, version_spec, "installed") is None
+    else:
+        need_install = not _is_installed_by_scan(package_name, version_spec, repo_dir)
 
     # 构建安装命令
     if need_install:
@@ -148,26 +407,51 @@ def dynamic_importer(
         if repo_dir:
             install_cmd += ["--target", repo_dir]
 
+        installed = False
+        # 本地 wheelhouse 中有满足要求的版本时离线安装
+        if manifest is not None and _match_manifest_version(package_name, version_spec, "wheel"):
+            try:
+                subprocess.run(
+                    [*install_cmd, "--no-index", "--find-links", WHEELHOUSE_DIR, package_spec],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=timeout,
+                )
+                installed = True
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                pass  # 传递依赖不完整时回退到远程源
+
         # 添加镜像源配置
-        if mirror:
+        if not installed and mirror:
             install_cmd += ["--index-url", mirror]
             if trusted_host:
                 host = urllib.parse.urlparse(mirror).hostname
                 if host:
                     install_cmd += ["--trusted-host", host]
 
-        install_cmd.append(package_spec)
-
         # 执行安装
-        try:
-            subprocess.run(install_cmd, capture_output=True, text=True, check=True, timeout=timeout)
-        except subprocess.CalledProcessError as e:
-            error_msg = _parse_pip_error(e.stderr or e.stdout)
-            print(f"安装 {package_spec} 失败: {error_msg}")
-            exit(1)
-        except subprocess.TimeoutExpired:
-            print(f"安装 {package_spec} 超时（{timeout}秒），请检查网络连接")
-            exit(1)
+        if not installed:
+            try:
+                subprocess.run([*install_cmd, package_spec], capture_output=True, text=True, check=True, timeout=timeout)
+            except subprocess.CalledProcessError as e:
+                error_msg = _parse_pip_error(e.stderr or e.stdout)
+                print(f"安装 {package_spec} 失败: {error_msg}")
+                exit(1)
+            except subprocess.TimeoutExpired:
+                print(f"安装 {package_spec} 超时（{timeout}秒），请检查网络连接")
+                exit(1)
+            _record_remote_install(package_spec, mirror)
+
+        # 安装后的版本在本次运行内也应直接命中清单
+        if manifest is not None and repo_dir:
+            for dist in distributions(path=[repo_dir]):
+                dist_name = getattr(dist.metadata, "Name", None) or dist.name
+                if _normalize_package_name(dist_name) == _normalize_package_name(package_name):
+                    manifest.setdefault(_normalize_package_name(package_name), {}).setdefault(dist.version, {})[
+                        "installed"
+                    ] = repo_dir
+                    break
 
     # 确定导入模块名称
     module_name = import_name if import_name is not None else package_name
@@ -175,7 +459,8 @@ def dynamic_importer(
     # 动态导入模块
     try:
         module = importlib.import_module(module_name)
-        module = importlib.reload(module)  # 确保加载最新版本
+        if need_install:
+            module = importlib.reload(module)  # 确保加载最新版本
     except ImportError:
         # 尝试刷新导入路径
         if repo_dir:
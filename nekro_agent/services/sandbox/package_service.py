@@ -0,0 +1,241 @@
+"""沙盒依赖包服务
+
+主机侧维护沙盒动态依赖的包清单与本地 wheelhouse：
+- 包清单：汇总持久化包目录中已安装的发行包与 wheelhouse 中可用的 wheel，
+  以 `规范化包名 -> 版本 -> 容器内路径` 的形式写入 wheelhouse（只读挂载到沙盒），
+  沙盒内 dynamic_importer 直接查表判断是否需要安装，无需逐个遍历已安装发行包
+- wheelhouse：沙盒从远程源安装过的依赖由主机在后台下载 wheel，后续安装使用 `--find-links` 离线完成；
+  完全离线部署时也可以直接向该目录放入 wheel 文件
+
+安装记录由沙盒写入，不可信：只接受可解析的 PEP 508 包名依赖（不含 URL、路径与 pip 选项），
+下载时使用主机配置的镜像源而非记录中的镜像源。
+"""
+
+import asyncio
+import json
+import platform
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from packaging.requirements import InvalidRequirement, Requirement
+
+from nekro_agent.core.config import config
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import SANDBOX_PACKAGE_DIR, SANDBOX_WHEELHOUSE_DIR
+
+logger = get_sub_logger("sandbox_runtime")
+
+CONTAINER_PACKAGE_DIR = "/app/packages"  # 容器包缓存目录 (与 runner 保持一致)
+CONTAINER_WHEELHOUSE_DIR = "/app/wheelhouse"  # 容器离线 wheel 仓库 (只读)
+MANIFEST_FILENAME = "manifest.json"
+PACKAGE_REQUESTS_FILENAME = "package_requests.json"  # 沙盒写入共享目录的远程安装记录
+
+SANDBOX_PYTHON_VERSION = "3.11"  # 与沙盒镜像的 Python 版本保持一致
+PREFETCH_TIMEOUT = 600
+
+
+def normalize_package_name(name: str) -> str:
+    """按 PEP 503 规范化包名"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def sanitize_package_spec(spec: str) -> Optional[str]:
+    """校验沙盒记录的依赖说明，返回规范化后的说明，不合法时返回 None"""
+    spec = spec.strip()
+    if not spec or spec.startswith("-") or any(marker in spec for marker in ("://", "/", "\\", "\n", "\r")):
+        return None
+    try:
+        requirement = Requirement(spec)
+    except InvalidRequirement:
+        return None
+    if requirement.url:
+        return None
+    return str(requirement)
+
+
+def _parse_dist_info_name(dirname: str) -> Optional[Tuple[str, str]]:
+    stem = dirname[: -len(".dist-info")]
+    if "-" not in stem:
+        return None
+    name, version = stem.rsplit("-", 1)
+    return normalize_package_name(name), version
+
+
+def _parse_wheel_name(filename: str) -> Optional[Tuple[str, str]]:
+    parts = filename[: -len(".whl")].split("-")
+    if len(parts) < 5:
+        return None
+    return normalize_package_name(parts[0]), parts[1]
+
+
+class SandboxPackageService:
+    """沙盒依赖包清单与 wheelhouse 管理"""
+
+    def __init__(self, package_dir: Path, wheelhouse_dir: Path) -> None:
+        self.package_dir = package_dir
+        self.wheelhouse_dir = wheelhouse_dir
+        self._manifest_signature: Optional[Tuple[float, float]] = None
+        self._prefetch_queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._prefetch_pending: Set[str] = set()
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._pip_available: Optional[bool] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.wheelhouse_dir / MANIFEST_FILENAME
+
+    def _signature(self) -> Tuple[float, float]:
+        # 发行包与 wheel 都位于目录第一层，增删时目录 mtime 会变化
+        return (
+            self.package_dir.stat().st_mtime if self.package_dir.exists() else 0.0,
+            self.wheelhouse_dir.stat().st_mtime if self.wheelhouse_dir.exists() else 0.0,
+        )
+
+    def build_manifest(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """扫描已安装发行包与本地 wheel，生成包清单"""
+        packages: Dict[str, Dict[str, Dict[str, str]]] = {}
+        if self.package_dir.exists():
+            for entry in self.package_dir.iterdir():
+                if not entry.name.endswith(".dist-info") or not entry.is_dir():
+                    continue
+                parsed = _parse_dist_info_name(entry.name)
+                if parsed:
+                    name, version = parsed
+                    packages.setdefault(name, {}).setdefault(version, {})["installed"] = (
+                        f"{CONTAINER_PACKAGE_DIR}/{entry.name}"
+                    )
+        if self.wheelhouse_dir.exists():
+            for entry in self.wheelhouse_dir.iterdir():
+                if not entry.name.endswith(".whl"):
+                    continue
+                parsed = _parse_wheel_name(entry.name)
+                if parsed:
+                    name, version = parsed
+                    packages.setdefault(name, {}).setdefault(version, {})["wheel"] = f"{CONTAINER_WHEELHOUSE_DIR}/{entry.name}"
+        return packages
+
+    def ensure_manifest(self) -> Path:
+        """确保包清单与磁盘一致，目录未变化时直接复用"""
+        self.wheelhouse_dir.mkdir(parents=True, exist_ok=True)
+        signature = self._signature()
+        if signature == self._manifest_signature and self.manifest_path.exists():
+            return self.manifest_path
+
+        payload = {"version": 1, "generated_at": int(time.time()), "packages": self.build_manifest()}
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.manifest_path)
+        # 写入清单本身会改变 wheelhouse 目录的 mtime，需在写入后重新记录
+        self._manifest_signature = self._signature()
+        return self.manifest_path
+
+    def collect_requests(self, host_shared_dir: Path) -> List[str]:
+        """读取沙盒本次运行中从远程源安装的依赖，校验后加入预下载队列
+
+        记录中的镜像源会被忽略，预下载始终使用主机配置的镜像源。
+        """
+        requests_path = host_shared_dir / PACKAGE_REQUESTS_FILENAME
+        if not requests_path.exists():
+            return []
+        requests: List[str] = []
+        try:
+            raw = json.loads(requests_path.read_text(encoding="utf-8"))
+            for item in raw if isinstance(raw, list) else []:
+                if not isinstance(item, dict) or not isinstance(item.get("spec"), str):
+                    continue
+                spec = sanitize_package_spec(item["spec"])
+                if spec is None:
+                    logger.warning(f"忽略不合法的沙盒依赖安装记录: {item['spec'][:200]!r}")
+                    continue
+                requests.append(spec)
+        except Exception as e:
+            logger.debug(f"读取沙盒依赖安装记录失败: {e}")
+        finally:
+            requests_path.unlink(missing_ok=True)
+        if requests and config.SANDBOX_PACKAGE_PREFETCH:
+            self.enqueue_prefetch(requests)
+        return requests
+
+    def enqueue_prefetch(self, specs: Iterable[str]) -> None:
+        for spec in specs:
+            if spec in self._prefetch_pending:
+                continue
+            self._prefetch_pending.add(spec)
+            self._prefetch_queue.put_nowait(spec)
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self._prefetch_worker())
+
+    async def _prefetch_worker(self) -> None:
+        while not self._prefetch_queue.empty():
+            spec = await self._prefetch_queue.get()
+            try:
+                await self.prefetch(spec)
+            finally:
+                self._prefetch_pending.discard(spec)
+
+    def _download_cmd(self, spec: str) -> List[str]:
+        machine = platform.machine().lower()
+        arch = {"amd64": "x86_64", "arm64": "aarch64"}.get(machine, machine)
+        cmd = [
+            sys.executable,
+            "-m",
+            "pip",
+            "download",
+            "--disable-pip-version-check",
+            "--quiet",
+            "--no-input",
+            "--dest",
+            str(self.wheelhouse_dir),
+            "--only-binary=:all:",
+            "--implementation",
+            "cp",
+            "--python-version",
+            SANDBOX_PYTHON_VERSION,
+        ]
+        for plat in (f"manylinux2014_{arch}", f"manylinux_2_17_{arch}", f"manylinux_2_28_{arch}", "any"):
+            cmd += ["--platform", plat]
+        if config.DYNAMIC_PLUGIN_INSTALL_MIRROR:
+            cmd += ["--index-url", config.DYNAMIC_PLUGIN_INSTALL_MIRROR]
+        # `--` 之后的参数不会被 pip 解析为选项
+        cmd += ["--", spec]
+        return cmd
+
+    async def prefetch(self, spec: str) -> bool:
+        """在主机上下载依赖及其传递依赖的 wheel 到 wheelhouse"""
+        if self._pip_available is False:
+            return False
+        self.wheelhouse_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._download_cmd(spec),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=PREFETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"预下载沙盒依赖超时: {spec}")
+            return False
+        except OSError as e:
+            logger.warning(f"预下载沙盒依赖失败: {e}")
+            return False
+        if process.returncode != 0:
+            message = stderr.decode(errors="replace")
+            if "No module named pip" in message:
+                self._pip_available = False
+                logger.warning("主机环境未安装 pip，已停用沙盒依赖预下载，可手动向 wheelhouse 放入 wheel 文件")
+            else:
+                logger.warning(f"预下载沙盒依赖失败: {spec} | {message[-500:]}")
+            return False
+        self._pip_available = True
+        logger.info(f"沙盒依赖已加入本地 wheelhouse: {spec}")
+        self.ensure_manifest()
+        return True
+
+
+sandbox_package_service = SandboxPackageService(
+    package_dir=Path(SANDBOX_PACKAGE_DIR).resolve(),
+    wheelhouse_dir=Path(SANDBOX_WHEELHOUSE_DIR).resolve(),
+)
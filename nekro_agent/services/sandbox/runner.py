@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import json
 import os
 import re
 import shutil
@@ -22,12 +23,14 @@ from nekro_agent.core.os_env import (
 from nekro_agent.models.db_exec_code import DBExecCode, ExecStopType
 from nekro_agent.schemas.agent_ctx import AgentCtx
 from nekro_agent.schemas.chat_message import ChatMessage
-from nekro_agent.schemas.sandbox import SandboxCodeExtData
+from nekro_agent.schemas.sandbox import RPCMethodLatency, SandboxCodeExtData
 from nekro_agent.services.agent.openai import OpenAIResponse
+from nekro_agent.services.agent.reply_timing import get_first_reply_ms
 from nekro_agent.services.agent.resolver import ParsedCodeRunData
 from nekro_agent.tools.common_util import limited_text_output
 
 from .ext_caller import CODE_PREAMBLE, get_api_caller_code
+from .package_service import CONTAINER_WHEELHOUSE_DIR, sandbox_package_service
 
 # 主机共享目录
 
@@ -57,6 +60,8 @@ RUN_CODE_FILENAME = "run_script.py"  # 要执行的代码文件名
 API_CALLER_FILENAME = "api_caller.py.code"  # 外部 API 调用器文件名
 RUN_API_CALLER_FILENAME = "api_caller.py"  # 外部 API 调用器文件名
 
+RPC_STATS_FILENAME = "rpc_stats.json"  # 沙盒退出时写出的 RPC 耗时统计 (与 ext_caller_code.RPC_STATS_PATH 对应)
+
 # 代码运行结束标记
 CODE_RUN_END_FLAGS = {
     ExecStopType.NORMAL: "[SANDBOX_RUN_ENDS_WITH_NORMAL]",  # 正常结束 (exit code 0)
@@ -105,6 +110,81 @@ def _sanitize_docker_name_part(value: str) -> str:
     return sanitized or "unknown"
 
 
+class SandboxReservation:
+    """提前预留的沙盒执行槽位
+
+    流式提前执行时，在代码块开始输出后即占用并发槽位、写入共享目录并创建（不启动）容器，
+    代码块闭合后只需写入代码并启动容器。
+    """
+
+    def __init__(
+        self,
+        from_chat_key: str,
+        container_key: str,
+        host_shared_dir: Path,
+        docker: aiodocker.Docker,
+        container: Optional[DockerContainer],
+        container_name: str,
+    ) -> None:
+        self.from_chat_key = from_chat_key
+        self.container_key = container_key
+        self.host_shared_dir = host_shared_dir
+        self.docker = docker
+        self.container = container
+        self.container_name = container_name
+        self._released = False
+
+    async def release(self, discard_container: bool = True) -> None:
+        """释放并发槽位，未被使用的预建容器会一并删除"""
+        if self._released:
+            return
+        self._released = True
+        try:
+            if discard_container and self.container is not None:
+                with contextlib.suppress(Exception):
+                    await self.container.delete(force=True)
+                if chat_key_sandbox_container_map.get(self.from_chat_key) is self.container:
+                    del chat_key_sandbox_container_map[self.from_chat_key]
+            await self.docker.close()
+        finally:
+            semaphore.release()
+
+
+async def reserve_sandbox(from_chat_key: str, ctx: Optional[AgentCtx] = None) -> SandboxReservation:
+    """预留沙盒：占用并发槽位、准备共享目录并提前创建容器"""
+    await semaphore.acquire()
+    docker: Optional[aiodocker.Docker] = None
+    try:
+        container_key, host_shared_dir = await _prepare_sandbox(from_chat_key, ctx)
+        docker = aiodocker.Docker()
+        container: Optional[DockerContainer] = None
+        container_name = _gen_container_name(container_key)
+        try:
+            container = await docker.containers.create(
+                config=_build_container_config(from_chat_key, host_shared_dir),
+                name=container_name,
+            )
+            chat_key_sandbox_container_map[from_chat_key] = container
+            logger.debug(f"预创建容器: {container_name} | ID: {container.id}")
+        except Exception as e:
+            # 预创建失败不影响执行，届时按常规流程创建并启动容器
+            logger.warning(f"预创建沙盒容器失败，将在执行时重新创建: {e}")
+        return SandboxReservation(
+            from_chat_key=from_chat_key,
+            container_key=container_key,
+            host_shared_dir=host_shared_dir,
+            docker=docker,
+            container=container,
+            container_name=container_name,
+        )
+    except BaseException:
+        if docker is not None:
+            with contextlib.suppress(Exception):
+                await docker.close()
+        semaphore.release()
+        raise
+
+
 async def limited_run_code(
     code_run_data: ParsedCodeRunData,
     from_chat_key: str,
@@ -113,6 +193,7 @@ async def limited_run_code(
     chat_message: Optional[ChatMessage] = None,
     ctx: Optional[AgentCtx] = None,
     llm_retry_errors: Optional[list[str]] = None,
+    reservation: Optional[SandboxReservation] = None,
 ) -> Tuple[str, str, int]:
     """限制并发运行代码
 
@@ -124,11 +205,27 @@ async def limited_run_code(
         chat_message: 聊天消息
         ctx: Agent 上下文
         llm_retry_errors: LLM 重试过程中产生的错误信息列表
+        reservation: 流式提前执行时预留的沙盒，已持有并发槽位
 
     Returns:
         Tuple[str, str, int]: 最终输出结果、原始输出结果和退出类型
     """
 
+    if reservation is not None:
+        try:
+            return await run_code_in_sandbox(
+                code_run_data=code_run_data,
+                from_chat_key=from_chat_key,
+                output_limit=output_limit,
+                llm_response=llm_response,
+                chat_message=chat_message,
+                ctx=ctx,
+                llm_retry_errors=llm_retry_errors,
+                reservation=reservation,
+            )
+        finally:
+            await reservation.release(discard_container=False)
+
     async with semaphore:
         return await run_code_in_sandbox(
             code_run_data=code_run_data,
@@ -141,25 +238,48 @@ async def limited_run_code(
         )
 
 
-async def run_code_in_sandbox(
-    code_run_data: ParsedCodeRunData,
-    from_chat_key: str,
-    output_limit: int,
-    llm_response: Optional[OpenAIResponse] = None,
-    chat_message: Optional[ChatMessage] = None,
-    ctx: Optional[AgentCtx] = None,
-    llm_retry_errors: Optional[list[str]] = None,
-) -> Tuple[str, str, int]:
-    """在沙盒容器中运行代码并获取输出"""
-
-    # 记录开始时间
-    start_time = time.time()
-
-    generation_time_ms = llm_response.generation_time_ms if llm_response else 0
+def _gen_container_name(container_key: str) -> str:
+    return f"nekro-agent-sandbox-{container_key}-{os.urandom(4).hex()}"
+
+
+def _build_container_config(from_chat_key: str, host_shared_dir: Path) -> dict:
+    return {
+        "Image": IMAGE_NAME,
+        "Cmd": ["bash", "-c", EXEC_SCRIPT],
+        "HostConfig": {
+            "Binds": [
+                f"{HOST_PIP_CACHE_DIR}:{CONTAINER_PIP_CACHE_DIR}:rw",
+                f"{HOST_PACKAGE_DIR}:{CONTAINER_PACKAGE_DIR}:rw",
+                f"{sandbox_package_service.wheelhouse_dir}:{CONTAINER_WHEELHOUSE_DIR}:ro",
+                f"{host_shared_dir}:{CONTAINER_SHARE_DIR}:rw",
+                f"{USER_UPLOAD_DIR}/{_sanitize_docker_name_part(from_chat_key)}:{CONTAINER_UPLOAD_DIR}:ro",
+            ],
+            "Memory": 512 * 1024 * 1024,  # 内存限制 (512MB)
+            "NanoCPUs": 1000000000,  # CPU 限制 (1 core)
+            "SecurityOpt": (
+                []
+                if OsEnv.RUN_IN_DOCKER
+                else [
+                    # "no-new-privileges",  # 禁止提升权限
+                    "apparmor=unconfined",  # 禁止 AppArmor 配置
+                ]
+            ),
+            "NetworkMode": "bridge",
+            "ExtraHosts": ["host.docker.internal:host-gateway"],
+        },
+        "User": "nobody",  # 非特权用户
+        "AutoRemove": True,
+    }
+
+
+async def _prepare_sandbox(from_chat_key: str, ctx: Optional[AgentCtx]) -> Tuple[str, Path]:
+    """准备共享目录与预置依赖代码，并清理该频道的过期沙盒
 
+    Returns:
+        Tuple[str, Path]: 容器键与主机共享目录
+    """
     # container_key = f'{time.strftime("%Y%m%d%H%M%S")}_{os.urandom(4).hex()}'
     container_key = f"sandbox_{_sanitize_docker_name_part(from_chat_key)}"
-    container_name = f"nekro-agent-sandbox-{container_key}-{os.urandom(4).hex()}"
 
     host_shared_dir = Path(HOST_SHARED_DIR / container_key)
     host_shared_dir.mkdir(parents=True, exist_ok=True)
@@ -167,6 +287,12 @@ async def run_code_in_sandbox(
     HOST_PACKAGE_DIR.mkdir(parents=True, exist_ok=True)
     HOST_PIP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+    # 刷新依赖包清单，沙盒内 dynamic_importer 据此判断是否需要安装
+    try:
+        sandbox_package_service.ensure_manifest()
+    except OSError as e:
+        logger.warning(f"刷新沙盒依赖包清单失败: {e}")
+
     # 写入预置依赖代码
     api_caller_file_path = Path(host_shared_dir) / API_CALLER_FILENAME
     api_caller_file_path.write_text(
@@ -174,10 +300,6 @@ async def run_code_in_sandbox(
         encoding="utf-8",
     )
 
-    # 写入要执行的代码
-    code_file_path = Path(host_shared_dir) / CODE_FILENAME
-    code_file_path.write_text(f"{CODE_PREAMBLE.strip()}\n\n{code_run_data.code_content}", encoding="utf-8")
-
     # 设置目录权限
     try:
         Path.chmod(host_shared_dir, 0o777)
@@ -202,48 +324,62 @@ async def run_code_in_sandbox(
     if from_chat_key in chat_key_sandbox_container_map:
         try:
             await chat_key_sandbox_container_map[from_chat_key].delete()
-            logger.debug(f"清理过期沙盒: {from_chat_key} | {container_name}")
+            logger.debug(f"清理过期沙盒: {from_chat_key}")
         except Exception as e:
             if "404" in str(e):
-                logger.debug(f"沙盒容器已不存在: {from_chat_key} | {container_name}")
+                logger.debug(f"沙盒容器已不存在: {from_chat_key}")
             else:
                 logger.warning(f"清理过期沙盒失败: {e}")
         del chat_key_sandbox_container_map[from_chat_key]
 
+    return container_key, host_shared_dir
+
+
+async def run_code_in_sandbox(
+    code_run_data: ParsedCodeRunData,
+    from_chat_key: str,
+    output_limit: int,
+    llm_response: Optional[OpenAIResponse] = None,
+    chat_message: Optional[ChatMessage] = None,
+    ctx: Optional[AgentCtx] = None,
+    llm_retry_errors: Optional[list[str]] = None,
+    reservation: Optional[SandboxReservation] = None,
+) -> Tuple[str, str, int]:
+    """在沙盒容器中运行代码并获取输出"""
+
+    # 记录开始时间
+    start_time = time.time()
+
+    generation_time_ms = llm_response.generation_time_ms if llm_response else 0
+
+    if reservation is not None:
+        container_key, host_shared_dir = reservation.container_key, reservation.host_shared_dir
+    else:
+        container_key, host_shared_dir = await _prepare_sandbox(from_chat_key, ctx)
+    container_name = _gen_container_name(container_key)
+
+    # 清理上一次执行遗留的 RPC 统计
+    rpc_stats_path = Path(host_shared_dir) / RPC_STATS_FILENAME
+    rpc_stats_path.unlink(missing_ok=True)
+
+    # 写入要执行的代码
+    code_file_path = Path(host_shared_dir) / CODE_FILENAME
+    code_file_path.write_text(f"{CODE_PREAMBLE.strip()}\n\n{code_run_data.code_content}", encoding="utf-8")
+
     # 启动容器
     # 使用 try/finally 确保 Docker 客户端（及其底层 aiohttp UnixConnector）在使用后被正确关闭，
     # 防止连接泄漏导致连接池耗尽后 docker.containers.run() 永久挂起
-    docker = aiodocker.Docker()
+    docker = reservation.docker if reservation is not None else aiodocker.Docker()
     try:
-        container: DockerContainer = await docker.containers.run(
-            name=container_name,
-            config={
-                "Image": IMAGE_NAME,
-                "Cmd": ["bash", "-c", EXEC_SCRIPT],
-                "HostConfig": {
-                    "Binds": [
-                        f"{HOST_PIP_CACHE_DIR}:{CONTAINER_PIP_CACHE_DIR}:rw",
-                        f"{HOST_PACKAGE_DIR}:{CONTAINER_PACKAGE_DIR}:rw",
-                        f"{host_shared_dir}:{CONTAINER_SHARE_DIR}:rw",
-                        f"{USER_UPLOAD_DIR}/{_sanitize_docker_name_part(from_chat_key)}:{CONTAINER_UPLOAD_DIR}:ro",
-                    ],
-                    "Memory": 512 * 1024 * 1024,  # 内存限制 (512MB)
-                    "NanoCPUs": 1000000000,  # CPU 限制 (1 core)
-                    "SecurityOpt": (
-                        []
-                        if OsEnv.RUN_IN_DOCKER
-                        else [
-                            # "no-new-privileges",  # 禁止提升权限
-                            "apparmor=unconfined",  # 禁止 AppArmor 配置
-                        ]
-                    ),
-                    "NetworkMode": "bridge",
-                    "ExtraHosts": ["host.docker.internal:host-gateway"],
-                },
-                "User": "nobody",  # 非特权用户
-                "AutoRemove": True,
-            },
-        )
+        if reservation is not None and reservation.container is not None:
+            container = reservation.container
+            container_name = reservation.container_name
+            await container.start()
+        else:
+            container = await docker.containers.run(
+                name=container_name,
+                config=_build_container_config(from_chat_key, host_shared_dir),
+            )
         chat_key_sandbox_container_map[from_chat_key] = container
         logger.debug(f"启动容器: {container_name} | ID: {container.id}")
 
@@ -253,7 +389,9 @@ async def run_code_in_sandbox(
             config.SANDBOX_RUNNING_TIMEOUT,
         )
     finally:
-        await docker.close()
+        # 预留沙盒的 Docker 客户端由 reservation.release() 统一关闭
+        if reservation is None:
+            await docker.close()
 
     # 记录执行耗时
     exec_time = int((time.time() - start_time) * 1000)  # 转换为毫秒
@@ -262,6 +400,9 @@ async def run_code_in_sandbox(
 
     logger.debug(f"容器 {container_name} 输出: {limited_text_output(output_text)} | 退出类型: {stop_type}")
 
+    rpc_latency = _load_rpc_latency(rpc_stats_path)
+    sandbox_package_service.collect_requests(host_shared_dir)
+
     # 沙盒共享目录超过 30 分钟未活动，则自动清理
     async def cleanup_container_shared_dir(box_last_active_time):
         nonlocal from_chat_key, container
@@ -306,14 +447,33 @@ async def run_code_in_sandbox(
         exec_time_ms=exec_time,
         generation_time_ms=generation_time_ms,
         total_time_ms=total_time,
+        first_reply_time_ms=get_first_reply_ms(from_chat_key),
         trigger_user_id=str(chat_message.sender_id or "0") if chat_message else "",
         trigger_user_name=chat_message.sender_name if chat_message else "System",
-        extra_data=SandboxCodeExtData.create_from_llm_response(llm_response, llm_retry_errors=llm_retry_errors).model_dump_json() if llm_response else "",
+        extra_data=SandboxCodeExtData.create_from_llm_response(
+            llm_response,
+            llm_retry_errors=llm_retry_errors,
+            rpc_latency=rpc_latency,
+        ).model_dump_json() if llm_response else "",
     )
 
     return final_output, output_text, stop_type.value
 
 
+def _load_rpc_latency(rpc_stats_path: Path) -> Dict[str, RPCMethodLatency]:
+    """读取沙盒写出的各方法 RPC 往返耗时，超时被强制终止时可能不存在"""
+    if not rpc_stats_path.exists():
+        return {}
+    try:
+        raw = json.loads(rpc_stats_path.read_text(encoding="utf-8"))
+        return {str(name): RPCMethodLatency.model_validate(stat) for name, stat in raw.items()}
+    except Exception as e:
+        logger.debug(f"读取 RPC 耗时统计失败: {e}")
+        return {}
+    finally:
+        rpc_stats_path.unlink(missing_ok=True)
+
+
 async def run_container_with_timeout(container: DockerContainer, timeout: int) -> Tuple[str, ExecStopType]:
     """运行容器并返回输出结果和退出类型"""
     try:
@@ -19,6 +19,7 @@ from nekro_agent.core.os_env import (
     SANDBOX_PACKAGE_DIR,
     SANDBOX_PIP_CACHE_DIR,
     SANDBOX_SHARED_HOST_DIR,
+    USER_UPLOAD_BLOB_DIR,
     USER_UPLOAD_DIR,
     OsEnv,
 )
@@ -29,6 +30,7 @@ from nekro_agent.schemas.space_cleanup import (
     CleanupStatus,
     ResourceType,
 )
+from nekro_agent.tools.upload_blob_store import upload_blob_store
 
 # 清理任务缓存目录
 
@@ -182,11 +184,13 @@ class CleanupService:
                 ResourceType.SANDBOX_PIP_CACHE,
                 ResourceType.SANDBOX_PACKAGES,
                 ResourceType.PLUGIN_DYNAMIC_PACKAGES,
+                ResourceType.UPLOAD_BLOBS,
             }
 
             # 资源类型到目录的映射（用于清理空目录）
             resource_dirs = {
                 ResourceType.USER_UPLOADS: Path(USER_UPLOAD_DIR),
+                ResourceType.UPLOAD_BLOBS: Path(USER_UPLOAD_BLOB_DIR),
                 ResourceType.SANDBOX_SHARED: Path(SANDBOX_SHARED_HOST_DIR),
                 ResourceType.SANDBOX_PIP_CACHE: Path(SANDBOX_PIP_CACHE_DIR),
                 ResourceType.SANDBOX_PACKAGES: Path(SANDBOX_PACKAGE_DIR),
@@ -204,7 +208,7 @@ class CleanupService:
 
                 if not request.dry_run:
                     try:
-                        file_size = file_path.stat().st_size if file_path.exists() else 0
+                        file_size = self._reclaimable_size(file_path)
                         success = self._safe_remove_file(file_path)
                         if success:
                             deleted_files += 1
@@ -233,6 +237,13 @@ class CleanupService:
                 if idx % 10 == 0:
                     await self._save_task_progress(task_id, progress)
 
+            # 聊天上传资源删除后，回收引用归零的去重内容
+            if not request.dry_run and ResourceType.USER_UPLOADS in request.resource_types:
+                reclaimed_files, reclaimed_space = upload_blob_store.reclaim_unreferenced()
+                deleted_files += reclaimed_files
+                freed_space += reclaimed_space
+                progress.freed_space = freed_space
+
             # 对于不支持时间过滤的资源类型，删除文件后清理空目录
             if not request.dry_run:
                 for resource_type in request.resource_types:
@@ -320,6 +331,7 @@ class CleanupService:
         # 资源类型到目录的映射
         resource_dirs = {
             ResourceType.USER_UPLOADS: Path(USER_UPLOAD_DIR),
+            ResourceType.UPLOAD_BLOBS: Path(USER_UPLOAD_BLOB_DIR),
             ResourceType.SANDBOX_SHARED: Path(SANDBOX_SHARED_HOST_DIR),
             ResourceType.SANDBOX_PIP_CACHE: Path(SANDBOX_PIP_CACHE_DIR),
             ResourceType.SANDBOX_PACKAGES: Path(SANDBOX_PACKAGE_DIR),
@@ -356,7 +368,9 @@ class CleanupService:
                 continue
 
             # 按chat_key组织的资源
-            if resource_type in chat_based_types:
+            if resource_type == ResourceType.UPLOAD_BLOBS:
+                files = [blob for blob, _ in upload_blob_store.iter_unreferenced()]
+            elif resource_type in chat_based_types:
                 files = await self._collect_chat_based_files(directory, request)
             else:
                 files = await self._collect_simple_files(directory, request)
@@ -384,8 +398,8 @@ class CleanupService:
 
                 chat_key = chat_dir.name
 
-                # 如果是沙盒共享目录，跳过 .pip_cache 和 .packages
-                if directory.name == "sandboxes" and chat_key in {".pip_cache", ".packages"}:
+                # 如果是沙盒共享目录，跳过 .pip_cache、.packages 和 .wheelhouse
+                if directory.name == "sandboxes" and chat_key in {".pip_cache", ".packages", ".wheelhouse"}:
                     continue
 
                 # 检查chat_key过滤
@@ -444,6 +458,15 @@ class CleanupService:
 
         return files
 
+    @staticmethod
+    def _reclaimable_size(file_path: Path) -> int:
+        """删除文件可释放的空间，仍被其他硬链接引用时删除不释放空间"""
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            return 0
+        return st.st_size if st.st_nlink <= 1 else 0
+
     def _safe_remove_file(self, file_path: Path) -> bool:
         """安全删除文件
 
@@ -517,6 +540,7 @@ class CleanupService:
         """
         resource_dirs = {
             ResourceType.USER_UPLOADS: Path(USER_UPLOAD_DIR),
+            ResourceType.UPLOAD_BLOBS: Path(USER_UPLOAD_BLOB_DIR),
             ResourceType.SANDBOX_SHARED: Path(SANDBOX_SHARED_HOST_DIR),
             ResourceType.SANDBOX_PIP_CACHE: Path(SANDBOX_PIP_CACHE_DIR),
             ResourceType.SANDBOX_PACKAGES: Path(SANDBOX_PACKAGE_DIR),
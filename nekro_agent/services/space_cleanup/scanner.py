@@ -38,6 +38,7 @@ from nekro_agent.schemas.space_cleanup import (
     ScanSummary,
 )
 from nekro_agent.services.plugin.collector import plugin_collector
+from nekro_agent.tools.upload_blob_store import upload_blob_store
 
 # 扫描缓存目录
 
@@ -127,6 +128,7 @@ class ScannerService:
             # 定义扫描任务
             scan_tasks = [
                 (ResourceType.USER_UPLOADS, self._scan_user_uploads),
+                (ResourceType.UPLOAD_BLOBS, self._scan_upload_blobs),
                 (ResourceType.SANDBOX_SHARED, self._scan_sandbox_shared),
                 (ResourceType.SANDBOX_PIP_CACHE, self._scan_sandbox_pip_cache),
                 (ResourceType.SANDBOX_PACKAGES, self._scan_sandbox_packages),
@@ -417,7 +419,7 @@ class ScannerService:
         )
 
     async def _scan_sandbox_shared(self) -> ResourceCategory:
-        """扫描沙盒共享目录（排除.pip_cache和.packages）"""
+        """扫描沙盒共享目录（排除.pip_cache、.packages和.wheelhouse）"""
         directory = Path(SANDBOX_SHARED_HOST_DIR)
 
         if not directory.exists():
@@ -451,8 +453,8 @@ class ScannerService:
                 if not chat_dir.is_dir():
                     continue
 
-                # 跳过 .pip_cache 和 .packages 目录
-                if chat_dir.name in {".pip_cache", ".packages"}:
+                # 跳过 .pip_cache、.packages 和 .wheelhouse 目录
+                if chat_dir.name in {".pip_cache", ".packages", ".wheelhouse"}:
                     continue
 
                 chat_key = chat_dir.name
@@ -735,6 +737,39 @@ class ScannerService:
             ),
         )
 
+    async def _scan_upload_blobs(self) -> ResourceCategory:
+        """扫描上传资源内容存储
+
+        仍被频道文件引用的内容与频道文件共享磁盘空间，已计入聊天上传资源，这里只统计引用归零的内容
+        """
+        total_size = 0
+        total_files = 0
+        for idx, (_, st) in enumerate(upload_blob_store.iter_unreferenced()):
+            total_size += st.st_size
+            total_files += 1
+            if idx % 100 == 0:
+                await asyncio.sleep(0)
+
+        return ResourceCategory(
+            resource_type=ResourceType.UPLOAD_BLOBS,
+            display_name="未引用的上传资源",
+            description="已不被任何聊天引用的去重上传资源内容",
+            total_size=total_size,
+            file_count=total_files,
+            can_cleanup=True,
+            risk_level="safe",
+            risk_message=None,
+            supports_time_filter=False,
+            chat_resources=[],
+            plugin_resources=[],
+            i18n_display_name=i18n_text(zh_CN="未引用的上传资源", en_US="Unreferenced Upload Blobs"),
+            i18n_description=i18n_text(
+                zh_CN="已不被任何聊天引用的去重上传资源内容",
+                en_US="Deduplicated upload contents no longer referenced by any chat",
+            ),
+            i18n_risk_message=None,
+        )
+
     async def _scan_app_logs(self) -> ResourceCategory:
         """扫描应用日志"""
         directory = Path(APP_LOG_DIR)
@@ -24,19 +24,23 @@
 - 每个前端连接注册一个 ``asyncio.Queue``
 - 队列大小限制 ``_MAX_QUEUE_SIZE``，超限自动移除断开连接的订阅者
 - 最大并发订阅者 ``_MAX_SUBSCRIBERS``
+- 多实例部署时事件经 ``coordinator`` 扇出到其他实例，各实例各自维护状态快照并推送给本实例的订阅者
 """
 
 import asyncio
 from asyncio import Queue, QueueFull
 from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from nekro_agent.core.logger import logger
+from nekro_agent.services.coordination import coordinator
 
 _subscribers: List[Queue[str]] = []
 _MAX_QUEUE_SIZE = 200
 _MAX_SUBSCRIBERS = 50
+# 跨实例扇出使用的协调事件主题
+SYSTEM_EVENT_TOPIC = "system_event"
 
 
 WorkspaceStatusValue = Literal["active", "stopped", "failed", "deleting"]
@@ -158,6 +162,8 @@ class AgentRuntimeStatusEvent(BaseModel):
     sandbox_stop_type: Optional[int] = None
     model_name: Optional[str] = None
     error_summary: Optional[str] = None
+    stage_timings: Dict[str, float] = Field(default_factory=dict, description="上下文构建各阶段耗时（ms）")
+    context_budget: Optional[Dict[str, Any]] = Field(default=None, description="上下文 Token 预算分配，未启用预算时为空")
 
 
 class MemoryRecallMatchedNode(BaseModel):
@@ -254,6 +260,7 @@ SystemEvent = Annotated[
     ],
     Field(discriminator="type"),
 ]
+_system_event_adapter: TypeAdapter[SystemEvent] = TypeAdapter(SystemEvent)
 
 
 class WorkspaceStatusState(BaseModel):
@@ -604,7 +611,7 @@ def _build_snapshot_payload() -> str:
     return json.dumps({"type": "snapshot", "data": get_state_snapshot()}, ensure_ascii=False)
 
 
-async def publish_system_event(
+def _deliver_system_event(
     event: Union[
         WorkspaceStatusEvent,
         WorkspaceCcActiveEvent,
@@ -617,7 +624,7 @@ async def publish_system_event(
         AdapterInstanceStatusEvent,
     ],
 ) -> None:
-    """向所有全局 SSE 订阅者广播事件，并同步更新状态快照。"""
+    """向本实例的全局 SSE 订阅者推送事件，并同步更新状态快照。"""
     _update_state(event)
 
     payload = event.model_dump_json()
@@ -634,6 +641,31 @@ async def publish_system_event(
                 _subscribers.remove(q)
 
 
+async def publish_system_event(
+    event: Union[
+        WorkspaceStatusEvent,
+        WorkspaceCcActiveEvent,
+        WorkspaceCcRuntimeStatusEvent,
+        AgentActiveEvent,
+        AgentRuntimeStatusEvent,
+        MemoryRecallActivityEvent,
+        KbIndexProgressEvent,
+        KbLibraryIndexProgressEvent,
+        AdapterInstanceStatusEvent,
+    ],
+) -> None:
+    """向所有全局 SSE 订阅者广播事件，并同步更新状态快照；多实例部署时同时扇出到其他实例。"""
+    _deliver_system_event(event)
+    await coordinator.publish(SYSTEM_EVENT_TOPIC, event.model_dump(mode="json"))
+
+
+def _on_remote_system_event(payload: Dict[str, Any]) -> None:
+    _deliver_system_event(_system_event_adapter.validate_python(payload))
+
+
+coordinator.subscribe(SYSTEM_EVENT_TOPIC, _on_remote_system_event)
+
+
 def subscribe_system_events() -> "Queue[str] | None":
     """注册新订阅者，返回专属 Queue；连接数超限时返回 None。
 
@@ -4,18 +4,24 @@ import asyncio
 import heapq
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from croniter import croniter
 
 from nekro_agent.core.logger import get_sub_logger
 from nekro_agent.models.db_recurring_timer_job import DBRecurringTimerJob
+from nekro_agent.services.coordination import LEADER_TIMERS, coordinator
 from nekro_agent.services.message_service import message_service
 
 from .cn_workday_service import cn_workday_service
 
 logger = get_sub_logger("timer")
+
+# 多实例同步使用的协调事件主题
+RECURRING_JOB_TOPIC = "timer.recurring_job"
+
+
 @dataclass(frozen=True, order=True)
 class _HeapItem:
     next_run_ts: float
@@ -30,6 +36,7 @@ class RecurringTimerService:
     - 任务持久化，可随服务重启恢复
     - 低 CPU：按最近触发时间 sleep，不做每秒轮询
     - 健壮：单任务异常不影响整体；连续失败自动暂停并提示一次
+    - 多实例：各实例都维护调度堆，只有定时器主节点触发；任务变更经协调器通知其他实例按数据库刷新
     """
 
     def __init__(self) -> None:
@@ -73,12 +80,14 @@ class RecurringTimerService:
             # 不应因 DB 写入问题影响调度本身（至少保证内存调度继续）
             logger.exception(f"更新 cron 任务 next_run_at 持久化失败: job_id={job.job_id}")
         await self._schedule_job(job)
+        await self._announce(job.job_id)
 
     async def pause_job(self, job: DBRecurringTimerJob) -> None:
         job.status = "paused"
         await job.save()
         logger.debug(f"[cron] pause_job: job_id={job.job_id}")
         await self._unschedule_job(job.job_id)
+        await self._announce(job.job_id)
 
     async def resume_job(self, job: DBRecurringTimerJob) -> None:
         job.status = "active"
@@ -93,6 +102,7 @@ class RecurringTimerService:
         logger.debug(f"[cron] delete_job: job_id={job_id}")
         await self._unschedule_job(job_id)
         await DBRecurringTimerJob.filter(job_id=job_id).delete()
+        await self._announce(job_id)
 
     async def run_now(self, job: DBRecurringTimerJob) -> bool:
         """立即执行一次任务（不改变 cron 表达式）。"""
@@ -177,6 +187,20 @@ class RecurringTimerService:
             )
             await self._schedule_job(job)
 
+    async def _announce(self, job_id: str) -> None:
+        await coordinator.publish(RECURRING_JOB_TOPIC, {"job_id": job_id})
+
+    async def _on_remote_job(self, payload: Dict[str, Any]) -> None:
+        """其他实例变更了任务：按数据库中的最新状态刷新本地调度"""
+        if not self._running:
+            return
+        job_id = payload["job_id"]
+        job = await DBRecurringTimerJob.get_or_none(job_id=job_id)
+        if job is not None and job.status == "active" and job.next_run_at is not None:
+            await self._schedule_job(job)
+        else:
+            await self._unschedule_job(job_id)
+
     async def _schedule_job(self, job: DBRecurringTimerJob) -> None:
         if job.status != "active" or job.next_run_at is None:
             return
@@ -202,6 +226,10 @@ class RecurringTimerService:
     async def _run_loop(self) -> None:
         while self._running:
             try:
+                if not coordinator.is_leader(LEADER_TIMERS):
+                    await self._wait_for_wakeup(1)
+                    continue
+
                 item = await self._peek_next_item()
                 if item is None:
                     await self._wait_for_wakeup(None)
@@ -334,12 +362,14 @@ class RecurringTimerService:
             job.status = "paused"
             await job.save()
             await self._unschedule_job(job.job_id)
+            await self._announce(job.job_id)
             return
 
         job.status = "paused"
         job.paused_notice_sent_at = datetime.now(ZoneInfo(job.timezone))
         await job.save()
         await self._unschedule_job(job.job_id)
+        await self._announce(job.job_id)
         logger.debug(f"[cron] auto_paused: job_id={job.job_id}, failures={job.consecutive_failures}")
 
         try:
@@ -447,4 +477,5 @@ class RecurringTimerService:
 
 
 recurring_timer_service = RecurringTimerService()
+coordinator.subscribe(RECURRING_JOB_TOPIC, recurring_timer_service._on_remote_job)
 
@@ -4,15 +4,22 @@ import secrets
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Awaitable, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import aiofiles
 
 from nekro_agent.core.logger import get_sub_logger
 from nekro_agent.core.os_env import TIMER_ONE_SHOT_PERSIST_PATH
+from nekro_agent.services.coordination import LEADER_TIMERS, coordinator
 from nekro_agent.services.message_service import message_service
 
 logger = get_sub_logger("timer")
+
+# 多实例同步使用的协调事件主题
+TIMER_TASKS_TOPIC = "timer.tasks"
+TIMER_RESYNC_TOPIC = "timer.resync"
+
+
 class TimerTask:
     """定时任务类"""
 
@@ -117,8 +124,10 @@ class TimerService:
                 dropped += 1
                 continue
 
-            # 已过期：在宽限期内补发一次，否则丢弃
+            # 已过期：在宽限期内补发一次，否则丢弃；多实例部署时只由定时器主节点补发
             if trigger_time <= now:
+                if not coordinator.is_leader(LEADER_TIMERS):
+                    continue
                 lag = now - trigger_time
                 if 0 <= lag <= self._MISFIRE_GRACE_SECONDS and event_desc:
                     try:
@@ -178,12 +187,56 @@ class TimerService:
             except Exception:
                 logger.exception(f"持久化定时器写入失败: path={path}")
 
+    def _dump_chat_tasks(self, chat_key: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "task_id": t.task_id,
+                "trigger_time": int(t.trigger_time),
+                "event_desc": t.event_desc,
+                "temporary": bool(t.temporary),
+            }
+            for t in self.tasks.get(chat_key, [])
+            if t.callback is None
+        ]
+
+    async def _replicate(self, chat_key: str) -> None:
+        """将频道的普通/临时定时器同步给其他实例。
+
+        带 callback 的系统定时器由各实例启动时自行注册，不参与同步；
+        只有定时器主节点会触发定时器，其余实例保留副本以便主节点退出后接管。
+        """
+        await coordinator.publish(TIMER_TASKS_TOPIC, {"chat_key": chat_key, "tasks": self._dump_chat_tasks(chat_key)})
+
+    async def _on_remote_tasks(self, payload: Dict[str, Any]) -> None:
+        chat_key = payload["chat_key"]
+        replicated = []
+        for item in payload["tasks"]:
+            task = TimerTask(chat_key, item["trigger_time"], item["event_desc"], task_id=item["task_id"])
+            task.temporary = item["temporary"]
+            replicated.append(task)
+        tasks = [t for t in self.tasks.get(chat_key, []) if t.callback is not None] + replicated
+        if tasks:
+            self.tasks[chat_key] = tasks
+        else:
+            self.tasks.pop(chat_key, None)
+        await self._persist_tasks()
+
+    async def _on_resync_request(self, _: Dict[str, Any]) -> None:
+        if not self.running or not coordinator.is_leader(LEADER_TIMERS):
+            return
+        for chat_key in list(self.tasks):
+            if self._dump_chat_tasks(chat_key):
+                await self._replicate(chat_key)
+
     async def start(self):
         """启动定时器服务"""
         if self.running:
             return
         self.running = True
         await self._load_persisted_tasks()
+        if not coordinator.is_leader(LEADER_TIMERS):
+            # 从主节点拉取其他实例设置的定时器
+            await coordinator.publish(TIMER_RESYNC_TOPIC, {})
         asyncio.create_task(self._timer_loop())
         logger.info("Timer service started")
 
@@ -239,6 +292,7 @@ class TimerService:
                     )
                 # 清理后同步到磁盘（只影响 callback 为空的任务）
                 await self._persist_tasks()
+                await self._replicate(chat_key)
             return True
 
         # 如果触发时间为0，立即触发频道
@@ -274,6 +328,8 @@ class TimerService:
         # 仅普通/临时定时器持久化；带 callback 的系统定时器不写磁盘
         if callback is None:
             await self._persist_tasks()
+        if callback is None or override:
+            await self._replicate(chat_key)
         return True
 
     def get_timers(self, chat_key: str) -> List[TimerTask]:
@@ -303,20 +359,21 @@ class TimerService:
         return None
 
     async def delete_timer_by_id(self, task_id: str) -> bool:
-        removed = False
+        removed_from: Optional[str] = None
         for chat_key, tasks in list(self.tasks.items()):
             remaining = [task for task in tasks if task.task_id != task_id]
             if len(remaining) != len(tasks):
-                removed = True
+                removed_from = chat_key
                 if remaining:
                     self.tasks[chat_key] = remaining
                 else:
                     del self.tasks[chat_key]
                 break
 
-        if removed:
+        if removed_from is not None:
             await self._persist_tasks()
-        return removed
+            await self._replicate(removed_from)
+        return removed_from is not None
 
     async def trigger_timer_now(self, task_id: str) -> bool:
         task = self.get_timer_by_id(task_id)
@@ -343,6 +400,10 @@ class TimerService:
     async def _timer_loop(self):
         """定时器循环"""
         while self.running:
+            # 多实例部署时只由定时器主节点触发，其余实例仅保留副本
+            if not coordinator.is_leader(LEADER_TIMERS):
+                await asyncio.sleep(1)
+                continue
             current_time = int(time.time())
 
             # 检查所有任务
@@ -364,9 +425,12 @@ class TimerService:
 
                 if triggered_tasks:
                     await self._persist_tasks()
+                    await self._replicate(chat_key)
 
             await asyncio.sleep(1)  # 每秒检查一次
 
 
 # 全局定时器服务实例
 timer_service = TimerService()
+coordinator.subscribe(TIMER_TASKS_TOPIC, timer_service._on_remote_tasks)
+coordinator.subscribe(TIMER_RESYNC_TOPIC, timer_service._on_resync_request)
@@ -0,0 +1,64 @@
+"""异步令牌桶
+
+按「每分钟令牌数」匀速补充，桶容量默认为 10 秒的配额，允许少量突发。
+用于记忆重建、模型组 RPM / TPM 等需要平滑速率的场景。
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+BURST_SECONDS = 10.0
+
+
+class TokenBucket:
+    """异步令牌桶
+
+    Args:
+        rate_per_minute: 每分钟补充的令牌数，<= 0 表示不限速
+        burst: 桶容量，默认为 `BURST_SECONDS` 秒的配额
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None) -> None:
+        self.rate_per_minute = rate_per_minute
+        self.capacity = max(1.0, burst if burst is not None else rate_per_minute * BURST_SECONDS / 60)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_minute <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_minute / 60)
+        self._updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """获取令牌，不足时等待补充；单次请求超过桶容量时按桶容量计"""
+        if self.unlimited:
+            return
+        amount = min(amount, self.capacity)
+        # 持锁等待，保证先到先得，避免大请求被小请求持续插队
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) * 60 / self.rate_per_minute)
+
+    def wait_seconds(self, amount: float = 1) -> float:
+        """按当前余额估算获取令牌需等待的秒数，不扣减令牌"""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self._tokens) * 60 / self.rate_per_minute)
+
+    def consume(self, amount: float) -> None:
+        """不等待直接扣减（可为负数以退还），用于按实际用量校正预估值；余额可透支，后续请求等待补足"""
+        if self.unlimited:
+            return
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
@@ -1,9 +1,8 @@
+import asyncio
 import base64
-import difflib
 import hashlib
 import mimetypes
 import random
-import re
 from pathlib import Path
 from typing import Tuple
 
@@ -17,6 +16,7 @@ from nekro_agent.core import logger
 from nekro_agent.core.config import CoreConfig
 from nekro_agent.core.os_env import USER_UPLOAD_DIR
 from nekro_agent.tools.path_convertor import is_url_path, sanitize_chat_key_for_path
+from nekro_agent.tools.upload_blob_store import upload_blob_store
 
 _APP_VERSION: str = ""
 
@@ -79,6 +79,20 @@ def compare_semver(a: str, b: str) -> int:
     return 0
 
 
+def _is_upload_path(file_path: Path) -> bool:
+    return file_path.resolve().is_relative_to(Path(USER_UPLOAD_DIR).resolve())
+
+
+def _save_file_bytes(bytes_data: bytes, file_path: str) -> None:
+    """保存文件内容，上传目录内的文件经由内容寻址存储去重"""
+    path = Path(file_path)
+    if _is_upload_path(path):
+        upload_blob_store.store_bytes(bytes_data, path)
+        return
+    path.write_bytes(bytes_data)
+    path.chmod(0o755)
+
+
 async def download_file(
     url: str,
     file_path: str = "",
@@ -113,8 +127,7 @@ async def download_file(
                     save_path = Path(USER_UPLOAD_DIR) / Path(file_name)
                 save_path.parent.mkdir(parents=True, exist_ok=True)
                 file_path = str(save_path)
-            Path(file_path).write_bytes(content)
-            Path(file_path).chmod(0o755)
+            _save_file_bytes(content, file_path)
     except Exception:
         if retry_count > 0:
             return await download_file(
@@ -155,8 +168,7 @@ async def download_file_from_bytes(
             save_path = Path(USER_UPLOAD_DIR) / Path(file_name)
         save_path.parent.mkdir(parents=True, exist_ok=True)
         file_path = str(save_path)
-    Path(file_path).write_bytes(bytes_data)
-    Path(file_path).chmod(0o755)
+    _save_file_bytes(bytes_data, file_path)
     return file_path, file_name
 
 
@@ -191,8 +203,7 @@ async def download_file_from_base64(
             save_path = Path(USER_UPLOAD_DIR) / Path(file_name)
         save_path.parent.mkdir(parents=True, exist_ok=True)
         file_path = str(save_path)
-    Path(file_path).write_bytes(base64.b64decode(base64_str.encode(encoding="utf-8")))
-    Path(file_path).chmod(0o755)
+    _save_file_bytes(base64.b64decode(base64_str.encode(encoding="utf-8")), file_path)
     return file_path, file_name
 
 
@@ -211,15 +222,18 @@ async def copy_to_upload_dir(
     Returns:
         Tuple[str, str]: 文件路径, 文件名
     """
+    # 分块读取一次即可同时得到存储摘要与文件名所需的 MD5
+    digest, md5 = await asyncio.to_thread(upload_blob_store.put_file, file_path)
     if not file_name:
-        file_name = f"{hashlib.md5(Path(file_path).read_bytes()).hexdigest()}{use_suffix}"
+        file_name = f"{md5}{use_suffix}"
     if from_chat_key:
         save_path = Path(USER_UPLOAD_DIR) / sanitize_chat_key_for_path(from_chat_key) / Path(file_name)
     else:
         save_path = Path(USER_UPLOAD_DIR) / Path(file_name)
-    save_path.parent.mkdir(parents=True, exist_ok=True)
-    Path(save_path).write_bytes(Path(file_path).read_bytes())
-    Path(save_path).chmod(0o755)
+    try:
+        upload_blob_store.link(digest, save_path)
+    except FileNotFoundError:
+        await asyncio.to_thread(upload_blob_store.store_file, file_path, save_path)
     return str(save_path), file_name
 
 
@@ -242,12 +256,9 @@ def check_content_trigger(content: str, config: CoreConfig) -> bool:
     Returns:
         bool: 是否触发
     """
+    from nekro_agent.services.message_rules import message_rule_engine
 
-    for reg_text in config.AI_CHAT_TRIGGER_REGEX:
-        reg = re.compile(reg_text)
-        if reg.search(content):
-            return True
-    return False
+    return message_rule_engine.match_trigger(content, config) is not None
 
 
 def check_forbidden_message(content: str, config: CoreConfig) -> bool:
@@ -259,13 +270,12 @@ def check_forbidden_message(content: str, config: CoreConfig) -> bool:
     Returns:
         bool: 是否忽略
     """
+    from nekro_agent.services.message_rules import message_rule_engine
 
-    for reg_text in config.AI_CHAT_IGNORE_REGEX:
-        reg = re.compile(reg_text)
-        _r = reg.search(content)
-        if _r:
-            logger.info(f'忽略消息: "{content}" - 命中正则: "{reg_text}" 匹配内容: "{_r.group(0)}"')
-            return True
+    hit = message_rule_engine.match_ignore(content, config)
+    if hit:
+        logger.info(f'忽略消息: "{content}" - 命中正则: "{hit.rule}" 匹配内容: "{hit.matched}"')
+        return True
     return False
 
 
@@ -358,18 +368,3 @@ async def calculate_file_md5(file_path: str, strict: bool = False) -> str:
             raise
         logger.warning(f"计算文件 MD5 失败: {e}")
         return file_path  # 如果无法计算 MD5，则返回文件路径作为标识
-
-
-def calculate_text_similarity(text1: str, text2: str, min_length: int = 12) -> float:
-    """计算两段文本的相似度
-
-    Args:
-        text1 (str): 第一段文本
-        text2 (str): 第二段文本
-
-    Returns:
-        float: 相似度（0-1）
-    """
-    if len(text1) < min_length or len(text2) < min_length:
-        return 0
-    return difflib.SequenceMatcher(None, text1, text2).ratio()
@@ -0,0 +1,187 @@
+"""上传资源内容寻址存储
+
+聊天上传资源按 SHA-256 内容存放在 `USER_UPLOAD_BLOB_DIR/<前2位>/<3-4位>/<摘要>`，
+各频道目录 `USER_UPLOAD_DIR/<chat_key>/<文件名>` 以硬链接指向同一份内容：
+- 同一张表情 / 图片在多个群中出现时磁盘上只保存一份，原有路径约定（沙盒挂载、
+  `convert_to_host_path`）保持不变
+- 引用计数即硬链接数减一，频道文件被清理后引用归零的内容由空间清理回收
+- 不使用符号链接：沙盒仅只读挂载频道目录，容器内无法解析指向挂载范围外的链接目标
+- 文件系统不支持硬链接（跨设备、部分网络存储）时退化为复制，复制后的内容不再依赖存储
+- 写入频道目录均为「临时文件 + 原子替换」，不会就地覆写其他频道共享的内容
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+from nekro_agent.core.logger import get_sub_logger
+from nekro_agent.core.os_env import USER_UPLOAD_BLOB_DIR
+
+logger = get_sub_logger("upload_blob_store")
+
+# 流式哈希的分块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+# 内容文件权限，与上传目录保持一致（硬链接共享同一权限）
+BLOB_FILE_MODE = 0o755
+TMP_DIR_NAME = ".tmp"
+
+PathLike = Union[str, Path]
+
+
+class UploadBlobStore:
+    """SHA-256 分片存储 + 频道硬链接"""
+
+    def __init__(self, root: PathLike = USER_UPLOAD_BLOB_DIR) -> None:
+        self.root = Path(root)
+
+    def blob_path(self, digest: str) -> Path:
+        """内容摘要对应的存储路径"""
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def _tmp_path(self) -> Path:
+        tmp_dir = self.root / TMP_DIR_NAME
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tmp_dir / uuid.uuid4().hex
+
+    def _commit_blob(self, tmp: Path, digest: str) -> Path:
+        """将写好的临时文件落盘为内容文件，已存在相同内容时丢弃临时文件"""
+        blob = self.blob_path(digest)
+        if blob.exists():
+            tmp.unlink(missing_ok=True)
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp.chmod(BLOB_FILE_MODE)
+        os.replace(tmp, blob)
+        return blob
+
+    def put_bytes(self, data: bytes) -> str:
+        """写入内容，返回 SHA-256 摘要"""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.blob_path(digest).exists():
+            return digest
+        tmp = self._tmp_path()
+        try:
+            tmp.write_bytes(data)
+            self._commit_blob(tmp, digest)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return digest
+
+    def put_file(self, source: PathLike) -> Tuple[str, str]:
+        """分块读取源文件写入存储，单次读取同时计算 SHA-256 与 MD5
+
+        Returns:
+            Tuple[str, str]: SHA-256 摘要, MD5 摘要
+        """
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        tmp = self._tmp_path()
+        try:
+            with Path(source).open("rb") as src, tmp.open("wb") as dst:
+                while chunk := src.read(HASH_CHUNK_SIZE):
+                    sha256.update(chunk)
+                    md5.update(chunk)
+                    dst.write(chunk)
+            digest = sha256.hexdigest()
+            self._commit_blob(tmp, digest)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return digest, md5.hexdigest()
+
+    def link(self, digest: str, target: PathLike) -> None:
+        """将内容链接到目标路径，目标已存在时原子替换"""
+        blob = self.blob_path(digest)
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() and os.path.samefile(blob, target):
+            return
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            try:
+                os.link(blob, tmp)
+            except FileNotFoundError:
+                raise
+            except OSError as e:
+                logger.debug(f"硬链接失败，改为复制: {target} ({e})")
+                shutil.copyfile(blob, tmp)
+                tmp.chmod(BLOB_FILE_MODE)
+                self._discard_if_unreferenced(blob)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def store_bytes(self, data: bytes, target: PathLike) -> str:
+        """写入内容并链接到目标路径，返回 SHA-256 摘要"""
+        digest = self.put_bytes(data)
+        try:
+            self.link(digest, target)
+        except FileNotFoundError:
+            # 内容恰好在链接前被空间清理回收，重新写入一次
+            self.link(self.put_bytes(data), target)
+        return digest
+
+    def store_file(self, source: PathLike, target: PathLike) -> str:
+        """流式写入源文件内容并链接到目标路径，返回 SHA-256 摘要"""
+        digest, _ = self.put_file(source)
+        try:
+            self.link(digest, target)
+        except FileNotFoundError:
+            digest, _ = self.put_file(source)
+            self.link(digest, target)
+        return digest
+
+    def refcount(self, digest: str) -> int:
+        """内容被频道文件引用的次数"""
+        try:
+            return self.blob_path(digest).stat().st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def iter_blobs(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """遍历所有内容文件"""
+        if not self.root.exists():
+            return
+        for shard in sorted(self.root.glob("??/??")):
+            for blob in shard.iterdir():
+                try:
+                    yield blob, blob.stat()
+                except OSError:
+                    continue
+
+    def iter_unreferenced(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """遍历不再被任何频道文件引用的内容文件"""
+        for blob, st in self.iter_blobs():
+            if st.st_nlink <= 1:
+                yield blob, st
+
+    def _discard_if_unreferenced(self, blob: Path) -> int:
+        try:
+            st = blob.stat()
+            if st.st_nlink > 1:
+                return 0
+            blob.unlink()
+        except OSError:
+            return 0
+        return st.st_size
+
+    def reclaim_unreferenced(self) -> Tuple[int, int]:
+        """回收引用归零的内容文件
+
+        删除前再次检查链接数；即使检查后恰好新增了引用，频道文件持有同一 inode，内容不会丢失。
+
+        Returns:
+            Tuple[int, int]: 回收文件数, 释放字节数
+        """
+        count = freed = 0
+        for blob, _ in list(self.iter_unreferenced()):
+            size = self._discard_if_unreferenced(blob)
+            if size or not blob.exists():
+                count += 1
+                freed += size
+        return count, freed
+
+
+upload_blob_store = UploadBlobStore()
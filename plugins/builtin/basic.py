@@ -38,11 +38,11 @@
 
 import re
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import aiofiles
 import magic
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from nekro_agent.adapters.onebot_v11.tools import user
 from nekro_agent.api import core, i18n
@@ -56,9 +56,13 @@ from nekro_agent.api.plugin import (
 from nekro_agent.api.schemas import AgentCtx
 from nekro_agent.api.signal import MsgSignal
 from nekro_agent.services.message_service import message_service
+from nekro_agent.services.near_duplicate import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    NearDuplicateDetector,
+    legacy_ratio_to_jaccard,
+)
 from nekro_agent.tools.common_util import (
     calculate_file_md5,
-    calculate_text_similarity,
     download_file,
 )
 from nekro_agent.tools.at_markup import neutralize_at_all_markup
@@ -153,18 +157,31 @@ class BasicConfig(ConfigBase):
             ),
         ).model_dump(),
     )
-    SIMILARITY_THRESHOLD: float = Field(
-        default=0.7,
+    SIMILARITY_JACCARD_THRESHOLD: float = Field(
+        default=DEFAULT_SIMILARITY_THRESHOLD,
         title="消息相似度警告阈值",
-        description="当消息相似度超过该阈值时，将触发系统警告提示引导 AI 调整生成策略",
+        description=(
+            "当消息相似度超过该阈值时，将触发系统警告提示引导 AI 调整生成策略。"
+            "相似度为字符三元组的 Jaccard 估算值，取值 0~1，数值明显低于旧版的序列匹配比值；"
+            "旧版配置项 SIMILARITY_THRESHOLD 会在加载时自动换算（旧版 0.7 约相当于现在的 0.35）"
+        ),
         json_schema_extra=ExtraField(
             i18n_title=i18n.i18n_text(
                 zh_CN="消息相似度警告阈值",
                 en_US="Message Similarity Warning Threshold",
             ),
             i18n_description=i18n.i18n_text(
-                zh_CN="当消息相似度超过该阈值时，将触发系统警告提示引导 AI 调整生成策略",
-                en_US="System warning will be triggered when message similarity exceeds this threshold",
+                zh_CN=(
+                    "当消息相似度超过该阈值时，将触发系统警告提示引导 AI 调整生成策略。"
+                    "相似度为字符三元组的 Jaccard 估算值，取值 0~1，数值明显低于旧版的序列匹配比值；"
+                    "旧版配置项 SIMILARITY_THRESHOLD 会在加载时自动换算（旧版 0.7 约相当于现在的 0.35）"
+                ),
+                en_US=(
+                    "System warning will be triggered when message similarity exceeds this threshold. "
+                    "Similarity is a Jaccard estimate over character trigrams in the range 0-1 and reads much lower "
+                    "than the previous sequence-matching ratio; a legacy SIMILARITY_THRESHOLD value is converted on "
+                    "load (the old 0.7 roughly corresponds to 0.35 now)"
+                ),
             ),
         ).model_dump(),
     )
@@ -183,6 +200,36 @@ class BasicConfig(ConfigBase):
             ),
         ).model_dump(),
     )
+    SIMILARITY_WINDOW_SIZE: int = Field(
+        default=5,
+        title="消息重复检查窗口条数",
+        description="仅与最近发送的 N 条消息进行重复与相似度比较",
+        json_schema_extra=ExtraField(
+            i18n_title=i18n.i18n_text(
+                zh_CN="消息重复检查窗口条数",
+                en_US="Duplicate Check Window Size",
+            ),
+            i18n_description=i18n.i18n_text(
+                zh_CN="仅与最近发送的 N 条消息进行重复与相似度比较",
+                en_US="Only compare with the most recent N sent messages for duplicates and similarity",
+            ),
+        ).model_dump(),
+    )
+    SIMILARITY_WINDOW_SECONDS: int = Field(
+        default=0,
+        title="消息重复检查窗口时长（秒）",
+        description="仅与该时长内发送的消息进行比较，0 表示不限制",
+        json_schema_extra=ExtraField(
+            i18n_title=i18n.i18n_text(
+                zh_CN="消息重复检查窗口时长（秒）",
+                en_US="Duplicate Check Window Duration (seconds)",
+            ),
+            i18n_description=i18n.i18n_text(
+                zh_CN="仅与该时长内发送的消息进行比较，0 表示不限制",
+                en_US="Only compare with messages sent within this duration, 0 means unlimited",
+            ),
+        ).model_dump(),
+    )
     ALLOW_AT_ALL: bool = Field(
         default=False,
         title="允许 @全体成员",
@@ -214,6 +261,17 @@ class BasicConfig(ConfigBase):
         ).model_dump(),
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_legacy_similarity_threshold(cls, data: Any) -> Any:
+        """旧版配置的 SIMILARITY_THRESHOLD 是序列匹配比值，换算为 Jaccard 阈值后迁移到新字段"""
+        if isinstance(data, dict) and "SIMILARITY_THRESHOLD" in data:
+            data = dict(data)
+            legacy = data.pop("SIMILARITY_THRESHOLD")
+            if "SIMILARITY_JACCARD_THRESHOLD" not in data and isinstance(legacy, (int, float)):
+                data["SIMILARITY_JACCARD_THRESHOLD"] = legacy_ratio_to_jaccard(float(legacy))
+        return data
+
 
 # 获取配置
 config: BasicConfig = plugin.get_config(BasicConfig)
@@ -240,7 +298,7 @@ async def basic_prompt_inject(_ctx: AgentCtx):
     return base_prompt + "\n".join([f"{k}: {v}" for k, v in features.items()]) + "\n" + tips
 
 
-SEND_MSG_CACHE: Dict[str, List[str]] = {}
+SEND_MSG_DETECTOR = NearDuplicateDetector()
 SEND_FILE_CACHE: Dict[str, List[str]] = {}  # 文件 MD5 缓存，格式: {chat_key: [md5_1, md5_2, md5_3]}
 
 
@@ -277,8 +335,6 @@ async def send_msg_text(_ctx: AgentCtx, chat_key: str, message_text: str, ref_ms
         result = ... # Always use the right result, not the error message.
         send_msg_text(_ck, f"Result: {result}")  # You can send the result of the calculation directly.
     """
-    global SEND_MSG_CACHE
-
     if _ctx.adapter_key not in plugin.support_adapter:
         raise Exception(f"Error: This method is not available in this adapter. Current adapter: {_ctx.adapter_key}")
 
@@ -296,17 +352,18 @@ async def send_msg_text(_ctx: AgentCtx, chat_key: str, message_text: str, ref_ms
             "Error: You can't send image message directly, please use the send_msg_file method to send image/file resources.",
         )
 
-    # 初始化消息缓存
-    if chat_key not in SEND_MSG_CACHE:
-        SEND_MSG_CACHE[chat_key] = []
-
-    recent_messages = SEND_MSG_CACHE[chat_key][-5:] if SEND_MSG_CACHE[chat_key] else []
-
     # 检查完全匹配
     if config.SIMILARITY_MESSAGE_FILTER:
-        if message_text in recent_messages:
+        duplicate = SEND_MSG_DETECTOR.check(
+            chat_key,
+            message_text,
+            window_size=config.SIMILARITY_WINDOW_SIZE,
+            window_seconds=config.SIMILARITY_WINDOW_SECONDS,
+            min_length=config.SIMILARITY_CHECK_LENGTH,
+        )
+        if duplicate.exact:
             # 清空缓存允许再次发送
-            SEND_MSG_CACHE[chat_key] = []
+            SEND_MSG_DETECTOR.clear(chat_key)
             if config.STRICT_MESSAGE_FILTER:
                 raise Exception(
                     "Error: Identical message has been sent recently. Carefully read the recent chat history whether it has sent duplicate messages. Please generate more interesting replies. If you COMPLETELY DETERMINED that it is necessary, resend it. SPAM IS NOT ALLOWED!",
@@ -319,17 +376,14 @@ async def send_msg_text(_ctx: AgentCtx, chat_key: str, message_text: str, ref_ms
             return
 
         # 检查相似度（仅对超过限定字符的消息进行检查）
-        for recent_msg in recent_messages:
-            similarity = calculate_text_similarity(message_text, recent_msg, min_length=config.SIMILARITY_CHECK_LENGTH)
-            if similarity > config.SIMILARITY_THRESHOLD:
-                # 发送系统消息提示避免类似内容
-                core.logger.warning(f"[{chat_key}] 检测到相似度过高的消息: {similarity:.2f}")
-                await message_service.push_system_message(
-                    chat_key=chat_key,
-                    agent_messages="System Alert: You have sent a message that is too similar to a recently sent message! You should KEEP YOUR RESPONSE USEFUL and not redundant and cumbersome!",
-                    trigger_agent=False,
-                )
-                break
+        if duplicate.similarity > config.SIMILARITY_JACCARD_THRESHOLD:
+            # 发送系统消息提示避免类似内容
+            core.logger.warning(f"[{chat_key}] 检测到相似度过高的消息: {duplicate.similarity:.2f}")
+            await message_service.push_system_message(
+                chat_key=chat_key,
+                agent_messages="System Alert: You have sent a message that is too similar to a recently sent message! You should KEEP YOUR RESPONSE USEFUL and not redundant and cumbersome!",
+                trigger_agent=False,
+            )
 
     try:
         await _ctx.ms.send_text(chat_key, message_text, _ctx, ref_msg_id=ref_msg_id)
@@ -340,8 +394,7 @@ async def send_msg_text(_ctx: AgentCtx, chat_key: str, message_text: str, ref_ms
         ) from e
 
     # 更新消息缓存
-    SEND_MSG_CACHE[chat_key].append(message_text)
-    SEND_MSG_CACHE[chat_key] = SEND_MSG_CACHE[chat_key][-10:]  # 保持最近10条消息
+    SEND_MSG_DETECTOR.add(chat_key, message_text)
 
 
 @plugin.mount_sandbox_method(
@@ -575,6 +628,6 @@ async def collect_available_methods(_ctx: AgentCtx) -> List[Callable]:
 @plugin.mount_cleanup_method()
 async def clean_up():
     """清理插件"""
-    global SEND_MSG_CACHE, SEND_FILE_CACHE
-    SEND_MSG_CACHE = {}
+    global SEND_FILE_CACHE
+    SEND_MSG_DETECTOR.clear()
     SEND_FILE_CACHE = {}
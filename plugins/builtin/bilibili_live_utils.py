@@ -31,7 +31,7 @@ import json
 import re
 from typing import Any, Dict, List
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from nekro_agent.api import core, i18n
 from nekro_agent.api.core import logger
@@ -44,7 +44,11 @@ from nekro_agent.api.plugin import (
 from nekro_agent.models.db_chat_channel import DBChatChannel
 from nekro_agent.schemas.agent_ctx import AgentCtx
 from nekro_agent.services.message_service import message_service
-from nekro_agent.tools.common_util import calculate_text_similarity
+from nekro_agent.services.near_duplicate import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    NearDuplicateDetector,
+    legacy_ratio_to_jaccard,
+)
 
 plugin = NekroPlugin(
     name="Bilibili 直播工具插件",
@@ -75,10 +79,14 @@ class BasicConfig(ConfigBase):
         title="启用严格重复消息过滤",
         description="启用后,完全重复的消息将直接抛出异常,否则仅过滤并提示",
     )
-    SIMILARITY_THRESHOLD: float = Field(
-        default=0.7,
+    SIMILARITY_JACCARD_THRESHOLD: float = Field(
+        default=DEFAULT_SIMILARITY_THRESHOLD,
         title="消息相似度警告阈值",
-        description="当消息相似度超过该阈值时,将触发系统警告提示引导 AI 调整生成策略",
+        description=(
+            "当消息相似度超过该阈值时,将触发系统警告提示引导 AI 调整生成策略。"
+            "相似度为字符三元组的 Jaccard 估算值,取值 0~1;"
+            "旧版配置项 SIMILARITY_THRESHOLD 会在加载时自动换算(旧版 0.7 约相当于现在的 0.35)"
+        ),
     )
     SIMILARITY_CHECK_LENGTH: int = Field(
         default=12,
@@ -86,11 +94,23 @@ class BasicConfig(ConfigBase):
         description="当消息长度超过该阈值时,将进行相似度检查",
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_legacy_similarity_threshold(cls, data: Any) -> Any:
+        """旧版配置的 SIMILARITY_THRESHOLD 是序列匹配比值，换算为 Jaccard 阈值后迁移到新字段"""
+        if isinstance(data, dict) and "SIMILARITY_THRESHOLD" in data:
+            data = dict(data)
+            legacy = data.pop("SIMILARITY_THRESHOLD")
+            if "SIMILARITY_JACCARD_THRESHOLD" not in data and isinstance(legacy, (int, float)):
+                data["SIMILARITY_JACCARD_THRESHOLD"] = legacy_ratio_to_jaccard(float(legacy))
+        return data
+
 
 config: BasicConfig = plugin.get_config(BasicConfig)
 
-# 消息缓存
-SEND_MSG_CACHE: Dict[str, List[str]] = {}
+# 最近发送消息的重复检测窗口
+SEND_MSG_DETECTOR = NearDuplicateDetector()
+SEND_MSG_CHECK_WINDOW = 5
 
 
 def extract_expressions(json_data: Dict) -> str:
@@ -306,8 +326,6 @@ async def send_text_message(_ctx: AgentCtx, chat_key: str, message_text: str, tt
     返回:
         无
     """
-    global SEND_MSG_CACHE
-
     # 检查消息列表是否为空或者长度不匹配
     if not message_text:
         raise Exception("错误:消息列表不能为空.")
@@ -324,16 +342,17 @@ async def send_text_message(_ctx: AgentCtx, chat_key: str, message_text: str, tt
             "错误:不能直接发送图片消息,请使用 send_msg_file 方法发送图片/文件资源.",
         )
 
-    # 初始化消息缓存
-    if chat_key not in SEND_MSG_CACHE:
-        SEND_MSG_CACHE[chat_key] = []
-
-    recent_messages = SEND_MSG_CACHE[chat_key][-5:] if SEND_MSG_CACHE[chat_key] else []
+    duplicate = SEND_MSG_DETECTOR.check(
+        chat_key,
+        message_text,
+        window_size=SEND_MSG_CHECK_WINDOW,
+        min_length=config.SIMILARITY_CHECK_LENGTH,
+    )
 
     # 检查完全匹配
-    if message_text in recent_messages:
+    if duplicate.exact:
         # 清空缓存允许再次发送
-        SEND_MSG_CACHE[chat_key] = []
+        SEND_MSG_DETECTOR.clear(chat_key)
         if config.STRICT_MESSAGE_FILTER:
             raise Exception(
                 "错误:最近已发送过相同的消息.请仔细阅读最近的聊天记录,检查是否发送了重复消息.请生成更有趣的回复.如果你完全确定有必要,可以重新发送.禁止刷屏!",
@@ -346,17 +365,14 @@ async def send_text_message(_ctx: AgentCtx, chat_key: str, message_text: str, tt
         return
 
     # 检查相似度(仅对超过限定字符的消息进行检查)
-    for recent_msg in recent_messages:
-        similarity = calculate_text_similarity(message_text, recent_msg, min_length=config.SIMILARITY_CHECK_LENGTH)
-        if similarity > config.SIMILARITY_THRESHOLD:
-            # 发送系统消息提示避免类似内容
-            logger.warning(f"[{chat_key}] 检测到相似度过高的消息: {similarity:.2f}")
-            await message_service.push_system_message(
-                chat_key=chat_key,
-                agent_messages="系统提示:您发送的消息与最近发送的消息过于相似!您的回复应当保持有效性,而不是冗余和繁琐!",
-                trigger_agent=False,
-            )
-            break
+    if duplicate.similarity > config.SIMILARITY_JACCARD_THRESHOLD:
+        # 发送系统消息提示避免类似内容
+        logger.warning(f"[{chat_key}] 检测到相似度过高的消息: {duplicate.similarity:.2f}")
+        await message_service.push_system_message(
+            chat_key=chat_key,
+            agent_messages="系统提示:您发送的消息与最近发送的消息过于相似!您的回复应当保持有效性,而不是冗余和繁琐!",
+            trigger_agent=False,
+        )
 
     # TODO: 在这里实现实际的消息发送逻辑
     # 此处预留给用户自行实现发送功能
@@ -379,8 +395,7 @@ async def send_text_message(_ctx: AgentCtx, chat_key: str, message_text: str, tt
         }
         await ws_client.send_animate_command(msg)
     # 更新消息缓存
-    SEND_MSG_CACHE[chat_key].append(message_text)
-    SEND_MSG_CACHE[chat_key] = SEND_MSG_CACHE[chat_key][-10:]  # 保持最近10条消息
+    SEND_MSG_DETECTOR.add(chat_key, message_text)
 
 
 @plugin.mount_sandbox_method(
@@ -626,7 +641,6 @@ async def clean_up():
     清理插件资源,特别是清除消息缓存.
 
     此函数通常在插件卸载或应用程序关闭时调用.
-    它将 `SEND_MSG_CACHE` 重置为空字典.
+    它将清空 `SEND_MSG_DETECTOR` 中的消息窗口.
     """
-    global SEND_MSG_CACHE
-    SEND_MSG_CACHE = {}
+    SEND_MSG_DETECTOR.clear()
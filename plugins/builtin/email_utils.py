@@ -107,6 +107,7 @@ from nekro_agent.core.os_env import USER_UPLOAD_DIR, OsEnv
 from nekro_agent.services.agent.openai import gen_openai_chat_response
 from nekro_agent.services.plugin.base import ConfigBase, NekroPlugin
 from nekro_agent.services.plugin.schema import SandboxMethodType
+from nekro_agent.tools.upload_blob_store import upload_blob_store
 
 # 创建插件实例
 plugin = NekroPlugin(
@@ -271,12 +272,8 @@ async def send_email_attachment(
         upload_dir.mkdir(parents=True, exist_ok=True)
         target_path = upload_dir / safe_filename
 
-        # 异步复制文件
-        async with aiofiles.open(host_path, "rb") as src_file:
-            content = await src_file.read()
-        async with aiofiles.open(target_path, "wb") as target_file:
-            await target_file.write(content)
-        target_path.chmod(0o755)
+        # 经由内容寻址存储写入：同名目标可能是其他频道共享的硬链接，不能就地覆写
+        await asyncio.to_thread(upload_blob_store.store_file, host_path, target_path)
 
         logger.info(f"[附件发送] 文件复制到宿主机: {target_path}")
         logger.info(f"[附件发送] 参数 chat_key: {chat_key}")
@@ -36,6 +36,7 @@ from nekro_agent.api.plugin import (
 from nekro_agent.core.logger import logger
 from nekro_agent.models.db_chat_channel import DBChatChannel
 from nekro_agent.models.db_chat_message import DBChatMessage
+from nekro_agent.services.chat.history_search import ChatSearchQuery, chat_history_search
 
 plugin = NekroPlugin(
     name="漫游历史记录",
@@ -136,118 +137,30 @@ async def find_history_travel(_ctx: schemas.AgentCtx, chat_key: str, keywords: L
     conversation_start_time: datetime.datetime = db_chat_channel.conversation_start_time
     conversation_start_timestamp = int(conversation_start_time.timestamp())
 
-    # 安全地获取上下文截止时间点
-    # 首先获取最近的消息总数
-    total_messages = await DBChatMessage.filter(chat_key=chat_key).count()
-
-    context_cutoff_timestamp = 0
-    # 只有当消息数量超过上下文大小时才设置截止时间
-    if total_messages > core_config.AI_CHAT_CONTEXT_MAX_LENGTH:
-        # 获取上下文边界消息
-        oldest_context_message = (
-            await DBChatMessage.filter(chat_key=chat_key)
-            .order_by("-send_timestamp")  # 按时间降序排列
-            .offset(core_config.AI_CHAT_CONTEXT_MAX_LENGTH - 1)  # 跳过最近的N-1条
-            .limit(1)  # 只取一条
-            .first()
-        )
-
-        if oldest_context_message:
-            context_cutoff_timestamp = oldest_context_message.send_timestamp
-
-    # 分类关键词
-    or_keywords = []  # 或关系(默认)
-    and_keywords = []  # 与关系(必须包含)
-    not_keywords = []  # 非关系(必须排除)
-
-    for keyword in keywords:
-        if keyword.startswith("+"):
-            and_keywords.append(keyword[1:])
-        elif keyword.startswith("-"):
-            not_keywords.append(keyword[1:])
-        else:
-            or_keywords.append(keyword)
+    # 上下文窗口边界消息：仅当消息数量超过上下文大小时存在，其之后的消息已在上下文中，无需检索
+    oldest_context_message = (
+        await DBChatMessage.filter(chat_key=chat_key)
+        .order_by("-send_timestamp")
+        .offset(core_config.AI_CHAT_CONTEXT_MAX_LENGTH - 1)
+        .limit(1)
+        .first()
+    )
+    context_cutoff_timestamp = oldest_context_message.send_timestamp if oldest_context_message else None
 
-    logger.info(f"搜索聊天频道 {chat_key} 中的关键词，OR: {or_keywords}, AND: {and_keywords}, NOT: {not_keywords}")
+    query = ChatSearchQuery.parse(keywords)
+    logger.info(
+        f"搜索聊天频道 {chat_key} 中的关键词，OR: {query.or_keywords}, AND: {query.and_keywords}, NOT: {query.not_keywords}",
+    )
     logger.info(f"上下文截止时间戳: {context_cutoff_timestamp}")
 
-    # 构建基础查询
-    base_query = DBChatMessage.filter(
-        chat_key=chat_key,
-        send_timestamp__gte=conversation_start_timestamp,
+    relevant_messages = await chat_history_search.search_messages(
+        chat_key,
+        query,
+        start_timestamp=conversation_start_timestamp,
+        end_timestamp=context_cutoff_timestamp,
+        limit=config.MAX_HISTORY_TRAVEL_QUERY_SIZE,
     )
 
-    # 添加上下文截止时间条件
-    if context_cutoff_timestamp > 0:
-        base_query = base_query.filter(send_timestamp__lt=context_cutoff_timestamp)
-
-    # 处理OR关键词
-    db_chat_message_list = []
-    db_chat_msg_id_set = set()
-    keyword_match_count = {}  # 记录每条消息匹配的关键词数量
-
-    if or_keywords:
-        # 如果有OR关键词，先按OR关系查询
-        for keyword in or_keywords:
-            query = base_query.filter(content_text__icontains=keyword)
-
-            db_chat_message = await query.order_by("-update_time").limit(config.MAX_HISTORY_TRAVEL_QUERY_SIZE * 4).all()
-
-            # 记录每个关键词的结果数量
-            logger.info(f"OR关键词 '{keyword}' 匹配到 {len(db_chat_message)} 条消息")
-
-            for msg in db_chat_message:
-                if msg.id not in db_chat_msg_id_set:
-                    db_chat_message_list.append(msg)
-                    db_chat_msg_id_set.add(msg.id)
-                    keyword_match_count[msg.id] = 1
-                else:
-                    # 增加已存在消息的关键词匹配计数
-                    keyword_match_count[msg.id] = keyword_match_count.get(msg.id, 0) + 1
-    else:
-        # 如果没有OR关键词，则查询所有消息
-        db_chat_message = await base_query.order_by("-update_time").limit(config.MAX_HISTORY_TRAVEL_QUERY_SIZE * 4).all()
-        for msg in db_chat_message:
-            db_chat_message_list.append(msg)
-            db_chat_msg_id_set.add(msg.id)
-            keyword_match_count[msg.id] = 0
-
-    # 处理AND和NOT关键词进行过滤
-    filtered_messages = []
-    for msg in db_chat_message_list:
-        # 检查是否满足AND条件
-        and_match = True
-        for keyword in and_keywords:
-            if keyword.lower() not in msg.content_text.lower():
-                and_match = False
-                break
-
-        if not and_match:
-            continue
-
-        # 检查是否满足NOT条件
-        not_match = False
-        for keyword in not_keywords:
-            if keyword.lower() in msg.content_text.lower():
-                not_match = True
-                break
-
-        if not_match:
-            continue
-
-        # 通过了所有条件，添加到结果
-        filtered_messages.append(msg)
-
-        # 更新匹配分数 - AND关键词匹配增加更高权重
-        for keyword in and_keywords:
-            if keyword.lower() in msg.content_text.lower():
-                keyword_match_count[msg.id] = keyword_match_count.get(msg.id, 0) + 2
-
-    # 先按关键词匹配数量和更新时间排序，选出最相关的消息
-    relevant_messages = sorted(filtered_messages, key=lambda x: (-keyword_match_count.get(x.id, 0), x.update_time))[
-        : config.MAX_HISTORY_TRAVEL_QUERY_SIZE
-    ]
-
     # 最后按发送时间戳从早到晚排序，确保消息按时间顺序呈现
     result_messages = sorted(relevant_messages, key=lambda x: x.send_timestamp)
 
@@ -256,10 +169,7 @@ async def find_history_travel(_ctx: schemas.AgentCtx, chat_key: str, keywords: L
 
     # 如果没有找到任何结果，返回特殊提示
     if not result_messages:
-        not_msg = f", NOT: {', '.join(not_keywords)}" if not_keywords else ""
-        and_msg = f", AND: {', '.join(and_keywords)}" if and_keywords else ""
-        or_msg = f"OR: {', '.join(or_keywords)}" if or_keywords else "no keywords"
-        return f"[No messages found matching {or_msg}{and_msg}{not_msg}]"
+        return f"[No messages found matching {query.describe()}]"
 
     additional_info = f"\n\n[Query {len(result_messages)} messages. You NEED to use the 'find_history_travel_range' method to get more context around a specific message. DO NOT GUESS THE EXACT CONTEXT ACCORDING TO THE SIMPLIFIED MESSAGE.]"
 
@@ -0,0 +1,15 @@
+"""测试公共夹具。"""
+
+from pathlib import Path
+
+import pytest
+
+from nekro_agent.core.os_env import OsEnv
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """适配器等组件在实例化时按 `OsEnv.DATA_DIR` 写出配置文件，测试中改到临时目录，避免污染仓库的 ./data"""
+    data_dir = tmp_path / "nekro_agent_data"
+    monkeypatch.setattr(OsEnv, "DATA_DIR", str(data_dir))
+    return data_dir
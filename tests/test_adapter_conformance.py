@@ -0,0 +1,617 @@
+"""适配器一致性与吞吐回归测试。
+
+每个适配器挂在一个本地假平台上（HTTP 接口用 httpx.MockTransport 模拟，SDK 接口用假客户端替换，
+OneBot V11 直接构造 NoneBot 事件交给消息匹配器，SSE 在进程内注册客户端并消费其事件队列），
+将录制的入站事件语料逐条回放到适配器的入站入口，截获 `collect_message` 的输入并与期望的标准化
+`PlatformMessage` 比对；同时统计入站 events/sec 与出站 sends/sec，低于下限视为性能回退。
+新增适配器时实现一个 `_AdapterRig` 并登记到 `RIGS` 即可纳入同一套检查。
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import pytest
+from nonebot.adapters.onebot.v11 import GroupMessageEvent, PrivateMessageEvent
+from tortoise import Tortoise
+
+from nekro_agent import adapters as adapters_module
+from nekro_agent.adapters.feishu import message_processor as feishu_processor_module
+from nekro_agent.adapters.feishu.adapter import FeishuAdapter
+from nekro_agent.adapters.feishu.client import FeishuClient
+from nekro_agent.adapters.interface.base import BaseAdapter
+from nekro_agent.adapters.interface.schemas.platform import (
+    PlatformChannel,
+    PlatformMessage,
+    PlatformSendRequest,
+    PlatformSendSegment,
+    PlatformSendSegmentType,
+    PlatformUser,
+)
+from nekro_agent.adapters.onebot_v11 import adapter as onebot_adapter_module
+from nekro_agent.adapters.onebot_v11.adapter import OnebotV11Adapter
+from nekro_agent.adapters.onebot_v11.matchers import message as onebot_matcher_module
+from nekro_agent.adapters.onebot_v11.tools import onebot_util as onebot_util_module
+from nekro_agent.adapters.onebot_v11.tools.group_member_cache import GroupMemberDirectory
+from nekro_agent.adapters.sse import commands as sse_commands_module
+from nekro_agent.adapters.sse.adapter import SSEAdapter
+from nekro_agent.adapters.sse.sdk.models import (
+    ChannelSubscribeRequest,
+    ReceiveMessage,
+    RegisterRequest,
+    RequestType,
+    TextSegment,
+)
+from nekro_agent.adapters.sse.sdk.models import Response as SseResponse
+from nekro_agent.adapters.wechat_openilink import adapter as openilink_adapter_module
+from nekro_agent.adapters.wechat_openilink.adapter import WeChatOpenILinkAdapter
+from nekro_agent.adapters.wxwork import corp_app as corp_app_module
+from nekro_agent.adapters.wxwork_corp_app import adapter as corp_app_adapter_module
+from nekro_agent.adapters.wxwork_corp_app.adapter import WxWorkCorpAppAdapter
+from nekro_agent.models.db_chat_channel import DBChatChannel
+from nekro_agent.schemas.chat_message import ChatMessageSegmentType, ChatType
+from nekro_agent.services.perf_metrics import perf_metrics
+
+# 吞吐门限：假平台无网络开销，正常实现远高于此值，仅用于捕获数量级的性能回退
+INBOUND_MIN_EVENTS_PER_SECOND = 100
+OUTBOUND_MIN_SENDS_PER_SECOND = 50
+LOAD_INBOUND_EVENTS = 300
+LOAD_OUTBOUND_SENDS = 100
+
+
+@dataclass
+class _Expected:
+    channel_id: str
+    channel_type: ChatType
+    message_id: str
+    sender_id: str
+    content_text: str
+    is_tome: bool
+
+
+@dataclass
+class _Collected:
+    channel: PlatformChannel
+    user: PlatformUser
+    message: PlatformMessage
+
+
+class _AdapterRig(ABC):
+    """单个适配器与其假平台的组合"""
+
+    name: str
+    adapter: BaseAdapter
+    # 以 `from ... import collect_message` 方式引用收集器的模块
+    collector_modules: Tuple[Any, ...] = ()
+    # 平台回执是否携带消息 ID
+    reports_message_id: bool = True
+
+    def __init__(self) -> None:
+        self.collected: List[_Collected] = []
+        self.sent: List[Dict[str, Any]] = []
+
+    async def record(
+        self,
+        adapter: BaseAdapter,
+        platform_channel: PlatformChannel,
+        platform_user: PlatformUser,
+        platform_message: PlatformMessage,
+    ) -> None:
+        assert adapter is self.adapter
+        self.collected.append(_Collected(platform_channel, platform_user, platform_message))
+
+    @abstractmethod
+    def event(self, index: int) -> Tuple[Any, Optional[_Expected]]:
+        """第 index 条入站事件及其期望结果，期望为 None 表示该事件应被忽略"""
+
+    @abstractmethod
+    async def deliver(self, raw: Any) -> None:
+        """将一条入站事件交给适配器的入站入口"""
+
+    @abstractmethod
+    def outbound(self, index: int) -> Tuple[str, str]:
+        """第 index 次出站发送的 chat_key 及假平台应收到的目标 ID"""
+
+    @abstractmethod
+    def sent_text(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        """从假平台记录的发送请求中取出 (目标, 文本)"""
+
+    async def start(self) -> None:
+        """收集器替换完成后调用，用于准备数据库或启动进程内客户端"""
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class _WxWorkCorpAppRig(_AdapterRig):
+    """企业微信自建应用：回调 XML 入站，qyapi HTTP 出站"""
+
+    name = "wxwork_corp_app"
+    collector_modules = (corp_app_adapter_module,)
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        super().__init__()
+        transport = httpx.MockTransport(self._handle)
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            corp_app_module.httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=transport, **kwargs),
+        )
+        # 发送间隔用于遵守平台频控，对假平台没有意义
+        monkeypatch.setattr(corp_app_adapter_module, "WXWORK_CORP_APP_SEND_INTERVAL_SECONDS", 0)
+        self.adapter = adapter = WxWorkCorpAppAdapter()
+        monkeypatch.setattr(adapter.config, "CORP_ID", "corp")
+        monkeypatch.setattr(adapter.config, "CORP_APP_SECRET", "secret")
+        monkeypatch.setattr(adapter.config, "CORP_APP_AGENT_ID", "1000002")
+        monkeypatch.setattr(adapter.config, "CORP_API_BASE_URL", "https://qyapi.test")
+        monkeypatch.setattr(adapter.config, "ENABLE_TEXT_MESSAGE_COLLECTION", True)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/cgi-bin/gettoken":
+            return httpx.Response(200, json={"errcode": 0, "access_token": "token", "expires_in": 7200})
+        if request.url.path == "/cgi-bin/message/send":
+            self.sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"errcode": 0, "errmsg": "ok", "msgid": f"msg{len(self.sent)}"})
+        return httpx.Response(404, json={"errcode": 404, "errmsg": "not found"})
+
+    def event(self, index: int) -> Tuple[Any, Optional[_Expected]]:
+        if index % 4 == 3:
+            xml = (
+                "<xml><ToUserName>corp</ToUserName><FromUserName>sys</FromUserName>"
+                "<MsgType>event</MsgType><Event>enter_agent</Event></xml>"
+            )
+            return xml, None
+        user = f"user{index % 3}"
+        xml = (
+            f"<xml><ToUserName>corp</ToUserName><FromUserName>{user}</FromUserName>"
+            f"<CreateTime>1700000000</CreateTime><MsgType>text</MsgType>"
+            f"<Content><![CDATA[你好 {index}]]></Content><MsgId>{index}</MsgId><AgentID>1000002</AgentID></xml>"
+        )
+        return xml, _Expected(
+            channel_id=f"private_{user}",
+            channel_type=ChatType.PRIVATE,
+            message_id=str(index),
+            sender_id=user,
+            content_text=f"你好 {index}",
+            is_tome=True,
+        )
+
+    async def deliver(self, raw: Any) -> None:
+        await self.adapter.handle_corp_app_callback(
+            decrypted_xml=raw,
+            raw_body="",
+            msg_signature="",
+            timestamp="",
+            nonce="",
+        )
+
+    def outbound(self, index: int) -> Tuple[str, str]:
+        return f"wxwork_corp_app-private_user{index % 3}", f"user{index % 3}"
+
+    def sent_text(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        return payload["touser"], payload["text"]["content"]
+
+
+class _FeishuRig(_AdapterRig):
+    """飞书：事件回调入站，OpenAPI HTTP 出站"""
+
+    name = "feishu"
+    collector_modules = (feishu_processor_module,)
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        super().__init__()
+        self.adapter = adapter = FeishuAdapter()
+        client = FeishuClient("app", "secret", adapter, transport=httpx.MockTransport(self._handle))
+        client._bot_info = PlatformUser(platform_name="feishu", user_id="ou_bot", user_name="bot")
+        adapter.client = client
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/tenant_access_token/internal"):
+            return httpx.Response(200, json={"code": 0, "tenant_access_token": "t", "expire": 7200})
+        if path.startswith("/open-apis/contact/v3/users/"):
+            open_id = path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={"code": 0, "data": {"user": {"open_id": open_id, "name": f"name_{open_id}"}}})
+        if path.startswith("/open-apis/im/v1/chats/"):
+            return httpx.Response(200, json={"code": 0, "data": {"name": "测试群"}})
+        if path == "/open-apis/im/v1/messages":
+            body = json.loads(request.content)
+            body["receive_id_type"] = request.url.params["receive_id_type"]
+            self.sent.append(body)
+            return httpx.Response(200, json={"code": 0, "data": {"message_id": f"om_{len(self.sent)}"}})
+        return httpx.Response(404, json={"code": 1, "msg": "not found"})
+
+    def event(self, index: int) -> Tuple[Any, Optional[_Expected]]:
+        sender = f"ou_{index % 3}"
+        if index % 4 == 3:
+            # 机器人自身发出的消息不进入收集器
+            sender = "ou_bot"
+        group = index % 2 == 1
+        mentions = [{"key": "@_user_1", "id": {"open_id": "ou_bot"}, "name": "bot"}] if group else []
+        text = f"@_user_1 hello {index}" if group else f"hello {index}"
+        event = {
+            "sender": {"sender_id": {"open_id": sender}, "sender_type": "user"},
+            "message": {
+                "message_id": f"om_in_{index}",
+                "chat_id": "oc_group",
+                "chat_type": "group" if group else "p2p",
+                "message_type": "text",
+                "content": json.dumps({"text": text}),
+                "mentions": mentions,
+            },
+        }
+        if sender == "ou_bot":
+            return event, None
+        return event, _Expected(
+            channel_id="group_oc_group" if group else f"private_{sender}",
+            channel_type=ChatType.GROUP if group else ChatType.PRIVATE,
+            message_id=f"om_in_{index}",
+            sender_id=sender,
+            content_text=f"hello {index}",
+            is_tome=True,
+        )
+
+    async def deliver(self, raw: Any) -> None:
+        assert isinstance(self.adapter, FeishuAdapter) and self.adapter.client is not None
+        await feishu_processor_module.handle_message(self.adapter.client, self.adapter, raw)
+
+    def outbound(self, index: int) -> Tuple[str, str]:
+        return f"feishu-private_ou_{index % 3}", f"ou_{index % 3}"
+
+    def sent_text(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        assert payload["receive_id_type"] == "open_id" and payload["msg_type"] == "text"
+        return payload["receive_id"], json.loads(payload["content"])["text"]
+
+    async def close(self) -> None:
+        assert isinstance(self.adapter, FeishuAdapter) and self.adapter.client is not None
+        await self.adapter.client.stop()
+
+
+class _FakeWeChatBotClient:
+    """替代 wechatbot-sdk 的假客户端，记录发出的文本"""
+
+    def __init__(self, sent: List[Dict[str, Any]]) -> None:
+        self.sent = sent
+
+    async def send_text(self, to_user_id: str, text: str, ref_msg: Any = None) -> str:
+        self.sent.append({"to_user_id": to_user_id, "text": text})
+        return f"wx_out_{len(self.sent)}"
+
+
+class _WeChatOpenILinkRig(_AdapterRig):
+    """微信 OpenILink：SDK 回调入站，SDK 客户端出站"""
+
+    name = "wechat_openilink"
+    collector_modules = (openilink_adapter_module,)
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        super().__init__()
+        self.adapter = adapter = WeChatOpenILinkAdapter()
+        adapter.client = _FakeWeChatBotClient(self.sent)  # type: ignore[assignment]
+        adapter.message_processor.set_self_user_id("wxid_bot")
+
+    def event(self, index: int) -> Tuple[Any, Optional[_Expected]]:
+        user = f"wxid_u{index % 3}"
+        if index % 4 == 3:
+            # 没有内容的消息被解析器丢弃
+            return {"user_id": user, "message_id": f"wx_in_{index}", "type": "text", "text": ""}, None
+        group = index % 2 == 1
+        raw: Dict[str, Any] = {"user_id": user, "message_id": f"wx_in_{index}", "type": "text", "text": f"hi {index}"}
+        if group:
+            raw.update(group_id="room1", is_mention_bot=True)
+        return raw, _Expected(
+            channel_id="group_room1" if group else f"private_{user.replace('_', '__')}",
+            channel_type=ChatType.GROUP if group else ChatType.PRIVATE,
+            message_id=f"wx_in_{index}",
+            sender_id=user,
+            content_text=f"hi {index}",
+            is_tome=True,
+        )
+
+    async def deliver(self, raw: Any) -> None:
+        assert isinstance(self.adapter, WeChatOpenILinkAdapter)
+        await self.adapter._handle_inbound_message(raw)
+
+    def outbound(self, index: int) -> Tuple[str, str]:
+        return f"wechat_openilink-private_wxid__u{index % 3}", f"wxid_u{index % 3}"
+
+    def sent_text(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        return payload["to_user_id"], payload["text"]
+
+
+async def _open_channel_db(adapter_key: str, channel_ids: List[str]) -> None:
+    """出站时适配器从数据库反查频道，预先建好内存库与出站目标频道"""
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["nekro_agent.models.db_chat_channel", "nekro_agent.models.db_preset"]},
+    )
+    await Tortoise.generate_schemas()
+    for channel_id in channel_ids:
+        await DBChatChannel.get_or_create(adapter_key, channel_id, ChatType.PRIVATE)
+
+
+class _FakeOneBot:
+    """替代 OneBot V11 协议端的假 Bot，只实现适配器用到的接口"""
+
+    self_id = "10000"
+
+    def __init__(self, sent: List[Dict[str, Any]]) -> None:
+        self.sent = sent
+
+    async def get_group_member_list(self, group_id: int) -> List[Dict[str, Any]]:
+        return [{"user_id": 10000 + i, "card": f"群名片{i}", "nickname": f"qq{i}"} for i in range(1, 4)]
+
+    async def get_group_info(self, group_id: int) -> Dict[str, Any]:
+        return {"group_id": group_id, "group_name": "测试群"}
+
+    async def get_stranger_info(self, user_id: int) -> Dict[str, Any]:
+        return {"user_id": user_id, "nickname": f"qq{user_id}"}
+
+    async def send_private_msg(self, user_id: int, message: Any, auto_escape: bool = False) -> Dict[str, Any]:
+        self.sent.append({"user_id": user_id, "message": message})
+        return {"message_id": len(self.sent)}
+
+    async def send_group_msg(self, group_id: int, message: Any, auto_escape: bool = False) -> Dict[str, Any]:
+        self.sent.append({"group_id": group_id, "message": message})
+        return {"message_id": len(self.sent)}
+
+
+class _CapturedMatcher:
+    """替代 `on_message` / `on_notice` 的返回值，截获注册的处理函数"""
+
+    def __init__(self, handlers: List[Callable[..., Any]]) -> None:
+        self.handlers = handlers
+
+    def handle(self) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.handlers.append(func)
+            return func
+
+        return decorator
+
+
+class _OnebotV11Rig(_AdapterRig):
+    """OneBot V11：直接构造 NoneBot 事件交给消息匹配器，假 Bot 出站"""
+
+    name = "onebot_v11"
+    collector_modules = (onebot_matcher_module,)
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        super().__init__()
+        self.adapter = adapter = OnebotV11Adapter()
+        self.bot = _FakeOneBot(self.sent)
+        monkeypatch.setattr(onebot_adapter_module, "get_bot", lambda: self.bot)
+        monkeypatch.setattr(onebot_util_module, "group_member_directory", GroupMemberDirectory())
+        handlers: List[Callable[..., Any]] = []
+        monkeypatch.setattr(onebot_matcher_module, "on_message", lambda **_: _CapturedMatcher(handlers))
+        monkeypatch.setattr(onebot_matcher_module, "on_notice", lambda **_: _CapturedMatcher([]))
+        onebot_matcher_module.register_matcher(adapter)
+        (self.handle_message,) = handlers
+
+    async def start(self) -> None:
+        await _open_channel_db(self.adapter.key, [f"private_{10001 + index}" for index in range(3)])
+
+    def event(self, index: int) -> Tuple[Any, Optional[_Expected]]:
+        user_id = 10001 + index % 3
+        group = index % 2 == 1
+        # 命中忽略前缀的消息不进入收集器
+        text = f"# 调试 {index}" if index % 4 == 3 else f"你好 {index}"
+        raw: Dict[str, Any] = {
+            "time": 1700000000,
+            "self_id": 10000,
+            "post_type": "message",
+            "sub_type": "normal" if group else "friend",
+            "message_type": "group" if group else "private",
+            "message_id": 5000 + index,
+            "user_id": user_id,
+            "message": [{"type": "text", "data": {"text": text}}],
+            "raw_message": text,
+            "font": 0,
+            "sender": {"user_id": user_id, "nickname": f"qq{user_id}"},
+            # 私聊消息总是与机器人相关，群聊未 @ 机器人
+            "to_me": not group,
+        }
+        if group:
+            raw["group_id"] = 20000
+        event = GroupMessageEvent.model_validate(raw) if group else PrivateMessageEvent.model_validate(raw)
+        if index % 4 == 3:
+            return event, None
+        return event, _Expected(
+            channel_id="group_20000" if group else f"private_{user_id}",
+            channel_type=ChatType.GROUP if group else ChatType.PRIVATE,
+            message_id=str(5000 + index),
+            sender_id=str(user_id),
+            content_text=text,
+            is_tome=not group,
+        )
+
+    async def deliver(self, raw: Any) -> None:
+        await self.handle_message(None, raw, self.bot)
+
+    def outbound(self, index: int) -> Tuple[str, str]:
+        return f"onebot_v11-private_{10001 + index % 3}", str(10001 + index % 3)
+
+    def sent_text(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        return str(payload["user_id"]), payload["message"].extract_plain_text()
+
+    async def close(self) -> None:
+        await Tortoise.close_connections()
+
+
+class _SseRig(_AdapterRig):
+    """SSE：进程内注册客户端，经命令处理器入站，客户端事件队列出站并回执"""
+
+    name = "sse"
+    collector_modules = (sse_commands_module,)
+    # SSE 客户端回执只有成败，不携带消息 ID
+    reports_message_id = False
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        super().__init__()
+        # 适配器构造时会改写命令模块的全局客户端管理器，测试结束后恢复
+        monkeypatch.setattr(sse_commands_module, "client_manager", None, raising=False)
+        self.adapter = SSEAdapter()
+        self.client_id = ""
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await _open_channel_db(self.adapter.key, [f"private_u{index}" for index in range(3)])
+        registered = await sse_commands_module.handle_register(
+            RegisterRequest(platform="test", client_name="conformance", client_version="1.0"),
+        )
+        self.client_id = registered.client_id
+        await sse_commands_module.handle_subscribe(
+            ChannelSubscribeRequest(channel_ids=["group_room", *(f"private_u{i}" for i in range(3))]),
+            self.client_id,
+        )
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def _consume(self) -> None:
+        """模拟 SSE 客户端：读取推送事件并立即回执，频道信息请求返回固定名称"""
+        assert isinstance(self.adapter, SSEAdapter)
+        client = self.adapter.client_manager.get_client(self.client_id)
+        assert client is not None
+        while True:
+            event = await client.event_queue.get()
+            data: Dict[str, Any] = {}
+            if event.event == RequestType.SEND_MESSAGE.value:
+                self.sent.append(event.data.data)
+            elif event.event == RequestType.GET_CHANNEL_INFO.value:
+                data = {"channel_id": event.data.data["channel_id"], "channel_name": "测试频道"}
+            else:
+                continue
+            await sse_commands_module.handle_response(
+                SseResponse(request_id=event.data.request_id, success=True, data=data),
+                self.client_id,
+            )
+
+    def event(self, index: int) -> Tuple[Any, Optional[_Expected]]:
+        group = index % 2 == 1
+        channel_id = "group_room" if group else f"private_u{index % 3}"
+        message = ReceiveMessage(
+            msg_id=f"sse_in_{index}",
+            from_id=f"u{index % 3}",
+            from_name=f"name{index % 3}",
+            # SSE 不过滤消息，未 @ 机器人的消息同样收集且 is_tome 为 False
+            is_to_me=index % 4 != 3,
+            channel_id=channel_id,
+            channel_name="测试频道",
+            platform_name="test",
+            segments=[TextSegment(content=f"hey {index}")],
+        )
+        return message, _Expected(
+            channel_id=channel_id,
+            # SSE 协议不区分私聊，频道类型固定为群聊
+            channel_type=ChatType.GROUP,
+            message_id=f"sse_in_{index}",
+            sender_id=f"u{index % 3}",
+            content_text=f"hey {index}",
+            is_tome=index % 4 != 3,
+        )
+
+    async def deliver(self, raw: Any) -> None:
+        await sse_commands_module.handle_message(
+            sse_commands_module.MessageCommand(channel_id=raw.channel_id, message=raw),
+            self.client_id,
+        )
+
+    def outbound(self, index: int) -> Tuple[str, str]:
+        return f"sse-private_u{index % 3}", f"private_u{index % 3}"
+
+    def sent_text(self, payload: Dict[str, Any]) -> Tuple[str, str]:
+        return payload["channel_id"], payload["segments"][0]["content"]
+
+    async def close(self) -> None:
+        if self._consumer is not None:
+            self._consumer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._consumer
+        await Tortoise.close_connections()
+
+
+RIGS: Dict[str, Callable[[pytest.MonkeyPatch], _AdapterRig]] = {
+    "wxwork_corp_app": _WxWorkCorpAppRig,
+    "feishu": _FeishuRig,
+    "wechat_openilink": _WeChatOpenILinkRig,
+    "onebot_v11": _OnebotV11Rig,
+    "sse": _SseRig,
+}
+
+
+@pytest.fixture(params=sorted(RIGS))
+async def rig(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    instance = RIGS[request.param](monkeypatch)
+    # 频道模型与消息转换器经 `adapter_utils.get_adapter` 反查适配器实例
+    monkeypatch.setitem(adapters_module.loaded_adapters, instance.adapter.key, instance.adapter)
+    for module in instance.collector_modules:
+        monkeypatch.setattr(module, "collect_message", instance.record)
+    await instance.start()
+    yield instance
+    await instance.close()
+
+
+def _text_request(chat_key: str, text: str) -> PlatformSendRequest:
+    return PlatformSendRequest(
+        chat_key=chat_key,
+        segments=[PlatformSendSegment(type=PlatformSendSegmentType.TEXT, content=text)],
+    )
+
+
+async def test_inbound_corpus_is_normalized_and_outbound_reaches_platform(rig: _AdapterRig) -> None:
+    expected: List[_Expected] = []
+    for index in range(8):
+        raw, expect = rig.event(index)
+        await rig.deliver(raw)
+        if expect is not None:
+            expected.append(expect)
+
+    assert len(rig.collected) == len(expected)
+    for got, expect in zip(rig.collected, expected):
+        assert got.channel.channel_id == expect.channel_id
+        assert got.channel.channel_type == expect.channel_type
+        assert got.user.user_id == expect.sender_id
+        assert got.message.message_id == expect.message_id
+        assert got.message.sender_id == expect.sender_id
+        assert got.message.content_text == expect.content_text
+        assert got.message.is_tome is expect.is_tome
+        texts = [seg.text.strip() for seg in got.message.content_data if seg.type == ChatMessageSegmentType.TEXT.value]
+        assert texts == [expect.content_text]
+
+    chat_key, target = rig.outbound(1)
+    response = await rig.adapter.forward_message(_text_request(chat_key, "回复内容"))
+    assert response.success is True, response.error_message
+    assert bool(response.message_id) is rig.reports_message_id
+    assert rig.sent_text(rig.sent[-1]) == (target, "回复内容")
+
+
+async def test_throughput_gate(rig: _AdapterRig, record_property: Callable[[str, object], None]) -> None:
+    events = [rig.event(index) for index in range(LOAD_INBOUND_EVENTS)]
+    started = time.perf_counter()
+    for raw, _ in events:
+        await rig.deliver(raw)
+    inbound_elapsed = time.perf_counter() - started
+    assert len(rig.collected) == sum(1 for _, expect in events if expect is not None)
+
+    started = time.perf_counter()
+    for index in range(LOAD_OUTBOUND_SENDS):
+        response = await rig.adapter.forward_message(_text_request(rig.outbound(index)[0], f"load {index}"))
+        assert response.success is True, response.error_message
+    outbound_elapsed = time.perf_counter() - started
+    assert len(rig.sent) == LOAD_OUTBOUND_SENDS
+
+    events_per_second = LOAD_INBOUND_EVENTS / inbound_elapsed
+    sends_per_second = LOAD_OUTBOUND_SENDS / outbound_elapsed
+    perf_metrics.observe(f"adapter.{rig.name}.inbound_event", inbound_elapsed * 1000 / LOAD_INBOUND_EVENTS)
+    perf_metrics.observe(f"adapter.{rig.name}.outbound_send", outbound_elapsed * 1000 / LOAD_OUTBOUND_SENDS)
+    record_property("inbound_events_per_second", round(events_per_second, 1))
+    record_property("outbound_sends_per_second", round(sends_per_second, 1))
+
+    assert events_per_second >= INBOUND_MIN_EVENTS_PER_SECOND
+    assert sends_per_second >= OUTBOUND_MIN_SENDS_PER_SECOND
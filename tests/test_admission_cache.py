@@ -0,0 +1,86 @@
+"""消息准入缓存回归测试。"""
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from nekro_agent.core.core_utils import ConfigManager
+from nekro_agent.services import admission_cache as module
+from nekro_agent.services.admission_cache import AdmissionCache, TTLCache
+from nekro_agent.services.config_resolver import ConfigResolver
+
+
+def test_ttl_cache_expires_and_evicts(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 100.0
+    monkeypatch.setattr(module.time, "monotonic", lambda: now)
+
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # 容量超限时淘汰最久未访问的条目（"a" 刚被访问过，淘汰 "b"）
+    cache.set("c", 3)
+    assert cache.get("b", None) is None
+    assert cache.get("a") == 1
+
+    now = 111.0
+    assert cache.get("a", None) is None
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_preset_lookup_is_cached_until_invalidated(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups: list[int] = []
+
+    async def fake_get_or_none(**kwargs: Any) -> None:
+        lookups.append(kwargs["id"])
+
+    monkeypatch.setattr(module.DBPreset, "get_or_none", fake_get_or_none)
+    cache = AdmissionCache()
+
+    assert await cache.get_preset(7) is None
+    assert await cache.get_preset(7) is None
+    assert lookups == [7], "不存在的人设也应被缓存，避免每条消息重复查询"
+
+    cache.invalidate_preset(7)
+    await cache.get_preset(7)
+    assert lookups == [7, 7]
+
+
+@pytest.mark.asyncio
+async def test_user_lookup_skips_caching_unregistered_user(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups = 0
+
+    async def fake_get_by_union_id(**kwargs: Any) -> None:
+        nonlocal lookups
+        del kwargs
+        lookups += 1
+
+    monkeypatch.setattr(module.DBUser, "get_by_union_id", fake_get_by_union_id)
+    cache = AdmissionCache()
+
+    assert await cache.get_user("onebot_v11", "10001") is None
+    assert await cache.get_user("onebot_v11", "10001") is None
+    assert lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_effective_config_cache_follows_config_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    resolved: list[str] = []
+
+    def fake_resolve(self: ConfigResolver, chat_key: str) -> Any:
+        resolved.append(chat_key)
+        return SimpleNamespace(chat_key=chat_key)
+
+    monkeypatch.setattr(ConfigResolver, "_resolve_effective_config", fake_resolve)
+    resolver = ConfigResolver()
+
+    first = await resolver.get_effective_config("onebot_v11-group_1")
+    assert await resolver.get_effective_config("onebot_v11-group_1") is first
+    assert resolved == ["onebot_v11-group_1"]
+
+    ConfigManager.bump_version()
+    assert await resolver.get_effective_config("onebot_v11-group_1") is not first
+    assert len(resolved) == 2
@@ -0,0 +1,75 @@
+"""Agent 上下文并行构建与记忆批量召回回归测试。"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from nekro_agent.services.agent import run_agent
+from nekro_agent.services.agent.templates import history
+from nekro_agent.services.memory import embedding_service, retriever
+from nekro_agent.services.memory.recall_contract import MemoryRecallPlan, MemoryRecallQuerySpec
+
+
+def _memory(target_id: int, weight: float) -> Any:
+    return SimpleNamespace(source_type="paragraph", target_id=target_id, effective_weight=weight)
+
+
+async def test_recall_queries_share_one_embedding_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    plan = MemoryRecallPlan(
+        queries=[
+            MemoryRecallQuerySpec(query_text="q1"),
+            MemoryRecallQuerySpec(query_text="q2", importance=2.0),
+            MemoryRecallQuerySpec(query_text="q3"),
+        ],
+    )
+    embed_calls: List[List[str]] = []
+    searches: Dict[str, Any] = {}
+    running = peak = 0
+
+    async def fake_plan(recent_messages: Any) -> MemoryRecallPlan:
+        return plan
+
+    async def fake_embed_batch(texts: List[str]) -> List[Any]:
+        embed_calls.append(texts)
+        return [[float(i)] for i in range(len(texts) - 1)] + [None]
+
+    async def fake_retrieve(*, query: str, query_embedding: Any, **_: Any) -> List[Any]:
+        nonlocal running, peak
+        searches[query] = query_embedding
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return [_memory(1, 1.0), _memory(int(query[1]) + 1, 0.5)]
+
+    async def fake_compile(*, memories: List[Any], **_: Any) -> str:
+        return ",".join(f"{m.target_id}:{m.effective_weight}" for m in memories)
+
+    monkeypatch.setattr(history, "is_memory_system_enabled", lambda: True)
+    monkeypatch.setattr(history, "_build_memory_recall_plan", fake_plan)
+    monkeypatch.setattr(embedding_service, "embed_batch", fake_embed_batch)
+    monkeypatch.setattr(retriever, "retrieve_memories", fake_retrieve)
+    monkeypatch.setattr(retriever, "compile_memories_for_context", fake_compile)
+
+    context = await history._inject_memory_context(workspace_id=1, recent_messages=[], max_length=100)
+
+    assert embed_calls == [["q1", "q2", "q3"]]
+    # 合并请求中失败的语句交由检索器自行向量化
+    assert searches == {"q1": [0.0], "q2": [1.0], "q3": None}
+    assert peak == 3
+    # 同一记忆取加权后的最高分
+    assert context.startswith("1:2.0,3:1.0")
+
+
+async def test_timed_stage_records_duration_even_on_failure() -> None:
+    timings: Dict[str, float] = {}
+
+    async def fail() -> None:
+        raise RuntimeError("boom")
+
+    assert await run_agent._timed_stage(timings, "ok", asyncio.sleep(0, result=3)) == 3
+    with pytest.raises(RuntimeError):
+        await run_agent._timed_stage(timings, "failed", fail())
+    assert set(timings) == {"ok", "failed"}
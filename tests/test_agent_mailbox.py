@@ -0,0 +1,174 @@
+"""频道信箱调度器回归测试。"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from nekro_agent.schemas.chat_message import ChatMessage
+from nekro_agent.services.agent_mailbox import ChannelMailboxScheduler
+from nekro_agent.services.agent_run_scheduler import AgentRunScheduler, RunPriority, RunTicket
+
+
+def _message(chat_key: str, text: str) -> ChatMessage:
+    message = ChatMessage.create_empty(chat_key)
+    message.content_text = text
+    return message
+
+
+class _Recorder:
+    def __init__(self, run_seconds: float = 0.0) -> None:
+        self.run_seconds = run_seconds
+        self.runs: list[tuple[str, Optional[str]]] = []
+        self.running = 0
+        self.peak = 0
+        self.started = asyncio.Event()
+
+    async def __call__(self, chat_key: str, message: Optional[ChatMessage], ctx: Any) -> None:
+        self.runs.append((chat_key, message.content_text if message else None))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.started.set()
+        try:
+            await asyncio.sleep(self.run_seconds)
+        finally:
+            self.running -= 1
+
+
+def _scheduler(recorder: _Recorder, debounce: float = 0.0, max_runs: int = 0, **kwargs: Any) -> ChannelMailboxScheduler:
+    async def debounce_seconds(chat_key: str) -> float:
+        return debounce
+
+    async def ticket_of(chat_key: str, priority: RunPriority) -> RunTicket:
+        return RunTicket(chat_key=chat_key, adapter_key=chat_key.split("-", 1)[0], priority=priority)
+
+    return ChannelMailboxScheduler(
+        runner=recorder,
+        debounce_seconds=debounce_seconds,
+        ticket_of=ticket_of,
+        run_scheduler=AgentRunScheduler(lambda: max_runs),
+        **kwargs,
+    )
+
+
+async def _drain(scheduler: ChannelMailboxScheduler, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while any(scheduler.is_running(k) or scheduler.has_pending(k) for k in scheduler.active_channels()):
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+async def test_burst_is_debounced_into_single_run() -> None:
+    recorder = _Recorder()
+    scheduler = _scheduler(recorder, debounce=0.05)
+    for i in range(20):
+        scheduler.submit("qq-1", _message("qq-1", f"m{i}"))
+        await asyncio.sleep(0.005)
+    await _drain(scheduler)
+    assert recorder.runs == [("qq-1", "m19")]
+    await scheduler.stop()
+
+
+async def test_triggers_during_run_coalesce_into_one_follow_up() -> None:
+    recorder = _Recorder(run_seconds=0.05)
+    scheduler = _scheduler(recorder)
+    scheduler.submit("qq-1", _message("qq-1", "first"))
+    await recorder.started.wait()
+    for i in range(5):
+        scheduler.submit("qq-1", _message("qq-1", f"during{i}"))
+    await _drain(scheduler)
+    assert recorder.runs == [("qq-1", "first"), ("qq-1", "during4")]
+
+    # 空消息触发以 None 传给执行器
+    scheduler.submit("qq-1")
+    await _drain(scheduler)
+    assert recorder.runs[-1] == ("qq-1", None)
+    await scheduler.stop()
+
+
+async def test_cancel_running_keeps_pending_trigger() -> None:
+    recorder = _Recorder(run_seconds=10)
+    scheduler = _scheduler(recorder)
+    scheduler.submit("qq-1", _message("qq-1", "long"))
+    await recorder.started.wait()
+    scheduler.submit("qq-1", _message("qq-1", "next"))
+
+    assert scheduler.cancel_running("qq-1")
+    recorder.run_seconds = 0
+    await _drain(scheduler)
+    assert recorder.runs == [("qq-1", "long"), ("qq-1", "next")]
+    assert not scheduler.cancel_running("qq-1")
+    await scheduler.stop()
+
+
+async def test_global_cap_and_idle_eviction() -> None:
+    recorder = _Recorder(run_seconds=0.02)
+    scheduler = _scheduler(recorder, max_runs=2, idle_seconds=0.05)
+    for i in range(6):
+        scheduler.submit(f"qq-{i}", _message(f"qq-{i}", "hi"))
+    await _drain(scheduler)
+    assert recorder.peak == 2 and len(recorder.runs) == 6
+
+    await asyncio.sleep(0.1)
+    assert scheduler.active_channels() == []
+    await scheduler.stop()
+
+
+async def test_explicit_trigger_overtakes_random_in_queue() -> None:
+    recorder = _Recorder(run_seconds=0.02)
+    scheduler = _scheduler(recorder, max_runs=1)
+    scheduler.submit("qq-busy", _message("qq-busy", "hold"))
+    await recorder.started.wait()
+    scheduler.submit("qq-1", _message("qq-1", "random"), priority=RunPriority.RANDOM)
+    scheduler.submit("qq-2", _message("qq-2", "random"), priority=RunPriority.RANDOM)
+    # 合并后的触发取较高优先级
+    scheduler.submit("qq-2", _message("qq-2", "at"), priority=RunPriority.EXPLICIT)
+    await _drain(scheduler)
+    assert [key for key, _ in recorder.runs] == ["qq-busy", "qq-2", "qq-1"]
+    await scheduler.stop()
+
+
+async def test_pending_triggers_survive_restart(tmp_path: Path) -> None:
+    recorder = _Recorder()
+    scheduler = _scheduler(recorder, debounce=60, persist_dir=tmp_path, worker_id="host:1:old")
+    scheduler.submit("qq-1", _message("qq-1", "hi"))
+    await scheduler.stop()
+    path = tmp_path / "host_1_old.json"
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["worker_id"] == "host:1:old"
+    assert list(saved["triggers"]) == ["qq-1"]
+
+    saved["triggers"]["qq-old"] = time.time() - 3600
+    path.write_text(json.dumps(saved), encoding="utf-8")
+
+    restored = _scheduler(recorder, persist_dir=tmp_path, worker_id="host:2:new")
+    assert await restored.restore() == 1
+    await _drain(restored)
+    assert recorder.runs == [("qq-1", None)]
+    await restored.stop()
+    assert not path.exists(), "已接管的文件应删除，避免再次回放"
+    assert json.loads((tmp_path / "host_2_new.json").read_text(encoding="utf-8"))["triggers"] == {}
+
+
+async def test_restore_skips_triggers_of_live_workers(tmp_path: Path) -> None:
+    """多实例共享数据目录时，仍在运行的实例自己负责其触发，不能被重复回放。"""
+    live = _scheduler(_Recorder(), debounce=60, persist_dir=tmp_path, worker_id="live")
+    live.submit("qq-live", _message("qq-live", "hi"))
+    live.flush()
+    dead = _scheduler(_Recorder(), debounce=60, persist_dir=tmp_path, worker_id="dead")
+    dead.submit("qq-dead", _message("qq-dead", "hi"))
+    await dead.stop()
+
+    async def is_worker_alive(worker_id: str) -> bool:
+        return worker_id == "live"
+
+    recorder = _Recorder()
+    leader = _scheduler(recorder, persist_dir=tmp_path, worker_id="leader")
+    assert await leader.restore(is_worker_alive) == 1
+    await _drain(leader)
+    assert recorder.runs == [("qq-dead", None)]
+    assert (tmp_path / "live.json").exists()
+    assert not (tmp_path / "dead.json").exists()
+    await leader.stop()
+    await live.stop()
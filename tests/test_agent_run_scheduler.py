@@ -0,0 +1,152 @@
+"""Agent 运行公平调度与模型组限流回归测试。"""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from nekro_agent.core.config import ModelConfigGroup
+from nekro_agent.services import agent_run_scheduler as module
+from nekro_agent.services import token_bucket
+from nekro_agent.services.agent.creator import OpenAIChatMessage
+from nekro_agent.services.agent.model_group_limiter import ModelGroupLimiterRegistry
+from nekro_agent.services.agent_run_scheduler import (
+    AgentRunScheduler,
+    BackpressureLevel,
+    BackpressureSignal,
+    RunPriority,
+    RunTicket,
+)
+
+
+async def _queue(scheduler: AgentRunScheduler, tickets: List[RunTicket]) -> List[str]:
+    """占满唯一槽位后依次排队，逐个释放并返回放行顺序"""
+    holder = RunTicket(chat_key="hold", adapter_key="hold")
+    await scheduler.acquire(holder)
+    order: List[str] = []
+
+    async def waiter(ticket: RunTicket) -> None:
+        await scheduler.acquire(ticket)
+        order.append(ticket.chat_key)
+        await asyncio.sleep(0)
+        scheduler.release(ticket)
+
+    tasks = []
+    for ticket in tickets:
+        tasks.append(asyncio.create_task(waiter(ticket)))
+        await asyncio.sleep(0)
+    scheduler.release(holder)
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_busy_adapter_does_not_starve_others() -> None:
+    scheduler = AgentRunScheduler(lambda: 1)
+    tickets = [RunTicket(chat_key=f"qq-{i}", adapter_key="qq") for i in range(4)]
+    tickets.append(RunTicket(chat_key="tg-1", adapter_key="tg"))
+    order = await _queue(scheduler, tickets)
+    assert order.index("tg-1") == 1
+    assert scheduler.in_use == 0 and scheduler.waiting == 0
+
+
+async def test_workspace_weight_shares_slots() -> None:
+    scheduler = AgentRunScheduler(lambda: 1)
+    scheduler.set_weight(module.DIMENSION_WORKSPACE, "vip", 3)
+    tickets = [RunTicket(chat_key=f"a{i}", adapter_key=f"a{i}", workspace_key="normal") for i in range(3)]
+    tickets += [RunTicket(chat_key=f"v{i}", adapter_key=f"v{i}", workspace_key="vip") for i in range(3)]
+    order = await _queue(scheduler, tickets)
+    assert order[:4].count("a0") + order[:4].count("a1") + order[:4].count("a2") == 1
+
+    with pytest.raises(ValueError):
+        scheduler.set_weight(module.DIMENSION_CHANNEL, "x", 0)
+
+
+async def test_explicit_priority_first_and_aging(monkeypatch: pytest.MonkeyPatch) -> None:
+    scheduler = AgentRunScheduler(lambda: 1)
+    tickets = [
+        RunTicket(chat_key="random", adapter_key="qq", priority=RunPriority.RANDOM),
+        RunTicket(chat_key="keyword", adapter_key="qq", priority=RunPriority.NORMAL),
+        RunTicket(chat_key="at", adapter_key="qq", priority=RunPriority.EXPLICIT),
+    ]
+    assert await _queue(scheduler, tickets) == ["at", "keyword", "random"]
+
+    # 等待足够久的随机触发提升到显式优先级，按排队先后放行
+    now = 0.0
+    monkeypatch.setattr(module.time, "monotonic", lambda: now)
+    holder = RunTicket(chat_key="hold", adapter_key="hold")
+    await scheduler.acquire(holder)
+    old = asyncio.create_task(scheduler.acquire(RunTicket(chat_key="old", priority=RunPriority.RANDOM)))
+    await asyncio.sleep(0)
+    now = module.PRIORITY_AGING_SECONDS * 2
+    fresh = asyncio.create_task(scheduler.acquire(RunTicket(chat_key="fresh", priority=RunPriority.EXPLICIT)))
+    await asyncio.sleep(0)
+    scheduler.release(holder)
+    await asyncio.sleep(0)
+    assert old.done() and not fresh.done()
+    fresh.cancel()
+    await asyncio.gather(fresh, return_exceptions=True)
+    assert scheduler.waiting == 0
+
+
+async def test_backpressure_signals_and_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(module, "OVERLOAD_QUEUE_LENGTH", 2)
+    signals: List[BackpressureSignal] = []
+    scheduler = AgentRunScheduler(lambda: 1)
+    scheduler.add_backpressure_listener(signals.append)
+
+    holder = RunTicket(chat_key="hold", adapter_key="qq")
+    await scheduler.acquire(holder)
+    waiters = [asyncio.create_task(scheduler.acquire(RunTicket(chat_key=f"qq-{i}", adapter_key="qq"))) for i in range(2)]
+    await asyncio.sleep(0)
+
+    snapshot = scheduler.snapshot()
+    assert snapshot.running == 1 and snapshot.queued == 2
+    assert snapshot.queued_by_priority["normal"] == 2
+    assert snapshot.adapters["qq"].level == BackpressureLevel.OVERLOADED
+
+    for task in waiters:
+        task.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    scheduler.release(holder)
+    assert [s.level for s in signals] == [
+        BackpressureLevel.BUSY,
+        BackpressureLevel.OVERLOADED,
+        BackpressureLevel.BUSY,
+        BackpressureLevel.NORMAL,
+    ]
+    assert scheduler.snapshot().adapters == {}
+
+
+def _group(**limits: Any) -> ModelConfigGroup:
+    return ModelConfigGroup(CHAT_MODEL="m", BASE_URL="http://x", API_KEY="k", **limits)
+
+
+async def test_model_group_limiter_caps_concurrency_and_settles_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = ModelGroupLimiterRegistry()
+    messages = [OpenAIChatMessage.from_text("user", "x" * 400)]
+    assert registry.get("default", _group()) is None
+
+    running = peak = 0
+
+    async def call() -> None:
+        nonlocal running, peak
+        async with registry.limit("default", _group(MAX_CONCURRENCY=2), messages):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(5)))
+    assert peak == 2
+
+    now = 0.0
+    monkeypatch.setattr(token_bucket.time, "monotonic", lambda: now)
+    group = _group(TPM_LIMIT=1000)
+    async with registry.limit("default", group, messages) as lease:
+        assert lease is not None and lease.estimated_tokens == 100
+        lease.settle(700)
+    limiter = registry.get("default", group)
+    assert limiter is not None and limiter.tpm._tokens == pytest.approx(300)
+
+    # 限制变更后重建限流器
+    assert registry.get("default", _group(TPM_LIMIT=2000)) is not limiter
@@ -0,0 +1,241 @@
+"""聊天记录全文检索回归测试。"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from tortoise import Tortoise
+
+from nekro_agent.models.db_chat_message import DBChatMessage
+from nekro_agent.services.chat import history_search as module
+from nekro_agent.services.chat.history_search import (
+    ChatHistorySearchService,
+    ChatSearchQuery,
+    build_postgres_count_sql,
+    build_postgres_search_sql,
+)
+
+
+def _make_service(monkeypatch: pytest.MonkeyPatch, rows: list[tuple[int, str, int]]) -> ChatHistorySearchService:
+    """以假数据构建进程内索引，模拟非 PostgreSQL 数据库"""
+    service = ChatHistorySearchService(max_channels=2)
+    monkeypatch.setattr(ChatHistorySearchService, "_use_postgres", staticmethod(lambda: False))
+
+    async def fake_load(chat_key: str, index: Any) -> None:
+        for msg_id, text, ts in rows:
+            index.add(msg_id, text, ts)
+
+    monkeypatch.setattr(service, "_load_index", fake_load)
+    return service
+
+
+def test_query_parse_groups_and_dedups_keywords() -> None:
+    query = ChatSearchQuery.parse(["吃饭", "+午饭", "-鱼", "吃饭", " ", "+", "Lunch", "lunch"])
+    assert query.or_keywords == ["吃饭", "Lunch"]
+    assert query.and_keywords == ["午饭"]
+    assert query.not_keywords == ["鱼"]
+    assert query.describe() == "OR: 吃饭, Lunch, AND: 午饭, NOT: 鱼"
+
+
+@pytest.mark.asyncio
+async def test_fallback_index_ranks_by_keyword_hits(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(
+        monkeypatch,
+        [
+            (1, "今天中午去吃饭", 100),
+            (2, "午饭吃什么？吃饭要紧", 200),
+            (3, "晚餐吃鱼", 300),
+            (4, "晚餐吃牛排", 400),
+            (5, "Let's grab LUNCH", 500),
+        ],
+    )
+
+    hits = await service.search("c1", ["吃饭", "午饭"])
+    assert [h.id for h in hits] == [2, 1]
+    assert hits[0].score == 2
+
+    hits = await service.search("c1", ["晚餐", "-鱼"])
+    assert [h.id for h in hits] == [4]
+
+    hits = await service.search("c1", ["+吃", "+晚"])
+    assert [h.id for h in hits] == [4, 3]
+
+    # 单字关键词与大小写不敏感匹配
+    assert [h.id for h in await service.search("c1", ["鱼"])] == [3]
+    assert [h.id for h in await service.search("c1", ["lunch"])] == [5]
+
+
+@pytest.mark.asyncio
+async def test_fallback_index_time_window_and_paging(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(monkeypatch, [(i, f"消息 {i} 打卡", i * 10) for i in range(1, 11)])
+
+    hits = await service.search("c1", ["打卡"], start_timestamp=30, end_timestamp=80)
+    assert [h.id for h in hits] == [7, 6, 5, 4, 3]
+
+    hits = await service.search("c1", ["打卡"], limit=3, before_id=6, rank=False)
+    assert [h.id for h in hits] == [5, 4, 3]
+
+
+@pytest.mark.asyncio
+async def test_saved_and_deleted_messages_update_loaded_index(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(monkeypatch, [(1, "旧消息", 10)])
+    monkeypatch.setattr(module, "chat_history_search", service)
+    assert await service.search("c1", ["新消息"]) == []
+
+    message: Any = SimpleNamespace(id=2, chat_key="c1", content_text="一条新消息", send_timestamp=20)
+    await module._on_message_saved(None, message, True, None, None)
+    assert [h.id for h in await service.search("c1", ["新消息"])] == [2]
+
+    await module._on_message_deleted(None, message, None)
+    assert await service.search("c1", ["新消息"]) == []
+
+    # 未加载的频道不做增量写入
+    other: Any = SimpleNamespace(id=3, chat_key="c2", content_text="x", send_timestamp=30)
+    service.index_message(other)
+    assert "c2" not in service._indexes
+
+
+@pytest.mark.asyncio
+async def test_index_cache_evicts_least_recent_channel(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(monkeypatch, [(1, "hello", 10)])
+    for chat_key in ("a", "b", "a", "c"):
+        await service.search(chat_key, ["hello"])
+    assert list(service._indexes) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_count_reports_all_matches_beyond_page(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(monkeypatch, [(i, f"消息 {i} 打卡" if i % 2 else f"消息 {i}", i * 10) for i in range(1, 21)])
+
+    hits = await service.search("c1", ["打卡"], limit=3, rank=False)
+    assert [h.id for h in hits] == [19, 17, 15]
+    assert await service.count("c1", ["打卡"]) == 10
+    assert await service.count("c1", ["打卡"], before_id=15) == 7
+    assert await service.count("c1", ["打卡", "-19"]) == 9
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_build_index_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = ChatHistorySearchService()
+    monkeypatch.setattr(ChatHistorySearchService, "_use_postgres", staticmethod(lambda: False))
+    loads: list[str] = []
+
+    async def slow_load(chat_key: str, index: Any) -> None:
+        loads.append(chat_key)
+        await asyncio.sleep(0.01)
+        index.add(1, "hello", 10)
+
+    monkeypatch.setattr(service, "_load_index", slow_load)
+    await asyncio.gather(*(service.search("c1", ["hello"]) for _ in range(5)))
+    assert loads == ["c1"]
+    assert service._loading == {}
+
+
+@pytest.fixture
+async def chat_db():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["nekro_agent.models.db_chat_message"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+async def _save_message(msg_id: int, text: str) -> None:
+    await DBChatMessage.create(
+        id=msg_id,
+        sender_id="1",
+        sender_name="u",
+        sender_nickname="u",
+        is_tome=0,
+        is_recalled=False,
+        adapter_key="test",
+        message_id=str(msg_id),
+        chat_key="c1",
+        chat_type="group",
+        platform_userid="1",
+        content_text=text,
+        content_data="[]",
+        raw_cq_code="",
+        ext_data="{}",
+        send_timestamp=msg_id * 10,
+    )
+
+
+@pytest.mark.asyncio
+async def test_fallback_index_keeps_recent_window_and_queries_older_from_db(
+    chat_db: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(module, "MAX_INDEXED_MESSAGES_PER_CHANNEL", 10)
+    monkeypatch.setattr(ChatHistorySearchService, "_use_postgres", staticmethod(lambda: False))
+    service = ChatHistorySearchService()
+    monkeypatch.setattr(module, "chat_history_search", service)
+    for i in range(1, 31):
+        await _save_message(i, f"第 {i} 次打卡" if i % 3 else f"第 {i} 次吃饭打卡")
+
+    hits = await service.search("c1", ["打卡"], limit=50, rank=False)
+    assert [h.id for h in hits] == list(range(30, 0, -1))
+    index = service._indexes["c1"]
+    assert len(index.texts) == 10 and index.floor_id == 21
+
+    # 翻页到索引窗口之前的消息，以及相关度排序时合并库中的更早消息
+    hits = await service.search("c1", ["打卡"], limit=4, before_id=23, rank=False)
+    assert [h.id for h in hits] == [22, 21, 20, 19]
+    hits = await service.search("c1", ["吃饭", "打卡"], limit=3)
+    assert [(h.id, h.score) for h in hits] == [(30, 2), (27, 2), (24, 2)]
+    assert await service.count("c1", ["吃饭"]) == 10
+    assert await service.count("c1", ["+吃饭", "-3"], before_id=21) == 5
+
+    # 新消息写入后淘汰最旧的一批，索引保持在容量以内
+    for i in range(31, 36):
+        await _save_message(i, f"第 {i} 次打卡")
+    assert len(index.texts) <= 10 and index.floor_id > 21
+    assert await service.count("c1", ["打卡"]) == 35
+
+
+def test_postgres_sql_binds_and_escapes_keywords() -> None:
+    query = ChatSearchQuery.parse(["100%", "a_b", "+必须", "-排除"])
+    sql, params = build_postgres_search_sql("c1", query, 10, 20, 8)
+
+    assert params == ["c1", 10, 20, "%100\\%%", "%a\\_b%", "%必须%", "%排除%", 8]
+    assert '"send_timestamp" >= $2' in sql and '"send_timestamp" < $3' in sql
+    assert '("content_text" ILIKE $4 OR "content_text" ILIKE $5)' in sql
+    assert '"content_text" ILIKE $6' in sql and 'NOT "content_text" ILIKE $7' in sql
+    assert "(CASE WHEN \"content_text\" ILIKE $4 THEN 1 ELSE 0 END)" in sql
+    assert sql.endswith('ORDER BY "score" DESC, "send_timestamp" DESC, "id" DESC LIMIT $8')
+
+    sql, params = build_postgres_search_sql("c1", ChatSearchQuery.parse(["x"]), None, None, 5, before_id=99, rank=False)
+    assert params == ["c1", 99, "%x%", 5]
+    assert sql.endswith('ORDER BY "id" DESC LIMIT $4')
+
+    sql, params = build_postgres_count_sql("c1", ChatSearchQuery.parse(["x", "-y"]), 10, None, before_id=99)
+    assert params == ["c1", 10, 99, "%x%", "%y%"]
+    assert sql == (
+        'SELECT COUNT(*) AS "total" FROM "chat_message" WHERE "chat_key" = $1 AND "send_timestamp" >= $2 '
+        'AND "id" < $3 AND ("content_text" ILIKE $4) AND NOT "content_text" ILIKE $5'
+    )
+
+
+@pytest.mark.asyncio
+async def test_postgres_routes_short_keywords_to_bigram_index(monkeypatch: pytest.MonkeyPatch) -> None:
+    """两字中文词走不了 pg_trgm 索引，改由进程内二元组索引检索；有长词可走索引时仍在数据库内完成。"""
+    service = _make_service(monkeypatch, [(1, "今天中午去吃饭", 100), (2, "晚上吃火锅", 200)])
+    monkeypatch.setattr(ChatHistorySearchService, "_use_postgres", staticmethod(lambda: True))
+    executed: list[str] = []
+
+    async def execute_query_dict(sql: str, params: list[object]) -> list[dict[str, Any]]:
+        executed.append(sql)
+        return [{"total": 0}] if sql.startswith("SELECT COUNT") else []
+
+    monkeypatch.setattr(module.connections, "get", lambda _: SimpleNamespace(execute_query_dict=execute_query_dict))
+
+    assert [h.id for h in await service.search("c1", ["吃饭", "火锅"])] == [2, 1]
+    assert await service.count("c1", ["吃饭", "-火锅"]) == 1
+    assert executed == []
+
+    assert ChatSearchQuery.parse(["吃饭", "+今天中午"]).trgm_indexable
+    assert not ChatSearchQuery.parse(["今天中午", "吃饭"]).trgm_indexable
+    await service.search("c1", ["今天中午", "+午饭"])
+    await service.search("c1", ["吃饭", "+今天中午"])
+    await service.count("c1", [])
+    assert len(executed) == 3
@@ -0,0 +1,92 @@
+"""上下文 Token 预算回归测试。"""
+
+from typing import List
+
+import pytest
+
+from nekro_agent.core.config import ModelConfigGroup
+from nekro_agent.services.agent import context_budget as module
+from nekro_agent.services.agent.context_budget import (
+    IMAGE_TOKEN_ESTIMATE,
+    ContextBudget,
+    RatioTokenCounter,
+    TiktokenCounter,
+    get_token_counter,
+    resolve_tokenizer_family,
+)
+
+
+class _FakeEncoding:
+    name = "fake_base"
+
+    def encode(self, text: str, disallowed_special: object = ()) -> List[str]:
+        return text.split()
+
+
+async def test_tokenizer_resolved_per_family_with_cached_ratio_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+
+    def get_encoding(name: str) -> _FakeEncoding:
+        calls.append(name)
+        if name == "o200k_base":
+            raise ConnectionError("offline")
+        return _FakeEncoding()
+
+    monkeypatch.setattr(module.tiktoken, "get_encoding", get_encoding)
+    monkeypatch.setattr(module, "_encoding_counters", {})
+
+    assert resolve_tokenizer_family("openai/GPT-4o-mini").encoding == "o200k_base"
+    assert resolve_tokenizer_family("gpt-4-turbo").encoding == "cl100k_base"
+    assert resolve_tokenizer_family("deepseek-chat").encoding == ""
+
+    # 编码加载失败时回退为比例估算，且不再重复尝试
+    for _ in range(2):
+        counter = await get_token_counter(ModelConfigGroup(CHAT_MODEL="gpt-4o"))
+        assert isinstance(counter, RatioTokenCounter)
+    assert calls == ["o200k_base"]
+
+    counter = await get_token_counter(ModelConfigGroup(CHAT_MODEL="deepseek-chat", TOKENIZER="fake_base"))
+    assert isinstance(counter, TiktokenCounter)
+    assert counter.count("a b c") == 3
+
+    ratio = await get_token_counter(ModelConfigGroup(CHAT_MODEL="qwen-max"))
+    assert ratio.count("你好世界") == 3  # 4 * 0.7 向上取整
+    assert ratio.count("abcdefg") == 2  # 7 / 3.5
+
+
+def test_sections_are_capped_and_history_packed_newest_first() -> None:
+    budget = ContextBudget(total=4000, counter=RatioTokenCounter(chars_per_token=1, tokens_per_cjk_char=1))
+    budget.charge("system", 800)
+    budget.charge("plugins", 200)
+
+    # 剩余 3000，图片上限 25% -> 750 个 Token，不足一张
+    assert budget.allot_images(3) == 0
+    assert IMAGE_TOKEN_ESTIMATE > 750
+
+    memory = "".join(f"{i:03d}" + "m" * 96 + "\n" for i in range(10))
+    kept_memory = budget.fit_memory(memory)
+    # 记忆上限 15% -> 450 个 Token，每行 100 个 Token，保留排在前面的 4 行
+    assert kept_memory.splitlines() == memory.splitlines()[:4]
+
+    history = ["x" * 1000, "y" * 2000, "z" * 500, "w" * 1000]
+    start = budget.pack_history(history, separator="|")
+    # 剩余 2600：最新两条装入后，较旧的 2000 放不下，更早的消息也不再装入以保持连续
+    assert start == 2
+
+    report = budget.report()
+    assert report["sections"] == {"system": 800, "plugins": 200, "images": 0, "memory": 400, "history": 1502}
+    assert report["used"] == 2902 <= budget.total
+    assert (report["history_kept"], report["history_dropped"]) == (2, 2)
+    assert report["images_dropped"] == 3 and report["memory_trimmed"] is True
+    assert report["tokenizer"] == "ratio:1/1"
+
+
+def test_images_fit_within_share_of_elastic_budget() -> None:
+    budget = ContextBudget(total=10_000, counter=RatioTokenCounter())
+    budget.charge("system", 1000)
+    # 剩余 9000 的 25% 为 2250，可容纳 2 张图片
+    assert budget.allot_images(5) == 2
+    assert budget.sections["images"] == 2 * IMAGE_TOKEN_ESTIMATE
+    # 记忆占比以首次分配弹性分段时的剩余预算 9000 为基数，上限 1350 个 Token
+    assert budget.fit_memory("a" * 5400) == "a" * 5400
+    assert budget.memory_trimmed is False
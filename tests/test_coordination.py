@@ -0,0 +1,223 @@
+"""多实例协调回归测试。"""
+
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from nekro_agent.services.coordination import (
+    LEADER_ROLES,
+    LEADER_TIMERS,
+    Coordinator,
+    MemoryCoordinationBackend,
+    MemoryHub,
+)
+
+# 包内同名单例遮蔽了子模块属性，按模块路径取模块本身
+coordinator_module = importlib.import_module("nekro_agent.services.coordination.coordinator")
+timer_module = importlib.import_module("nekro_agent.services.timer.timer_service")
+quota_module = importlib.import_module("nekro_agent.services.quota_service")
+
+
+@pytest.fixture
+def hub(monkeypatch: pytest.MonkeyPatch) -> MemoryHub:
+    monkeypatch.setattr(coordinator_module, "LEASE_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(coordinator_module, "ELECTION_INTERVAL_SECONDS", 0.02)
+    return MemoryHub()
+
+
+async def _start(hub: MemoryHub, worker_id: str) -> Coordinator:
+    coordinator = Coordinator(MemoryCoordinationBackend(hub), worker_id=worker_id)
+    await coordinator.start()
+    return coordinator
+
+
+async def test_channel_lease_is_exclusive_across_workers(hub: MemoryHub) -> None:
+    a, b = await _start(hub, "a"), await _start(hub, "b")
+    timeline: List[str] = []
+
+    async def run(worker: Coordinator, name: str) -> None:
+        async with worker.channel_lease("onebot_v11-group_1"):
+            timeline.append(f"{name}+")
+            await asyncio.sleep(0.05)
+            timeline.append(f"{name}-")
+
+    await asyncio.gather(run(a, "a1"), run(b, "b"), run(a, "a2"))
+    # 同一频道的运行区间互不重叠，实例内的并发获取也按租约串行
+    assert [timeline[i][-1] for i in range(len(timeline))] == ["+", "-"] * 3
+    assert sorted(timeline[0::2]) == ["a1+", "a2+", "b+"]
+
+    # 不同频道互不阻塞
+    async with a.channel_lease("c1"), b.channel_lease("c2"):
+        pass
+    assert hub.locks.keys() == {f"leader:{role}" for role in LEADER_ROLES} | {"worker:a", "worker:b"}
+    await a.stop()
+    await b.stop()
+
+
+async def test_events_fan_out_to_other_workers_only(hub: MemoryHub) -> None:
+    a, b = await _start(hub, "a"), await _start(hub, "b")
+    received: Dict[str, List[Any]] = {"a": [], "b": []}
+    a.subscribe("topic", lambda payload: received["a"].append(payload))
+
+    async def on_b(payload: Dict[str, Any]) -> None:
+        received["b"].append(payload)
+
+    b.subscribe("topic", on_b)
+    await a.publish("topic", {"n": 1})
+    await asyncio.sleep(0.01)
+    assert received == {"a": [], "b": [{"n": 1}]}
+
+    # 未启动的协调器按单实例处理：不外发事件，所有角色均为主节点
+    standalone = Coordinator(MemoryCoordinationBackend(hub), worker_id="standalone")
+    await standalone.publish("topic", {"n": 2})
+    await asyncio.sleep(0.01)
+    assert received["b"] == [{"n": 1}]
+    assert all(standalone.is_leader(role) for role in LEADER_ROLES)
+    await a.stop()
+    await b.stop()
+
+
+async def test_private_memory_backend_skips_publish(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = MemoryCoordinationBackend()
+    coordinator = Coordinator(backend, worker_id="solo")
+    await coordinator.start()
+    notified: List[str] = []
+
+    async def notify(payload: str) -> None:
+        notified.append(payload)
+
+    monkeypatch.setattr(backend, "notify", notify)
+    # 没有共享总线就没有其他实例，事件不做序列化与回环投递
+    await coordinator.publish("topic", {"n": 1})
+    assert notified == []
+    assert MemoryCoordinationBackend(MemoryHub()).fanout
+    await coordinator.stop()
+
+
+async def test_leader_roles_fail_over_when_worker_stops(hub: MemoryHub) -> None:
+    a, b = await _start(hub, "a"), await _start(hub, "b")
+    assert all(a.is_leader(role) and not b.is_leader(role) for role in LEADER_ROLES)
+
+    await a.stop()
+    await asyncio.sleep(0.1)
+    assert all(b.is_leader(role) for role in LEADER_ROLES)
+    await b.stop()
+
+
+async def test_worker_presence_follows_worker_lifetime(hub: MemoryHub) -> None:
+    a, b = await _start(hub, "a"), await _start(hub, "b")
+    assert await a.is_worker_alive("a")
+    assert await a.is_worker_alive("b")
+    # 查询本身不能顺带占住对方的存活锁
+    assert await a.is_worker_alive("b")
+
+    await b.stop()
+    assert not await a.is_worker_alive("b")
+    assert not await a.is_worker_alive("never-started")
+    await a.stop()
+
+
+async def test_quota_counts_follow_replies_on_other_workers(
+    hub: MemoryHub,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Any,
+) -> None:
+    a, b = await _start(hub, "a"), await _start(hub, "b")
+    monkeypatch.setattr(quota_module, "coordinator", a)
+    local = quota_module.QuotaService(boost_persist_path=str(tmp_path / "a.json"))
+    remote = quota_module.QuotaService(boost_persist_path=str(tmp_path / "b.json"))
+    b.subscribe(quota_module.QUOTA_REPLY_TOPIC, remote._on_remote_reply)
+    for service in (local, remote):
+        service._roll_buckets()
+        service._seeded = True
+
+    await local.record_bot_reply("chat")
+    await local.record_bot_reply("chat")
+    await asyncio.sleep(0.01)
+    assert remote._daily_counts == {"chat": 2}
+    assert remote._hourly_counts == {"chat": 2}
+    await a.stop()
+    await b.stop()
+
+
+async def test_one_shot_timers_replicate_to_standby_worker(
+    hub: MemoryHub,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Any,
+) -> None:
+    a, b = await _start(hub, "a"), await _start(hub, "b")
+    monkeypatch.setattr(timer_module, "coordinator", a)
+    monkeypatch.setattr(timer_module, "TIMER_ONE_SHOT_PERSIST_PATH", str(tmp_path / "timers.json"))
+    leader, standby = timer_module.TimerService(), timer_module.TimerService()
+    b.subscribe(timer_module.TIMER_TASKS_TOPIC, standby._on_remote_tasks)
+
+    async def festival() -> None:
+        return None
+
+    trigger_time = int(time.time()) + 3600
+    assert await leader.set_timer("chat", trigger_time, "喝水")
+    assert await leader.set_timer("chat", trigger_time, "节日", callback=festival)
+    await asyncio.sleep(0.05)
+    assert [t.event_desc for t in standby.get_timers("chat")] == ["喝水"]
+    assert a.is_leader(LEADER_TIMERS) and not b.is_leader(LEADER_TIMERS)
+
+    task_id = leader.get_timers("chat")[0].task_id
+    assert standby.get_timer_by_id(task_id) is not None
+    assert await leader.delete_timer_by_id(task_id)
+    await asyncio.sleep(0.05)
+    assert standby.get_timers("chat") == []
+    await a.stop()
+    await b.stop()
+
+
+_POSTGRES_WORKER = """
+import asyncio, json, sys, time
+from nekro_agent.services.coordination import LEADER_ROLES, Coordinator
+from nekro_agent.services.coordination.postgres import PostgresCoordinationBackend
+
+async def main():
+    coordinator = Coordinator(PostgresCoordinationBackend(sys.argv[1]))
+    await coordinator.start()
+    received = []
+    coordinator.subscribe("ping", received.append)
+    await asyncio.sleep(1)
+    await coordinator.publish("ping", {"from": coordinator.worker_id})
+    async with coordinator.channel_lease("shared-channel"):
+        started = time.time()
+        await asyncio.sleep(0.5)
+        ended = time.time()
+    await asyncio.sleep(1)
+    leaders = [role for role in LEADER_ROLES if coordinator.is_leader(role)]
+    await coordinator.stop()
+    print(json.dumps({"leaders": leaders, "lease": [started, ended], "received": len(received)}))
+
+asyncio.run(main())
+"""
+
+
+@pytest.mark.skipif(not os.getenv("NEKRO_TEST_POSTGRES_DSN"), reason="需要设置 NEKRO_TEST_POSTGRES_DSN 指向可用的 Postgres")
+async def test_two_worker_processes_share_postgres_backend() -> None:
+    dsn = os.environ["NEKRO_TEST_POSTGRES_DSN"]
+    workers = [
+        await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            _POSTGRES_WORKER,
+            dsn,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        for _ in range(2)
+    ]
+    outputs = [await asyncio.wait_for(worker.communicate(), timeout=60) for worker in workers]
+    results = [json.loads(stdout.decode().strip().splitlines()[-1]) for stdout, _ in outputs]
+
+    assert sorted(results[0]["leaders"] + results[1]["leaders"]) == sorted(LEADER_ROLES)
+    assert [r["received"] for r in results] == [1, 1]
+    (_, first_end), (second_start, _) = sorted(r["lease"] for r in results)
+    assert first_end <= second_start
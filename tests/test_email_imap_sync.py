@@ -0,0 +1,425 @@
+"""Email 适配器 IMAP 增量同步回归测试。
+
+基于本地 IMAP 桩服务器验证 UID 增量检索、BODYSTRUCTURE 优先的批量拉取、
+大邮件附件按需下载、旧序号记录的对账，以及 IDLE / NOOP 两种新邮件等待方式。
+"""
+
+import asyncio
+import base64
+import email
+import imaplib
+import re
+import select
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import pytest
+from tortoise import Tortoise
+
+from nekro_agent.adapters.email import adapter as adapter_module
+from nekro_agent.adapters.email.adapter import EmailAdapter
+from nekro_agent.adapters.email.checkpoint import EmailCheckpointStore
+from nekro_agent.adapters.email.clients import imap_smtp_password as client_module
+from nekro_agent.adapters.email.clients.imap_smtp_password import ImapSmtpPasswordClient
+from nekro_agent.adapters.email.clients.imap_sync import format_uid_set
+from nekro_agent.adapters.email.config import EmailAccount
+from nekro_agent.models.db_email import DBEmail
+
+_ATTACHMENT = b"%PDF-1.4 fake attachment payload" * 8
+
+_PLAIN_MESSAGE = (
+    b"From: Alice <alice@example.com>\r\n"
+    b"Subject: hello\r\n"
+    b"Content-Type: text/plain; charset=utf-8\r\n"
+    b"\r\n"
+    b"plain body\r\n"
+)
+_PLAIN_STRUCTURE = b'("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 12 1 NIL NIL NIL NIL)'
+
+_MIXED_MESSAGE = (
+    b"From: Bob <bob@example.com>\r\n"
+    b"Subject: report\r\n"
+    b"Message-ID: <report@example.com>\r\n"
+    b'Content-Type: multipart/mixed; boundary="XX"\r\n'
+    b"\r\n"
+    b"--XX\r\n"
+    b"Content-Type: text/plain; charset=utf-8\r\n"
+    b"Content-Transfer-Encoding: base64\r\n"
+    b"\r\n" + base64.b64encode("正文内容".encode()) + b"\r\n"
+    b"--XX\r\n"
+    b"Content-Type: application/pdf\r\n"
+    b'Content-Disposition: attachment; filename="report.pdf"\r\n'
+    b"Content-Transfer-Encoding: base64\r\n"
+    b"\r\n" + base64.b64encode(_ATTACHMENT) + b"\r\n"
+    b"--XX--\r\n"
+)
+_MIXED_STRUCTURE = (
+    b'(("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "BASE64" 16 1 NIL NIL NIL NIL)'
+    b'("APPLICATION" "PDF" NIL NIL NIL "BASE64" 360 NIL ("ATTACHMENT" ("FILENAME" "report.pdf")) NIL NIL)'
+    b' "MIXED" ("BOUNDARY" "XX") NIL NIL NIL)'
+)
+
+
+class _Mailbox:
+    def __init__(self, idle: bool) -> None:
+        self.idle = idle
+        self.name = "INBOX"
+        self.uidvalidity = 777
+        self.messages: Dict[int, Tuple[bytes, bytes]] = {}
+        self.seen: set[int] = set()
+        self.lock = threading.Lock()
+
+    @property
+    def uidnext(self) -> int:
+        return max(self.messages, default=0) + 1
+
+    def append(self, raw: bytes, structure: bytes) -> int:
+        with self.lock:
+            uid = self.uidnext
+            self.messages[uid] = (raw, structure)
+            return uid
+
+
+def _section(raw: bytes, section: str) -> bytes:
+    if section == "":
+        return raw
+    header, _, body = raw.partition(b"\r\n\r\n")
+    if section == "HEADER":
+        return header + b"\r\n\r\n"
+    message = email.message_from_bytes(raw)
+    if not message.is_multipart():
+        return body
+    payload = message.get_payload()[int(section) - 1].get_payload()
+    return payload.encode() if isinstance(payload, str) else payload
+
+
+class _ImapStubHandler(socketserver.StreamRequestHandler):
+    mailbox: _Mailbox
+
+    def _send(self, line: bytes) -> None:
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self) -> None:
+        self.reported_exists = 0
+        self.selected = ""
+        self._send(b"* OK IMAP4rev1 stub ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, _, rest = line.strip().partition(b" ")
+            command, _, args = rest.partition(b" ")
+            command = command.upper()
+            if command == b"UID":
+                command, _, args = args.partition(b" ")
+                command = b"UID " + command.upper()
+            handler = getattr(self, "cmd_" + command.decode().replace(" ", "_").lower(), None)
+            if handler is None:
+                self._send(tag + b" BAD unsupported")
+                continue
+            if handler(tag, args) is False:
+                return
+
+    def _uids(self, uid_set: bytes) -> List[int]:
+        existing = sorted(self.mailbox.messages) if self.selected == self.mailbox.name else []
+        result: List[int] = []
+        for chunk in uid_set.decode().split(","):
+            start, _, end = chunk.partition(":")
+            low = int(start)
+            high = (max(existing, default=0) if end == "*" else int(end)) if end else low
+            low, high = min(low, high), max(low, high)
+            result.extend(uid for uid in existing if low <= uid <= high)
+        return result
+
+    def cmd_capability(self, tag: bytes, _args: bytes) -> None:
+        self._send(b"* CAPABILITY IMAP4rev1" + (b" IDLE" if self.mailbox.idle else b""))
+        self._send(tag + b" OK done")
+
+    def cmd_login(self, tag: bytes, _args: bytes) -> None:
+        self._send(tag + b" OK logged in")
+
+    def cmd_list(self, tag: bytes, _args: bytes) -> None:
+        for name in sorted({"INBOX", self.mailbox.name}):
+            self._send(b'* LIST (\\HasNoChildren) "/" "%s"' % name.encode())
+        self._send(tag + b" OK done")
+
+    def cmd_select(self, tag: bytes, args: bytes) -> None:
+        self.selected = args.strip().strip(b'"').decode()
+        self.reported_exists = len(self._uids(b"1:*"))
+        self._send(b"* %d EXISTS" % self.reported_exists)
+        self._send(b"* OK [UIDVALIDITY %d] ok" % self.mailbox.uidvalidity)
+        self._send(b"* OK [UIDNEXT %d] ok" % self.mailbox.uidnext)
+        self._send(tag + b" OK [READ-WRITE] selected")
+
+    def cmd_uid_search(self, tag: bytes, args: bytes) -> None:
+        tokens = args.split()
+        uids = self._uids(b"1:*")
+        if b"HEADER" in tokens:
+            value = tokens[tokens.index(b"HEADER") + 2].strip(b'"')
+            uids = [uid for uid in uids if b"\r\nMessage-ID: " + value + b"\r\n" in self.mailbox.messages[uid][0]]
+        if b"UID" in tokens:
+            uids = self._uids(tokens[tokens.index(b"UID") + 1])
+        if b"UNSEEN" in tokens:
+            uids = [uid for uid in uids if uid not in self.mailbox.seen]
+        self._send(b"* SEARCH" + b"".join(b" %d" % uid for uid in uids))
+        self._send(tag + b" OK done")
+
+    def cmd_uid_fetch(self, tag: bytes, args: bytes) -> None:
+        uid_set, _, query = args.partition(b" ")
+        items = re.findall(rb"BODY(?:\.PEEK)?\[[^\]]*\]|RFC822\.SIZE|RFC822|BODYSTRUCTURE", query)
+        ordered = sorted(self.mailbox.messages)
+        for uid in self._uids(uid_set):
+            raw, structure = self.mailbox.messages[uid]
+            chunks = [b"* %d FETCH (UID %d" % (ordered.index(uid) + 1, uid)]
+            for item in items:
+                if item == b"RFC822.SIZE":
+                    chunks.append(b" RFC822.SIZE %d" % len(raw))
+                elif item == b"BODYSTRUCTURE":
+                    chunks.append(b" BODYSTRUCTURE " + structure)
+                else:
+                    name = item.replace(b".PEEK", b"")
+                    data = raw if name == b"RFC822" else _section(raw, name[5:-1].decode())
+                    chunks.append(b" %s {%d}\r\n" % (name, len(data)) + data)
+            self.wfile.write(b"".join(chunks) + b")\r\n")
+        self._send(tag + b" OK done")
+
+    def cmd_uid_store(self, tag: bytes, args: bytes) -> None:
+        self.mailbox.seen.update(self._uids(args.split()[0]))
+        self._send(tag + b" OK done")
+
+    def _report_new(self) -> bool:
+        count = len(self.mailbox.messages)
+        if count == self.reported_exists:
+            return False
+        self.reported_exists = count
+        self._send(b"* %d EXISTS" % count)
+        return True
+
+    def cmd_noop(self, tag: bytes, _args: bytes) -> None:
+        self._report_new()
+        self._send(tag + b" OK done")
+
+    def cmd_idle(self, tag: bytes, _args: bytes) -> None:
+        self._send(b"+ idling")
+        while True:
+            self._report_new()
+            readable, _, _ = select.select([self.connection], [], [], 0.02)
+            if readable:
+                self.rfile.readline()
+                self._send(tag + b" OK IDLE terminated")
+                return
+
+    def cmd_close(self, tag: bytes, _args: bytes) -> None:
+        self._send(tag + b" OK closed")
+
+    def cmd_logout(self, tag: bytes, _args: bytes) -> bool:
+        self._send(b"* BYE")
+        self._send(tag + b" OK bye")
+        return False
+
+
+class _StubClient(ImapSmtpPasswordClient):
+    port = 0
+
+    def _connect_sync(self) -> imaplib.IMAP4:
+        conn = imaplib.IMAP4("127.0.0.1", self.port, timeout=self.imap_timeout)
+        conn.login(self.account.USERNAME, self.account.PASSWORD)
+        return conn
+
+
+def _start_stub(idle: bool) -> Tuple[socketserver.ThreadingTCPServer, _Mailbox]:
+    mailbox = _Mailbox(idle=idle)
+    handler = type("Handler", (_ImapStubHandler,), {"mailbox": mailbox})
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, mailbox
+
+
+@pytest.fixture
+def imap_stub(request: pytest.FixtureRequest) -> Iterator[Tuple[_StubClient, _Mailbox]]:
+    server, mailbox = _start_stub(idle=getattr(request, "param", True))
+    client = _StubClient(EmailAccount(USERNAME="bot@example.com", PASSWORD="x"), imap_timeout=5)
+    client.port = server.server_address[1]
+    yield client, mailbox
+    server.shutdown()
+    server.server_close()
+
+
+def test_format_uid_set_compresses_ranges() -> None:
+    assert format_uid_set([b"9", b"3", b"4", b"5", b"12", b"13"]) == "3:5,9,12:13"
+
+
+@pytest.mark.asyncio
+async def test_uid_incremental_fetch_with_bodystructure_first(imap_stub: Tuple[_StubClient, _Mailbox]) -> None:
+    client, mailbox = imap_stub
+    mailbox.append(_PLAIN_MESSAGE, _PLAIN_STRUCTURE)
+    mailbox.append(_MIXED_MESSAGE, _MIXED_STRUCTURE)
+    await client.connect()
+
+    await client.select_mailbox()
+    assert client.mailbox_state is not None
+    assert (client.mailbox_state.uidvalidity, client.mailbox_state.uidnext) == (777, 3)
+    assert await client.list_uids_since(1, unseen_only=True) == [b"2"]
+    assert await client.list_uids_since(2, unseen_only=True) == [], "UID n:* 需要过滤掉旧邮件"
+
+    summaries = await client.fetch_summaries([b"1", b"2"])
+    assert summaries[b"1"].size == len(_PLAIN_MESSAGE)
+    assert [p.section for p in summaries[b"2"].text_parts] == ["1"]
+    assert [p.filename for p in summaries[b"2"].attachment_parts] == ["report.pdf"]
+
+    raw = await client.fetch_raw_messages([b"1", b"2"])
+    assert raw == {b"1": _PLAIN_MESSAGE, b"2": _MIXED_MESSAGE}
+
+    # 大邮件只拉取头部与正文，附件在需要时单独下载
+    preview = await client.fetch_preview(summaries[b"2"])
+    assert preview is not None
+    assert b"Subject: report" in preview.header_bytes
+    assert preview.text_parts[0][1].decode() == "正文内容"
+    attachment = preview.lazy_attachments[0]
+    assert await client.fetch_body_part(b"2", attachment) == _ATTACHMENT
+
+    await client.mark_seen_batch([b"1", b"2"])
+    assert mailbox.seen == {1, 2}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_returns_on_new_mail_push(imap_stub: Tuple[_StubClient, _Mailbox]) -> None:
+    client, mailbox = imap_stub
+    await client.connect()
+    watcher = await client.open_watcher()
+    await watcher.select_mailbox()
+    assert watcher.supports_idle()
+    # IDLE 在监听连接独占的线程上阻塞，不占用默认线程池
+    threads: List[str] = []
+    idle_sync = watcher._idle_sync
+    watcher._idle_sync = lambda *args: threads.append(threading.current_thread().name) or idle_sync(*args)  # type: ignore[method-assign]
+
+    assert await watcher.wait_for_changes(0.2) is False
+
+    waiter = asyncio.create_task(watcher.wait_for_changes(10))
+    await asyncio.sleep(0.1)
+    started = time.monotonic()
+    mailbox.append(_PLAIN_MESSAGE, _PLAIN_STRUCTURE)
+    assert await waiter is True
+    assert time.monotonic() - started < 2
+
+    # IDLE 结束后连接仍可正常执行命令
+    await watcher.select_mailbox()
+    assert watcher.mailbox_state is not None and watcher.mailbox_state.exists == 1
+    assert len(threads) == 2 and all(name.startswith("imap-watch") for name in threads)
+    watcher.abort()
+    assert watcher._wait_executor is None
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("imap_stub", [False], indirect=True)
+async def test_noop_fallback_without_idle_capability(
+    imap_stub: Tuple[_StubClient, _Mailbox],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, mailbox = imap_stub
+    monkeypatch.setattr(client_module, "NOOP_PROBE_INTERVAL", 0.05)
+    await client.connect()
+    await client.select_mailbox()
+    assert not client.supports_idle()
+
+    assert await client.wait_for_changes(0.1) is False
+    mailbox.append(_PLAIN_MESSAGE, _PLAIN_STRUCTURE)
+    assert await client.wait_for_changes(5) is True
+    await client.close()
+
+
+def _adapter(client: _StubClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> EmailAdapter:
+    monkeypatch.setattr(adapter_module.OsEnv, "DATA_DIR", str(tmp_path))
+    adapter = EmailAdapter.__new__(EmailAdapter)
+    adapter.email_clients = {client.account_username: client}
+    adapter.imap_locks = {client.account_username: asyncio.Lock()}
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_lazy_attachment_is_fetched_from_its_own_folder(
+    imap_stub: Tuple[_StubClient, _Mailbox],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    client, mailbox = imap_stub
+    mailbox.name = "Archive"
+    uid = mailbox.append(_MIXED_MESSAGE, _MIXED_STRUCTURE)
+    adapter = _adapter(client, monkeypatch, tmp_path)
+    await client.connect()
+
+    await client.select_mailbox(override_folder="Archive")
+    summary = (await client.fetch_summaries([b"%d" % uid]))[b"%d" % uid]
+    preview = await client.fetch_preview(summary)
+    assert preview is not None
+    await adapter._record_lazy_attachments(client.account_username, str(uid), preview, client.mailbox_state)
+
+    # 主连接此后回到 INBOX，下载附件时需切回邮件所在的文件夹
+    await client.select_mailbox()
+    path = await adapter.download_lazy_attachment(client.account_username, str(uid), "report.pdf")
+    assert path is not None and path.read_bytes() == _ATTACHMENT
+
+    # 文件夹 UIDVALIDITY 变化后旧 UID 失效，不下载错误的邮件
+    path.unlink()
+    mailbox.uidvalidity += 1
+    assert await adapter.download_lazy_attachment(client.account_username, str(uid), "report.pdf") is None
+    await client.close()
+
+
+@pytest.fixture
+async def email_db():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["nekro_agent.models.db_email"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_legacy_sequence_records_reconcile_to_uid(
+    email_db: None,
+    imap_stub: Tuple[_StubClient, _Mailbox],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    client, mailbox = imap_stub
+    mailbox.append(_PLAIN_MESSAGE, _PLAIN_STRUCTURE)
+    uid = mailbox.append(_MIXED_MESSAGE, _MIXED_STRUCTURE)
+    adapter = _adapter(client, monkeypatch, tmp_path)
+    await client.connect()
+
+    # 迁移前按序号 1 记录的邮件，序号与当前 UID 已不一致
+    legacy = await DBEmail.create(account_username=client.account_username, email_uid="seq:1", message_id="<report@example.com>")
+    legacy_dir = adapter._attachment_dir(client.account_username, legacy.storage_key)
+    legacy_dir.mkdir(parents=True)
+    (legacy_dir / "report.pdf").write_bytes(_ATTACHMENT)
+
+    assert legacy.is_legacy_seq
+    assert await adapter.reconcile_legacy_email(legacy) == str(uid)
+    record = await DBEmail.get(id=legacy.id)
+    assert (record.email_uid, record.is_legacy_seq) == (str(uid), False)
+    assert (adapter._attachment_dir(client.account_username, str(uid)) / "report.pdf").read_bytes() == _ATTACHMENT
+
+    # 已有同 UID 的新记录时，旧记录并入新记录
+    duplicate = await DBEmail.create(account_username=client.account_username, email_uid="seq:7", message_id="<report@example.com>")
+    assert await adapter.reconcile_legacy_email(duplicate) == str(uid)
+    assert await DBEmail.filter(message_id="<report@example.com>").count() == 1
+    await client.close()
+
+
+def test_checkpoint_store_resets_on_uidvalidity_change(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoints.json"
+    store = EmailCheckpointStore(path)
+    store.advance("bot@example.com", "INBOX", 777, 10)
+    store.advance("bot@example.com", "INBOX", 777, 8)
+
+    reloaded = EmailCheckpointStore(path)
+    checkpoint = reloaded.get("bot@example.com", "INBOX", 777)
+    assert checkpoint is not None and checkpoint.last_uid == 10, "检查点只增不减且应持久化"
+    assert reloaded.get("bot@example.com", "INBOX", 778) is None
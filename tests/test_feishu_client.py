@@ -0,0 +1,90 @@
+"""飞书异步 OpenAPI 客户端回归测试。"""
+
+import json
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from nekro_agent.adapters.feishu import client as module
+from nekro_agent.adapters.feishu.client import FeishuClient, FeishuRateLimitError
+
+
+class _FakeOpenApi:
+    """本地飞书 OpenAPI：记录请求，按预设依次返回消息发送结果"""
+
+    def __init__(self) -> None:
+        self.token_calls = 0
+        self.requests: List[httpx.Request] = []
+        self.send_results: List[httpx.Response] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/tenant_access_token/internal"):
+            self.token_calls += 1
+            return httpx.Response(200, json={"code": 0, "tenant_access_token": f"t{self.token_calls}", "expire": 7200})
+        self.requests.append(request)
+        if path == "/open-apis/im/v1/messages":
+            if self.send_results:
+                return self.send_results.pop(0)
+            return httpx.Response(200, json={"code": 0, "data": {"message_id": "om_1"}})
+        if path == "/open-apis/im/v1/files":
+            request.read()
+            return httpx.Response(200, json={"code": 0, "data": {"file_key": "file_1"}})
+        if "/resources/" in path:
+            return httpx.Response(200, content=b"x" * 200_000, headers={"content-type": "application/octet-stream"})
+        return httpx.Response(404, json={"code": 1, "msg": "not found"})
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> _FakeOpenApi:
+    monkeypatch.setattr(module, "FEISHU_RETRY_BASE_DELAY_SECONDS", 0.0)
+    return _FakeOpenApi()
+
+
+def _client(api: _FakeOpenApi) -> FeishuClient:
+    return FeishuClient("app", "secret", adapter=None, transport=httpx.MockTransport(api.handler))  # type: ignore[arg-type]
+
+
+async def test_token_cached_and_refreshed_when_invalid(api: _FakeOpenApi) -> None:
+    client = _client(api)
+    api.send_results = [httpx.Response(400, json={"code": 99991663, "msg": "token invalid"})]
+
+    assert await client.send_text_message("oc_1", "chat_id", "hi") == "om_1"
+    assert await client.send_text_message("oc_1", "chat_id", "again") == "om_1"
+
+    assert api.token_calls == 2
+    assert [r.headers["Authorization"] for r in api.requests] == ["Bearer t1", "Bearer t2", "Bearer t2"]
+    body = json.loads(api.requests[-1].content)
+    assert body == {"receive_id": "oc_1", "msg_type": "text", "content": json.dumps({"text": "again"})}
+    await client.stop()
+
+
+async def test_rate_limit_retried_inline_or_surfaced(api: _FakeOpenApi) -> None:
+    client = _client(api)
+    limited = {"code": module.FEISHU_RATE_LIMIT_CODE, "msg": "too many"}
+    api.send_results = [httpx.Response(429, json=limited, headers={"x-ogw-ratelimit-reset": "0"})]
+    assert await client.send_text_message("oc_1", "chat_id", "hi") == "om_1"
+
+    api.send_results = [httpx.Response(429, json=limited, headers={"x-ogw-ratelimit-reset": "30"})]
+    with pytest.raises(FeishuRateLimitError) as exc_info:
+        await client.send_text_message("oc_1", "chat_id", "hi")
+    assert exc_info.value.retry_after == 30.0
+    await client.stop()
+
+
+async def test_streaming_upload_and_download(api: _FakeOpenApi, tmp_path: Path) -> None:
+    client = _client(api)
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"%PDF-content")
+
+    assert await client.upload_file(source, source.name) == "file_1"
+    upload = api.requests[-1]
+    assert b"%PDF-content" in upload.content and b'name="file_name"' in upload.content
+
+    target = tmp_path / "download.bin"
+    await client.download_file_to("om_1", "file_1", target)
+    assert target.stat().st_size == 200_000
+    assert api.requests[-1].url.params["type"] == "file"
+    await client.stop()
@@ -0,0 +1,161 @@
+"""情景记忆批量写入回归测试。"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from tortoise import Tortoise
+
+from nekro_agent.models.db_mem_entity import DBMemEntity
+from nekro_agent.models.db_mem_paragraph import DBMemParagraph
+from nekro_agent.models.db_mem_relation import DBMemRelation
+from nekro_agent.services.memory import consolidator as module
+from nekro_agent.services.memory.consolidator import ConsolidationResult, EpisodicConsolidator
+
+
+@pytest.fixture
+async def memory_db():
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={
+            "models": [
+                "nekro_agent.models.db_mem_paragraph",
+                "nekro_agent.models.db_mem_entity",
+                "nekro_agent.models.db_mem_relation",
+            ],
+        },
+    )
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+def vector_calls(monkeypatch: pytest.MonkeyPatch) -> dict[str, list[Any]]:
+    calls: dict[str, list[Any]] = {"embed_batch": [], "embed_text": [], "batch_upsert": [], "upsert_paragraph": []}
+
+    async def fake_embed_batch(texts: list[str]) -> list[list[float] | None]:
+        calls["embed_batch"].append(texts)
+        return [[0.1, 0.2] for _ in texts]
+
+    async def fake_embed_text(text: str) -> list[float]:
+        calls["embed_text"].append(text)
+        return [0.1, 0.2]
+
+    async def fake_batch_upsert(points: list[tuple[int, list[float], dict[str, Any]]]) -> int:
+        calls["batch_upsert"].append(points)
+        return len(points)
+
+    async def fake_upsert_paragraph(paragraph_id: int, embedding: list[float], payload: dict[str, Any]) -> bool:
+        calls["upsert_paragraph"].append(paragraph_id)
+        return True
+
+    monkeypatch.setattr(module, "embed_batch", fake_embed_batch)
+    monkeypatch.setattr(module, "embed_text", fake_embed_text)
+    monkeypatch.setattr(module.memory_qdrant_manager, "batch_upsert", fake_batch_upsert)
+    monkeypatch.setattr(module.memory_qdrant_manager, "upsert_paragraph", fake_upsert_paragraph)
+    return calls
+
+
+def _messages() -> list[Any]:
+    return [
+        SimpleNamespace(message_id="m1", send_timestamp=1_700_000_000),
+        SimpleNamespace(message_id="m2", send_timestamp=1_700_000_060),
+    ]
+
+
+def _items() -> list[dict[str, Any]]:
+    return [
+        {
+            "content": "小明说他周末要去爬山",
+            "summary": "小明周末爬山",
+            "knowledge_type": "experience",
+            "entities": ["小明", "爬山"],
+            "relations": [{"subject": "小明", "predicate": "喜欢", "object": "爬山"}],
+        },
+        {
+            "content": "小明推荐了一家拉面店",
+            "summary": "小明推荐拉面",
+            "knowledge_type": "preference",
+            "entities": ["小明", "拉面店"],
+            "relations": [
+                {"subject": "小明", "predicate": "喜欢", "object": "爬山"},
+                {"subject": "小明", "predicate": "推荐", "object": "Tokyo Ramen"},
+            ],
+        },
+    ]
+
+
+async def _snapshot() -> dict[str, Any]:
+    entities = await DBMemEntity.all().order_by("canonical_name")
+    relations = await DBMemRelation.all().order_by("predicate")
+    paragraphs = await DBMemParagraph.all().order_by("id")
+    return {
+        "entities": [(e.entity_type, e.canonical_name, e.appearance_count) for e in entities],
+        "relations": [(r.predicate, round(r.base_weight, 2), r.half_life_seconds) for r in relations],
+        "paragraphs": [(p.content, p.knowledge_type, p.embedding_ref == str(p.id)) for p in paragraphs],
+    }
+
+
+async def test_batched_store_matches_one_by_one(memory_db: None, vector_calls: dict[str, list[Any]]) -> None:
+    await DBMemEntity.create(workspace_id=1, entity_type="person", name="小明", canonical_name="小明")
+
+    consolidator = EpisodicConsolidator(workspace_id=1)
+    batched = ConsolidationResult()
+    await consolidator._store_memories(_items(), "chat", _messages(), batched)
+    batched_snapshot = await _snapshot()
+
+    assert len(vector_calls["embed_batch"]) == 1 and not vector_calls["embed_text"]
+    assert len(vector_calls["batch_upsert"]) == 1 and len(vector_calls["batch_upsert"][0]) == 2
+
+    for model in (DBMemParagraph, DBMemEntity, DBMemRelation):
+        await model.all().delete()
+    await DBMemEntity.create(workspace_id=1, entity_type="person", name="小明", canonical_name="小明")
+    sequential = ConsolidationResult()
+    await consolidator._store_memories_one_by_one(_items(), "chat", _messages(), sequential)
+
+    assert batched_snapshot == await _snapshot()
+    assert batched == sequential
+    assert (batched.paragraphs_created, batched.entities_created, batched.entities_updated) == (2, 2, 2)
+    assert (batched.relations_created, batched.relations_updated) == (2, 1)
+
+
+async def test_batched_store_skips_already_stored_paragraphs(
+    memory_db: None,
+    vector_calls: dict[str, list[Any]],
+) -> None:
+    consolidator = EpisodicConsolidator(workspace_id=1)
+    await consolidator._store_memories(_items()[:1], "chat", _messages(), ConsolidationResult())
+
+    result = ConsolidationResult()
+    await consolidator._store_memories(_items(), "chat", _messages(), result)
+
+    assert await DBMemParagraph.all().count() == 2
+    assert vector_calls["embed_batch"][-1] == ["小明推荐了一家拉面店"]
+    assert result.paragraphs_created == 2
+    entity = await DBMemEntity.get(canonical_name="小明")
+    assert entity.appearance_count == 2
+
+
+async def test_concurrent_channels_share_workspace_entities(
+    memory_db: None,
+    vector_calls: dict[str, list[Any]],
+) -> None:
+    # 记忆重建会对同一工作区的多个频道并发沉淀，实体与关系不应重复创建
+    consolidator = EpisodicConsolidator(workspace_id=1)
+    await asyncio.gather(
+        *(
+            consolidator._store_memories_one_by_one(_items(), chat_key, _messages(), ConsolidationResult())
+            for chat_key in ("chat_a", "chat_b", "chat_c")
+        ),
+        *(
+            consolidator._store_memories(_items(), chat_key, _messages(), ConsolidationResult())
+            for chat_key in ("chat_d", "chat_e")
+        ),
+    )
+
+    entities = await DBMemEntity.all()
+    assert sorted(e.canonical_name for e in entities) == ["tokyo ramen", "小明", "拉面店", "爬山"]
+    assert next(e for e in entities if e.canonical_name == "小明").appearance_count == 10
+    assert await DBMemRelation.all().count() == 2
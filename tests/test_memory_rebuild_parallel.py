@@ -0,0 +1,211 @@
+"""记忆重建并发回放与限流回归测试。"""
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from nekro_agent.services import token_bucket
+from nekro_agent.services.memory import rate_limiter
+from nekro_agent.services.memory import rebuild as module
+from nekro_agent.services.memory import rebuild_state_store as store
+from nekro_agent.services.memory.rebuild_state_store import (
+    MemoryRebuildChannelsFile,
+    MemoryRebuildChannelState,
+    RebuildChannelStatus,
+    RebuildFailureCode,
+    RebuildJobStatus,
+)
+from nekro_agent.services.token_bucket import TokenBucket
+
+BATCH_SIZE = 2
+
+
+@pytest.fixture
+def rebuild_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(store, "REBUILD_WORKSPACE_DIR", tmp_path / "workspaces")
+    monkeypatch.setattr(store, "REBUILD_JOB_DIR", tmp_path / "jobs")
+
+
+def _channels(totals: dict[str, int], processed: dict[str, int] | None = None) -> MemoryRebuildChannelsFile:
+    channels: dict[str, MemoryRebuildChannelState] = {}
+    for index, (chat_key, total) in enumerate(totals.items()):
+        base = index * 100
+        done = (processed or {}).get(chat_key, 0)
+        channels[chat_key] = MemoryRebuildChannelState(
+            status=RebuildChannelStatus.PENDING,
+            message_count_total=total,
+            message_count_processed=done,
+            cursor_start_db_id=base,
+            cursor_current_db_id=base + done,
+            cursor_upper_bound_db_id=base + total,
+        )
+    return MemoryRebuildChannelsFile(channels=channels)
+
+
+def _fake_consolidate(calls: list[tuple[str, int]], stats: dict[str, int], errors: set[str] | None = None) -> Any:
+    async def fake(workspace_id: int, chat_key: str, *, max_message_db_id: int, start_after_db_id: int, **_: Any) -> Any:
+        calls.append((chat_key, start_after_db_id))
+        stats["running"] += 1
+        stats["peak"] = max(stats["peak"], stats["running"])
+        await asyncio.sleep(0.01)
+        stats["running"] -= 1
+        if errors and chat_key in errors:
+            return SimpleNamespace(errors=["llm failed"], messages_processed=0, paragraphs_created=0,
+                                   last_processed_message_db_id=start_after_db_id)
+        last = min(max_message_db_id, start_after_db_id + BATCH_SIZE)
+        return SimpleNamespace(
+            errors=[],
+            messages_processed=last - start_after_db_id,
+            paragraphs_created=1,
+            last_processed_message_db_id=last,
+        )
+
+    return fake
+
+
+def _new_job(channels_file: MemoryRebuildChannelsFile) -> Any:
+    state = store.create_job_state(1, requested_by=None, request_id=None, cutoff=None)
+    store.write_job_channels(state.job_id, channels_file)
+    return state
+
+
+async def test_channels_rebuild_concurrently_with_exact_checkpoints(
+    rebuild_dirs: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[tuple[str, int]] = []
+    stats = {"running": 0, "peak": 0}
+    monkeypatch.setattr(module, "consolidate_workspace", _fake_consolidate(calls, stats))
+    monkeypatch.setattr(module.config, "MEMORY_REBUILD_CONCURRENCY", 3)
+
+    # c2 为上次中断后恢复的频道，只应从游标处继续
+    channels_file = _channels({"c1": 6, "c2": 6, "c3": 4, "c4": 5}, processed={"c2": 4})
+    state = _new_job(channels_file)
+
+    processed, paragraphs = await module._rebuild_channels(state, channels_file)
+
+    assert stats["peak"] == 3
+    assert processed == 6 + 2 + 4 + 5
+    assert paragraphs == len(calls)
+    assert [start for key, start in calls if key == "c2"] == [104]
+    assert not state.active_chat_keys and state.worker_count == 3
+    assert state.progress.throughput_messages_per_minute > 0
+
+    stored = store.read_job_channels(state.job_id)
+    for chat_key, channel in stored.channels.items():
+        assert channel.status == RebuildChannelStatus.COMPLETED, chat_key
+        assert channel.cursor_current_db_id == channel.cursor_upper_bound_db_id
+        assert channel.message_count_processed == channel.message_count_total
+
+
+async def test_channel_failure_stops_remaining_workers(rebuild_dirs: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, int]] = []
+    stats = {"running": 0, "peak": 0}
+    monkeypatch.setattr(module, "consolidate_workspace", _fake_consolidate(calls, stats, errors={"c1"}))
+    monkeypatch.setattr(module.config, "MEMORY_REBUILD_CONCURRENCY", 2)
+
+    channels_file = _channels({"c1": 4, "c2": 20, "c3": 4})
+    state = _new_job(channels_file)
+    await module._rebuild_channels(state, channels_file)
+
+    assert state.status == RebuildJobStatus.FAILED
+    assert state.failure_code == RebuildFailureCode.CHANNEL_BATCH_FAILED
+    assert state.failure_reason == "c1: llm failed"
+    assert "c3" not in {key for key, _ in calls}
+    assert channels_file.channels["c2"].status != RebuildChannelStatus.COMPLETED
+
+
+async def test_cancel_written_by_api_is_honoured(rebuild_dirs: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[str, int]] = []
+    stats = {"running": 0, "peak": 0}
+    fake = _fake_consolidate(calls, stats)
+
+    async def cancelling(*args: Any, **kwargs: Any) -> Any:
+        if len(calls) == 2:
+            stored = store.read_job_state(state.job_id)
+            assert stored is not None
+            stored.cancel_requested = True
+            store.write_job_state(stored)
+        return await fake(*args, **kwargs)
+
+    monkeypatch.setattr(module, "consolidate_workspace", cancelling)
+    monkeypatch.setattr(module.config, "MEMORY_REBUILD_CONCURRENCY", 1)
+
+    channels_file = _channels({"c1": 20})
+    state = _new_job(channels_file)
+    await module._rebuild_channels(state, channels_file)
+
+    assert state.status == RebuildJobStatus.CANCELLED
+    assert len(calls) < 10
+    assert channels_file.channels["c1"].cursor_current_db_id == len(calls) * BATCH_SIZE
+
+
+def test_refresh_progress_reports_throughput_and_eta() -> None:
+    channels_file = _channels({"c1": 60, "c2": 30}, processed={"c1": 30})
+    state = store.MemoryRebuildJobState(
+        job_id="j",
+        workspace_id=1,
+        status=RebuildJobStatus.REBUILDING_CHANNELS,
+        phase=store.RebuildJobPhase.CHANNEL_BATCH,
+        created_at=store.utcnow_iso(),
+    )
+    state.progress.rate_window_started_at = (store.utcnow() - timedelta(seconds=60)).isoformat()
+    state.progress.rate_window_base_messages = 10
+
+    module._refresh_progress(state, channels_file)
+
+    assert state.progress.throughput_messages_per_minute == pytest.approx(20, rel=0.05)
+    assert state.progress.eta_seconds == pytest.approx(180, abs=5)
+
+    state.status = RebuildJobStatus.COMPLETED
+    module._refresh_progress(state, channels_file)
+    assert state.progress.eta_seconds is None
+
+
+async def test_token_bucket_paces_after_burst(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        nonlocal now
+        sleeps.append(seconds)
+        now += seconds
+
+    monkeypatch.setattr(token_bucket.time, "monotonic", lambda: now)
+    monkeypatch.setattr(token_bucket.asyncio, "sleep", fake_sleep)
+
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    for _ in range(4):
+        await bucket.acquire()
+    assert sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+
+    # 超过容量的请求按容量计，不会永久等待
+    await bucket.acquire(10)
+    assert now == pytest.approx(4.0)
+
+    unlimited = TokenBucket(rate_per_minute=0)
+    await unlimited.acquire(1000)
+
+
+async def test_quota_helpers_only_apply_inside_rebuild(monkeypatch: pytest.MonkeyPatch) -> None:
+    acquired: list[tuple[str, float]] = []
+
+    class FakeBucket:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def acquire(self, amount: float = 1) -> None:
+            acquired.append((self.name, amount))
+
+    limiter: Any = SimpleNamespace(llm=FakeBucket("llm"), embedding=FakeBucket("embedding"))
+    await rate_limiter.acquire_llm_quota()
+    assert acquired == []
+
+    with rate_limiter.use_rebuild_rate_limiter(limiter):
+        await asyncio.gather(rate_limiter.acquire_llm_quota(), rate_limiter.acquire_embedding_quota(8))
+    await rate_limiter.acquire_embedding_quota()
+    assert sorted(acquired) == [("embedding", 8), ("llm", 1)]
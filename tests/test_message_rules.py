@@ -0,0 +1,93 @@
+"""消息准入规则引擎回归测试。"""
+
+import re
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from nekro_agent.core.core_utils import ConfigManager
+from nekro_agent.services import message_rules as module
+from nekro_agent.services.message_rules import CompiledRuleSet, MessageRuleEngine
+from nekro_agent.tools.common_util import check_content_trigger, check_forbidden_message
+
+
+def _config(trigger: list[str] | None = None, ignore: list[str] | None = None) -> Any:
+    return SimpleNamespace(AI_CHAT_TRIGGER_REGEX=trigger or [], AI_CHAT_IGNORE_REGEX=ignore or [])
+
+
+def test_compiled_rule_set_matches_like_individual_search() -> None:
+    rules = [r"^/ask", r"(天气|气温)怎么样", r"(\w)\1{3}", r"(?P<word>hello)\s+(?P=word)", r"(?i)^BOT", r"[invalid"]
+    rule_set = CompiledRuleSet("trigger", rules)
+    assert rule_set.invalid_rules == ["[invalid"]
+
+    samples = ["/ask 今天", "明天天气怎么样", "哈哈哈哈", "hello hello", "bot 在吗", "普通消息", "xx/ask"]
+    for text in samples:
+        expected = next((r for r in rules[:-1] if re.search(r, text)), None)
+        hit = rule_set.search(text)
+        assert (hit.rule if hit else None) == expected, text
+    hit = rule_set.search("明天气温怎么样")
+    assert hit is not None and hit.matched == "气温怎么样"
+
+
+def test_engine_caches_by_config_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = MessageRuleEngine()
+    compiled: list[tuple[str, ...]] = []
+    original = module.CompiledRuleSet
+
+    def counting(kind: str, patterns: tuple[str, ...]) -> CompiledRuleSet:
+        compiled.append(tuple(patterns))
+        return original(kind, patterns)
+
+    monkeypatch.setattr(module, "CompiledRuleSet", counting)
+    config = _config(trigger=["救命"], ignore=["^#"])
+
+    for _ in range(3):
+        assert engine.match_trigger("救命啊", config) is not None
+        assert engine.match_ignore("普通消息", config) is None
+    assert compiled == [("救命",), ("^#",)]
+
+    ConfigManager.bump_version()
+    assert engine.match_trigger("救命啊", config) is not None
+    assert len(compiled) == 3
+
+    # 覆盖配置中的规则不同，编译为独立的匹配器
+    assert engine.match_trigger("救命啊", _config(trigger=["帮忙"])) is None
+
+
+def test_fake_message_rules_and_hit_counters() -> None:
+    engine = MessageRuleEngine()
+    assert engine.match_fake("<1234|Message Separator> hi") is not None
+    assert engine.match_fake("<abcdef|messageseperator>") is not None
+    assert engine.match_fake("[(ID:123)] Some Message") is not None
+    assert engine.match_fake("from_id: 10001") is not None
+    assert engine.match_fake("这条 message 很正常") is None
+
+    config = _config(trigger=["ping"])
+    for _ in range(3):
+        engine.match_trigger("ping", config)
+    stats = {(s.kind, s.rule): s.hits for s in engine.hit_stats()}
+    assert stats[("trigger", "ping")] == 3
+    assert stats[("fake", module.FAKE_MESSAGE_PATTERNS[0])] == 2
+    assert stats[("fake", "message & (id:")] == 1
+    assert engine.hit_stats()[0].rule == "ping"
+
+
+def test_fake_message_check_is_linear_on_large_input() -> None:
+    engine = MessageRuleEngine()
+    # `message[\s\S]*\(id:` 形式的正则在该输入上需要数秒
+    texts = ["message" * 16000, "(id:" * 28000, "message" * 16000 + "(id:"]
+    started = time.perf_counter()
+    results = [engine.match_fake(text) for text in texts]
+    elapsed = time.perf_counter() - started
+    assert [hit is not None for hit in results] == [False, False, True]
+    assert elapsed < 0.05
+
+
+def test_common_util_wrappers_use_engine() -> None:
+    config = _config(trigger=["^nekro"], ignore=["广告", "[bad"])
+    assert check_content_trigger("nekro 你好", config)
+    assert not check_content_trigger("你好 nekro", config)
+    assert check_forbidden_message("这是广告", config)
+    assert not check_forbidden_message("[bad", config)
@@ -0,0 +1,208 @@
+"""模型组路由与熔断回归测试。"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from nekro_agent.core.config import CoreConfig, ModelConfigGroup
+from nekro_agent.services.agent import model_router as module
+from nekro_agent.services.agent import openai as openai_module
+from nekro_agent.services.agent import run_agent
+from nekro_agent.services.agent.creator import OpenAIChatMessage
+from nekro_agent.services.agent.model_group_limiter import model_group_limiters
+from nekro_agent.services.agent.model_router import BreakerState, EndpointHealth, ModelRouter
+
+MESSAGES = [OpenAIChatMessage.from_text("user", "hi")]
+
+
+class _StubOpenAIServer:
+    """OpenAI 兼容的本地桩服务，按 API 地址的主机名注入故障"""
+
+    def __init__(self) -> None:
+        self.faults: Dict[str, int] = {}
+        self.hits: List[str] = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.hits.append(host)
+        status = self.faults.get(host, 200)
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": f"{host} injected {status}", "type": "server_error"}})
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stub",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": f"from {host}"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            },
+        )
+
+
+@pytest.fixture
+def stub_server(monkeypatch: pytest.MonkeyPatch, tmp_path: Any) -> _StubOpenAIServer:
+    server = _StubOpenAIServer()
+    monkeypatch.setattr(
+        openai_module,
+        "_create_http_client",
+        lambda **_: httpx.AsyncClient(transport=httpx.MockTransport(server.handle)),
+    )
+    monkeypatch.setattr(run_agent, "PROMPT_ERROR_LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(run_agent, "model_router", ModelRouter())
+    return server
+
+
+def _group(host: str, pool: str = "", **kwargs: Any) -> ModelConfigGroup:
+    return ModelConfigGroup(CHAT_MODEL="stub", BASE_URL=f"http://{host}/v1", API_KEY="sk-test", ROUTING_POOL=pool, **kwargs)
+
+
+async def test_failover_within_pool_then_breaker_moves_to_fallback(stub_server: _StubOpenAIServer) -> None:
+    router: ModelRouter = run_agent.model_router
+    stub_server.faults["a.test"] = 500
+    pooled = CoreConfig(
+        MODEL_GROUPS={"a": _group("a.test", "p"), "b": _group("b.test", "p"), "fb": _group("fb.test")},
+        USE_MODEL_GROUP="a",
+        FALLBACK_MODEL_GROUP="fb",
+    )
+
+    response, used, errors = await run_agent.send_agent_request(MESSAGES, pooled)
+    assert (response.response_content, used.BASE_URL, len(errors)) == ("from b.test", "http://b.test/v1", 1)
+    # 主模型组刚出错，下一次对话直接按错误率折算后的预期耗时选择同池模型组
+    await run_agent.send_agent_request(MESSAGES, pooled)
+    assert stub_server.hits == ["a.test", "b.test", "b.test"]
+    assert [(d.chosen, d.reason) for d in reversed(router.snapshot().decisions)] == [
+        ("a", "primary"),
+        ("b", "failover"),
+        ("b", "score"),
+    ]
+
+    # 未配置路由池时保持原有行为：主模型组重试，最后一次改用备用模型组
+    stub_server.hits.clear()
+    single = pooled.model_copy(update={"MODEL_GROUPS": {**pooled.MODEL_GROUPS, "a": _group("a.test")}})
+    _, used, _ = await run_agent.send_agent_request(MESSAGES, single)
+    assert stub_server.hits == ["a.test", "a.test", "fb.test"]
+    assert used.BASE_URL == "http://fb.test/v1"
+
+    # 主模型组连续失败已熔断，下一次对话首次尝试即切换到备用模型组
+    stub_server.hits.clear()
+    await run_agent.send_agent_request(MESSAGES, single)
+    assert stub_server.hits == ["fb.test"]
+    assert (router.snapshot().decisions[0].chosen, router.snapshot().decisions[0].reason) == ("fb", "failover")
+
+    status = {endpoint.name: endpoint for endpoint in router.snapshot().endpoints}
+    assert status["a"].state == BreakerState.OPEN and status["a"].error_rate == 1.0
+    assert "injected 500" in status["a"].last_error
+    assert status["b"].latency_ms is not None and status["b"].error_rate == 0
+
+
+async def test_half_open_admits_single_probe_and_doubles_cooldown(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(module, "BREAKER_COOLDOWN_SECONDS", 0.05)
+    router = ModelRouter()
+    health: EndpointHealth = router.health("a")
+    for _ in range(module.BREAKER_CONSECUTIVE_FAILURES):
+        health.record_failure("boom")
+    assert health.current_state() == BreakerState.OPEN and not health.available
+
+    await asyncio.sleep(0.06)
+    assert health.current_state() == BreakerState.HALF_OPEN and health.available
+    # 被取消的探测不计入统计，并释放探测名额
+    with pytest.raises(asyncio.CancelledError), router.track("a"):
+        assert not health.available
+        raise asyncio.CancelledError
+    assert health.available
+
+    # 与模型组无关的错误同样只释放探测名额
+    with pytest.raises(ValueError), router.track("a"):
+        raise ValueError("bad tool schema")
+    assert health.current_state() == BreakerState.HALF_OPEN and health.available
+
+    with pytest.raises(ConnectionError), router.track("a"):
+        raise ConnectionError("still down")
+    assert health.current_state() == BreakerState.OPEN
+    assert health.cooldown == pytest.approx(0.1)
+
+    await asyncio.sleep(0.11)
+    with router.track("a") as attempt:
+        attempt.ttft_ms = 12
+    assert health.current_state() == BreakerState.CLOSED
+    assert health.cooldown == module.BREAKER_COOLDOWN_SECONDS
+    assert health.status().ttft_ms == 12
+
+
+async def test_client_errors_do_not_trip_breaker(stub_server: _StubOpenAIServer) -> None:
+    router: ModelRouter = run_agent.model_router
+    stub_server.faults["a.test"] = 400
+    single = CoreConfig(MODEL_GROUPS={"a": _group("a.test"), "fb": _group("fb.test")}, USE_MODEL_GROUP="a", FALLBACK_MODEL_GROUP="fb")
+
+    for _ in range(2):
+        await run_agent.send_agent_request(MESSAGES, single)
+    # 请求内容导致的 400 重试时仍会换模型组，但不计入主模型组的错误率与熔断
+    assert stub_server.hits == ["a.test", "a.test", "fb.test"] * 2
+    status = router.health("a").status()
+    assert (status.state, status.samples, status.consecutive_failures) == (BreakerState.CLOSED, 0, 0)
+
+    stub_server.faults["a.test"] = 429
+    for _ in range(2):
+        await run_agent.send_agent_request(MESSAGES, single)
+    assert router.health("a").current_state() == BreakerState.OPEN
+
+
+async def test_half_open_probe_is_reserved_when_chosen(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(module, "BREAKER_COOLDOWN_SECONDS", 0.05)
+    router = ModelRouter()
+    groups = {"a": _group("a.test", "p"), "b": _group("b.test", "p")}
+    for _ in range(module.BREAKER_CONSECUTIVE_FAILURES):
+        router.health("a").record_failure("boom")
+    await asyncio.sleep(0.06)
+
+    # 并发请求在发出前依次选择：只有第一个拿到探测名额，其余转到同池模型组
+    first, second = set(), set()
+    assert router.choose(groups, primary="a", fallback="a", messages=MESSAGES, reserved=first) == "a"
+    assert router.choose(groups, primary="a", fallback="a", messages=MESSAGES, reserved=second) == "b"
+    assert (first, second) == ({"a"}, set())
+
+    # 请求未发出时归还名额，下一个请求重新探测
+    router.release("a")
+    assert router.choose(groups, primary="a", fallback="a", messages=MESSAGES, reserved=second) == "a"
+
+
+async def test_probe_reservation_released_when_attempt_never_starts(
+    stub_server: _StubOpenAIServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(module, "BREAKER_COOLDOWN_SECONDS", 0.05)
+    router: ModelRouter = run_agent.model_router
+    for _ in range(module.BREAKER_CONSECUTIVE_FAILURES):
+        router.health("a").record_failure("boom")
+    await asyncio.sleep(0.06)
+    single = CoreConfig(MODEL_GROUPS={"a": _group("a.test")}, USE_MODEL_GROUP="a", FALLBACK_MODEL_GROUP="a")
+
+    async def cancelled_before_request(*_: Any) -> None:
+        raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        await run_agent.send_agent_request(MESSAGES, single, on_llm_attempt=cancelled_before_request)
+    assert stub_server.hits == [] and router.health("a").available
+
+
+def test_pool_member_with_exhausted_quota_loses_to_slower_peer() -> None:
+    router = ModelRouter()
+    groups = {"quota_fast": _group("fast.test", "q", RPM_LIMIT=6), "quota_slow": _group("slow.test", "q")}
+    for _ in range(3):
+        router.health("quota_fast").record_success(100)
+        router.health("quota_slow").record_success(400)
+
+    assert router.choose(groups, primary="quota_fast", fallback="quota_fast", messages=MESSAGES) == "quota_fast"
+
+    # RPM 令牌耗尽后需等待约 10 秒，预期耗时高于较慢的同池模型组
+    limiter = model_group_limiters.get("quota_fast", groups["quota_fast"])
+    assert limiter is not None
+    limiter.rpm.consume(limiter.rpm.capacity)
+    assert router.choose(groups, primary="quota_fast", fallback="quota_fast", messages=MESSAGES) == "quota_slow"
+    decision = router.snapshot().decisions[0]
+    assert decision.reason == "score"
+    assert {c.name: c.quota_wait_ms > 5000 for c in decision.candidates} == {"quota_fast": True, "quota_slow": False}
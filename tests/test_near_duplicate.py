@@ -0,0 +1,90 @@
+"""近似重复消息检测回归测试。"""
+
+import pytest
+
+from nekro_agent.services import near_duplicate as module
+from nekro_agent.services.near_duplicate import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    NearDuplicateDetector,
+    estimate_similarity,
+    legacy_ratio_to_jaccard,
+    minhash_signature,
+    text_shingles,
+)
+
+
+def test_signature_is_bounded_and_estimates_jaccard() -> None:
+    long_text = "今天的天气非常好，我们一起去公园散步吧，顺便买点水果回来。" * 20
+    assert len(minhash_signature(long_text)) <= 64
+
+    text_a = "the quick brown fox jumps over the lazy dog near the river bank"
+    text_b = "the quick brown fox jumps over the lazy cat near the river bank"
+    shingles_a, shingles_b = text_shingles(text_a), text_shingles(text_b)
+    exact = len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+    estimated = estimate_similarity(minhash_signature(text_a), minhash_signature(text_b))
+    assert abs(estimated - exact) < 0.2
+    assert estimate_similarity(minhash_signature(text_a), minhash_signature("完全无关的中文内容，没有任何重叠")) == 0.0
+
+
+def test_check_detects_exact_and_similar_messages() -> None:
+    detector = NearDuplicateDetector()
+    detector.add("c1", "我觉得这个方案还不错，可以先试试看效果如何")
+
+    assert detector.check("c1", "我觉得这个方案还不错，可以先试试看效果如何").exact
+    similar = detector.check("c1", "我觉得这个方案还不错，可以先试试看效果怎样", min_length=12)
+    assert not similar.exact and similar.similarity > 0.6
+    assert detector.check("c1", "完全不同的一句话，讨论的是晚饭吃什么", min_length=12).similarity < 0.2
+
+    # 短消息不计算相似度，其他频道互不影响
+    assert detector.check("c1", "我觉得这个方案", min_length=12).similarity == 0.0
+    assert not detector.check("c2", "我觉得这个方案还不错，可以先试试看效果如何").exact
+
+
+def test_windows_are_bounded_by_count_time_and_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(module.time, "monotonic", lambda: now)
+
+    detector = NearDuplicateDetector(max_window_size=3, max_keys=2)
+    for i in range(5):
+        detector.add("c1", f"message {i}")
+    assert not detector.check("c1", "message 1").exact
+    assert detector.check("c1", "message 2").exact
+    assert not detector.check("c1", "message 2", window_size=2).exact
+
+    now = 1100.0
+    detector.add("c1", "fresh message")
+    assert not detector.check("c1", "message 4", window_seconds=60).exact
+    assert detector.check("c1", "fresh message", window_seconds=60).exact
+
+    detector.add("c2", "x")
+    detector.add("c3", "y")
+    assert len(detector) == 2
+    assert not detector.check("c1", "fresh message").exact
+
+
+def test_default_threshold_matches_previous_sequence_matcher_range() -> None:
+    detector = NearDuplicateDetector()
+    detector.add("c1", "好的主人，我已经帮你把明天早上八点的闹钟设置好了，记得早点休息哦")
+
+    # 旧版 SequenceMatcher 比值约 0.7 的改写仍应触发警告
+    reworded = detector.check("c1", "收到！明天早上八点的闹钟已经设置好了，主人记得早点休息哦", min_length=12)
+    assert reworded.similarity > DEFAULT_SIMILARITY_THRESHOLD
+    # 只共享称呼和语气词的回复不应触发
+    unrelated = detector.check("c1", "好的主人，有什么需要随时叫我哦，我会一直在这里等你的", min_length=12)
+    assert unrelated.similarity < DEFAULT_SIMILARITY_THRESHOLD
+
+
+def test_legacy_sequence_ratio_thresholds_are_converted() -> None:
+    assert legacy_ratio_to_jaccard(0.7) == DEFAULT_SIMILARITY_THRESHOLD
+    assert legacy_ratio_to_jaccard(0.9) == 0.5
+    assert legacy_ratio_to_jaccard(0.8) == 0.425
+    assert legacy_ratio_to_jaccard(1.5) == 1.0
+
+    from plugins.builtin.basic import BasicConfig
+
+    # 旧配置文件中的 SIMILARITY_THRESHOLD 是序列匹配比值，加载时换算到新字段，不再原样沿用
+    migrated = BasicConfig.model_validate({"SIMILARITY_THRESHOLD": 0.9})
+    assert migrated.SIMILARITY_JACCARD_THRESHOLD == 0.5
+    assert "SIMILARITY_THRESHOLD" not in migrated.model_dump()
+    explicit = BasicConfig.model_validate({"SIMILARITY_THRESHOLD": 0.9, "SIMILARITY_JACCARD_THRESHOLD": 0.2})
+    assert explicit.SIMILARITY_JACCARD_THRESHOLD == 0.2
@@ -0,0 +1,68 @@
+"""OneBot 群成员目录缓存回归测试。"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from nekro_agent.adapters.onebot_v11.tools import group_member_cache as module
+from nekro_agent.adapters.onebot_v11.tools.group_member_cache import GroupMemberDirectory
+
+
+class _FakeBot:
+    def __init__(self, fail_list: bool = False) -> None:
+        self.fail_list = fail_list
+        self.calls: List[str] = []
+        self.members: Dict[int, Dict[str, Any]] = {
+            1: {"user_id": 1, "nickname": "alice", "card": "A"},
+            2: {"user_id": 2, "nickname": "bob", "card": ""},
+        }
+
+    async def get_group_member_list(self, *, group_id: int) -> List[Dict[str, Any]]:
+        self.calls.append("list")
+        await asyncio.sleep(0.01)
+        if self.fail_list:
+            raise RuntimeError("timeout")
+        return list(self.members.values())
+
+    async def get_group_member_info(self, *, group_id: int, user_id: int, no_cache: bool) -> Dict[str, Any]:
+        self.calls.append(f"info:{user_id}")
+        await asyncio.sleep(0.01)
+        return self.members[user_id]
+
+
+async def test_concurrent_lookups_share_one_bulk_load() -> None:
+    bot = _FakeBot()
+    directory = GroupMemberDirectory()
+
+    names = await asyncio.gather(*(directory.get_display_name(bot, "100", uid) for uid in (1, 2, 1, 2)))  # type: ignore[arg-type]
+
+    assert names == ["A", "bob", "A", "bob"]
+    assert bot.calls == ["list"]
+
+
+async def test_missing_member_and_card_change_refetch_single_member() -> None:
+    bot = _FakeBot()
+    directory = GroupMemberDirectory()
+    await directory.get_display_name(bot, 100, 1)  # type: ignore[arg-type]
+
+    # 新入群成员不在预热目录中，单独查询后补入
+    bot.members[3] = {"user_id": 3, "nickname": "carol", "card": ""}
+    await asyncio.gather(*(directory.get_display_name(bot, 100, 3) for _ in range(3)))  # type: ignore[arg-type]
+    assert bot.calls == ["list", "info:3"]
+
+    bot.members[1] = {"user_id": 1, "nickname": "alice", "card": "Alice2"}
+    directory.handle_notice({"notice_type": "group_card", "group_id": 100, "user_id": 1})
+    assert await directory.get_display_name(bot, 100, 1) == "Alice2"  # type: ignore[arg-type]
+    assert bot.calls == ["list", "info:3", "info:1"]
+
+
+async def test_list_failure_falls_back_and_expires_sooner(monkeypatch: pytest.MonkeyPatch) -> None:
+    bot = _FakeBot(fail_list=True)
+    directory = GroupMemberDirectory(ttl=3600)
+    monkeypatch.setattr(module, "MEMBER_LIST_RETRY_SECONDS", 0)
+
+    assert await directory.get_display_name(bot, 100, 2) == "bob"  # type: ignore[arg-type]
+    bot.fail_list = False
+    assert await directory.get_display_name(bot, 100, 1) == "A"  # type: ignore[arg-type]
+    assert bot.calls == ["list", "info:2", "list"]
@@ -0,0 +1,92 @@
+"""OneBot 入站媒体并发下载回归测试。"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from nonebot.adapters.onebot.v11 import Message, MessageSegment
+
+from nekro_agent.adapters.onebot_v11.tools import convertor
+from nekro_agent.schemas.chat_message import ChatMessageSegmentImage, ChatMessageSegmentType
+from nekro_agent.services.media_download_pool import MediaDownloadPool
+
+
+def _image_node(sender: str, *urls: str, nested: Any = None) -> Dict[str, Any]:
+    content: List[Dict[str, Any]] = [{"type": "image", "data": {"url": url}} for url in urls]
+    if nested is not None:
+        content.append({"type": "forward", "data": {"content": nested}})
+    return {"sender": {"nickname": sender}, "content": content}
+
+
+class _FakeBot:
+    async def call_api(self, action: str, **_: Any) -> Dict[str, Any]:
+        assert action == "get_forward_msg"
+        nested = [_image_node("inner", "http://cdn-b/n1.png")]
+        return {
+            "messages": [
+                _image_node("alice", "http://cdn-a/f1.png", "http://cdn-a/bad.png"),
+                _image_node("bob", "http://cdn-a/f2.png", nested=nested),
+            ],
+        }
+
+
+async def test_media_downloaded_concurrently_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    running = peak = 0
+    per_host_peak: Dict[str, int] = {}
+    per_host_running: Dict[str, int] = {}
+
+    async def fake_create_from_url(cls: Any, url: str, from_chat_key: str, file_name: str = "", use_suffix: str = ""):
+        nonlocal running, peak
+        host = url.split("/")[2]
+        running += 1
+        per_host_running[host] = per_host_running.get(host, 0) + 1
+        peak = max(peak, running)
+        per_host_peak[host] = max(per_host_peak.get(host, 0), per_host_running[host])
+        await asyncio.sleep(0.01)
+        running -= 1
+        per_host_running[host] -= 1
+        if "bad" in url:
+            raise ConnectionError("timeout")
+        name = url.rsplit("/", 1)[-1]
+        return cls(type=cls.get_segment_type(), text=f"[Image: {name}]", file_name=name, remote_url=url)
+
+    monkeypatch.setattr(ChatMessageSegmentImage, "create_from_url", classmethod(fake_create_from_url))
+    monkeypatch.setattr(convertor, "media_download_pool", MediaDownloadPool(max_concurrency=8, per_host=2))
+
+    message = Message(
+        [
+            MessageSegment.text("hi"),
+            MessageSegment(type="image", data={"url": "http://cdn-a/bad.png", "file": "bad.png"}),
+            MessageSegment(type="forward", data={"id": "f1"}),
+            MessageSegment(type="image", data={"url": "http://cdn-b/top.png", "file": "top.png"}),
+        ],
+    )
+    event = SimpleNamespace(message=message, message_id=1)
+    channel = SimpleNamespace(chat_key="onebot_v11-group_1")
+
+    segments, is_tome, message_id = await convertor.convert_chat_message(
+        event,  # type: ignore[arg-type]
+        False,
+        _FakeBot(),  # type: ignore[arg-type]
+        channel,  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+    )
+
+    assert (is_tome, message_id) == (False, "1")
+    assert [seg.type for seg in segments] == [
+        ChatMessageSegmentType.TEXT.value,
+        ChatMessageSegmentType.TEXT.value,
+        ChatMessageSegmentType.FORWARD.value,
+        ChatMessageSegmentType.IMAGE.value,
+    ]
+    # 下载失败降级为占位文本，不影响整条消息
+    assert segments[1].text == convertor.IMAGE_FALLBACK_TEXT
+    forward = segments[2].forward_content  # type: ignore[attr-defined]
+    assert forward[0]["images"] == ["f1.png"]
+    assert forward[1]["forward_content"][0]["images"] == ["n1.png"]
+    assert forward[2]["images"] == ["f2.png"]
+    assert segments[3].file_name == "top.png"  # type: ignore[attr-defined]
+
+    assert peak > 2
+    assert max(per_host_peak.values()) <= 2
@@ -0,0 +1,198 @@
+"""出站消息投递队列回归测试。"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+from tortoise import Tortoise
+
+from nekro_agent.adapters.interface.base import AdapterMetadata, SendRateLimit
+from nekro_agent.adapters.interface.schemas.platform import (
+    PlatformSendRequest,
+    PlatformSendResponse,
+    PlatformSendSegment,
+    PlatformSendSegmentType,
+)
+from nekro_agent.models.db_outbox_message import DBOutboxMessage
+from nekro_agent.schemas.agent_message import AgentMessageSegment
+from nekro_agent.services import outbox as module
+from nekro_agent.services.outbox import OutboxService, extract_retry_after
+
+
+class _FakeAdapter:
+    """按预设结果依次返回的适配器，记录每次发送的文本"""
+
+    def __init__(self, key: str = "fake", results: Optional[Dict[str, List[Any]]] = None) -> None:
+        self.key = key
+        self.metadata = AdapterMetadata(name="fake", description="fake")
+        self.results = results or {}
+        self.sent: List[str] = []
+
+    async def forward_message(self, request: PlatformSendRequest) -> PlatformSendResponse:
+        text = request.segments[0].content
+        self.sent.append(text)
+        await asyncio.sleep(0)
+        pending = self.results.get(text)
+        result = pending.pop(0) if pending else PlatformSendResponse(success=True, message_id=text)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _request(text: str, chat_key: str = "fake-group_1") -> PlatformSendRequest:
+    return PlatformSendRequest(
+        chat_key=chat_key,
+        segments=[PlatformSendSegment(type=PlatformSendSegmentType.TEXT, content=text)],
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fast_retry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(module.config, "OUTBOX_PERSIST_ENABLED", False)
+    monkeypatch.setattr(module.config, "OUTBOX_MAX_RETRIES", 2)
+    monkeypatch.setattr(module, "RETRY_BASE_DELAY_SECONDS", 0.0)
+
+
+async def test_channel_order_kept_while_other_channels_proceed() -> None:
+    adapter = _FakeAdapter(
+        results={"a1": [PlatformSendResponse(success=False, error_message="429", retry_after=0.05)]},
+    )
+    service = OutboxService()
+    results = await asyncio.gather(
+        service.send(adapter, _request("a1")),  # type: ignore[arg-type]
+        service.send(adapter, _request("a2")),  # type: ignore[arg-type]
+        service.send(adapter, _request("b1", chat_key="fake-group_2")),  # type: ignore[arg-type]
+    )
+    assert [r.message_id for r in results] == ["a1", "a2", "b1"]
+    # 频道 1 重试期间频道 2 不受阻塞，频道 1 内部顺序不变
+    assert adapter.sent == ["a1", "b1", "a1", "a2"]
+    assert service.pending_count() == 0
+
+
+async def test_retry_exhaustion_and_non_retryable_failure() -> None:
+    adapter = _FakeAdapter(
+        results={
+            "boom": [httpx.ConnectError("down")] * 3,
+            "read_timeout": [httpx.ReadTimeout("no response")],
+            "partial": [RuntimeError("segment 2 failed")],
+            "bad": [PlatformSendResponse(success=False, error_message="invalid chat")],
+        },
+    )
+    service = OutboxService()
+    with pytest.raises(httpx.ConnectError):
+        await service.send(adapter, _request("boom"))  # type: ignore[arg-type]
+    assert adapter.sent.count("boom") == 3
+
+    # 平台可能已接收的发送不重试，避免重复消息
+    with pytest.raises(httpx.ReadTimeout):
+        await service.send(adapter, _request("read_timeout"))  # type: ignore[arg-type]
+    with pytest.raises(RuntimeError):
+        await service.send(adapter, _request("partial"))  # type: ignore[arg-type]
+    assert adapter.sent.count("read_timeout") == adapter.sent.count("partial") == 1
+
+    response = await service.send(adapter, _request("bad"))  # type: ignore[arg-type]
+    assert not response.success and adapter.sent.count("bad") == 1
+
+
+async def test_cancelled_before_sending_is_dropped() -> None:
+    adapter = _FakeAdapter(results={"slow": [PlatformSendResponse(success=False, retry_after=0.05)]})
+    service = OutboxService()
+    first = asyncio.create_task(service.send(adapter, _request("slow")))  # type: ignore[arg-type]
+    second = asyncio.create_task(service.send(adapter, _request("dropped")))  # type: ignore[arg-type]
+    await asyncio.sleep(0.01)
+    second.cancel()
+    assert (await first).success
+    assert "dropped" not in adapter.sent
+
+
+def test_retry_delay_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(module, "RETRY_BASE_DELAY_SECONDS", 6.0)
+    monkeypatch.setattr(module.config, "OUTBOX_RETRY_MAX_DELAY_SECONDS", 10.0)
+    assert OutboxService._retry_delay(0, 3.0) == 3.0
+    # 平台要求等待过久时放弃
+    assert OutboxService._retry_delay(0, 60.0) is None
+    assert 6.0 <= OutboxService._retry_delay(0, None) <= 6.0 * (1 + module.RETRY_JITTER_RATIO)  # type: ignore[operator]
+    assert OutboxService._retry_delay(1, None) == 10.0
+    assert OutboxService._retry_delay(2, None) is None
+
+
+def test_extract_retry_after_and_channel_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+    from datetime import timedelta
+
+    class RetryAfter(Exception):
+        def __init__(self, value: Any) -> None:
+            self.retry_after = value
+
+    assert extract_retry_after(RetryAfter(5)) == 5.0
+    assert extract_retry_after(RetryAfter(timedelta(seconds=2))) == 2.0
+    assert extract_retry_after(ValueError()) is None
+
+    monkeypatch.setattr(module, "CHANNEL_BUCKET_CACHE_SIZE", 2)
+    service = OutboxService()
+    limit = SendRateLimit(per_minute=600, per_channel_per_minute=20)
+    first = service._channel_bucket("fake", "c1", limit)
+    service._channel_bucket("fake", "c2", limit)
+    assert service._channel_bucket("fake", "c1", limit) is first
+    service._channel_bucket("fake", "c3", limit)
+    # 淘汰最久未使用的 c2
+    assert set(service._channel_buckets) == {("fake", "c1"), ("fake", "c3")}
+    assert first.rate_per_minute == 20
+    assert service._adapter_bucket("fake", limit).rate_per_minute == 600
+
+
+async def test_persisting_keeps_submission_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(module.config, "OUTBOX_PERSIST_ENABLED", True)
+    service = OutboxService()
+    delays = {"first": 0.05, "second": 0.0}
+
+    async def slow_persist(adapter_key: str, request: PlatformSendRequest, history: Any = None) -> int:
+        await asyncio.sleep(delays[request.segments[0].content])
+        return 1
+
+    monkeypatch.setattr(service, "_persist", slow_persist)
+    monkeypatch.setattr(service, "_discard", lambda record_id: asyncio.sleep(0))
+    adapter = _FakeAdapter()
+    await asyncio.gather(
+        service.send(adapter, _request("first")),  # type: ignore[arg-type]
+        service.send(adapter, _request("second")),  # type: ignore[arg-type]
+    )
+    assert adapter.sent == ["first", "second"]
+
+
+@pytest.fixture
+async def outbox_db():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["nekro_agent.models.db_outbox_message"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+async def test_recovered_messages_are_recorded_after_delivery(
+    outbox_db: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from nekro_agent.adapters.utils import adapter_utils
+    from nekro_agent.services.chat.universal_chat_service import universal_chat_service
+
+    monkeypatch.setattr(module.config, "OUTBOX_PERSIST_ENABLED", True)
+    history = {"messages": [{"type": "text", "content": "补发"}], "ref_msg_id": "m1"}
+    await OutboxService()._persist("fake", _request("补发"), history)
+    await OutboxService()._persist("fake", _request("不记录"))
+
+    adapter = _FakeAdapter()
+    recorded: List[Any] = []
+
+    async def fake_record(chat_key: str, messages: List[AgentMessageSegment], response: Any, ref_msg_id: Any = None) -> None:
+        recorded.append((chat_key, [m.content for m in messages], response.message_id, ref_msg_id))
+
+    monkeypatch.setattr(adapter_utils, "get_adapter", lambda key: adapter)
+    monkeypatch.setattr(universal_chat_service, "record_bot_message", fake_record)
+
+    service = OutboxService()
+    assert await service.recover() == 2
+    await asyncio.gather(*service._workers.values())
+
+    assert adapter.sent == ["补发", "不记录"]
+    assert recorded == [("fake-group_1", ["补发"], "补发", "m1")]
+    assert await DBOutboxMessage.all().count() == 0
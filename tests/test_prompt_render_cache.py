@@ -0,0 +1,70 @@
+"""Prompt 渲染缓存回归测试。"""
+
+from typing import Any, List
+
+import pytest
+
+from nekro_agent.services.agent.templates import compiler as compiler_module
+from nekro_agent.services.agent.templates.base import env
+from nekro_agent.services.agent.templates.cache import PromptRenderCache
+from nekro_agent.services.agent.templates.compiler import PromptCompiler
+from nekro_agent.services.agent.templates.plugin import PluginPrompt
+from nekro_agent.services.perf_metrics import perf_metrics
+
+
+def _build_compiler(**overrides: Any) -> PromptCompiler:
+    kwargs: dict[str, Any] = {
+        "platform_name": "QQ",
+        "bot_platform_id": "10000",
+        "chat_preset": "你是一只猫娘",
+        "plugins_prompt": "<plugin />",
+        "plugins_runtime_prompt": "",
+        "plugin_activation_rules": "",
+        "plugin_call_priority_rules": "",
+        "enable_cot": True,
+        "chat_key_rules": "- onebot_v11-group_<id>",
+        "enable_at": True,
+    }
+    kwargs.update(overrides)
+    return PromptCompiler(**kwargs)
+
+
+def test_template_render_is_reused_for_identical_fields() -> None:
+    cache = PromptRenderCache()
+    perf_metrics.reset()
+
+    first = cache.render(PluginPrompt(plugin_name="A", module_name="a", state="always_awake"), env)
+    second = cache.render(PluginPrompt(plugin_name="A", module_name="a", state="always_awake"), env)
+    cache.render(PluginPrompt(plugin_name="A", module_name="a", state="sleeping"), env)
+
+    assert first == second
+    assert perf_metrics.get_counter("prompt.cache.template.hit") == 1
+    assert perf_metrics.get_counter("prompt.cache.template.miss") == 2
+    assert perf_metrics.snapshot("prompt.cache").hit_rates["prompt.cache.template"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+def test_static_prefix_is_cached_per_key_and_returned_as_copy(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = PromptRenderCache()
+    monkeypatch.setattr(compiler_module, "prompt_render_cache", cache)
+    builds: List[str] = []
+    original = PromptCompiler.render_system_message
+
+    def counting_render(self: PromptCompiler):
+        builds.append(self.chat_preset)
+        return original(self)
+
+    monkeypatch.setattr(PromptCompiler, "render_system_message", counting_render)
+
+    first = _build_compiler().render_static_prefix("onebot_v11", None, None)
+    first[0].add({"type": "text", "text": "mutated"})
+    second = _build_compiler().render_static_prefix("onebot_v11", None, None)
+
+    assert builds == ["你是一只猫娘"]
+    assert [m.to_dict() for m in second] == [m.to_dict() for m in _build_compiler().render_static_prefix("onebot_v11", None, None)]
+    assert "mutated" not in second[0].to_dict()["content"], "调用方修改返回的消息不能污染缓存"
+
+    # 模型组开关、人设或适配器变化都会使用新的前缀
+    _build_compiler(enable_cot=False).render_static_prefix("onebot_v11", None, None)
+    _build_compiler(chat_preset="新人设").render_static_prefix("onebot_v11", None, None)
+    _build_compiler().render_static_prefix("telegram", None, None)
+    assert len(builds) == 4
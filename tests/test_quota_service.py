@@ -0,0 +1,59 @@
+"""QuotaService 内存回复计数器与临时提升持久化测试。"""
+
+import pytest
+
+from nekro_agent.services.quota_service import QuotaService
+
+
+def _seed(service: QuotaService, daily: dict[str, int], hourly: dict[str, int]) -> None:
+    """绕过数据库，直接以给定计数完成初始化。"""
+    service._daily_counts = dict(daily)
+    service._hourly_counts = dict(hourly)
+    service._seeded = True
+
+
+@pytest.mark.asyncio
+async def test_counts_seed_once_and_follow_recorded_replies(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    service = QuotaService(boost_persist_path=str(tmp_path / "boosts.json"))
+    reconcile_calls = 0
+
+    async def fake_reconcile() -> None:
+        nonlocal reconcile_calls
+        reconcile_calls += 1
+        service._roll_buckets()
+        _seed(service, {"chat-a": 3}, {"chat-a": 1})
+        service._last_reconcile = 10**9
+
+    monkeypatch.setattr(service, "reconcile", fake_reconcile)
+    monkeypatch.setattr("nekro_agent.services.quota_service.time.monotonic", lambda: 10**9)
+
+    assert await service.get_daily_count("chat-a") == 3
+    assert await service.get_hourly_count("chat-b") == 0
+
+    await service.record_bot_reply("chat-a")
+    await service.record_bot_reply("chat-b")
+
+    assert await service.get_daily_count("chat-a") == 4
+    assert await service.get_hourly_count("chat-a") == 2
+    assert await service.get_daily_count("chat-b") == 1
+    assert reconcile_calls == 1, "热路径上不应重复查询数据库"
+
+
+@pytest.mark.asyncio
+async def test_record_before_seed_is_ignored(tmp_path) -> None:
+    """未初始化前的回复已经落库，由初始化查询统计，避免重复计数。"""
+    service = QuotaService(boost_persist_path=str(tmp_path / "boosts.json"))
+    await service.record_bot_reply("chat-a")
+    assert service._daily_counts == {}
+
+
+def test_boosts_survive_restart(tmp_path) -> None:
+    path = str(tmp_path / "boosts.json")
+    service = QuotaService(boost_persist_path=path)
+    service.add_boost("chat-a", 5)
+    service.add_boost("chat-b", 2)
+    service.clear_boost("chat-b")
+
+    restarted = QuotaService(boost_persist_path=path)
+    assert restarted.get_boost("chat-a") == 5
+    assert restarted.get_boost("chat-b") == 0
@@ -0,0 +1,126 @@
+"""沙盒 RPC 通道编码与批量调用测试。"""
+
+import importlib.util
+import pickle
+from pathlib import Path
+from types import ModuleType
+from typing import Any, List, NamedTuple, Tuple
+
+import pytest
+
+from nekro_agent.routers import rpc as rpc_router
+from nekro_agent.schemas.rpc import RPCRequest
+from nekro_agent.services.plugin.schema import SandboxMethodType
+from nekro_agent.services.rpc_service import (
+    decode_rpc_payload,
+    decode_rpc_request,
+    encode_rpc_payload,
+)
+
+EXT_CALLER_CODE = Path(__file__).resolve().parents[1] / "nekro_agent" / "services" / "sandbox" / "ext_caller_code.py"
+
+
+def _load_api_caller() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("_test_api_caller", EXT_CALLER_CODE)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Point(NamedTuple):
+    x: int
+    y: int
+
+
+class _FakeResponse:
+    def __init__(self, content: bytes) -> None:
+        self.status_code = 200
+        self.content = content
+        self.headers: dict = {}
+
+
+class _FakeRequest:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+def test_sandbox_and_host_codecs_interoperate() -> None:
+    api_caller = _load_api_caller()
+
+    framed = api_caller._rpc_encode({"method": "send_msg_text", "args": ["chat", "你好"], "kwargs": {}})
+    assert framed.startswith(b"NRPC1m"), "基础类型使用 msgpack 编码"
+    assert decode_rpc_request(framed) == RPCRequest(method="send_msg_text", args=["chat", "你好"], kwargs={})
+
+    complex_payload = {"method": "save", "args": [Path("/app/shared/a.png")], "kwargs": {}}
+    framed_complex = api_caller._rpc_encode(complex_payload)
+    assert framed_complex.startswith(b"NRPC1p"), "msgpack 无法表示的对象回退到 pickle"
+    assert decode_rpc_payload(framed_complex) == complex_payload
+
+    assert api_caller._rpc_decode(encode_rpc_payload({"ok": True, "data": b"\x00\x01"})) == {"ok": True, "data": b"\x00\x01"}
+    # 旧版 api_caller 的裸 pickle 请求仍可解析
+    assert decode_rpc_request(pickle.dumps({"method": "m", "args": [], "kwargs": {}})).method == "m"
+
+
+def test_tuples_round_trip_through_msgpack() -> None:
+    api_caller = _load_api_caller()
+    payload = {"method": "m", "args": [(1, "a"), [(2, (3, 4))]], "kwargs": {"size": (640, 480)}}
+
+    framed = api_caller._rpc_encode(payload)
+    assert framed.startswith(b"NRPC1m")
+    assert decode_rpc_payload(framed) == payload
+    assert isinstance(decode_rpc_payload(framed)["args"][1][0][1], tuple)
+    assert api_caller._rpc_decode(encode_rpc_payload(payload)) == payload
+
+    # 元组子类无法用扩展类型还原，回退到 pickle 保留原类型
+    point = _Point(1, 2)
+    framed_point = encode_rpc_payload({"ok": True, "data": point})
+    assert framed_point.startswith(b"NRPC1p")
+    assert type(api_caller._rpc_decode(framed_point)["data"]) is _Point
+
+def test_batch_sends_single_request_and_records_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    api_caller = _load_api_caller()
+    posts: List[Tuple[str, Any]] = []
+
+    def fake_post(path: str, payload: Any) -> _FakeResponse:
+        posts.append((path, payload))
+        items = [{"method_type": "tool", "error": "", "result": f"ok:{call['args'][1]}"} for call in payload["calls"]]
+        return _FakeResponse(encode_rpc_payload(items))
+
+    monkeypatch.setattr(api_caller, "_rpc_post", fake_post)
+
+    @api_caller.__dict__["__extension_method_proxy"]
+    def send_msg_text(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    with api_caller.rpc_batch() as batch:
+        first = send_msg_text("chat", "a")
+        send_msg_text("chat", "b")
+        assert not first.done
+
+    assert [path for path, _ in posts] == ["rpc_batch"]
+    assert batch.results == ["ok:a", "ok:b"]
+    assert first.value == "ok:a"
+    assert api_caller._rpc_stats["send_msg_text"][0] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_stops_after_agent_method(monkeypatch: pytest.MonkeyPatch) -> None:
+    executed: List[str] = []
+
+    async def fake_dispatch(container_key: str, from_chat_key: str, rpc_request: RPCRequest):
+        executed.append(rpc_request.method)
+        method_type = SandboxMethodType.AGENT if rpc_request.method == "search" else SandboxMethodType.TOOL
+        return f"{rpc_request.method}-result", "", method_type
+
+    monkeypatch.setattr(rpc_router, "_dispatch_rpc", fake_dispatch)
+
+    body = encode_rpc_payload({"calls": [{"method": name, "args": [], "kwargs": {}} for name in ("send", "search", "send2")]})
+    response = await rpc_router.rpc_batch("sandbox_x", "chat", _FakeRequest(body))  # type: ignore[arg-type]
+
+    assert executed == ["send", "search"]
+    items = decode_rpc_payload(response.body)
+    assert [item["method_type"] for item in items] == ["tool", "agent"]
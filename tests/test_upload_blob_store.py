@@ -0,0 +1,102 @@
+"""上传资源内容寻址存储回归测试。"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nekro_agent.adapters.sse.tools import common as sse_common
+from nekro_agent.core import os_env
+from nekro_agent.tools import common_util
+from nekro_agent.tools import upload_blob_store as module
+from nekro_agent.tools.upload_blob_store import UploadBlobStore
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> UploadBlobStore:
+    store = UploadBlobStore(tmp_path / "upload_blobs")
+    monkeypatch.setattr(common_util, "USER_UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(common_util, "upload_blob_store", store)
+    return store
+
+
+async def test_same_content_across_chats_shares_one_blob(store: UploadBlobStore, tmp_path: Path) -> None:
+    data = b"sticker"
+    path_a, name_a = await common_util.download_file_from_bytes(data, use_suffix=".png", from_chat_key="qq-group_1")
+    path_b, name_b = await common_util.download_file_from_bytes(data, use_suffix=".png", from_chat_key="qq-group_2")
+
+    # 原有路径约定不变
+    assert name_a == name_b
+    assert Path(path_a) == tmp_path / "uploads" / "qq-group_1" / name_a
+    assert Path(path_b).read_bytes() == data
+
+    blobs = list(store.iter_blobs())
+    assert len(blobs) == 1
+    digest = blobs[0][0].name
+    assert blobs[0][0].parent.parent.name == digest[:2]
+    assert store.refcount(digest) == 2
+
+    # 重复写入同一路径不增加引用
+    await common_util.download_file_from_bytes(data, use_suffix=".png", from_chat_key="qq-group_1")
+    assert store.refcount(digest) == 2
+
+    Path(path_a).unlink()
+    assert store.reclaim_unreferenced() == (0, 0)
+    Path(path_b).unlink()
+    assert store.reclaim_unreferenced() == (1, len(data))
+    assert list(store.iter_blobs()) == []
+
+
+async def test_copy_streams_source_and_keeps_md5_name(store: UploadBlobStore, tmp_path: Path) -> None:
+    source = tmp_path / "big.bin"
+    source.write_bytes(os.urandom(module.HASH_CHUNK_SIZE * 2 + 7))
+    expected = await common_util.calculate_file_md5(str(source), strict=True)
+
+    save_path, file_name = await common_util.copy_to_upload_dir(str(source), use_suffix=".bin", from_chat_key="tg-1")
+
+    assert file_name == f"{expected}.bin"
+    assert Path(save_path).read_bytes() == source.read_bytes()
+    assert [s.st_nlink for _, s in store.iter_blobs()] == [2]
+
+
+def test_falls_back_to_copy_without_hardlinks(
+    store: UploadBlobStore,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def no_link(*_: object) -> None:
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(module.os, "link", no_link)
+    target = tmp_path / "uploads" / "chat" / "a.txt"
+    store.store_bytes(b"hello", target)
+
+    assert target.read_bytes() == b"hello"
+    # 复制后的内容不依赖存储，未被引用的内容立即丢弃
+    assert list(store.iter_blobs()) == []
+
+    # 已存在的目标被原子替换而不是就地覆写
+    store.store_bytes(b"world", target)
+    assert target.read_bytes() == b"world"
+
+
+async def test_rewriting_a_shared_file_keeps_other_channels_intact(
+    store: UploadBlobStore,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(os_env, "USER_UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(sse_common, "upload_blob_store", store)
+    original = b"shared attachment"
+    path_a, _ = await common_util.download_file_from_bytes(original, file_name="report.txt", from_chat_key="sse-a")
+    path_b, _ = await common_util.download_file_from_bytes(original, file_name="report.txt", from_chat_key="sse-b")
+    assert os.path.samefile(path_a, path_b)
+
+    # 频道 a 收到同名但内容不同的附件
+    rewritten, _ = await sse_common.bytes_to_file(b"new content", file_name="report.txt", save_dir=Path(path_a).parent)
+
+    assert rewritten == path_a
+    assert Path(path_a).read_bytes() == b"new content"
+    assert Path(path_b).read_bytes() == original
+    digests = {blob.name: blob.read_bytes() for blob, _ in store.iter_blobs()}
+    assert sorted(digests.values()) == [b"new content", original]
@@ -3,6 +3,7 @@ from typing import Any
 
 import pytest
 
+from nekro_agent.adapters.interface.base import AdapterMetadata
 from nekro_agent.adapters.interface.schemas.platform import (
     PlatformSendRequest,
     PlatformSendSegment,
@@ -102,6 +103,9 @@ async def test_universal_chat_service_skips_duplicate_record_when_adapter_record
     from nekro_agent.services.chat.universal_chat_service import universal_chat_service
 
     class Adapter:
+        key = "web"
+        metadata = AdapterMetadata(name="web", description="web")
+
         async def forward_message(self, request: PlatformSendRequest) -> PlatformSendResponse:
             return PlatformSendResponse(success=True, message_id="webout_test", recorded=True)
 
@@ -0,0 +1,94 @@
+"""微信客服消息增量同步回归测试。"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from nekro_agent.adapters.wxwork_corp_app.kf_sync import (
+    KfCursorStore,
+    KfMessageDeduper,
+    KfSyncEngine,
+)
+
+
+class _FakeSyncEndpoint:
+    """按游标分页返回消息的本地 `kf/sync_msg`"""
+
+    def __init__(self, page_size: int = 2) -> None:
+        self.page_size = page_size
+        self.messages: List[Dict[str, Any]] = []
+        self.calls: List[str] = []
+
+    def push(self, *msgids: str, send_time: int = 0) -> None:
+        for msgid in msgids:
+            self.messages.append({"msgid": msgid, "send_time": send_time or int(time.time()), "origin": 3})
+
+    async def sync_kf_messages(self, *, token: str, open_kfid: str, cursor: str = "") -> Dict[str, Any]:
+        self.calls.append(cursor)
+        await asyncio.sleep(0.01)
+        start = int(cursor or 0)
+        end = min(start + self.page_size, len(self.messages))
+        return {
+            "msg_list": [dict(m) for m in self.messages[start:end]],
+            "next_cursor": str(end),
+            "has_more": end < len(self.messages),
+        }
+
+
+def _engine(endpoint: _FakeSyncEndpoint, handled: List[str], path: Path) -> KfSyncEngine:
+    async def handle(item: Dict[str, Any]) -> None:
+        assert item["open_kfid"] == "kf1"
+        handled.append(item["msgid"])
+
+    return KfSyncEngine(
+        fetch=endpoint.sync_kf_messages,
+        handle=handle,
+        cursor_store=KfCursorStore(path),
+    )
+
+
+async def test_resumes_from_persisted_cursor_and_processes_every_message(tmp_path: Path) -> None:
+    endpoint = _FakeSyncEndpoint()
+    endpoint.push("old", send_time=1)
+    endpoint.push("m1", "m2", "m3")
+    handled: List[str] = []
+    engine = _engine(endpoint, handled, tmp_path / "cursors.json")
+
+    await engine.sync(token="t1", open_kfid="kf1")
+    # 首次同步跳过过旧的积压消息，同批到达的消息全部按序处理
+    assert handled == ["m1", "m2", "m3"]
+
+    endpoint.push("m4")
+    # 重启后从持久化游标继续，不再翻阅历史
+    restarted = _engine(endpoint, handled, tmp_path / "cursors.json")
+    endpoint.calls.clear()
+    await restarted.sync(token="t2", open_kfid="kf1")
+    assert handled == ["m1", "m2", "m3", "m4"]
+    assert endpoint.calls == ["4"]
+
+
+async def test_concurrent_callbacks_coalesce_into_one_sync(tmp_path: Path) -> None:
+    endpoint = _FakeSyncEndpoint(page_size=10)
+    handled: List[str] = []
+    engine = _engine(endpoint, handled, tmp_path / "cursors.json")
+    endpoint.push("m1")
+
+    first = asyncio.create_task(engine.sync(token="t1", open_kfid="kf1"))
+    await asyncio.sleep(0)
+    endpoint.push("m2")
+    await asyncio.gather(*(engine.sync(token=f"t{i}", open_kfid="kf1") for i in range(2, 6)), first)
+
+    # 进行中的同步结束后只补拉一轮
+    assert len(endpoint.calls) == 2
+    assert handled == ["m1", "m2"]
+
+
+def test_deduper_is_bounded() -> None:
+    deduper = KfMessageDeduper(capacity=2)
+    assert not deduper.check_and_add("a")
+    assert deduper.check_and_add("a")
+    deduper.check_and_add("b")
+    deduper.check_and_add("c")
+    assert not deduper.check_and_add("a")
+    assert not deduper.check_and_add("")